@@ -6,51 +6,72 @@
 
 作者: LAD Team
 创建时间: 2025-01-08
-最后更新: 2025-01-08
+最后更新: 2026-10-19
 """
 
-# 导入第三阶段：性能优化组件
-from .high_performance_file_reader import (
-    HighPerformanceFileReader, ReadStrategy, FileType, FileInfo, ReadMetrics
-)
-from .render_performance_optimizer import (
-    RenderPerformanceOptimizer, RenderStrategy, RenderMode, RenderMetrics, RenderChunk
-)
-from .memory_optimization_manager import (
-    MemoryOptimizationManager, MemoryStrategy, MemoryThreshold, MemoryInfo, MemoryMetrics, MemoryPool, StringPool
-)
-from .performance_benchmark import (
-    PerformanceBenchmark, BenchmarkType, BenchmarkResultEnum, BenchmarkResult, BenchmarkMetrics
-)
+# 导出名在首次访问时才导入所在子模块（导入任一 core 子模块不再连带加载全部组件及其 psutil/asyncio 依赖）
+from utils.lazy_imports import lazy_exports
 
-# 导入第四阶段：可观测性增强组件
-from .unified_logging_framework import (
-    UnifiedLoggingFramework, LogLevel, LogOutput, LogFormat, LogContext, LogMetrics,
-    StructuredFormatter, setup_logging_framework,
-    log_debug, log_info, log_warning, log_error, log_critical
-)
-from .performance_metrics_manager import (
-    PerformanceMetricsManager, MetricType, MetricUnit, MetricValue, MetricDefinition, MetricData,
-    AlertRule, Alert
-)
-from .debug_diagnostics_manager import (
-    DebugDiagnosticsManager, DiagnosticLevel, DiagnosticType, DiagnosticResult,
-    ComponentStatus, SystemHealth
-)
-
-# 导入第五阶段：边界条件处理与系统健壮性组件
-from .boundary_condition_handler import (
-    BoundaryConditionHandler, BoundaryType, ValidationLevel, BoundaryRule, ValidationResult, ParameterSuggestion
-)
-from .system_resource_boundary_checker import (
-    SystemResourceBoundaryChecker, ResourceType, ResourceStatus, ResourceLimit, ResourceUsage, ResourceAlert
-)
+_EXPORTS = {
+    # 现有组件
+    'unified_cache_manager': (
+        'UnifiedCacheManager', 'CacheStrategy', 'CacheStatus', 'CacheEntry', 'CacheStats',
+    ),
+    'cache_invalidation_manager': (
+        'CacheInvalidationManager', 'InvalidationStrategy', 'InvalidationTrigger', 'InvalidationRule',
+        'InvalidationEvent',
+    ),
+    'enhanced_error_handler': (
+        'EnhancedErrorHandler', 'ErrorSeverity', 'ErrorCategory', 'ErrorRecoveryStrategy', 'ErrorContext',
+        'ErrorInfo',
+    ),
+    'markdown_renderer': ('HybridMarkdownRenderer',),
+    'dynamic_module_importer': ('DynamicModuleImporter',),
+    # 第三阶段：性能优化组件
+    'high_performance_file_reader': (
+        'HighPerformanceFileReader', 'ReadStrategy', 'FileType', 'FileInfo', 'ReadMetrics',
+    ),
+    'render_performance_optimizer': (
+        'RenderPerformanceOptimizer', 'RenderStrategy', 'RenderMode', 'RenderMetrics', 'RenderChunk',
+    ),
+    'memory_optimization_manager': (
+        'MemoryOptimizationManager', 'MemoryStrategy', 'MemoryThreshold', 'MemoryInfo', 'MemoryMetrics',
+        'MemoryPool', 'StringPool',
+    ),
+    'performance_benchmark': (
+        'PerformanceBenchmark', 'BenchmarkType', 'BenchmarkResultEnum', 'BenchmarkResult', 'BenchmarkMetrics',
+    ),
+    # 第四阶段：可观测性增强组件
+    'unified_logging_framework': (
+        'UnifiedLoggingFramework', 'LogLevel', 'LogOutput', 'LogFormat', 'LogContext', 'LogMetrics',
+        'StructuredFormatter', 'setup_logging_framework',
+        'log_debug', 'log_info', 'log_warning', 'log_error', 'log_critical',
+    ),
+    'performance_metrics_manager': (
+        'PerformanceMetricsManager', 'MetricType', 'MetricUnit', 'MetricValue', 'MetricDefinition', 'MetricData',
+        'AlertRule', 'Alert',
+    ),
+    'debug_diagnostics_manager': (
+        'DebugDiagnosticsManager', 'DiagnosticLevel', 'DiagnosticType', 'DiagnosticResult',
+        'ComponentStatus', 'SystemHealth',
+    ),
+    # 第五阶段：边界条件处理与系统健壮性组件
+    'boundary_condition_handler': (
+        'BoundaryConditionHandler', 'BoundaryType', 'ValidationLevel', 'BoundaryRule', 'ValidationResult',
+        'ParameterSuggestion',
+    ),
+    'system_resource_boundary_checker': (
+        'SystemResourceBoundaryChecker', 'ResourceType', 'ResourceStatus', 'ResourceLimit', 'ResourceUsage',
+        'ResourceAlert',
+    ),
+    # 第六阶段：性能优化策略组件
+    'performance_optimization_strategy': (
+        'PerformanceOptimizationStrategy', 'OptimizationStrategy', 'OptimizationTarget', 'OptimizationLevel',
+        'OptimizationRule', 'OptimizationResult', 'PerformanceProfile',
+    ),
+}
 
-# 导入第六阶段：性能优化策略组件
-from .performance_optimization_strategy import (
-    PerformanceOptimizationStrategy, OptimizationStrategy, OptimizationTarget, OptimizationLevel,
-    OptimizationRule, OptimizationResult, PerformanceProfile
-)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 # 导出第三阶段性能优化组件
 __all__ = [
@@ -13,10 +13,52 @@ import threading
 import time
 import logging
 from contextlib import contextmanager
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from utils.config_manager import ConfigManager
 
 
+class FrozenStatus(dict):
+    """不可变状态字典
+    
+    状态写入时整体冻结一次（嵌套 dict/list 转为 FrozenStatus/tuple），读取方直接共享同一引用，
+    无需加锁或拷贝；copy/deepcopy 返回自身，json 序列化与普通 dict 一致。
+    """
+    
+    __slots__ = ()
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenStatus is read-only")
+    
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+    
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    def __reduce__(self):
+        return (FrozenStatus, (dict(self),))
+
+
+def freeze_status(value: Any) -> Any:
+    """递归冻结状态数据：dict -> FrozenStatus，list/tuple -> tuple，set -> frozenset"""
+    if isinstance(value, FrozenStatus):
+        return value
+    if isinstance(value, dict):
+        return FrozenStatus((key, freeze_status(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_status(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+_EMPTY_STATUS = FrozenStatus()
+
+
 class ApplicationStateManager:
     """
     应用状态管理器
@@ -38,10 +80,14 @@ class ApplicationStateManager:
         app_config = self.config_manager._app_config
         perf_config = app_config.get('markdown', {})
         
-        # 状态存储（三个域）
-        self._module_states = {}  # 模块导入状态
-        self._render_state = {}  # 渲染决策状态
-        self._link_state = {}  # 链接处理状态
+        # 状态存储（三个域）：写入时冻结并整体替换引用（写时复制），读取方无锁共享
+        self._module_states = _EMPTY_STATUS  # 模块导入状态
+        self._render_state = _EMPTY_STATUS  # 渲染决策状态
+        self._link_state = _EMPTY_STATUS  # 链接处理状态
+        
+        # 对外状态视图缓存：(状态版本, 配置代数, 视图)，版本或配置变化后首次读取时重建
+        self._status_views: Dict[Any, Tuple[int, Any, FrozenStatus]] = {}
+        self._config_generation = getattr(self.config_manager, "get_config_generation", None)
         
         # 简化配置驱动的组件初始化（延迟导入避免循环依赖）
         self._snapshot_manager = None
@@ -56,13 +102,73 @@ class ApplicationStateManager:
         self._module_locks = {}  # 模块级别的细粒度锁
         self._lock_manager_lock = threading.Lock()  # 锁管理器的锁
         
+        # 状态版本：每次成功更新递增，订阅者据此判断是否需要重新渲染
+        self._version = 0
+        self._version_lock = threading.Lock()
+        self._change_listeners: List[Callable[[int, str], None]] = []
+        self._snapshot_forwarding = False
+        
         # 日志记录器
         self.logger = logging.getLogger(__name__)
         self.logger.info("ApplicationStateManager initialized with simplified config")
     
     def set_snapshot_manager(self, snapshot_manager):
-        """设置快照管理器（避免循环依赖）"""
+        """设置快照管理器（避免循环依赖）
+        
+        快照管理器支持变更订阅时，绕过本管理器直接写入的快照（导入器、渲染器、
+        链接处理器）同样计入状态版本。
+        """
         self._snapshot_manager = snapshot_manager
+        self._snapshot_forwarding = False
+        self._status_views = {}
+        add_listener = getattr(snapshot_manager, "add_change_listener", None)
+        if callable(add_listener):
+            try:
+                add_listener(self._mark_changed)
+                self._snapshot_forwarding = True
+            except Exception as e:
+                self._log_thread_safe_error(f"Failed to subscribe snapshot changes: {e}")
+    
+    # 变更通知
+    def get_version(self) -> int:
+        """获取当前状态版本（每次成功更新递增）"""
+        with self._version_lock:
+            return self._version
+    
+    def add_change_listener(self, listener: Callable[[int, str], None]) -> None:
+        """注册状态变更监听器
+        
+        Args:
+            listener: 回调 listener(version, domain)，domain 为 module/render/link；
+                可能在写入状态的任意线程上调用，UI 需自行切回主线程并合并
+        """
+        with self._version_lock:
+            if listener not in self._change_listeners:
+                self._change_listeners.append(listener)
+    
+    def remove_change_listener(self, listener: Callable[[int, str], None]) -> None:
+        """移除状态变更监听器"""
+        with self._version_lock:
+            if listener in self._change_listeners:
+                self._change_listeners.remove(listener)
+    
+    def _mark_changed(self, domain: str) -> int:
+        """递增状态版本并通知监听器（在锁外回调，避免与监听器互相等待）"""
+        with self._version_lock:
+            self._version += 1
+            version = self._version
+            listeners = list(self._change_listeners)
+        for listener in listeners:
+            try:
+                listener(version, domain)
+            except Exception as e:
+                self._log_thread_safe_error(f"State change listener failed: {e}")
+        return version
+    
+    def _notify_update(self, domain: str) -> None:
+        """update_*_status 成功后调用；快照管理器已转发变更时不重复计数"""
+        if not self._snapshot_forwarding:
+            self._mark_changed(domain)
     
     def set_performance_metrics(self, performance_metrics):
         """设置性能指标收集器（避免循环依赖）"""
@@ -102,31 +208,30 @@ class ApplicationStateManager:
     def get_module_status(self, module_name: str) -> Dict[str, Any]:
         """线程安全获取模块状态（简化配置驱动）
         
+        返回不可变快照；状态与配置均未变化时直接返回缓存的同一对象（O(1)、无拷贝）。
+        _lock_info 记录该快照的构建线程与时间。
+        
         Args:
             module_name: 模块名称
             
         Returns:
-            模块状态字典
+            模块状态字典（FrozenStatus）
         """
-        with self._state_transaction(module_name):
-            # 从简化配置中获取模块信息
-            module_config = self.config_manager.get_external_module_config(module_name)
-            
-            # 合并运行时状态和配置信息
-            state = self._module_states.get(module_name, {}).copy()
-            state.update({
-                "config_enabled": module_config.get("enabled", False),
-                "config_version": module_config.get("version", "unknown"),
-                "required_functions": module_config.get("required_functions", [])
-            })
-            
-            # 添加线程信息
-            state['_lock_info'] = {
-                'thread_id': threading.current_thread().ident,
-                'access_time': time.time()
-            }
-            
-            return state
+        return self._cached_view(("module", module_name), lambda: self._build_module_view(module_name))
+    
+    def _build_module_view(self, module_name: str) -> FrozenStatus:
+        # 从简化配置中获取模块信息
+        module_config = self.config_manager.get_external_module_config(module_name) or {}
+        
+        # 合并运行时状态和配置信息
+        state = dict(self._module_states.get(module_name, _EMPTY_STATUS))
+        state.update({
+            "config_enabled": module_config.get("enabled", False),
+            "config_version": module_config.get("version", "unknown"),
+            "required_functions": module_config.get("required_functions", [])
+        })
+        state['_lock_info'] = self._build_info()
+        return freeze_status(state)
     
     def update_module_status(self, module_name: str, status_data: Dict[str, Any]) -> bool:
         """线程安全更新模块状态（简化配置感知）
@@ -146,17 +251,14 @@ class ApplicationStateManager:
                     self.logger.warning(f"Module {module_name} is disabled in config")
                     return False
                 
-                # 深拷贝状态数据，避免外部修改影响
-                safe_status_data = self._deep_copy_status_data(status_data)
-                
-                # 添加线程信息
-                safe_status_data['_thread_info'] = {
-                    'updated_by_thread': threading.current_thread().ident,
-                    'update_time': time.time()
-                }
+                # 冻结状态数据（唯一一次拷贝），避免外部修改影响
+                safe_status_data = self._freeze_status_data(status_data)
                 
-                # 更新状态
-                self._module_states[module_name] = safe_status_data
+                # 写时复制：新映射整体替换旧引用，读取方看到的要么是旧快照要么是新快照
+                with self._state_lock:
+                    states = dict(self._module_states)
+                    states[module_name] = safe_status_data
+                    self._module_states = FrozenStatus(states)
                 
                 # 更新快照（如果快照管理器已设置）
                 if self._snapshot_manager:
@@ -170,34 +272,30 @@ class ApplicationStateManager:
                 if self._performance_metrics:
                     self._performance_metrics.record_module_update(module_name, safe_status_data)
                 
-                return snapshot_success
+            self._notify_update("module")
+            return snapshot_success
                 
         except Exception as e:
             self._log_thread_safe_error(f"Failed to update module status for {module_name}: {e}")
             return False
     
     def get_render_status(self) -> Dict[str, Any]:
-        """线程安全获取渲染状态
+        """线程安全获取渲染状态（不可变快照，未变化时返回缓存对象）
         
         Returns:
-            渲染状态字典
+            渲染状态字典（FrozenStatus）
         """
-        with self._state_transaction():
-            if self._snapshot_manager:
-                snapshot = self._snapshot_manager.get_render_snapshot()
-            else:
-                snapshot = {}
-            
-            return {
-                'renderer_type': snapshot.get('renderer_type', 'unknown'),
-                'reason': snapshot.get('reason', 'unknown'),
-                'details': snapshot.get('details', {}).copy(),
-                'timestamp': snapshot.get('timestamp', ''),
-                '_lock_info': {
-                    'thread_id': threading.current_thread().ident,
-                    'access_time': time.time()
-                }
-            }
+        return self._cached_view("render", self._build_render_view)
+    
+    def _build_render_view(self) -> FrozenStatus:
+        snapshot = self._snapshot_manager.get_render_snapshot() if self._snapshot_manager else {}
+        return freeze_status({
+            'renderer_type': snapshot.get('renderer_type', 'unknown'),
+            'reason': snapshot.get('reason', 'unknown'),
+            'details': snapshot.get('details', {}),
+            'timestamp': snapshot.get('timestamp', ''),
+            '_lock_info': self._build_info()
+        })
     
     def update_render_status(self, status_data: Dict[str, Any]) -> bool:
         """线程安全更新渲染状态
@@ -210,12 +308,7 @@ class ApplicationStateManager:
         """
         try:
             with self._state_transaction():
-                safe_status_data = self._deep_copy_status_data(status_data)
-                safe_status_data['_thread_info'] = {
-                    'updated_by_thread': threading.current_thread().ident,
-                    'update_time': time.time()
-                }
-                
+                safe_status_data = self._freeze_status_data(status_data)
                 self._render_state = safe_status_data
                 
                 if self._snapshot_manager:
@@ -226,38 +319,34 @@ class ApplicationStateManager:
                 if self._performance_metrics:
                     self._performance_metrics.record_render_update(safe_status_data)
                 
-                return snapshot_success
+            self._notify_update("render")
+            return snapshot_success
                 
         except Exception as e:
             self._log_thread_safe_error(f"Failed to update render status: {e}")
             return False
     
     def get_link_status(self) -> Dict[str, Any]:
-        """线程安全获取链接状态
+        """线程安全获取链接状态（不可变快照，未变化时返回缓存对象）
         
         Returns:
-            链接状态字典
+            链接状态字典（FrozenStatus）
         """
-        with self._state_transaction():
-            if self._snapshot_manager:
-                snapshot = self._snapshot_manager.get_link_snapshot()
-            else:
-                snapshot = {}
-            
-            return {
-                'link_processor_loaded': snapshot.get('link_processor_loaded', False),
-                'policy_profile': snapshot.get('policy_profile', 'default'),
-                'last_action': snapshot.get('last_action', 'none'),
-                'last_result': snapshot.get('last_result', 'unknown'),
-                'details': snapshot.get('details', {}).copy(),
-                'error_code': snapshot.get('error_code', ''),
-                'message': snapshot.get('message', ''),
-                'timestamp': snapshot.get('timestamp', ''),
-                '_lock_info': {
-                    'thread_id': threading.current_thread().ident,
-                    'access_time': time.time()
-                }
-            }
+        return self._cached_view("link", self._build_link_view)
+    
+    def _build_link_view(self) -> FrozenStatus:
+        snapshot = self._snapshot_manager.get_link_snapshot() if self._snapshot_manager else {}
+        return freeze_status({
+            'link_processor_loaded': snapshot.get('link_processor_loaded', False),
+            'policy_profile': snapshot.get('policy_profile', 'default'),
+            'last_action': snapshot.get('last_action', 'none'),
+            'last_result': snapshot.get('last_result', 'unknown'),
+            'details': snapshot.get('details', {}),
+            'error_code': snapshot.get('error_code', ''),
+            'message': snapshot.get('message', ''),
+            'timestamp': snapshot.get('timestamp', ''),
+            '_lock_info': self._build_info()
+        })
     
     def update_link_status(self, status_data: Dict[str, Any]) -> bool:
         """线程安全更新链接状态
@@ -270,12 +359,7 @@ class ApplicationStateManager:
         """
         try:
             with self._state_transaction():
-                safe_status_data = self._deep_copy_status_data(status_data)
-                safe_status_data['_thread_info'] = {
-                    'updated_by_thread': threading.current_thread().ident,
-                    'update_time': time.time()
-                }
-                
+                safe_status_data = self._freeze_status_data(status_data)
                 self._link_state = safe_status_data
                 
                 if self._snapshot_manager:
@@ -286,24 +370,59 @@ class ApplicationStateManager:
                 if self._performance_metrics:
                     self._performance_metrics.record_link_update(safe_status_data)
                 
-                return snapshot_success
+            self._notify_update("link")
+            return snapshot_success
                 
         except Exception as e:
             self._log_thread_safe_error(f"Failed to update link status: {e}")
             return False
     
     # 辅助方法
-    def _deep_copy_status_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """深拷贝状态数据，确保线程安全
+    def _freeze_status_data(self, data: Dict[str, Any]) -> FrozenStatus:
+        """冻结写入的状态数据并附加写入线程信息
         
         Args:
             data: 状态数据
             
         Returns:
-            深拷贝后的数据
+            不可变的状态快照
         """
-        import copy
-        return copy.deepcopy(data)
+        state = dict(data or {})
+        state['_thread_info'] = {
+            'updated_by_thread': threading.current_thread().ident,
+            'update_time': time.time()
+        }
+        return freeze_status(state)
+    
+    def _build_info(self) -> Dict[str, Any]:
+        return {
+            'thread_id': threading.current_thread().ident,
+            'access_time': time.time()
+        }
+    
+    def _current_config_generation(self) -> Any:
+        if self._config_generation is None:
+            return None
+        try:
+            return self._config_generation()
+        except Exception:
+            return None
+    
+    def _cached_view(self, key: Any, build: Callable[[], FrozenStatus]) -> FrozenStatus:
+        """按 (状态版本, 配置代数) 缓存对外视图
+        
+        版本在构建前读取：构建期间发生的写入会让下一次读取重建。快照管理器不支持变更通知时，
+        无法感知绕过本管理器的写入，渲染/链接视图每次重建。
+        """
+        version = self._version
+        generation = self._current_config_generation()
+        cached = self._status_views.get(key)
+        if cached is not None and cached[0] == version and cached[1] == generation:
+            return cached[2]
+        view = build()
+        if self._snapshot_forwarding or self._snapshot_manager is None or isinstance(key, tuple):
+            self._status_views[key] = (version, generation, view)
+        return view
     
     def _log_thread_safe_error(self, message: str):
         """线程安全的错误日志记录
@@ -318,18 +437,17 @@ class ApplicationStateManager:
         """线程安全获取所有状态
         
         Returns:
-            包含所有域状态的字典
+            包含所有域状态的字典（各域为不可变快照的当前引用）
         """
-        with self._state_lock:
-            return {
-                'modules': self._module_states.copy(),
-                'render': self._render_state.copy(),
-                'link': self._link_state.copy(),
-                '_access_info': {
-                    'thread_id': threading.current_thread().ident,
-                    'access_time': time.time()
-                }
+        return {
+            'modules': self._module_states,
+            'render': self._render_state,
+            'link': self._link_state,
+            '_access_info': {
+                'thread_id': threading.current_thread().ident,
+                'access_time': time.time()
             }
+        }
 
     def get_snapshot_manager(self):
         return self._snapshot_manager
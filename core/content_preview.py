@@ -35,22 +35,20 @@
 
 import os
 import re
-import base64
 import mimetypes
 import logging
 import importlib
 import builtins
 from pathlib import Path
+from urllib.parse import quote
 from typing import Dict, Any, Optional, Union, List
 from datetime import datetime, timezone
 
-# 条件导入PIL/Pillow
-try:
-    from PIL import Image
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    Image = None
+# 条件导入PIL/Pillow（首次生成图片预览时才加载）
+from utils.lazy_imports import optional_import
+
+Image = optional_import('PIL.Image')
+PIL_AVAILABLE = Image is not None
 
 # 导入项目内部模块
 from core.file_resolver import FileResolver
@@ -516,33 +514,10 @@ class ContentPreview:
                                    image_info: Dict[str, Any]) -> str:
         """生成图片预览HTML"""
         try:
-            file_size = image_info.get('size') or os.path.getsize(file_path)
-            try:
-                w = int(image_info.get('width')) if image_info.get('width') is not None else None
-            except Exception:
-                w = None
-            try:
-                h = int(image_info.get('height')) if image_info.get('height') is not None else None
-            except Exception:
-                h = None
-            px = (w * h) if (isinstance(w, int) and isinstance(h, int)) else None
-            max_inline_bytes = 2 * 1024 * 1024
-            max_inline_pixels = 10_000_000
-            inline_ok = True
-            if isinstance(file_size, int) and file_size > max_inline_bytes:
-                inline_ok = False
-            if isinstance(px, int) and px > max_inline_pixels:
-                inline_ok = False
-            mime_type = image_info.get('mime_type', 'image/png')
-            if inline_ok:
-                with open(file_path, 'rb') as f:
-                    image_data = f.read()
-                    base64_data = base64.b64encode(image_data).decode('utf-8')
-                img_block = f'<img src="data:{mime_type};base64,{base64_data}" alt="{filename}" class="preview-image">'
-            else:
-                img_block = '<div class="image-too-large">图片过大，未内嵌</div>'
+            # 按引用显示（相对于图片所在目录，由 lmv:// 或 file:// baseUrl 解析），不再内嵌 base64
+            src = quote(Path(file_path).name)
+            img_block = f'<img src="{src}" alt="{filename}" class="preview-image">'
         except Exception:
-            mime_type = "image/png"
             img_block = '<div class="image-too-large">图片预览不可用</div>'
         
         html = f"""
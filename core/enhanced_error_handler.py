@@ -183,6 +183,9 @@ class ErrorStats:
 
 class EnhancedErrorHandler:
     """增强错误处理器"""
+
+    # 系统上下文（内存/CPU/磁盘占用）的缓存时长（秒）：错误风暴中不必每条错误都采样一次
+    SYSTEM_CONTEXT_TTL = 5.0
     
     def __init__(self, error_log_dir: Optional[Union[str, Path]] = None,
                  max_error_history: int = 1000,
@@ -229,6 +232,9 @@ class EnhancedErrorHandler:
         
         # 线程安全
         self._lock = threading.RLock()
+
+        # 系统上下文缓存：(采样时间, 上下文)
+        self._system_context_cache = None
         
         # 日志
         self.logger = logging.getLogger(__name__)
@@ -473,10 +479,14 @@ class EnhancedErrorHandler:
         )
     
     def _get_system_context(self) -> Dict[str, Any]:
-        """获取系统上下文"""
+        """获取系统上下文（采样结果缓存 SYSTEM_CONTEXT_TTL 秒）"""
+        cached = self._system_context_cache
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self.SYSTEM_CONTEXT_TTL:
+            return dict(cached[1])
         try:
             import psutil
-            return {
+            context = {
                 'memory_usage': psutil.virtual_memory().percent,
                 'cpu_usage': psutil.cpu_percent(),
                 'disk_usage': psutil.disk_usage('/').percent,
@@ -484,7 +494,9 @@ class EnhancedErrorHandler:
                 'platform': sys.platform
             }
         except Exception:
-            return {}
+            context = {}
+        self._system_context_cache = (now, context)
+        return dict(context)
     
     def _find_error_handler(self, exception: Exception) -> Optional[Callable]:
         """查找错误处理器"""
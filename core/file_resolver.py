@@ -20,17 +20,19 @@ from collections import OrderedDict
 import ctypes
 from ctypes import wintypes
 
-try:
-    import chardet
-    CHARDET_AVAILABLE = True
-except ImportError:
-    CHARDET_AVAILABLE = False
-    logging.warning("chardet库未安装，将使用基本编码检测方法")
-
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.lazy_imports import optional_import
+
+# 编码检测库（首次检测编码时才加载）
+chardet = optional_import('chardet')
+CHARDET_AVAILABLE = chardet is not None
+if not CHARDET_AVAILABLE:
+    logging.warning("chardet库未安装，将使用基本编码检测方法")
+
 from utils.config_manager import ConfigManager
+from core.tracing import traced
 
 
 class FileResolver:
@@ -111,6 +113,7 @@ class FileResolver:
         """用于测试/监控：当前解析器是否具备关键依赖。"""
         return True
 
+    @traced("file_resolver.resolve_file_path", component="file_resolver")
     def resolve_file_path(self, file_path: Union[str, Path], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         统一文件路径解析方法
@@ -562,6 +565,7 @@ class FileResolver:
             
         return min(confidence, 1.0)
     
+    @traced("file_resolver.detect_encoding", component="file_resolver")
     def _detect_encoding(self, file_path: Path) -> Dict[str, Any]:
         """
         检测文件编码
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HtmlBlockDiff v1.0.0
+渲染结果的顶层块级差分，用于同一文档重新渲染后的原地 DOM 更新
+
+- split_blocks(): 把渲染 HTML 拆为 document.body 的顶层元素块与其余“外壳”（样式/head/注释）
+- diff_blocks(): 计算旧块列表到新块列表的替换操作；变化比例过大时返回 None（调用方改用 setHtml）
+- build_patch_script(): 生成在页面中执行的补丁脚本，执行前后都校验 DOM 结构，不一致时返回 false
+- 无法可靠映射到 DOM 的输入（顶层裸文本、未闭合/错配标签、变化块含 <script>）一律放弃差分
+"""
+
+import difflib
+import json
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+
+# 不会成为 body 子元素的顶层标签（浏览器放入 head）
+_HEAD_TAGS = frozenset({'base', 'link', 'meta', 'style', 'title'})
+# 透明容器：其子元素视为顶层
+_TRANSPARENT_TAGS = frozenset({'html', 'body'})
+_VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                        'link', 'meta', 'param', 'source', 'track', 'wbr'})
+
+
+@dataclass
+class HtmlBlocks:
+    """拆分结果：shell 为顶层块之外的内容（去掉块间空白），blocks/tags 一一对应"""
+    shell: str
+    blocks: List[str]
+    tags: List[str]
+
+
+class _BlockScanner(HTMLParser):
+    """记录顶层块在源文本中的起止偏移"""
+
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=False)
+        self._html = html
+        self._line_starts = [0] + [m.end() for m in re.finditer('\n', html)]
+        self.spans: List[List[Any]] = []  # [start, end, tag]
+        self.valid = True
+        self._stack: List[str] = []
+        self._in_block = False
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self._line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        start = self._offset()
+        end = start + len(self.get_starttag_text() or '')
+        if not self._stack and tag in _TRANSPARENT_TAGS:
+            return
+        if not self._stack and tag not in _HEAD_TAGS and tag != 'head':
+            self._in_block = True
+            self.spans.append([start, end, tag])
+        if tag in _VOID_TAGS:
+            self._close_if_top(end)
+        else:
+            self._stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        start = self._offset()
+        end = start + len(self.get_starttag_text() or '')
+        if self._stack or tag in _TRANSPARENT_TAGS:
+            return
+        if tag not in _HEAD_TAGS and tag != 'head':
+            self.spans.append([start, end, tag])
+
+    def handle_endtag(self, tag):
+        if not self._stack:
+            if tag not in _TRANSPARENT_TAGS:
+                self.valid = False
+            return
+        if self._stack[-1] != tag:
+            # 隐式闭合的标签：浏览器的 DOM 可能与源文本结构不同
+            self.valid = False
+            return
+        self._stack.pop()
+        if not self._stack:
+            start = self._offset()
+            self._close_if_top(self._html.index('>', start) + 1)
+
+    def handle_data(self, data):
+        if not self._stack and data.strip():
+            self.valid = False  # 顶层裸文本会成为 body 的文本节点
+
+    def handle_entityref(self, name):
+        if not self._stack:
+            self.valid = False
+
+    handle_charref = handle_entityref
+
+    def _close_if_top(self, end: int) -> None:
+        if not self._stack and self._in_block:
+            self.spans[-1][1] = end
+            self._in_block = False
+
+
+def split_blocks(html: str) -> Optional[HtmlBlocks]:
+    """
+    拆分渲染 HTML 的顶层块
+
+    Args:
+        html: 渲染结果（完整文档或以 <style> 开头的片段）
+
+    Returns:
+        Optional[HtmlBlocks]: 无法可靠映射到 DOM 时返回 None
+    """
+    scanner = _BlockScanner(html)
+    try:
+        scanner.feed(html)
+        scanner.close()
+    except Exception:
+        return None
+    if not scanner.valid or scanner._stack:
+        return None
+    shell_parts: List[str] = []
+    blocks: List[str] = []
+    tags: List[str] = []
+    cursor = 0
+    for start, end, tag in scanner.spans:
+        shell_parts.append(html[cursor:start].strip())
+        blocks.append(html[start:end])
+        tags.append(tag)
+        cursor = end
+    shell_parts.append(html[cursor:].strip())
+    return HtmlBlocks(shell=''.join(shell_parts), blocks=blocks, tags=tags)
+
+
+def diff_blocks(old: HtmlBlocks, new: HtmlBlocks, max_ratio: float = 0.5) -> Optional[List[Dict[str, Any]]]:
+    """
+    计算旧块到新块的替换操作
+
+    Args:
+        old: 页面当前显示的拆分结果
+        new: 重新渲染后的拆分结果
+        max_ratio: 变化块数占比上限，超出返回 None
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: 按旧索引升序的操作 {'index', 'remove', 'insert'}；
+        外壳不同或变化过大时返回 None；无变化时返回空列表
+    """
+    if old.shell != new.shell:
+        return None
+    a, b = old.blocks, new.blocks
+    # 先剥离公共前后缀，编辑通常是局部的
+    prefix = 0
+    limit = min(len(a), len(b))
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[len(a) - 1 - suffix] == b[len(b) - 1 - suffix]:
+        suffix += 1
+    matcher = difflib.SequenceMatcher(None, a[prefix:len(a) - suffix], b[prefix:len(b) - suffix],
+                                      autojunk=False)
+    ops: List[Dict[str, Any]] = []
+    changed = 0
+    for opcode, i1, i2, j1, j2 in matcher.get_opcodes():
+        if opcode == 'equal':
+            continue
+        inserted = b[prefix + j1:prefix + j2]
+        if any('<script' in block.lower() for block in inserted):
+            return None
+        changed += max(i2 - i1, j2 - j1)
+        ops.append({'index': prefix + i1, 'remove': i2 - i1, 'insert': inserted})
+    if changed > max_ratio * max(len(a), len(b), 1):
+        return None
+    return ops
+
+
+_PATCH_JS = r"""
+(function(expectTags, ops, expectCount) {
+    try {
+        var root = document.body;
+        if (!root || root.children.length !== expectTags.length) { return false; }
+        for (var i = 0; i < expectTags.length; i++) {
+            if (root.children[i].tagName.toLowerCase() !== expectTags[i]) { return false; }
+        }
+        for (var k = ops.length - 1; k >= 0; k--) {
+            var op = ops[k];
+            for (var r = 0; r < op.remove; r++) { root.removeChild(root.children[op.index]); }
+            var tpl = document.createElement('template');
+            tpl.innerHTML = op.insert.join('');
+            root.insertBefore(tpl.content, root.children[op.index] || null);
+        }
+        return root.children.length === expectCount;
+    } catch (e) { return false; }
+})(%s, %s, %d);
+"""
+
+
+def build_patch_script(old: HtmlBlocks, new: HtmlBlocks, ops: List[Dict[str, Any]]) -> str:
+    """生成页面补丁脚本，返回值为 true 表示补丁已按预期应用"""
+    return _PATCH_JS % (json.dumps(old.tags), json.dumps(ops, ensure_ascii=False), len(new.blocks))
@@ -18,6 +18,7 @@ import json
 import logging
 import os
 from utils.config_manager import get_config_manager
+from core.tracing import traced
 
 
 class LinkType(Enum):
@@ -325,6 +326,7 @@ class LinkProcessor:
             # 默认保持保守策略
             return {"check_exists": True, "security": {}}
 
+    @traced("link_processor.process_link", component="link_processor")
     def process_link(self, ctx: LinkContext) -> LinkResult:  # pragma: no cover - 简化骨架
         try:
             # 保护extra
@@ -27,15 +27,16 @@ import builtins
 from .unified_cache_manager import UnifiedCacheManager, CacheStrategy
 from .cache_invalidation_manager import CacheInvalidationManager, InvalidationTrigger
 from .enhanced_error_handler import EnhancedErrorHandler, ErrorRecoveryStrategy
+from .tracing import span, traced
 
 
 
-# 备用markdown库
-try:
-    import markdown
-    MARKDOWN_AVAILABLE = True
-except ImportError:
-    MARKDOWN_AVAILABLE = False
+# 备用markdown库（首次渲染时才加载）
+from utils.lazy_imports import optional_import
+
+markdown = optional_import('markdown')
+MARKDOWN_AVAILABLE = markdown is not None
+if not MARKDOWN_AVAILABLE:
     logging.warning("无法导入markdown库，将使用基本文本渲染")
 
 try:
@@ -195,6 +196,7 @@ class HybridMarkdownRenderer:
         if not self.markdown_processor_available and not self.markdown_available:
             self.logger.warning("所有Markdown渲染组件都不可用，将使用纯文本渲染")
     
+    @traced("renderer.render", component="renderer")
     def render(self, markdown_content: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         渲染Markdown内容为HTML
@@ -228,7 +230,9 @@ class HybridMarkdownRenderer:
                 cache_key = self._generate_cache_key(markdown_content, render_options)
                 
                 # 使用统一缓存管理器
-                cached_result = self.cache_manager.get(cache_key)
+                with span("renderer.cache_lookup", component="renderer") as lookup_span:
+                    cached_result = self.cache_manager.get(cache_key)
+                    lookup_span.set_attribute("hit", cached_result is not None)
                 if cached_result is not None:
                     cached_result = cached_result.copy()
                     cached_result['cached'] = True
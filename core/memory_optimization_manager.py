@@ -11,7 +11,7 @@
 
 import os
 import gc
-import psutil
+from utils.lazy_imports import lazy_import
 import threading
 import time
 import logging
@@ -22,6 +22,8 @@ from enum import Enum
 import weakref
 import sys
 
+psutil = lazy_import("psutil")  # 首次采样时才加载
+
 # 导入统一缓存管理器
 from .unified_cache_manager import UnifiedCacheManager, CacheStrategy
 from .enhanced_error_handler import EnhancedErrorHandler, ErrorRecoveryStrategy
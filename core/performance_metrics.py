@@ -9,6 +9,7 @@ LAD-IMPL-006A: 架构修正方案实施
 创建时间: 2025-10-11
 """
 
+import itertools
 import logging
 import threading
 import time
@@ -17,6 +18,7 @@ from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Callable, TYPE_CHECKING
 
+from core.streaming_histogram import StreamingHistogram
 from utils.config_manager import ConfigManager
 
 
@@ -36,7 +38,10 @@ class PerformanceMetrics:
         self._timers: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._counters: Dict[str, int] = {}
         self._gauges: Dict[str, float] = {}
-        self._histograms: Dict[str, List[float]] = {}
+        # 每个指标名一个固定内存的流式直方图；计时器按名称单独聚合耗时分布
+        self._histograms: Dict[str, StreamingHistogram] = {}
+        self._timer_histograms: Dict[str, StreamingHistogram] = {}
+        self._timer_seq = itertools.count()
         self._lock = threading.Lock()
         self._thresholds: Dict[str, Dict[str, Any]] = metrics_config.get("thresholds", {})
         self._listeners: List[Callable[[str, float, Dict[str, Any]], None]] = []
@@ -46,6 +51,11 @@ class PerformanceMetrics:
         self._snapshot_histogram_limit = metrics_config.get("max_snapshot_histograms", 20)
         self._snapshot_trim_mode = metrics_config.get("snapshot_timer_trim", "drop_oldest")
         self._snapshot_timer_keep_recent = metrics_config.get("timer_keep_recent", 50)
+        self._histogram_name_limit = metrics_config.get("max_histograms", 200)
+        self._histogram_accuracy = metrics_config.get("histogram_relative_accuracy", 0.01)
+        self._histogram_max_buckets = metrics_config.get("histogram_max_buckets", 2048)
+        self._percentile_min_samples = metrics_config.get("percentile_min_samples", 20)
+        self._percentile_check_interval = max(1, metrics_config.get("percentile_check_interval", 16))
 
         self.logger = logging.getLogger(__name__)
 
@@ -87,6 +97,38 @@ class PerformanceMetrics:
             metadata.setdefault("warn_only", warn_only)
             self._notify_threshold(metric_name, value, metadata)
 
+    def _check_percentile_thresholds(
+        self, metric_name: str, histogram: StreamingHistogram, metadata: Dict[str, Any]
+    ) -> None:
+        """基于分布的阈值，如 {"p95_max": 0.2, "p99_max": 0.5}；按采样间隔评估以保持 O(1) 均摊。"""
+        config = self._thresholds.get(metric_name)
+        if not config or histogram.count < self._percentile_min_samples:
+            return
+        if histogram.count % self._percentile_check_interval:
+            return
+        for key, threshold in config.items():
+            if not (key.startswith("p") and key.endswith("_max")) or threshold is None:
+                continue
+            percentile = key[:-4]
+            try:
+                with self._lock:
+                    value = histogram.quantile(float(percentile[1:]) / 100)
+            except ValueError:
+                continue
+            if value is not None and value > threshold:
+                payload = dict(metadata)
+                payload.update({
+                    "percentile": percentile,
+                    "threshold": threshold,
+                    "sample_count": histogram.count,
+                    "severity": config.get("severity_over", "warning"),
+                    "warn_only": config.get("warn_only", False),
+                })
+                self._notify_threshold(metric_name, value, payload)
+
+    def _new_histogram(self) -> StreamingHistogram:
+        return StreamingHistogram(self._histogram_accuracy, self._histogram_max_buckets)
+
     @contextmanager
     def start_timer_ctx(self, name: str, metadata: Optional[Dict[str, Any]] = None):
         start = time.perf_counter()
@@ -98,7 +140,7 @@ class PerformanceMetrics:
 
     def start_timer(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> str:
         start = time.perf_counter()
-        key = f"{name}_{int(time.time() * 1000)}"
+        key = self._timer_key(name)
         with self._lock:
             self._timers[key] = {
                 "name": name,
@@ -130,7 +172,7 @@ class PerformanceMetrics:
         metadata.setdefault("captured_at", datetime.now(timezone.utc).isoformat())
 
         with self._lock:
-            timer_key = f"{name}_{int(time.time() * 1000)}"
+            timer_key = self._timer_key(name)
             self._timers[timer_key] = {
                 "name": name,
                 "duration": duration,
@@ -146,7 +188,18 @@ class PerformanceMetrics:
                 else:
                     self._timers.popitem(last=False)
 
+            histogram = self._timer_histograms.get(name)
+            if histogram is None:
+                histogram = self._timer_histograms[name] = self._new_histogram()
+                self._trim_map(self._timer_histograms, self._histogram_name_limit)
+            histogram.record(duration)
+
         self._check_threshold(name, duration, metadata)
+        self._check_percentile_thresholds(name, histogram, metadata)
+
+    def _timer_key(self, name: str) -> str:
+        # 毫秒时间戳 + 自增序号，避免同一毫秒内的计时互相覆盖
+        return f"{name}_{int(time.time() * 1000)}_{next(self._timer_seq)}"
 
     def increment_counter(self, name: str, value: int = 1, metadata: Optional[Dict[str, Any]] = None) -> None:
         with self._lock:
@@ -162,10 +215,29 @@ class PerformanceMetrics:
 
     def record_histogram(self, name: str, value: float, metadata: Optional[Dict[str, Any]] = None) -> None:
         with self._lock:
-            self._histograms.setdefault(name, []).append(value)
-            if len(self._histograms[name]) > self._snapshot_histogram_limit:
-                self._histograms[name].pop(0)
-        self._check_threshold(name, value, metadata or {})
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = self._new_histogram()
+                self._trim_map(self._histograms, self._histogram_name_limit)
+            histogram.record(value)
+        metadata = metadata or {}
+        self._check_threshold(name, value, metadata)
+        self._check_percentile_thresholds(name, histogram, metadata)
+
+    def get_histogram(self, name: str, timer: bool = False) -> Optional[StreamingHistogram]:
+        """返回直方图副本，可与其他实例的快照 merge。"""
+        with self._lock:
+            source = self._timer_histograms if timer else self._histograms
+            histogram = source.get(name)
+            return histogram.copy() if histogram is not None else None
+
+    def merge_histogram(self, name: str, other: StreamingHistogram, timer: bool = False) -> None:
+        with self._lock:
+            target = self._timer_histograms if timer else self._histograms
+            histogram = target.get(name)
+            if histogram is None:
+                histogram = target[name] = self._new_histogram()
+            histogram.merge(other)
 
     def record_module_update(self, module_name: str, status: Dict[str, Any]) -> None:
         self.increment_counter(f"module_updates.{module_name}")
@@ -199,6 +271,8 @@ class PerformanceMetrics:
             if include_timers:
                 timers_items = list(self._timers.items())[-self._snapshot_timer_keep_recent :]
                 snapshot["timers"] = OrderedDict(timers_items)
+                timer_stats = list(self._timer_histograms.items())[-self._snapshot_histogram_limit :]
+                snapshot["timer_stats"] = {k: v.snapshot() for k, v in timer_stats}
 
             if include_counters:
                 snapshot["counters"] = dict(self._counters)
@@ -207,7 +281,8 @@ class PerformanceMetrics:
                 snapshot["gauges"] = dict(self._gauges)
 
             if include_histograms:
-                snapshot["histograms"] = {k: list(v) for k, v in self._histograms.items()}
+                histogram_items = list(self._histograms.items())[-self._snapshot_histogram_limit :]
+                snapshot["histograms"] = {k: v.snapshot() for k, v in histogram_items}
 
             return snapshot
 
@@ -224,8 +299,10 @@ class PerformanceThresholdMonitor:
         severity = metadata.get("severity", "warning").upper()
         threshold = metadata.get("threshold") or metadata.get("threshold_min")
         warn_only = metadata.get("warn_only", False)
+        percentile = metadata.get("percentile")
+        label = f"{metric_name}.{percentile}" if percentile else metric_name
         message = (
-            f"性能阈值触发: {metric_name}={value:.4f}"
+            f"性能阈值触发: {label}={value:.4f}"
             + (f" 阈值={threshold}" if threshold is not None else "")
         )
         logger_level = "WARNING" if warn_only else severity
@@ -239,6 +316,7 @@ class PerformanceThresholdMonitor:
             threshold=threshold,
             severity=severity,
             threshold_direction="max" if "threshold" in metadata else "min",
+            percentile=percentile,
             metadata=metadata,
         )
 
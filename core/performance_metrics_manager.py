@@ -13,7 +13,7 @@ import os
 import sys
 import time
 import json
-import psutil
+from utils.lazy_imports import lazy_import
 import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, Union, List, Callable
@@ -23,6 +23,8 @@ import queue
 import statistics
 import builtins
 
+psutil = lazy_import("psutil")  # 首次采样时才加载
+
 from utils.config_manager import get_config_manager
 # 导入现有组件
 from .enhanced_error_handler import EnhancedErrorHandler, ErrorCategory, ErrorSeverity
@@ -19,10 +19,12 @@ from pathlib import Path
 from typing import Dict, Any, Optional, Union, List, Callable, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
-import psutil
+from utils.lazy_imports import lazy_import
 import gc
 from collections import deque, defaultdict
 
+psutil = lazy_import("psutil")  # 首次采样时才加载
+
 # 导入性能优化组件
 from .high_performance_file_reader import HighPerformanceFileReader, ReadStrategy
 from .render_performance_optimizer import RenderPerformanceOptimizer, RenderStrategy, RenderMode
@@ -11,11 +11,13 @@ from pathlib import Path
 from typing import Dict, List, Optional, Union, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
-import psutil
+from utils.lazy_imports import lazy_import
 import asyncio
 import os
 import builtins
 
+psutil = lazy_import("psutil")  # 首次采样时才加载
+
 from .unified_cache_manager import UnifiedCacheManager
 from .enhanced_error_handler import EnhancedErrorHandler
 from .performance_metrics_manager import PerformanceMetricsManager
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ServiceRegistry v1.0.0
+惰性组件注册表（按需构建 + 首帧后空闲预热）
+
+- register(name, factory, deps) 只登记工厂；get(name) 首次调用时先构建依赖再构建自身
+- 依赖图可导出（dependency_graph），循环依赖与未登记依赖在构建时报错
+- warm_up_step() 每次只构建一个尚未构建的组件，供 UI 在空闲定时器中逐个预热
+- startup_report() 给出每个组件的构建耗时（不含依赖）、触发方式与首帧时间
+- LazyService 描述符让宿主对象以普通属性访问组件，赋值则直接替换实例
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class ServiceRegistry:
+    """惰性组件注册表"""
+
+    def __init__(self, name: str = "services") -> None:
+        self.name = name
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._deps: Dict[str, List[str]] = {}
+        self._warm: Dict[str, bool] = {}
+        self._instances: Dict[str, Any] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._building: List[str] = []
+        self._failed: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._created_at = time.perf_counter()
+        self._first_paint_ms: Optional[float] = None
+
+    # === 登记 ===
+    def register(self, name: str, factory: Callable[[], Any], deps: Iterable[str] = (),
+                 warm: bool = True) -> None:
+        """
+        登记组件工厂
+
+        Args:
+            name: 组件名
+            factory: 无参工厂函数，依赖通过 get() 在工厂内部取得
+            deps: 依赖的组件名，构建本组件前先构建
+            warm: 是否参与首帧后的空闲预热；False 表示只在首次使用时构建
+        """
+        with self._lock:
+            if name in self._factories or name in self._instances:
+                raise ValueError(f"组件已登记: {name}")
+            self._factories[name] = factory
+            self._deps[name] = list(deps)
+            self._warm[name] = bool(warm)
+
+    def provide(self, name: str, instance: Any) -> None:
+        """直接提供（或替换）组件实例，不经过工厂"""
+        with self._lock:
+            self._instances[name] = instance
+            self._deps.setdefault(name, [])
+            self._warm.setdefault(name, False)
+            self._records.setdefault(name, {'init_ms': 0.0, 'trigger': 'provided', 'started_ms': self._elapsed_ms()})
+
+    def is_registered(self, name: str) -> bool:
+        with self._lock:
+            return name in self._factories or name in self._instances
+
+    def is_initialized(self, name: str) -> bool:
+        with self._lock:
+            return name in self._instances
+
+    # === 获取 ===
+    def get(self, name: str) -> Any:
+        """获取组件，未构建时先构建其依赖再构建自身"""
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            return self._build(name, 'demand')
+
+    def peek(self, name: str) -> Any:
+        """获取已构建的组件，未构建时返回 None（不触发构建）"""
+        with self._lock:
+            return self._instances.get(name)
+
+    def _build(self, name: str, trigger: str) -> Any:
+        if name not in self._factories:
+            raise KeyError(f"未登记的组件: {name}")
+        if name in self._building:
+            cycle = self._building[self._building.index(name):] + [name]
+            raise RuntimeError(f"组件循环依赖: {' -> '.join(cycle)}")
+
+        self._building.append(name)
+        try:
+            for dep in self._deps[name]:
+                if dep not in self._instances:
+                    self._build(dep, trigger)
+            started = time.perf_counter()
+            instance = self._factories[name]()
+            init_ms = (time.perf_counter() - started) * 1000.0
+        finally:
+            self._building.pop()
+
+        # 工厂内部可能已通过 provide 放入实例（例如别名），以先放入的为准
+        instance = self._instances.setdefault(name, instance)
+        self._records[name] = {
+            'init_ms': init_ms,
+            'trigger': trigger,
+            'started_ms': (started - self._created_at) * 1000.0,
+        }
+        return instance
+
+    # === 预热 ===
+    def pending_warm_up(self) -> List[str]:
+        """尚未构建、参与预热的组件（按登记顺序）"""
+        with self._lock:
+            return [name for name, warm in self._warm.items()
+                    if warm and name in self._factories and name not in self._instances
+                    and name not in self._failed]
+
+    def warm_up_step(self) -> bool:
+        """
+        构建下一个待预热组件（连同其依赖）；构建失败的组件不再预热，异常照常抛出，
+        之后首次使用时仍会重试构建
+
+        Returns:
+            bool: 是否还有待预热的组件
+        """
+        with self._lock:
+            pending = self.pending_warm_up()
+            if pending:
+                try:
+                    self._build(pending[0], 'warm_up')
+                except Exception as e:
+                    self._failed[pending[0]] = str(e)
+                    raise
+            return bool(self.pending_warm_up())
+
+    def warm_up(self) -> None:
+        """一次性构建全部待预热组件"""
+        while self.warm_up_step():
+            pass
+
+    # === 报告 ===
+    def mark_first_paint(self) -> None:
+        """记录首帧可见时间（只记录第一次）"""
+        with self._lock:
+            if self._first_paint_ms is None:
+                self._first_paint_ms = self._elapsed_ms()
+
+    def dependency_graph(self) -> Dict[str, List[str]]:
+        with self._lock:
+            return {name: list(deps) for name, deps in self._deps.items()}
+
+    def startup_report(self) -> Dict[str, Any]:
+        """
+        启动报告
+
+        Returns:
+            Dict[str, Any]: first_paint_ms、各组件构建耗时（不含依赖）、触发方式（demand / warm_up /
+            provided）、相对注册表创建的开始时间，以及首帧前构建耗时合计
+        """
+        with self._lock:
+            components = []
+            for name in self._deps:
+                record = self._records.get(name)
+                components.append({
+                    'name': name,
+                    'deps': list(self._deps[name]),
+                    'initialized': name in self._instances,
+                    'init_ms': record['init_ms'] if record else None,
+                    'trigger': record['trigger'] if record else None,
+                    'started_ms': record['started_ms'] if record else None,
+                    'error': self._failed.get(name) if not record else None,
+                })
+            first_paint = self._first_paint_ms
+            before_paint = [c for c in components if c['init_ms'] is not None
+                            and (first_paint is None or c['started_ms'] < first_paint)]
+            return {
+                'registry': self.name,
+                'first_paint_ms': first_paint,
+                'init_ms_before_first_paint': sum(c['init_ms'] for c in before_paint),
+                'init_ms_total': sum(c['init_ms'] for c in components if c['init_ms'] is not None),
+                'pending_warm_up': self.pending_warm_up(),
+                'components': components,
+            }
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._created_at) * 1000.0
+
+
+class LazyService:
+    """
+    将宿主对象的属性代理到其 ServiceRegistry 中的同名组件
+
+    宿主需提供 registry_attr 指定的注册表属性（默认 services）。读取时按需构建；
+    赋值时直接替换实例（兼容测试或外部注入）。
+    """
+
+    def __init__(self, service_name: Optional[str] = None, registry_attr: str = "services") -> None:
+        self.service_name = service_name
+        self.registry_attr = registry_attr
+
+    def __set_name__(self, owner, name):
+        if self.service_name is None:
+            self.service_name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self.registry_attr).get(self.service_name)
+
+    def __set__(self, instance, value):
+        getattr(instance, self.registry_attr).provide(self.service_name, value)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SessionSnapshotStore v1.0.0
+温启动会话快照：关闭时保存，下次启动先按快照立即显示，再后台校验刷新
+
+- 快照内容：文件树根目录与展开节点、当前文档与最近 N 个文档的渲染 HTML（附 mtime/大小）、
+  各文档滚动位置、markdown_processor 导入快照
+- 写入采用临时文件 + os.replace，进程中途退出不会留下半个快照
+- 文档以源文件 mtime_ns 与大小校验：is_document_fresh() 不一致即视为过期
+- 版本号不匹配或内容损坏的快照按不存在处理
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from core.enhanced_logger import TemplatedLogger
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = Path(__file__).parent.parent / "cache" / "session" / "warm_start.json"
+
+
+def file_signature(file_path: Union[str, Path]) -> Optional[Dict[str, int]]:
+    """源文件签名（mtime_ns + size），文件不存在时返回 None"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def is_document_fresh(document: Dict[str, Any]) -> bool:
+    """快照中的文档是否与磁盘上的源文件一致"""
+    signature = file_signature(document.get("path", ""))
+    return (signature is not None
+            and document.get("mtime_ns") == signature["mtime_ns"]
+            and document.get("size") == signature["size"])
+
+
+class SessionSnapshotStore:
+    """温启动会话快照存储"""
+
+    def __init__(self, snapshot_path: Union[str, Path, None] = None,
+                 max_documents: int = 5, max_html_bytes: int = 2 * 1024 * 1024):
+        """
+        Args:
+            snapshot_path: 快照文件路径，默认 cache/session/warm_start.json
+            max_documents: 最多保存的文档数（含当前文档）
+            max_html_bytes: 单个文档 HTML 的最大字节数，超出则不保存该文档的 HTML
+        """
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else DEFAULT_SNAPSHOT_PATH
+        self.max_documents = max(1, int(max_documents))
+        self.max_html_bytes = int(max_html_bytes)
+        self.logger = TemplatedLogger(__name__)
+        self._lock = threading.Lock()
+
+    def save(self, root_path: Optional[str] = None, expanded_paths: Optional[List[str]] = None,
+             documents: Optional[List[Dict[str, Any]]] = None, current_file: Optional[str] = None,
+             import_snapshot: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        保存会话快照
+
+        Args:
+            root_path: 文件树根目录
+            expanded_paths: 已展开的目录
+            documents: 文档列表（最近使用在前），每项含 path/html/type/mtime_ns/size/scroll_y
+            current_file: 当前文档路径
+            import_snapshot: markdown_processor 的 module_import_snapshot
+
+        Returns:
+            bool: 是否保存成功
+        """
+        kept: List[Dict[str, Any]] = []
+        for document in documents or []:
+            html = document.get("html") or ""
+            if not document.get("path") or document.get("mtime_ns") is None:
+                continue
+            if len(html.encode("utf-8")) > self.max_html_bytes:
+                continue
+            kept.append(document)
+            if len(kept) >= self.max_documents:
+                break
+
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "root_path": root_path or "",
+            "expanded_paths": list(expanded_paths or []),
+            "current_file": current_file or "",
+            "documents": kept,
+            "import_snapshot": import_snapshot or {},
+        }
+        try:
+            with self._lock:
+                self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=".warm_start.", suffix=".tmp",
+                                                dir=str(self.snapshot_path.parent))
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(snapshot, f, ensure_ascii=False)
+                    os.replace(tmp_path, self.snapshot_path)
+                except BaseException:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+                    raise
+            self.logger.info(f"会话快照已保存: {len(kept)} 个文档")
+            return True
+        except Exception as e:
+            self.logger.error(f"保存会话快照失败: {e}")
+            return False
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        读取会话快照（不做文档新鲜度校验）
+
+        Returns:
+            Optional[Dict[str, Any]]: 快照；不存在、版本不符或损坏时返回 None
+        """
+        try:
+            with self._lock:
+                if not self.snapshot_path.exists():
+                    return None
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"读取会话快照失败，按冷启动处理: {e}")
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            return None
+        snapshot.setdefault("documents", [])
+        snapshot.setdefault("expanded_paths", [])
+        return snapshot
+
+    def clear(self) -> None:
+        """删除会话快照"""
+        with self._lock:
+            try:
+                self.snapshot_path.unlink()
+            except OSError:
+                pass
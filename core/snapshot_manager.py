@@ -9,6 +9,7 @@ SnapshotManager v1.1.0
 - 使用 UnifiedCacheManager 进行落盘缓存，支持进程重启恢复
 - 维护 correlation_id 与时间戳，支持后续 008 任务的日志/性能关联
 - 与 PerformanceMetrics 协同，记录快照写入次数
+- 快照写入后通知变更监听器（供状态管理器推送式刷新状态栏）
 """
 
 from __future__ import annotations
@@ -18,7 +19,7 @@ import threading
 from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from utils.config_manager import ConfigManager
 from core.correlation_id_manager import CorrelationIdManager
@@ -109,9 +110,21 @@ class SnapshotManager:
         self._module_snapshots: Dict[str, Dict[str, Any]] = {}
         self._render_snapshot: Dict[str, Any] = {}
         self._link_snapshot: Dict[str, Any] = {}
+        self._change_listeners: List[Callable[[str], None]] = []
 
         self._load_cached_snapshots()
 
+    def add_change_listener(self, listener: Callable[[str], None]) -> None:
+        """注册快照变更监听器，写入后以域名（module/render/link）回调。"""
+        with self._lock:
+            if listener not in self._change_listeners:
+                self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[str], None]) -> None:
+        with self._lock:
+            if listener in self._change_listeners:
+                self._change_listeners.remove(listener)
+
     def set_cache_manager(self, cache_manager: UnifiedCacheManager) -> bool:
         with self._lock:
             self.cache_manager = cache_manager
@@ -127,6 +140,7 @@ class SnapshotManager:
             self._module_snapshots[module_name] = normalized
             self._persist_cache(self._module_cache_key(module_name), normalized)
             self._record_metric("snapshot.module_saved")
+        self._notify_change("module")
         return True
 
     def get_module_snapshot(self, module_name: str) -> Dict[str, Any]:
@@ -163,6 +177,7 @@ class SnapshotManager:
             self._render_snapshot = normalized
             self._persist_cache(self._RENDER_CACHE_KEY, normalized)
             self._record_metric("snapshot.render_saved")
+        self._notify_change("render")
         return True
 
     def get_render_snapshot(self) -> Dict[str, Any]:
@@ -179,6 +194,7 @@ class SnapshotManager:
             self._link_snapshot = normalized
             self._persist_cache(self._LINK_CACHE_KEY, normalized)
             self._record_metric("snapshot.link_saved")
+        self._notify_change("link")
         return True
 
     def get_link_snapshot(self) -> Dict[str, Any]:
@@ -189,6 +205,16 @@ class SnapshotManager:
     # ------------------------------------------------------------------
     # 辅助能力
     # ------------------------------------------------------------------
+    def _notify_change(self, domain: str) -> None:
+        """在快照锁外回调监听器，单个监听器失败不影响写入。"""
+        with self._lock:
+            listeners = list(self._change_listeners)
+        for listener in listeners:
+            try:
+                listener(domain)
+            except Exception:
+                pass
+
     def get_snapshot_summary(self) -> Dict[str, Any]:
         """提供快照数量、最后更新时间等信息，便于调试。"""
         with self._lock:
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+StreamingHistogram v1.0.0
+固定内存的流式分位数直方图（对数分桶，DDSketch 风格）
+
+- 相对误差由 relative_accuracy 保证（默认 1%），桶数上限 max_buckets
+- 达到上限后最低桶成为折叠桶，更低的值直接计入该桶；record 为摊还 O(1)；快照可合并（merge / from_dict），适合跨线程、跨进程汇总
+- quantile 在稀疏桶上按序累计，结果落在对应桶的代表值上
+"""
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+
+class StreamingHistogram:
+    """对数分桶直方图，支持 p50/p95/p99/max 等分位数查询。"""
+
+    DEFAULT_PERCENTILES = (50, 95, 99)
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        if max_buckets < 1:
+            raise ValueError("max_buckets must be positive")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        self._buckets: Dict[int, int] = {}
+        # 折叠后的最低桶键；不大于它的键直接计入该桶，避免插入后再折叠
+        self._collapsed_key: Optional[int] = None
+        self._zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    # === 写入 ===
+    def record(self, value: float, count: int = 1) -> None:
+        value = float(value)
+        if math.isnan(value) or count <= 0:
+            return
+        if value <= 0:
+            # 非正值（耗时为 0 或负的时钟偏差）统一计入零桶
+            self._zero_count += count
+        else:
+            self._add(math.ceil(math.log(value) / self._log_gamma), count)
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None or value < self.min else self.min
+        self.max = value if self.max is None or value > self.max else self.max
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge histograms with different relative_accuracy")
+        for key, value in other._buckets.items():
+            self._add(key, value)
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def _add(self, key: int, count: int) -> None:
+        if self._collapsed_key is not None and key <= self._collapsed_key:
+            self._buckets[self._collapsed_key] += count
+            return
+        self._buckets[key] = self._buckets.get(key, 0) + count
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """超过桶数上限时把最低桶并入次低桶，牺牲低分位精度以保证内存固定。
+
+        折叠桶只会上移，向上逐键查找次低桶的总步数受键范围限制，因此摊还为 O(1)；
+        间隔过大时退化为一次 O(B) 的 min 查找。
+        """
+        if self._collapsed_key is None:
+            self._collapsed_key = min(self._buckets)
+        while len(self._buckets) > self.max_buckets:
+            floor = self._collapsed_key
+            overflow = self._buckets.pop(floor)
+            target = floor + 1
+            for _ in range(len(self._buckets)):
+                if target in self._buckets:
+                    break
+                target += 1
+            else:
+                target = min(self._buckets)
+            self._buckets[target] += overflow
+            self._collapsed_key = target
+
+    # === 查询 ===
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("quantile must be in [0, 1]")
+        if q == 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return min(max(0.0, self.min), self.max)
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                value = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def percentiles(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Optional[float]]:
+        return {f"p{p:g}": self.quantile(p / 100) for p in percentiles}
+
+    def snapshot(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "count": self.count,
+            "sum": self.total,
+            "mean": (self.total / self.count) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+        }
+        data.update(self.percentiles(percentiles))
+        return data
+
+    # === 序列化 ===
+    def copy(self) -> "StreamingHistogram":
+        clone = StreamingHistogram(self.relative_accuracy, self.max_buckets)
+        clone.merge(self)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "buckets": {str(key): value for key, value in self._buckets.items()},
+            "zero_count": self._zero_count,
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamingHistogram":
+        histogram = cls(data.get("relative_accuracy", 0.01), data.get("max_buckets", 2048))
+        histogram._buckets = {int(key): int(value) for key, value in data.get("buckets", {}).items()}
+        if len(histogram._buckets) >= histogram.max_buckets:
+            # 已满的快照中最低桶可能吸收过折叠计数，恢复折叠桶以保持后续写入 O(1)
+            histogram._collapsed_key = min(histogram._buckets)
+        histogram._zero_count = int(data.get("zero_count", 0))
+        histogram.count = int(data.get("count", 0))
+        histogram.total = float(data.get("sum", 0.0))
+        histogram.min = data.get("min")
+        histogram.max = data.get("max")
+        return histogram
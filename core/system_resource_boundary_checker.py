@@ -19,9 +19,11 @@ from typing import Dict, Any, Optional, Union, List, Callable, Type
 from dataclasses import dataclass, asdict
 from enum import Enum
 import queue
-import psutil
+from utils.lazy_imports import lazy_import
 import builtins
 
+psutil = lazy_import("psutil")  # 首次采样时才加载
+
 # 导入现有组件
 from .enhanced_error_handler import EnhancedErrorHandler, ErrorCategory, ErrorSeverity
 from .unified_cache_manager import UnifiedCacheManager, CacheStrategy
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tracer v1.0.0
+低开销的链路追踪 Span（基于 CorrelationIdManager）
+
+- span(...) 上下文管理器 / traced(...) 装饰器，计时使用 perf_counter_ns
+- 同一线程内嵌套的 Span 自动建立父子关系，并共享根 Span 的 Correlation ID
+- 完成的 Span 写入固定容量环形缓冲区，可导出为 Chrome trace-event JSON（Perfetto 可直接打开）
+- 设置环境变量 LAD_TRACE_OUTPUT=<path> 时，进程退出前自动导出
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import count
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Union
+
+from core.correlation_id_manager import CorrelationIdManager
+
+
+@dataclass
+class SpanRecord:
+    """一次完成的 Span。"""
+
+    name: str
+    component: str
+    correlation_id: str
+    span_id: int
+    parent_id: Optional[int]
+    start_ns: int
+    duration_ns: int = 0
+    thread_id: int = 0
+    thread_name: str = ""
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1_000_000
+
+
+class _NoopSpan:
+    """追踪关闭时返回的占位 Span，避免调用方判空。"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """进程级 Span 收集器（单例）。"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    DEFAULT_CAPACITY = 4096
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._init_singleton()
+        return cls._instance
+
+    def _init_singleton(self) -> None:
+        self.enabled = os.environ.get("LAD_TRACING", "1") != "0"
+        self._spans: Deque[SpanRecord] = deque(maxlen=self.DEFAULT_CAPACITY)
+        self._local = threading.local()
+        self._span_ids = count(1)
+        # perf_counter_ns 无绝对起点，导出时统一换算到进程内的相对微秒
+        self._epoch_ns = time.perf_counter_ns()
+        self._correlation_manager = CorrelationIdManager()
+
+    # === 配置 ===
+    def configure(self, enabled: Optional[bool] = None, capacity: Optional[int] = None) -> None:
+        if enabled is not None:
+            self.enabled = bool(enabled)
+        if capacity is not None and capacity != self._spans.maxlen:
+            self._spans = deque(self._spans, maxlen=max(1, int(capacity)))
+
+    # === 记录 ===
+    def _stack(self) -> List[SpanRecord]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, component: str = "", correlation_id: Optional[str] = None,
+             **attributes: Any) -> Iterator[Union[SpanRecord, _NoopSpan]]:
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        if correlation_id is None:
+            if parent is not None:
+                correlation_id = parent.correlation_id
+            else:
+                correlation_id = (
+                    self._correlation_manager.get_current_correlation_id(component)
+                    or CorrelationIdManager.generate_correlation_id(name.split(".")[-1], component)
+                )
+        thread = threading.current_thread()
+        record = SpanRecord(
+            name=name,
+            component=component,
+            correlation_id=correlation_id,
+            span_id=next(self._span_ids),
+            parent_id=parent.span_id if parent is not None else None,
+            start_ns=time.perf_counter_ns(),
+            thread_id=thread.ident or 0,
+            thread_name=thread.name,
+            attributes=attributes,
+        )
+        stack.append(record)
+        try:
+            yield record
+        except BaseException as exc:
+            record.attributes["error"] = type(exc).__name__
+            raise
+        finally:
+            record.duration_ns = time.perf_counter_ns() - record.start_ns
+            stack.pop()
+            self._spans.append(record)
+
+    def current_span(self) -> Optional[SpanRecord]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    # === 查询与导出 ===
+    def get_spans(self, correlation_id: Optional[str] = None) -> List[SpanRecord]:
+        spans = list(self._spans)
+        if correlation_id is not None:
+            spans = [s for s in spans if s.correlation_id == correlation_id]
+        return spans
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    def export_chrome_trace(self, correlation_id: Optional[str] = None) -> Dict[str, Any]:
+        """导出 Chrome trace-event 格式（"X" 完整事件，时间单位微秒）。"""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        threads: Dict[int, str] = {}
+        for record in self.get_spans(correlation_id):
+            threads[record.thread_id] = record.thread_name
+            args = {"correlation_id": record.correlation_id, "span_id": record.span_id}
+            if record.parent_id is not None:
+                args["parent_id"] = record.parent_id
+            args.update({k: _json_safe(v) for k, v in record.attributes.items()})
+            events.append({
+                "name": record.name,
+                "cat": record.component or "app",
+                "ph": "X",
+                "ts": (record.start_ns - self._epoch_ns) / 1000,
+                "dur": record.duration_ns / 1000,
+                "pid": pid,
+                "tid": record.thread_id,
+                "args": args,
+            })
+        for tid, tname in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Union[str, Path], correlation_id: Optional[str] = None) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(self.export_chrome_trace(correlation_id), f, ensure_ascii=False)
+        return target
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def get_tracer() -> Tracer:
+    return Tracer()
+
+
+def span(name: str, component: str = "", **attributes: Any):
+    """便捷入口：with span("renderer.render", component="renderer"): ..."""
+    return Tracer().span(name, component, **attributes)
+
+
+def traced(name: Optional[str] = None, component: str = "") -> Callable:
+    """装饰器版本；未指定 name 时使用函数的 __qualname__。"""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = Tracer()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, component):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _export_on_exit() -> None:
+    output = os.environ.get("LAD_TRACE_OUTPUT")
+    if output and Tracer._instance is not None:
+        try:
+            Tracer._instance.write_chrome_trace(output)
+        except Exception:
+            pass
+
+
+atexit.register(_export_on_exit)
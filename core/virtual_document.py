@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VirtualDocument v1.0.0
+超大 Markdown 文档的虚拟化渲染：先出标题骨架，正文按节在滚动到附近时才渲染
+
+- 沿用 RenderPerformanceOptimizer 的 RenderMode.SKELETON 思路：骨架只渲染标题行，
+  标题 id 与整篇渲染一致，目录与锚点跳转照常可用
+- 以 ATX 标题（围栏代码块之外）分节；过长的节在空行处继续切分
+- 每节正文对应页面中的占位 <div class="lmv-section">，由 IntersectionObserver 在接近视口时
+  经 console 'LMVSECTION:<token>:<index>' 请求渲染，远离视口时卸载并保留实测高度
+- 已渲染的节保存在有上限的 LRU 中，卸载后再次滚回无需重新渲染
+"""
+
+import html as html_lib
+import json
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from core.html_block_diff import split_blocks
+
+_HEADING_RE = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+_FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+# 占位高度估算：每行源文本约 22px
+_LINE_HEIGHT_PX = 22
+
+
+@dataclass
+class VirtualSection:
+    """一节：可选的标题行 + 正文在源文本中的区间"""
+    index: int
+    heading: str
+    level: int
+    body_start: int
+    body_end: int
+    line_count: int
+
+
+_VIRTUAL_SCRIPT = r"""
+<script>
+(function() {
+    var token = %s;
+    function request(el) {
+        if (el.getAttribute('data-state')) { return; }
+        el.setAttribute('data-state', 'loading');
+        console.log('LMVSECTION:' + token + ':' + el.getAttribute('data-section'));
+    }
+    window.__lmvFill = function(t, index, html) {
+        if (t !== token) { return; }
+        var el = document.querySelector('.lmv-section[data-section="' + index + '"]');
+        if (!el) { return; }
+        el.innerHTML = html;
+        el.style.minHeight = '';
+        el.setAttribute('data-state', 'loaded');
+    };
+    var near = new IntersectionObserver(function(entries) {
+        entries.forEach(function(e) { if (e.isIntersecting) { request(e.target); } });
+    }, {rootMargin: '200%% 0px'});
+    var far = new IntersectionObserver(function(entries) {
+        entries.forEach(function(e) {
+            var el = e.target;
+            if (!e.isIntersecting && el.getAttribute('data-state') === 'loaded') {
+                el.style.minHeight = el.offsetHeight + 'px';
+                el.innerHTML = '';
+                el.removeAttribute('data-state');
+            }
+        });
+    }, {rootMargin: '600%% 0px'});
+    document.querySelectorAll('.lmv-section').forEach(function(el) {
+        near.observe(el);
+        far.observe(el);
+    });
+})();
+</script>
+"""
+
+
+class VirtualDocument:
+    """虚拟化文档：源文本分节、骨架生成与按需渲染"""
+
+    def __init__(self, source: str, max_section_chars: int = 32 * 1024, cache_sections: int = 64):
+        """
+        Args:
+            source: Markdown 源文本
+            max_section_chars: 单节正文的最大字符数，超出在空行处切分
+            cache_sections: 已渲染节 HTML 的缓存数量
+        """
+        self.source = source
+        self.max_section_chars = max(1024, int(max_section_chars))
+        self.cache_sections = max(1, int(cache_sections))
+        self.token = uuid.uuid4().hex
+        self.sections: List[VirtualSection] = self._split_sections()
+        self._rendered: "OrderedDict[int, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _split_sections(self) -> List[VirtualSection]:
+        sections: List[VirtualSection] = []
+        heading, level = "", 0
+        body_start = cursor = 0
+        lines = 0
+        fence = None
+
+        def close(end: int) -> None:
+            sections.append(VirtualSection(len(sections), heading, level, body_start, end, lines))
+
+        for line in self.source.splitlines(keepends=True):
+            line_start, cursor = cursor, cursor + len(line)
+            text = line.rstrip('\r\n')
+            fence_match = _FENCE_RE.match(text)
+            if fence is not None:
+                if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                    fence = None
+                lines += 1
+                continue
+            if fence_match:
+                fence = fence_match.group(1)
+                lines += 1
+                continue
+            heading_match = _HEADING_RE.match(text)
+            if heading_match:
+                if heading or line_start > body_start:
+                    close(line_start)
+                heading, level = text.strip(), len(heading_match.group(1))
+                body_start, lines = cursor, 0
+                continue
+            lines += 1
+            # 过长的节在空行（围栏外）处切分
+            if not text.strip() and cursor - body_start >= self.max_section_chars:
+                close(cursor)
+                heading, level = "", 0
+                body_start, lines = cursor, 0
+        if heading or cursor > body_start or not sections:
+            close(cursor)
+        return sections
+
+    def skeleton_markdown(self) -> str:
+        """仅含标题行的 Markdown，渲染后得到与整篇一致的标题 id"""
+        return "\n\n".join(section.heading for section in self.sections if section.heading) + "\n"
+
+    def build_skeleton_html(self, headings_html: str) -> str:
+        """
+        在渲染好的标题骨架中插入各节占位与加载脚本
+
+        Args:
+            headings_html: skeleton_markdown() 的渲染结果
+
+        Returns:
+            str: 完整的骨架 HTML
+        """
+        headed = [section for section in self.sections if section.heading]
+        blocks = split_blocks(headings_html)
+        if blocks is None or len(blocks.blocks) != len(headed):
+            # 标题渲染结果无法与节一一对应时，退回转义后的纯文本标题
+            headings_html = "\n".join(
+                f"<h{s.level}>{html_lib.escape(s.heading.lstrip('#').strip().rstrip('#').strip())}</h{s.level}>"
+                for s in headed)
+            blocks = split_blocks(headings_html)
+        # 样式等外壳保留在最前，占位只插在标题块之间
+        cursor = headings_html.index(blocks.blocks[0]) if blocks.blocks else len(headings_html)
+        parts: List[str] = [headings_html[:cursor]]
+        block_iter = iter(blocks.blocks)
+        for section in self.sections:
+            if section.heading:
+                block = next(block_iter)
+                position = headings_html.index(block, cursor)
+                parts.append(headings_html[cursor:position + len(block)])
+                cursor = position + len(block)
+            parts.append(self._placeholder(section))
+        parts.append(headings_html[cursor:])
+        parts.append(_VIRTUAL_SCRIPT % json.dumps(self.token))
+        return "".join(parts)
+
+    def _placeholder(self, section: VirtualSection) -> str:
+        height = max(_LINE_HEIGHT_PX, section.line_count * _LINE_HEIGHT_PX)
+        return (f'\n<div class="lmv-section" data-section="{section.index}" '
+                f'style="min-height:{height}px"></div>\n')
+
+    def section_markdown(self, index: int) -> str:
+        section = self.sections[index]
+        return self.source[section.body_start:section.body_end]
+
+    def render_section(self, index: int, render: Callable[[str], Optional[str]]) -> Optional[str]:
+        """
+        渲染一节正文（命中缓存时直接返回）
+
+        Args:
+            index: 节序号
+            render: Markdown -> HTML 的渲染函数，失败返回 None
+
+        Returns:
+            Optional[str]: 正文 HTML（已去掉样式等外壳）；序号无效或渲染失败时返回 None
+        """
+        if not 0 <= index < len(self.sections):
+            return None
+        with self._lock:
+            cached = self._rendered.get(index)
+            if cached is not None:
+                self._rendered.move_to_end(index)
+                return cached
+        markdown_text = self.section_markdown(index)
+        rendered = render(markdown_text) if markdown_text.strip() else ""
+        if rendered is None:
+            return None
+        blocks = split_blocks(rendered)
+        body = "\n".join(blocks.blocks) if blocks is not None else rendered
+        with self._lock:
+            self._rendered[index] = body
+            while len(self._rendered) > self.cache_sections:
+                self._rendered.popitem(last=False)
+        return body
+
+    def fill_script(self, index: int, body_html: str) -> str:
+        """把一节正文填入页面占位的脚本"""
+        return f"window.__lmvFill && window.__lmvFill({json.dumps(self.token)}, {int(index)}, {json.dumps(body_html)});"
@@ -5,9 +5,19 @@
 
 from .manager import ErrorHistoryManager
 from .models import ErrorRecord, DailyStatistics, ErrorHistoryConfig, ErrorSeverity, ErrorCategory
+from .write_queue import ErrorWriteQueue
+from .statistics_service import StatisticsService
+from .exporter import ErrorHistoryExporter, ExportCancelled
+from .fingerprint import compute_fingerprint, message_template
 
 __all__ = [
     'ErrorHistoryManager',
+    'ErrorWriteQueue',
+    'StatisticsService',
+    'ErrorHistoryExporter',
+    'ExportCancelled',
+    'compute_fingerprint',
+    'message_template',
     'ErrorRecord',
     'DailyStatistics',
     'ErrorHistoryConfig',
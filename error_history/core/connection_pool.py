@@ -0,0 +1,287 @@
+# error_history/core/connection_pool.py
+"""
+错误历史持久化子系统 - SQLite 连接池（单写连接 + 多读连接）
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 每个连接都需要的会话级 PRAGMA（journal_mode=WAL 持久化在库文件中，只在写连接创建时设置一次；
+# auto_vacuum 须在切换 WAL 之前设置才能对新库生效，旧库在下一次完整 VACUUM 时转换）
+_SESSION_PRAGMAS = """
+    PRAGMA cache_size = -64000;
+    PRAGMA temp_store = MEMORY;
+"""
+_WRITER_PRAGMAS = """
+    PRAGMA auto_vacuum = INCREMENTAL;
+""" + _SESSION_PRAGMAS + """
+    PRAGMA foreign_keys = ON;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA recursive_triggers = ON;
+"""
+_READER_PRAGMAS = _SESSION_PRAGMAS + """
+    PRAGMA query_only = ON;
+"""
+
+
+class SQLiteConnectionPool:
+    """SQLite 连接池
+
+    - 写操作共用一个专用写连接（可重入锁串行化），避免多个连接争抢写锁后忙等
+    - 读操作从最多 max_readers 个只读连接中借出/归还；WAL 模式下读写互不阻塞
+    - 同一线程嵌套获取连接时复用已持有的连接（已持有写连接时读操作也复用它，
+      从而能读到本事务尚未提交的数据）
+    - 借出时不做 SELECT 1 探活，只在使用过程中出现 sqlite3.Error 时校验，失效则丢弃
+    - 空闲超过 idle_timeout 秒的读连接在下次借出/归还时关闭
+    """
+
+    def __init__(self, db_path: str, max_readers: int = 4, timeout: float = 30.0,
+                 idle_timeout: float = 300.0):
+        self.db_path = str(db_path)
+        self.max_readers = max(1, int(max_readers))
+        self.timeout = float(timeout)
+        self.idle_timeout = float(idle_timeout)
+
+        self._writer = None
+        self._writer_lock = threading.RLock()
+
+        self._idle: Deque[Tuple[sqlite3.Connection, float]] = deque()
+        self._readers_total = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._closed = False
+
+        self._stats = {
+            'checkouts': 0,
+            'writer_checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'writer_wait_time_total': 0.0,
+            'writer_wait_time_max': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'reaped': 0,
+            'discarded': 0,
+            'peak_in_use': 0,
+        }
+
+    # ================ 借出/归还 ================
+
+    @contextmanager
+    def connection(self, readonly: bool = False):
+        """借出一个连接；with 块正常结束时提交未完成的事务，异常时回滚"""
+        held: List[Tuple[str, sqlite3.Connection]] = self._held()
+        for kind, conn in reversed(held):
+            if kind == 'writer' or readonly:
+                # 嵌套调用：复用当前线程已持有的连接，由最外层负责提交/归还
+                yield conn
+                return
+
+        kind = 'reader' if readonly else 'writer'
+        conn = self._acquire_reader() if readonly else self._acquire_writer()
+        held.append((kind, conn))
+        healthy = True
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException as e:
+            healthy = self._recover(conn, e)
+            raise
+        finally:
+            held.pop()
+            if readonly:
+                self._release_reader(conn, healthy)
+            else:
+                self._release_writer(conn, healthy)
+
+    def _held(self) -> List[Tuple[str, sqlite3.Connection]]:
+        held = getattr(self._local, 'held', None)
+        if held is None:
+            held = self._local.held = []
+        return held
+
+    def _acquire_writer(self) -> sqlite3.Connection:
+        started = time.monotonic()
+        if not self._writer_lock.acquire(timeout=self.timeout):
+            with self._cond:
+                self._stats['timeouts'] += 1
+            raise sqlite3.OperationalError("等待数据库写连接超时")
+        waited = time.monotonic() - started
+        try:
+            if self._closed:
+                raise sqlite3.ProgrammingError("连接池已关闭")
+            if self._writer is None:
+                self._writer = self._connect(_WRITER_PRAGMAS)
+                self._writer.execute("PRAGMA journal_mode = WAL")
+        except BaseException:
+            self._writer_lock.release()
+            raise
+        with self._cond:
+            self._stats['writer_checkouts'] += 1
+            self._stats['writer_wait_time_total'] += waited
+            self._stats['writer_wait_time_max'] = max(self._stats['writer_wait_time_max'], waited)
+        return self._writer
+
+    def _release_writer(self, conn: sqlite3.Connection, healthy: bool):
+        if not healthy and conn is self._writer:
+            self._writer = None
+            self._close_quietly(conn)
+        self._writer_lock.release()
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        started = time.monotonic()
+        deadline = started + self.timeout
+        create = False
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("连接池已关闭")
+                self._reap_idle_locked()
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    break
+                if self._readers_total < self.max_readers:
+                    self._readers_total += 1
+                    create = True
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise sqlite3.OperationalError("等待数据库读连接超时：连接池已满")
+                self._stats['waits'] += 1
+                self._cond.wait(remaining)
+
+            waited = time.monotonic() - started
+            self._stats['checkouts'] += 1
+            self._stats['wait_time_total'] += waited
+            self._stats['wait_time_max'] = max(self._stats['wait_time_max'], waited)
+            in_use = self._readers_total - len(self._idle)
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], in_use)
+
+        if create:
+            try:
+                conn = self._connect(_READER_PRAGMAS)
+            except BaseException:
+                with self._cond:
+                    self._readers_total -= 1
+                    self._cond.notify()
+                raise
+        return conn
+
+    def _release_reader(self, conn: sqlite3.Connection, healthy: bool):
+        with self._cond:
+            if healthy and not self._closed and self._readers_total <= self.max_readers:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            else:
+                self._readers_total -= 1
+            self._reap_idle_locked()
+            self._cond.notify()
+        if conn is not None:
+            self._close_quietly(conn)
+
+    def _recover(self, conn: sqlite3.Connection, error: BaseException) -> bool:
+        """异常退出时回滚未完成事务；仅在 sqlite3.Error 时探活，返回连接是否仍可用"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            pass
+        if not isinstance(error, sqlite3.Error):
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            with self._cond:
+                self._stats['discarded'] += 1
+            logger.warning(f"数据库连接已失效并被丢弃: {error}")
+            return False
+
+    # ================ 连接管理 ================
+
+    def _connect(self, pragmas: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.executescript(pragmas)
+        with self._cond:
+            self._stats['created'] += 1
+        return conn
+
+    def _reap_idle_locked(self):
+        """关闭空闲过久的读连接（需持有 _cond）"""
+        if not self._idle:
+            return
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < cutoff:
+            conn, _ = self._idle.popleft()
+            self._readers_total -= 1
+            self._stats['reaped'] += 1
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def configure(self, max_readers: int = None, timeout: float = None, idle_timeout: float = None):
+        """运行期调整池参数；缩容时多余的读连接在归还后关闭"""
+        with self._cond:
+            if max_readers is not None:
+                self.max_readers = max(1, int(max_readers))
+                while self._idle and self._readers_total > self.max_readers:
+                    conn, _ = self._idle.popleft()
+                    self._readers_total -= 1
+                    self._close_quietly(conn)
+            if timeout is not None:
+                self.timeout = float(timeout)
+            if idle_timeout is not None:
+                self.idle_timeout = float(idle_timeout)
+            self._cond.notify_all()
+
+    def size(self) -> int:
+        """当前打开的连接数（读连接 + 写连接）"""
+        with self._cond:
+            return self._readers_total + (1 if self._writer is not None else 0)
+
+    def close(self):
+        """关闭全部空闲连接与写连接；借出中的读连接在归还时关闭"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._readers_total -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
+        with self._writer_lock:
+            if self._writer is not None:
+                self._close_quietly(self._writer)
+                self._writer = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接池指标（借出次数、等待时间、利用率等）"""
+        with self._cond:
+            stats = dict(self._stats)
+            in_use = self._readers_total - len(self._idle)
+            stats.update({
+                'max_readers': self.max_readers,
+                'readers_open': self._readers_total,
+                'readers_idle': len(self._idle),
+                'readers_in_use': in_use,
+                'utilization': in_use / self.max_readers,
+                'writer_open': self._writer is not None,
+                'avg_wait_ms': (stats['wait_time_total'] / stats['checkouts'] * 1000.0) if stats['checkouts'] else 0.0,
+            })
+        return stats
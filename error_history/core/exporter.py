@@ -0,0 +1,199 @@
+# error_history/core/exporter.py
+"""
+错误历史持久化子系统 - 流式导出（JSON / NDJSON / CSV / XLSX，可选 gzip）
+"""
+
+import csv
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from .models import ErrorRecord
+
+if TYPE_CHECKING:
+    from .manager import ErrorHistoryManager
+
+logger = logging.getLogger(__name__)
+
+# 已实现的导出格式
+EXPORT_FORMATS = ('json', 'ndjson', 'csv', 'xlsx')
+
+_CSV_HEADERS = [
+    'error_id', 'error_type', 'error_message', 'severity', 'category',
+    'module', 'function', 'line_number', 'created_at', 'resolved',
+    'resolution_method', 'resolution_time', 'retry_count'
+]
+
+_XLSX_HEADERS = [
+    '错误ID', '错误类型', '错误消息', '严重程度', '分类',
+    '模块', '函数', '行号', '创建时间', '已解决',
+    '解决方法', '解决时间', '重试次数'
+]
+
+
+class ExportCancelled(Exception):
+    """导出被调用方取消"""
+
+
+def _tabular_row(error: ErrorRecord) -> List[Any]:
+    return [
+        error.error_id,
+        error.error_type,
+        error.error_message,
+        error.severity.value,
+        error.category.value,
+        error.module,
+        error.function,
+        error.line_number,
+        error.created_at.isoformat() if error.created_at else '',
+        error.resolved,
+        error.resolution_method,
+        error.resolution_time,
+        error.retry_count
+    ]
+
+
+class ErrorHistoryExporter:
+    """流式导出器
+
+    在一个读事务内用服务端游标按块（chunk_size 条）读取记录并逐条写出，
+    内存占用只与块大小有关；先写入同目录的 .part 临时文件，完成后原子替换，
+    取消或失败时不会留下半个文件。
+    """
+
+    def __init__(self, manager: "ErrorHistoryManager", chunk_size: int = 500):
+        self.manager = manager
+        self.chunk_size = max(1, int(chunk_size))
+
+    def export(self, file_path: str, format: str, filters: Dict[str, Any] = None,
+               limit: Optional[int] = None, compress: Optional[bool] = None,
+               progress_callback: Callable[[int, int], None] = None,
+               cancel_event: threading.Event = None) -> int:
+        """
+        导出匹配记录
+
+        Args:
+            file_path: 导出文件路径
+            format: 导出格式（json / ndjson / csv / xlsx）
+            filters: 过滤条件（同 query_errors）
+            limit: 最多导出条数，None 或 0 表示不限
+            compress: 是否 gzip 压缩；None 时按文件名是否以 .gz 结尾决定（xlsx 本身已压缩，忽略）
+            progress_callback: 每写完一块调用 progress_callback(已写条数, 总条数)
+            cancel_event: 置位后在下一块开始前中止导出
+
+        Returns:
+            int: 导出的记录数
+
+        Raises:
+            ExportCancelled: 导出被取消
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"不支持的导出格式: {format}")
+        if compress is None:
+            compress = str(file_path).endswith('.gz')
+        if format == 'xlsx' and compress:
+            logger.warning("xlsx 文件本身已压缩，忽略 gzip 选项")
+            compress = False
+
+        temp_path = f"{file_path}.part"
+        try:
+            with self.manager._get_connection(readonly=True) as conn:
+                # 计数与读取在同一读事务内，保证总数与导出内容一致
+                if not conn.in_transaction:
+                    conn.execute("BEGIN")
+                total = self.manager._count_errors(conn, filters, limit)
+                chunks = self.manager._iter_error_chunks(conn, filters, limit, self.chunk_size)
+
+                def guarded_chunks():
+                    done = 0
+                    for chunk in chunks:
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise ExportCancelled()
+                        yield chunk
+                        done += len(chunk)
+                        if progress_callback:
+                            progress_callback(done, total)
+
+                if format == 'xlsx':
+                    written = self._write_xlsx(temp_path, guarded_chunks())
+                else:
+                    writer = getattr(self, f"_write_{format}")
+                    with self._open_text(temp_path, compress) as f:
+                        written = writer(f, guarded_chunks(), total)
+
+            os.replace(temp_path, file_path)
+            return written
+
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _open_text(path: str, compress: bool):
+        if compress:
+            return gzip.open(path, 'wt', encoding='utf-8', newline='')
+        return open(path, 'w', encoding='utf-8', newline='')
+
+    # ================ 各格式写出 ================
+
+    def _write_json(self, f, chunks, total: int) -> int:
+        """JSON 文档：先写 export_info，再逐条追加 errors 数组元素"""
+        export_info = {
+            'timestamp': datetime.now().isoformat(),
+            'total_records': total,
+            'format': 'json'
+        }
+        f.write('{\n  "export_info": ')
+        f.write(json.dumps(export_info, ensure_ascii=False))
+        f.write(',\n  "errors": [')
+        written = 0
+        for chunk in chunks:
+            for error in chunk:
+                f.write(',\n    ' if written else '\n    ')
+                f.write(json.dumps(error.to_dict(), ensure_ascii=False))
+                written += 1
+        f.write('\n  ]\n}\n' if written else ']\n}\n')
+        return written
+
+    def _write_ndjson(self, f, chunks, total: int) -> int:
+        """NDJSON：每行一条记录"""
+        written = 0
+        for chunk in chunks:
+            f.writelines(json.dumps(error.to_dict(), ensure_ascii=False) + '\n' for error in chunk)
+            written += len(chunk)
+        return written
+
+    def _write_csv(self, f, chunks, total: int) -> int:
+        writer = csv.writer(f)
+        writer.writerow(_CSV_HEADERS)
+        written = 0
+        for chunk in chunks:
+            writer.writerows(_tabular_row(error) for error in chunk)
+            written += len(chunk)
+        return written
+
+    def _write_xlsx(self, path: str, chunks) -> int:
+        """Excel：write-only 工作簿逐行写出，不在内存中保留单元格对象"""
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            logger.error("导出Excel格式需要安装openpyxl库")
+            raise
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("错误历史")
+        ws.append(_XLSX_HEADERS)
+        written = 0
+        for chunk in chunks:
+            for error in chunk:
+                ws.append(_tabular_row(error))
+            written += len(chunk)
+        wb.save(path)
+        return written
@@ -0,0 +1,55 @@
+# error_history/core/fingerprint.py
+"""
+错误历史持久化子系统 - 错误指纹（归一化消息模板 + 哈希）
+"""
+
+import hashlib
+import re
+from typing import Optional
+
+# 按顺序替换消息中的易变部分；UUID 须在十六进制与数字之前处理
+_MESSAGE_NORMALIZERS = (
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<uuid>'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b'), '<hex>'),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), '<str>'),
+    (re.compile(r'(?:\b[A-Za-z]:)?(?:[\\/][^\s\\/:*?"<>|,;]+){2,}'), '<path>'),
+    (re.compile(r'(?<![A-Za-z_])\d+(?:\.\d+)?'), '<num>'),
+    (re.compile(r'\s+'), ' '),
+)
+
+# 消息模板的最大长度（超长消息只取前缀参与指纹）
+_MAX_TEMPLATE_LENGTH = 500
+
+
+def message_template(message: Optional[str]) -> str:
+    """
+    将错误消息归一化为模板：数字、十六进制地址、UUID、引号内字符串与路径替换为占位符
+
+    Args:
+        message: 原始错误消息
+
+    Returns:
+        str: 消息模板
+    """
+    template = (message or '')[:_MAX_TEMPLATE_LENGTH * 2]
+    for pattern, placeholder in _MESSAGE_NORMALIZERS:
+        template = pattern.sub(placeholder, template)
+    return template.strip()[:_MAX_TEMPLATE_LENGTH]
+
+
+def compute_fingerprint(error_type: Optional[str], module: Optional[str], function: Optional[str],
+                        line_number: Optional[int], message: Optional[str]) -> str:
+    """
+    计算错误指纹：错误类型、模块、函数、行号与消息模板的 SHA-1 摘要前 16 位
+
+    Returns:
+        str: 16 位十六进制指纹
+    """
+    key = '\x1f'.join((
+        error_type or '',
+        module or '',
+        function or '',
+        str(line_number) if line_number is not None else '',
+        message_template(message),
+    ))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
@@ -6,16 +6,21 @@
 import sqlite3
 import json
 import logging
+import random
 import threading
 import time
 import os
 from pathlib import Path
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
 from contextlib import contextmanager
-import builtins
 
 from .models import ErrorRecord, DailyStatistics, ErrorHistoryConfig, ErrorSeverity, ErrorCategory
+from .write_queue import ErrorWriteQueue
+from .statistics_service import StatisticsService
+from .connection_pool import SQLiteConnectionPool
+from .exporter import ErrorHistoryExporter, ExportCancelled
+from .fingerprint import compute_fingerprint, message_template
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +28,20 @@ logger = logging.getLogger(__name__)
 class ErrorHistoryManager:
     """错误历史管理器 - 负责数据库操作和数据管理"""
 
+    # 纳入全文索引的文本列
+    _FTS_COLUMNS = ('error_type', 'error_message', 'stack_trace', 'tags')
+
+    # PRAGMA auto_vacuum 取值：0=NONE, 1=FULL, 2=INCREMENTAL
+    _AUTO_VACUUM_INCREMENTAL = 2
+
+    # 游标分页可选择的列
+    _SELECTABLE_COLUMNS = (
+        'id', 'error_id', 'error_type', 'error_message', 'severity', 'category', 'module',
+        'function', 'line_number', 'stack_trace', 'context', 'user_context', 'system_context',
+        'created_at', 'resolved', 'resolved_at', 'resolution_method', 'resolution_time',
+        'retry_count', 'max_retries', 'tags', 'metadata', 'fingerprint'
+    )
+
     def __init__(self, db_path: str = None, config_manager = None):
         """
         初始化错误历史管理器
@@ -35,22 +54,44 @@ class ErrorHistoryManager:
         self.db_path = Path(db_path) if db_path else self._get_default_db_path()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # 数据库连接池
-        self._connection_pool = {}
-        self._pool_lock = threading.Lock()
-        self._max_connections = 20  # 增加连接池大小
-
         # 调度/监听线程控制
         self._cleanup_thread = None
         self._cleanup_stop_event = threading.Event()
         self._last_cleanup_run_ts = 0.0
+        self._vacuum_thread = None
+        self._vacuum_stop_event = threading.Event()
         self._config_watch_thread = None
         self._config_watch_stop_event = threading.Event()
         self._watched_files = {}
 
+        # 异步批量写入队列（首次 enqueue_error 时创建）
+        self._write_queue: Optional[ErrorWriteQueue] = None
+        self._write_queue_lock = threading.Lock()
+        self._shutting_down = False
+
+        # 统计汇总版本号：每次累加日/小时汇总后递增，供统计服务判断缓存是否过期
+        self._statistics_version = 0
+        self._statistics_service: Optional[StatisticsService] = None
+        self._statistics_service_lock = threading.Lock()
+
+        # 全文检索（FTS5），不可用时回退到 LIKE
+        self._fts_enabled = False
+        self._fts_tokenizer = None
+
+        # 指纹聚合的蓄水池抽样随机源
+        self._sample_random = random.Random()
+
         # 配置
         self.config = ErrorHistoryConfig()
 
+        # 数据库连接池：一个写连接 + 若干只读连接（max_connections 含写连接）
+        self._pool = SQLiteConnectionPool(
+            self.db_path,
+            max_readers=max(1, self.config.max_connections - 1),
+            timeout=self.config.timeout_seconds,
+            idle_timeout=self.config.connection_idle_seconds,
+        )
+
         # 初始化
         self._init_database()
         self._load_config()
@@ -152,8 +193,7 @@ class ErrorHistoryManager:
     def _load_config_from_db(self):
         """从本地数据库 system_config 表加载配置（若存在）。"""
         try:
-            with self._get_connection() as conn:
-                conn.row_factory = sqlite3.Row
+            with self._get_connection(readonly=True) as conn:
                 cursor = conn.execute(
                     "SELECT config_value FROM system_config WHERE config_key = ?",
                     ("error_history",)
@@ -210,9 +250,13 @@ class ErrorHistoryManager:
         """根据配置应用运行期参数（例如连接池最大连接数）。"""
         try:
             if isinstance(self.config.max_connections, int) and self.config.max_connections > 0:
-                self._max_connections = int(self.config.max_connections)
+                self._pool.configure(
+                    max_readers=max(1, int(self.config.max_connections) - 1),
+                    timeout=self.config.timeout_seconds,
+                    idle_timeout=self.config.connection_idle_seconds,
+                )
         except Exception as e:
-            logger.debug(f"应用运行期配置 _max_connections 失败: {e}")
+            logger.debug(f"应用运行期配置连接池参数失败: {e}")
 
         # 应用运行期：根据配置重启自动清理调度
         try:
@@ -441,6 +485,8 @@ class ErrorHistoryManager:
             days = getattr(self.config, 'retention_days', 90) or 90
             deleted = self.cleanup_old_errors(days=days)
             logger.info(f"自动清理执行完成，清理 {deleted} 条记录（> {days} 天）")
+            if deleted:
+                self._schedule_free_page_reclaim()
             return deleted
         except Exception as e:
             logger.warning(f"自动清理任务执行失败: {e}")
@@ -498,94 +544,39 @@ class ErrorHistoryManager:
                 'mode': 'unknown'
             }
 
-    @contextmanager
-    def _get_connection(self):
-        """获取数据库连接（连接池管理）"""
-        thread_id = threading.get_ident()
-        conn = None
-
-        with self._pool_lock:
-            # 尝试获取现有连接
-            if thread_id in self._connection_pool:
-                conn = self._connection_pool[thread_id]
-                try:
-                    # 测试连接是否有效
-                    conn.execute("SELECT 1").fetchone()
-                except sqlite3.Error:
-                    # 连接无效，关闭并移除
-                    try:
-                        conn.close()
-                    except:
-                        pass
-                    del self._connection_pool[thread_id]
-                    conn = None
-
-            # 创建新连接
-            if conn is None and len(self._connection_pool) < self._max_connections:
-                conn = sqlite3.connect(
-                    str(self.db_path),
-                    timeout=self.config.timeout_seconds,
-                    check_same_thread=False
-                )
-                conn.execute("PRAGMA foreign_keys = ON")
-                conn.execute("PRAGMA journal_mode = WAL")
-                conn.execute("PRAGMA synchronous = NORMAL")
-                conn.execute("PRAGMA cache_size = -64000")  # 64MB缓存
-                conn.execute("PRAGMA temp_store = MEMORY")
-                conn.execute("PRAGMA busy_timeout = 30000")  # 30秒忙等待超时
-
-                self._connection_pool[thread_id] = conn
-
-        if conn is None:
-            # 如果连接池满了，尝试清理无效连接
-            with self._pool_lock:
-                # 清理无效连接
-                invalid_connections = []
-                for tid, pool_conn in self._connection_pool.items():
-                    try:
-                        pool_conn.execute("SELECT 1").fetchone()
-                    except sqlite3.Error:
-                        invalid_connections.append(tid)
-
-                for tid in invalid_connections:
-                    try:
-                        self._connection_pool[tid].close()
-                    except:
-                        pass
-                    del self._connection_pool[tid]
-
-                # 再次尝试创建连接
-                if len(self._connection_pool) < self._max_connections:
-                    conn = sqlite3.connect(
-                        str(self.db_path),
-                        timeout=self.config.timeout_seconds,
-                        check_same_thread=False
-                    )
-                    conn.execute("PRAGMA foreign_keys = ON")
-                    conn.execute("PRAGMA journal_mode = WAL")
-                    conn.execute("PRAGMA synchronous = NORMAL")
-                    conn.execute("PRAGMA cache_size = -64000")
-                    conn.execute("PRAGMA temp_store = MEMORY")
-                    conn.execute("PRAGMA busy_timeout = 30000")
+    def _get_connection(self, readonly: bool = False):
+        """
+        从连接池借出数据库连接（with 语句使用）
 
-                    self._connection_pool[thread_id] = conn
+        Args:
+            readonly: 只读操作使用读连接；默认借出唯一的写连接
+        """
+        return self._pool.connection(readonly=readonly)
 
-        if conn is None:
-            raise sqlite3.Error("无法获取数据库连接：连接池已满且无无效连接可清理")
+    @staticmethod
+    def _row_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+        """返回以 sqlite3.Row 返回结果的游标（只作用于该游标，不修改共享连接）"""
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor
 
-        try:
-            yield conn
-        finally:
-            # 连接由连接池管理，不在这里关闭
-            pass
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """获取连接池指标（等待时间、利用率、连接创建/回收次数）"""
+        return self._pool.get_stats()
 
     def _init_database(self):
         """初始化数据库"""
         try:
             with self._get_connection() as conn:
                 self._create_tables(conn)
+                self._migrate_fingerprint_schema(conn)
+                statistics_migrated = self._migrate_statistics_schema(conn)
                 self._create_indexes(conn)
+                self._create_fulltext_index(conn)
                 logger.info("数据库初始化完成")
+            if statistics_migrated:
+                # 旧库首次启用增量计数：用全量重算补齐一次基线
+                self.rebuild_daily_statistics()
         except Exception as e:
             logger.error(f"数据库初始化失败: {e}")
             raise
@@ -616,10 +607,38 @@ class ErrorHistoryManager:
                 retry_count INTEGER DEFAULT 0,
                 max_retries INTEGER DEFAULT 3,
                 tags TEXT,
-                metadata TEXT
+                metadata TEXT,
+                fingerprint TEXT
             )
         ''')
 
+        # 错误指纹聚合表（每个指纹一行：出现次数与首末次出现时间）
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS error_fingerprints (
+                fingerprint TEXT NOT NULL PRIMARY KEY,
+                error_type TEXT NOT NULL,
+                module TEXT,
+                function TEXT,
+                line_number INTEGER,
+                message_template TEXT,
+                severity TEXT NOT NULL,
+                category TEXT NOT NULL,
+                occurrence_count INTEGER NOT NULL DEFAULT 0,
+                first_seen TIMESTAMP,
+                last_seen TIMESTAMP
+            ) WITHOUT ROWID
+        ''')
+
+        # 未保留完整记录的出现次数（按指纹、小时计数，供统计重算与过期清理）
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS error_fingerprint_hourly (
+                fingerprint TEXT NOT NULL,
+                hour TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (fingerprint, hour)
+            ) WITHOUT ROWID
+        ''')
+
         # 日统计表
         conn.execute('''
             CREATE TABLE IF NOT EXISTS error_statistics_daily (
@@ -633,10 +652,31 @@ class ErrorHistoryManager:
                 unresolved_errors INTEGER DEFAULT 0,
                 avg_resolution_time REAL,
                 error_rate_per_hour REAL,
+                resolution_time_sum REAL DEFAULT 0,
+                resolution_time_count INTEGER DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
 
+        # 日统计维度计数表（severity/category/module 的增量计数，替代 JSON 重算）
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS error_statistics_daily_counts (
+                date DATE NOT NULL,
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, dimension, key)
+            ) WITHOUT ROWID
+        ''')
+
+        # 小时汇总表（仪表盘按小时窗口计算错误率）
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS error_statistics_hourly (
+                hour TEXT NOT NULL PRIMARY KEY,
+                total_errors INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        ''')
+
         # 系统配置表
         conn.execute('''
             CREATE TABLE IF NOT EXISTS system_config (
@@ -651,14 +691,138 @@ class ErrorHistoryManager:
 
         conn.commit()
 
+    def _migrate_fingerprint_schema(self, conn: sqlite3.Connection):
+        """为旧库补齐 fingerprint 列，并按已有记录回填指纹与聚合计数"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(error_history)")}
+        if 'fingerprint' in columns:
+            return
+
+        conn.execute("ALTER TABLE error_history ADD COLUMN fingerprint TEXT")
+        cursor = conn.execute(
+            "SELECT id, error_type, module, function, line_number, error_message FROM error_history"
+        )
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            conn.executemany(
+                "UPDATE error_history SET fingerprint = ? WHERE id = ?",
+                [(compute_fingerprint(*row[1:]), row[0]) for row in rows]
+            )
+        # 旧记录全部作为样本保留，只补齐聚合计数
+        for row in conn.execute('''
+            SELECT fingerprint, error_type, module, function, line_number, error_message,
+                   severity, category, COUNT(*), MIN(created_at), MAX(created_at)
+            FROM error_history GROUP BY fingerprint
+        ''').fetchall():
+            conn.execute('''
+                INSERT OR IGNORE INTO error_fingerprints
+                (fingerprint, error_type, module, function, line_number, message_template,
+                 severity, category, occurrence_count, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (*row[:5], message_template(row[5]), *row[6:]))
+        conn.commit()
+        logger.info("已为历史错误记录回填指纹")
+
+    def _migrate_statistics_schema(self, conn: sqlite3.Connection) -> bool:
+        """
+        为旧库补齐增量统计所需的列，并检测小时汇总表是否需要回填
+
+        Returns:
+            bool: 是否发生了迁移（需要重算一次统计基线）
+        """
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(error_statistics_daily)")}
+        migrated = False
+        for column, ddl in (
+            ('resolution_time_sum', 'REAL DEFAULT 0'),
+            ('resolution_time_count', 'INTEGER DEFAULT 0'),
+        ):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE error_statistics_daily ADD COLUMN {column} {ddl}")
+                migrated = True
+        if not conn.execute("SELECT EXISTS (SELECT 1 FROM error_statistics_hourly)").fetchone()[0]:
+            migrated = migrated or bool(
+                conn.execute("SELECT EXISTS (SELECT 1 FROM error_history)").fetchone()[0]
+            )
+        conn.commit()
+        return migrated
+
+    def _create_fulltext_index(self, conn: sqlite3.Connection):
+        """创建 FTS5 全文索引（外部内容表 + 同步触发器）"""
+        exists = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'error_history_fts'"
+        ).fetchone()
+        if exists:
+            self._fts_enabled = True
+            self._fts_tokenizer = 'trigram' if 'trigram' in (exists[0] or '') else 'unicode61'
+        else:
+            # trigram 分词支持任意子串（含中文）匹配，与原 LIKE '%...%' 语义一致；旧版 SQLite 回退到 unicode61
+            for tokenizer in ('trigram', 'unicode61'):
+                try:
+                    conn.execute(f'''
+                        CREATE VIRTUAL TABLE error_history_fts USING fts5(
+                            error_type, error_message, stack_trace, tags,
+                            content='error_history', content_rowid='id',
+                            tokenize='{tokenizer}'
+                        )
+                    ''')
+                    self._fts_enabled = True
+                    self._fts_tokenizer = tokenizer
+                    break
+                except sqlite3.Error as e:
+                    logger.debug(f"创建全文索引失败（tokenize={tokenizer}）: {e}")
+            if not self._fts_enabled:
+                logger.warning("SQLite 不支持 FTS5，文本过滤将使用 LIKE 扫描")
+                return
+
+        columns = "error_type, error_message, stack_trace, tags"
+        new_values = "new.error_type, new.error_message, new.stack_trace, new.tags"
+        old_values = "old.error_type, old.error_message, old.stack_trace, old.tags"
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS error_history_fts_ai AFTER INSERT ON error_history BEGIN
+                INSERT INTO error_history_fts (rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS error_history_fts_ad AFTER DELETE ON error_history BEGIN
+                INSERT INTO error_history_fts (error_history_fts, rowid, {columns})
+                VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS error_history_fts_au
+            AFTER UPDATE OF error_type, error_message, stack_trace, tags ON error_history BEGIN
+                INSERT INTO error_history_fts (error_history_fts, rowid, {columns})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO error_history_fts (rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+
+        if not exists:
+            # 旧库首次建立全文索引时回填已有记录
+            conn.execute("INSERT INTO error_history_fts (error_history_fts) VALUES ('rebuild')")
+        conn.commit()
+
     def _create_indexes(self, conn: sqlite3.Connection):
         """创建数据库索引"""
+        # 旧单列索引均为下方复合索引的前缀，旧库中移除以减少写放大
+        for legacy in ("idx_error_history_severity", "idx_error_history_category",
+                       "idx_error_history_module", "idx_error_history_resolved"):
+            conn.execute(f"DROP INDEX IF EXISTS {legacy}")
+
         indexes = [
+            # (created_at, 隐含 rowid) 顺序，供 (created_at, id) 游标分页无需排序
             "CREATE INDEX IF NOT EXISTS idx_error_history_created_at ON error_history(created_at)",
-            "CREATE INDEX IF NOT EXISTS idx_error_history_severity ON error_history(severity)",
-            "CREATE INDEX IF NOT EXISTS idx_error_history_category ON error_history(category)",
-            "CREATE INDEX IF NOT EXISTS idx_error_history_module ON error_history(module)",
-            "CREATE INDEX IF NOT EXISTS idx_error_history_resolved ON error_history(resolved)",
+            # 时间范围 + 统计维度的覆盖索引：按日期范围的分组统计无需回表，也用于 ORDER BY created_at
+            "CREATE INDEX IF NOT EXISTS idx_error_history_created_stats ON error_history"
+            "(created_at, severity, category, module, resolved, resolution_time)",
+            # 仪表盘常用过滤：等值条件 + 时间范围/排序
+            "CREATE INDEX IF NOT EXISTS idx_error_history_severity_created ON error_history(severity, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_error_history_category_created ON error_history(category, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_error_history_module_created ON error_history(module, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_error_history_resolved_created ON error_history(resolved, created_at)",
+            # 指纹聚合：按指纹取样本记录
+            "CREATE INDEX IF NOT EXISTS idx_error_history_fingerprint ON error_history(fingerprint)",
             "CREATE INDEX IF NOT EXISTS idx_error_statistics_daily_date ON error_statistics_daily(date)"
         ]
 
@@ -688,53 +852,10 @@ class ErrorHistoryManager:
 
         try:
             with self._get_connection() as conn:
-                # 准备数据
-                data = {
-                    'error_id': error_record.error_id,
-                    'error_type': error_record.error_type,
-                    'error_message': error_record.error_message,
-                    'severity': error_record.severity.value,
-                    'category': error_record.category.value,
-                    'module': error_record.module,
-                    'function': error_record.function,
-                    'line_number': error_record.line_number,
-                    'stack_trace': error_record.stack_trace,
-                    'context': json.dumps(error_record.context, ensure_ascii=False) if error_record.context else None,
-                    'user_context': json.dumps(error_record.user_context, ensure_ascii=False) if error_record.user_context else None,
-                    'system_context': json.dumps(error_record.system_context, ensure_ascii=False) if error_record.system_context else None,
-                    'resolved': error_record.resolved,
-                    'resolved_at': error_record.resolved_at.isoformat() if error_record.resolved_at else None,
-                    'resolution_method': error_record.resolution_method,
-                    'resolution_time': error_record.resolution_time,
-                    'retry_count': error_record.retry_count,
-                    'max_retries': error_record.max_retries,
-                    'tags': json.dumps(error_record.tags, ensure_ascii=False) if error_record.tags else None,
-                    'metadata': json.dumps(error_record.metadata, ensure_ascii=False) if error_record.metadata else None
-                }
-
-                # 插入或更新
-                conn.execute('''
-                    INSERT OR REPLACE INTO error_history
-                    (error_id, error_type, error_message, severity, category, module,
-                     function, line_number, stack_trace, context, user_context, system_context,
-                     resolved, resolved_at, resolution_method, resolution_time,
-                     retry_count, max_retries, tags, metadata)
-                    VALUES (:error_id, :error_type, :error_message, :severity, :category, :module,
-                            :function, :line_number, :stack_trace, :context, :user_context, :system_context,
-                            :resolved, :resolved_at, :resolution_method, :resolution_time,
-                            :retry_count, :max_retries, :tags, :metadata)
-                ''', data)
-
-                # 立即提交事务
+                changed = self._store_rows(conn, [self._record_to_row(error_record)])
                 conn.commit()
-
-                # 更新日统计（在同一事务中）
-                try:
-                    self._update_daily_statistics(conn, error_record.created_at or datetime.now())
-                    conn.commit()  # 确保日统计更新也提交
-                except Exception as e:
-                    logger.warning(f"更新日统计失败，但错误记录已保存: {e}")
-                    conn.commit()  # 确保主事务提交
+                if changed:
+                    self._statistics_version += 1
 
                 logger.debug(f"错误记录已保存: {error_record.error_id}")
                 return True
@@ -743,6 +864,213 @@ class ErrorHistoryManager:
             logger.error(f"保存错误记录失败: {e}")
             return False
 
+    def save_errors(self, error_records: List[ErrorRecord]) -> int:
+        """
+        批量保存错误记录（单个事务 + executemany，供写入队列使用）
+
+        Args:
+            error_records: 错误记录列表
+
+        Returns:
+            int: 成功保存的记录数量
+        """
+        if not error_records:
+            return 0
+        if not self.config.enabled:
+            logger.debug("错误历史功能已禁用，跳过保存")
+            return len(error_records)
+
+        rows = [self._record_to_row(record) for record in error_records]
+
+        try:
+            with self._get_connection() as conn:
+                try:
+                    changed = self._store_rows(conn, rows)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                if changed:
+                    self._statistics_version += 1
+                return len(rows)
+
+        except Exception as e:
+            # 批量写入在后台线程执行，用 warning 避免经由日志处理器回灌
+            logger.warning(f"批量保存错误记录失败: {e}")
+            return 0
+
+    def _store_rows(self, conn: sqlite3.Connection, rows: List[Dict[str, Any]]) -> bool:
+        """
+        在当前事务内写入记录并增量更新统计（不提交事务）
+
+        已存在的 error_id 按原样覆盖；新出现的记录启用指纹聚合时先经 _fold_occurrences 抽样。
+
+        Returns:
+            bool: 汇总表是否有变化（见 _apply_statistics_delta）
+        """
+        changed = False
+        upserts, occurrences = rows, []
+        if self.config.dedup_enabled:
+            existing = self._existing_error_ids(conn, [row['error_id'] for row in rows])
+            upserts = [row for row in rows if row['error_id'] in existing]
+            occurrences = [row for row in rows if row['error_id'] not in existing]
+
+        if upserts:
+            error_ids = list({row['error_id'] for row in upserts})
+            # INSERT OR REPLACE 会覆盖同 error_id 的旧记录，先取出其统计贡献用于抵扣
+            removed = self._collect_stat_contributions_by_ids(conn, error_ids)
+            conn.executemany(self._UPSERT_ERROR_SQL, upserts)
+            try:
+                added = self._collect_stat_contributions_by_ids(conn, error_ids)
+                changed |= self._apply_statistics_delta(conn, removed=removed, added=added)
+            except Exception as e:
+                logger.warning(f"更新日统计失败，但错误记录已保存: {e}")
+
+        if occurrences:
+            added = self._fold_occurrences(conn, occurrences)
+            try:
+                changed |= self._apply_statistics_delta(conn, added=added)
+            except Exception as e:
+                logger.warning(f"更新日统计失败，但错误记录已保存: {e}")
+        return changed
+
+    def _existing_error_ids(self, conn: sqlite3.Connection, error_ids: List[str]) -> set:
+        """返回已存在于 error_history 中的 error_id 集合"""
+        existing = set()
+        unique_ids = list(set(error_ids))
+        for start in range(0, len(unique_ids), 500):
+            chunk = unique_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            existing.update(row[0] for row in conn.execute(
+                f"SELECT error_id FROM error_history WHERE error_id IN ({placeholders})", chunk
+            ))
+        return existing
+
+    def _fold_occurrences(self, conn: sqlite3.Connection, rows: List[Dict[str, Any]]) -> List[Tuple]:
+        """
+        按指纹聚合新出现的记录
+
+        每个指纹在 error_fingerprints 中累加出现次数与末次出现时间；完整记录按蓄水池抽样
+        （Algorithm R）最多保留 dedup_sample_size 条，其余出现只在 error_fingerprint_hourly
+        中按小时计数。被替换下来的样本同样转为计数，统计贡献保持不变。
+        已解决或严重程度/分类与指纹不一致的记录总是完整保存，保证计数可按指纹属性还原。
+
+        Returns:
+            List[Tuple]: 本批出现对日/小时汇总的贡献
+        """
+        sample_size = max(1, int(self.config.dedup_sample_size or 1))
+        current_hour = conn.execute("SELECT strftime('%Y-%m-%d %H:00:00', 'now')").fetchone()[0]
+        added = []
+
+        for row in rows:
+            fingerprint = row['fingerprint']
+            conn.execute(self._UPSERT_FINGERPRINT_SQL,
+                         {**row, 'message_template': message_template(row['error_message'])})
+            occurrences, severity, category, module = conn.execute(
+                "SELECT occurrence_count, severity, category, module FROM error_fingerprints WHERE fingerprint = ?",
+                (fingerprint,)
+            ).fetchone()
+            foldable = (not row['resolved'] and row['severity'] == severity and row['category'] == category)
+
+            keep = not foldable
+            if foldable:
+                samples = conn.execute('''
+                    SELECT id, strftime('%Y-%m-%d %H:00:00', created_at)
+                    FROM error_history
+                    WHERE fingerprint = ? AND resolved = 0 AND severity = ? AND category = ?
+                    ORDER BY id
+                ''', (fingerprint, severity, category)).fetchall()
+                if len(samples) < sample_size:
+                    keep = True
+                else:
+                    slot = self._sample_random.randrange(occurrences)
+                    if slot < sample_size and samples[slot][1]:
+                        sample_id, sample_hour = samples[slot]
+                        conn.execute("DELETE FROM error_history WHERE id = ?", (sample_id,))
+                        self._count_folded_occurrence(conn, fingerprint, sample_hour)
+                        keep = True
+
+            if keep:
+                cursor = conn.execute(self._UPSERT_ERROR_SQL, row)
+                added.extend(self._collect_stat_contributions(conn, "id = ?", (cursor.lastrowid,)))
+            else:
+                self._count_folded_occurrence(conn, fingerprint, current_hour)
+                added.append((current_hour, severity, category, module, 0, 1, 0, 0))
+
+        return added
+
+    @staticmethod
+    def _count_folded_occurrence(conn: sqlite3.Connection, fingerprint: str, hour: str):
+        conn.execute('''
+            INSERT INTO error_fingerprint_hourly (fingerprint, hour, count) VALUES (?, ?, 1)
+            ON CONFLICT (fingerprint, hour) DO UPDATE SET count = count + 1
+        ''', (fingerprint, hour))
+
+    def _collect_folded_contributions(self, conn: sqlite3.Connection, where_clause: str = "1=1",
+                                      params=()) -> List[Tuple]:
+        """按 (小时, 严重程度, 分类, 模块) 聚合未保留完整记录的出现对汇总的贡献（格式同 _collect_stat_contributions）"""
+        cursor = conn.execute(f'''
+            SELECT o.hour, f.severity, f.category, f.module, 0, SUM(o.count), 0, 0
+            FROM error_fingerprint_hourly o
+            JOIN error_fingerprints f ON f.fingerprint = o.fingerprint
+            WHERE {where_clause}
+            GROUP BY 1, 2, 3, 4
+        ''', params)
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def _collect_stat_contributions_by_ids(self, conn: sqlite3.Connection,
+                                           error_ids: List[str]) -> List[Tuple]:
+        """按 error_id 分块收集统计贡献（避免超出 SQLite 参数个数上限）"""
+        contributions = []
+        for start in range(0, len(error_ids), 500):
+            chunk = error_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            contributions.extend(
+                self._collect_stat_contributions(conn, f"error_id IN ({placeholders})", chunk)
+            )
+        return contributions
+
+    # ================ 异步写入队列 ================
+
+    def enqueue_error(self, error_record: ErrorRecord) -> bool:
+        """
+        将错误记录放入异步写入队列（O(1)，不阻塞调用线程）
+
+        队列关闭后（shutdown 之后）退化为同步 save_error。
+
+        Returns:
+            bool: 是否入队/保存成功；队列已满时返回 False 并计入 dropped
+        """
+        if not self.config.enabled:
+            return True
+        queue = self._get_write_queue()
+        if queue is None:
+            return self.save_error(error_record)
+        return queue.put(error_record)
+
+    def flush_write_queue(self, timeout: float = None) -> bool:
+        """立即写入队列中所有待写记录并等待完成"""
+        queue = self._write_queue
+        return queue.flush(timeout) if queue else True
+
+    def get_write_queue_stats(self) -> Dict[str, Any]:
+        """获取写入队列计数（入队/写入/丢弃/失败/批次/深度）"""
+        queue = self._write_queue
+        return queue.get_stats() if queue else {}
+
+    def _get_write_queue(self) -> Optional[ErrorWriteQueue]:
+        if self._write_queue is None:
+            with self._write_queue_lock:
+                if self._write_queue is None and not self._shutting_down:
+                    self._write_queue = ErrorWriteQueue(
+                        self.save_errors,
+                        capacity=self.config.write_queue_capacity,
+                        batch_size=self.config.write_batch_size,
+                        flush_interval_ms=self.config.write_flush_interval_ms
+                    )
+        queue = self._write_queue
+        return None if queue is None or queue.closed else queue
+
     def get_error(self, error_id: str) -> Optional[ErrorRecord]:
         """
         根据错误ID获取错误记录
@@ -754,9 +1082,8 @@ class ErrorHistoryManager:
             ErrorRecord或None: 错误记录对象
         """
         try:
-            with self._get_connection() as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(
+            with self._get_connection(readonly=True) as conn:
+                cursor = self._row_cursor(conn).execute(
                     "SELECT * FROM error_history WHERE error_id = ?",
                     (error_id,)
                 )
@@ -817,6 +1144,8 @@ class ErrorHistoryManager:
                     data['error_id'] = error_record.error_id
                     where_clause = "error_id = :error_id"
 
+                removed = self._collect_stat_contributions(conn, where_clause, data)
+
                 # 执行更新
                 cursor = conn.execute(f'''
                     UPDATE error_history SET
@@ -842,7 +1171,18 @@ class ErrorHistoryManager:
                     WHERE {where_clause}
                 ''', data)
 
+                # 解决状态/严重程度等变化时，按新旧贡献差值修正日统计
+                changed = False
+                if cursor.rowcount > 0:
+                    try:
+                        added = self._collect_stat_contributions(conn, where_clause, data)
+                        changed = self._apply_statistics_delta(conn, removed=removed, added=added)
+                    except Exception as e:
+                        logger.warning(f"更新日统计失败，但错误记录已更新: {e}")
+
                 conn.commit()
+                if changed:
+                    self._statistics_version += 1
 
                 if cursor.rowcount > 0:
                     logger.debug(f"错误记录已更新: {error_record.error_id or error_record.id}")
@@ -867,11 +1207,15 @@ class ErrorHistoryManager:
         """
         try:
             with self._get_connection() as conn:
+                removed = self._collect_stat_contributions(conn, "error_id = ?", (error_id,))
                 cursor = conn.execute(
                     "DELETE FROM error_history WHERE error_id = ?",
                     (error_id,)
                 )
+                changed = self._apply_statistics_delta(conn, removed=removed)
                 conn.commit()
+                if changed:
+                    self._statistics_version += 1
 
                 if cursor.rowcount > 0:
                     logger.debug(f"错误记录已删除: {error_id}")
@@ -903,65 +1247,9 @@ class ErrorHistoryManager:
         filters = filters or {}
 
         try:
-            with self._get_connection() as conn:
-                conn.row_factory = sqlite3.Row
-
+            with self._get_connection(readonly=True) as conn:
                 # 构建查询条件
-                where_clauses = []
-                query_params = []  # 使用位置参数列表
-
-                # 严重程度过滤
-                if 'severity' in filters:
-                    severity = filters['severity']
-                    if isinstance(severity, ErrorSeverity):
-                        where_clauses.append("severity = ?")
-                        query_params.append(severity.value)
-                    elif isinstance(severity, list):
-                        placeholders = ','.join('?' * len(severity))
-                        where_clauses.append(f"severity IN ({placeholders})")
-                        for s in severity:
-                            query_params.append(s.value if hasattr(s, 'value') else str(s))
-
-                # 分类过滤
-                if 'category' in filters:
-                    category = filters['category']
-                    if isinstance(category, ErrorCategory):
-                        where_clauses.append("category = ?")
-                        query_params.append(category.value)
-                    elif isinstance(category, list):
-                        placeholders = ','.join('?' * len(category))
-                        where_clauses.append(f"category IN ({placeholders})")
-                        for c in category:
-                            query_params.append(c.value if hasattr(c, 'value') else str(c))
-
-                # 模块过滤
-                if 'module' in filters:
-                    where_clauses.append("module = ?")
-                    query_params.append(filters['module'])
-
-                # 解决状态过滤
-                if 'resolved' in filters:
-                    where_clauses.append("resolved = ?")
-                    query_params.append(filters['resolved'])
-
-                # 时间范围过滤
-                if 'start_date' in filters:
-                    where_clauses.append("date(created_at) >= ?")
-                    query_params.append(filters['start_date'].isoformat())
-
-                if 'end_date' in filters:
-                    where_clauses.append("date(created_at) <= ?")
-                    query_params.append(filters['end_date'].isoformat())
-
-                # 错误类型过滤
-                if 'error_type' in filters:
-                    where_clauses.append("error_type LIKE ?")
-                    query_params.append(f"%{filters['error_type']}%")
-
-                # 错误消息过滤
-                if 'error_message' in filters:
-                    where_clauses.append("error_message LIKE ?")
-                    query_params.append(f"%{filters['error_message']}%")
+                where_clauses, query_params = self._build_filter_clauses(filters)
 
                 # 构建查询语句
                 where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
@@ -973,7 +1261,7 @@ class ErrorHistoryManager:
                 """
                 query_params.extend([limit, offset])
 
-                cursor = conn.execute(query, query_params)
+                cursor = self._row_cursor(conn).execute(query, query_params)
                 rows = cursor.fetchall()
 
                 # 转换为ErrorRecord对象
@@ -987,6 +1275,200 @@ class ErrorHistoryManager:
             logger.error(f"查询错误记录失败: {e}")
             return []
 
+    def query_errors_keyset(self, filters: Dict[str, Any] = None, columns: List[str] = None,
+                            after: Optional[Tuple[str, int]] = None, limit: int = 200) -> List[Tuple]:
+        """
+        按 (created_at, id) 倒序的游标分页查询
+
+        不使用 OFFSET，任意深度翻页都只需一次索引定位；只读取指定的列，不解码 JSON 字段。
+
+        Args:
+            filters: 过滤条件（同 query_errors）
+            columns: 需要返回的列
+            after: 上一页最后一行的 (created_at, id)，None 表示第一页
+            limit: 每页记录数
+
+        Returns:
+            List[Tuple]: 每行为 (id, created_at, *columns)；最后一行的前两项即下一页的 after
+        """
+        columns = list(columns or ())
+        unknown = [column for column in columns if column not in self._SELECTABLE_COLUMNS]
+        if unknown:
+            raise ValueError(f"不支持的列: {unknown}")
+
+        try:
+            with self._get_connection(readonly=True) as conn:
+                where_clauses, query_params = self._build_filter_clauses(filters or {})
+                if after is not None:
+                    where_clauses.append("(created_at, id) < (?, ?)")
+                    query_params.extend(after)
+                where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
+                select_list = ", ".join(["id", "created_at", *columns])
+
+                cursor = conn.execute(f"""
+                    SELECT {select_list} FROM error_history
+                    WHERE {where_clause}
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                """, [*query_params, limit])
+                return [tuple(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"分页查询错误记录失败: {e}")
+            return []
+
+    def search_errors(self, query: str, filters: Dict[str, Any] = None,
+                      limit: int = 100) -> List[ErrorRecord]:
+        """
+        全文检索错误记录（error_type / error_message / stack_trace / tags），按相关度排序
+
+        Args:
+            query: 检索词，空白分隔的多个词按 AND 组合
+            filters: 附加过滤条件（同 query_errors）
+            limit: 返回记录数量限制
+
+        Returns:
+            List[ErrorRecord]: 按 bm25 相关度排序的错误记录列表
+        """
+        filters = dict(filters or {})
+        filters.pop('search', None)
+        match_expr, short_terms = self._fts_match_expression(query)
+        if match_expr is None:
+            # 没有可用于全文索引的检索词：退化为普通过滤（按时间排序）
+            if query and query.strip():
+                filters['search'] = query
+            return self.query_errors(filters=filters, limit=limit)
+
+        try:
+            with self._get_connection(readonly=True) as conn:
+                where_clauses, query_params = self._build_filter_clauses(filters, prefix="e.")
+                for term in short_terms:
+                    clause, params = self._like_clause(term, self._FTS_COLUMNS, prefix="e.")
+                    where_clauses.append(clause)
+                    query_params.extend(params)
+                extra = "".join(f" AND {clause}" for clause in where_clauses)
+
+                # 列权重：错误类型 > 消息 > 标签 > 堆栈
+                cursor = self._row_cursor(conn).execute(f'''
+                    SELECT e.* FROM error_history_fts
+                    JOIN error_history e ON e.id = error_history_fts.rowid
+                    WHERE error_history_fts MATCH ?{extra}
+                    ORDER BY bm25(error_history_fts, 4.0, 2.0, 0.5, 1.0), e.created_at DESC
+                    LIMIT ?
+                ''', [match_expr, *query_params, limit])
+
+                return [self._row_to_error_record(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"全文检索错误记录失败: {e}")
+            return []
+
+    def _build_filter_clauses(self, filters: Dict[str, Any], prefix: str = "") -> Tuple[List[str], List[Any]]:
+        """
+        将过滤条件转换为 WHERE 子句列表与位置参数
+
+        Args:
+            filters: 过滤条件
+            prefix: 列名前缀（联表查询时使用，如 "e."）
+        """
+        where_clauses = []
+        query_params = []
+
+        # 严重程度过滤
+        if 'severity' in filters:
+            severity = filters['severity']
+            if isinstance(severity, ErrorSeverity):
+                where_clauses.append(f"{prefix}severity = ?")
+                query_params.append(severity.value)
+            elif isinstance(severity, list):
+                placeholders = ','.join('?' * len(severity))
+                where_clauses.append(f"{prefix}severity IN ({placeholders})")
+                for s in severity:
+                    query_params.append(s.value if hasattr(s, 'value') else str(s))
+
+        # 分类过滤
+        if 'category' in filters:
+            category = filters['category']
+            if isinstance(category, ErrorCategory):
+                where_clauses.append(f"{prefix}category = ?")
+                query_params.append(category.value)
+            elif isinstance(category, list):
+                placeholders = ','.join('?' * len(category))
+                where_clauses.append(f"{prefix}category IN ({placeholders})")
+                for c in category:
+                    query_params.append(c.value if hasattr(c, 'value') else str(c))
+
+        # 模块过滤
+        if 'module' in filters:
+            where_clauses.append(f"{prefix}module = ?")
+            query_params.append(filters['module'])
+
+        # 解决状态过滤
+        if 'resolved' in filters:
+            where_clauses.append(f"{prefix}resolved = ?")
+            query_params.append(filters['resolved'])
+
+        # 时间范围过滤（直接比较 created_at，保证可以使用索引）
+        range_clauses, range_params = self._created_at_range(
+            filters.get('start_date'), filters.get('end_date')
+        )
+        where_clauses.extend(f"{prefix}{clause}" for clause in range_clauses)
+        query_params.extend(range_params)
+
+        # 文本过滤：全文检索（search 覆盖全部文本列，error_type/error_message 限定单列）
+        for key, columns in (('search', self._FTS_COLUMNS),
+                             ('error_type', ('error_type',)),
+                             ('error_message', ('error_message',))):
+            text = filters.get(key)
+            if not text:
+                continue
+            match_expr, short_terms = self._fts_match_expression(str(text), columns)
+            if match_expr is not None:
+                where_clauses.append(
+                    f"{prefix}id IN (SELECT rowid FROM error_history_fts WHERE error_history_fts MATCH ?)"
+                )
+                query_params.append(match_expr)
+            for term in short_terms:
+                clause, params = self._like_clause(term, columns, prefix)
+                where_clauses.append(clause)
+                query_params.extend(params)
+
+        return where_clauses, query_params
+
+    def _fts_match_expression(self, text: str, columns: Tuple[str, ...] = None) -> Tuple[Optional[str], List[str]]:
+        """
+        构造 FTS5 MATCH 表达式
+
+        Returns:
+            Tuple[Optional[str], List[str]]: (MATCH 表达式或 None, 需要用 LIKE 匹配的短词)
+                trigram 分词无法索引少于 3 个字符的词；FTS 不可用时全部词都走 LIKE
+        """
+        terms = (text or "").split()
+        if not self._fts_enabled:
+            return None, terms
+
+        phrases, short_terms = [], []
+        for term in terms:
+            if self._fts_tokenizer == 'trigram' and len(term) < 3:
+                short_terms.append(term)
+                continue
+            phrase = '"' + term.replace('"', '""') + '"'
+            # unicode61 按词切分，用前缀查询近似子串匹配
+            phrases.append(phrase if self._fts_tokenizer == 'trigram' else phrase + ' *')
+        if not phrases:
+            return None, short_terms
+
+        expr = " AND ".join(phrases)
+        if columns:
+            expr = "{" + " ".join(columns) + "} : (" + expr + ")"
+        return expr, short_terms
+
+    @staticmethod
+    def _like_clause(term: str, columns: Tuple[str, ...], prefix: str = "") -> Tuple[str, List[str]]:
+        """短词回退：任一列包含该词"""
+        clause = "(" + " OR ".join(f"{prefix}{column} LIKE ?" for column in columns) + ")"
+        return clause, [f"%{term}%"] * len(columns)
+
     def get_recent_errors(self, limit: int = 50) -> List[ErrorRecord]:
         """
         获取最近的错误记录
@@ -1017,9 +1499,60 @@ class ErrorHistoryManager:
 
     # ================ 统计方法 ================
 
+    def get_fingerprints(self, limit: int = 50, order_by: str = "last_seen") -> List[Dict[str, Any]]:
+        """
+        获取错误指纹聚合列表
+
+        Args:
+            limit: 返回数量限制
+            order_by: 排序字段，last_seen（最近出现）或 occurrence_count（出现次数）
+
+        Returns:
+            List[Dict[str, Any]]: 每个指纹的类型、位置、消息模板、出现次数、首末次出现时间与样本数
+        """
+        if order_by not in ('last_seen', 'occurrence_count'):
+            raise ValueError(f"不支持的排序字段: {order_by}")
+
+        try:
+            with self._get_connection(readonly=True) as conn:
+                cursor = self._row_cursor(conn).execute(f'''
+                    SELECT f.*,
+                           (SELECT COUNT(*) FROM error_history h WHERE h.fingerprint = f.fingerprint) AS sample_count
+                    FROM error_fingerprints f
+                    ORDER BY f.{order_by} DESC
+                    LIMIT ?
+                ''', (limit,))
+                return [dict(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"获取错误指纹失败: {e}")
+            return []
+
+    def get_fingerprint_samples(self, fingerprint: str) -> List[ErrorRecord]:
+        """
+        获取某个指纹保留的完整样本记录（按时间倒序）
+
+        Args:
+            fingerprint: 错误指纹
+
+        Returns:
+            List[ErrorRecord]: 样本记录列表
+        """
+        try:
+            with self._get_connection(readonly=True) as conn:
+                cursor = self._row_cursor(conn).execute(
+                    "SELECT * FROM error_history WHERE fingerprint = ? ORDER BY created_at DESC, id DESC",
+                    (fingerprint,)
+                )
+                return [self._row_to_error_record(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"获取指纹样本失败: {e}")
+            return []
+
     def get_statistics(self, date_range: Tuple[date, date] = None) -> Dict[str, Any]:
         """
-        获取错误统计信息
+        获取错误统计信息（直接聚合 error_history，结果精确；仪表盘请使用 get_statistics_service）
 
         Args:
             date_range: 日期范围 (开始日期, 结束日期)，如果为None则统计全部
@@ -1028,15 +1561,15 @@ class ErrorHistoryManager:
             Dict[str, Any]: 统计信息字典
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(readonly=True) as conn:
                 # 设置日期范围条件
                 date_condition = ""
                 date_params = []
 
                 if date_range:
                     start_date, end_date = date_range
-                    date_condition = "AND date(created_at) BETWEEN ? AND ?"
-                    date_params = [start_date.isoformat(), end_date.isoformat()]
+                    range_clauses, date_params = self._created_at_range(start_date, end_date)
+                    date_condition = "AND " + " AND ".join(range_clauses)
 
                 # 基本统计
                 cursor = conn.execute(f'''
@@ -1081,15 +1614,30 @@ class ErrorHistoryManager:
                     AND 1=1 {date_condition}
                     GROUP BY module
                     ORDER BY count DESC
-                    LIMIT 20
                 ''', date_params)
 
                 module_stats = {row[0]: row[1] for row in cursor.fetchall()}
 
+                # 合并指纹聚合中未保留完整记录的出现次数
+                hour_clauses, hour_params = self._hour_range(*(date_range or (None, None)))
+                folded = self._collect_folded_contributions(conn, " AND ".join(hour_clauses), hour_params)
+                folded_total = sum(row[5] for row in folded)
+                for _, severity, category, module, _, count, _, _ in folded:
+                    severity_stats[severity] = severity_stats.get(severity, 0) + count
+                    category_stats[category] = category_stats.get(category, 0) + count
+                    if module:
+                        module_stats[module] = module_stats.get(module, 0) + count
+                if folded:
+                    severity_stats = dict(sorted(severity_stats.items(), key=lambda item: item[1], reverse=True))
+                    category_stats = dict(sorted(category_stats.items(), key=lambda item: item[1], reverse=True))
+                    module_stats = dict(sorted(module_stats.items(), key=lambda item: item[1], reverse=True))
+                module_stats = dict(list(module_stats.items())[:20])
+                total_errors = (basic_stats[0] or 0) + folded_total
+
                 # 计算错误率
                 if date_range:
                     days = (end_date - start_date).days + 1
-                    error_rate_per_day = basic_stats[0] / days if days > 0 else 0
+                    error_rate_per_day = total_errors / days if days > 0 else 0
                     error_rate_per_hour = error_rate_per_day / 24
                 else:
                     # 计算最近30天的错误率
@@ -1099,12 +1647,16 @@ class ErrorHistoryManager:
                         WHERE created_at >= datetime('now', '-30 days')
                     ''')
                     recent_count = cursor.fetchone()[0]
+                    recent_count += conn.execute('''
+                        SELECT COALESCE(SUM(count), 0) FROM error_fingerprint_hourly
+                        WHERE hour >= strftime('%Y-%m-%d %H:00:00', 'now', '-30 days')
+                    ''').fetchone()[0]
                     error_rate_per_hour = recent_count / (30 * 24)
 
                 return {
-                    'total_errors': basic_stats[0] or 0,
+                    'total_errors': total_errors,
                     'resolved_errors': basic_stats[1] or 0,
-                    'unresolved_errors': basic_stats[2] or 0,
+                    'unresolved_errors': (basic_stats[2] or 0) + folded_total,
                     'avg_resolution_time': basic_stats[3],
                     'error_rate_per_hour': error_rate_per_hour,
                     'errors_by_severity': severity_stats,
@@ -1117,9 +1669,91 @@ class ErrorHistoryManager:
             logger.error(f"获取统计信息失败: {e}")
             return {}
 
+    def get_statistics_service(self) -> StatisticsService:
+        """获取共享的统计服务（各仪表盘面板共用同一份短期缓存）"""
+        with self._statistics_service_lock:
+            if self._statistics_service is None:
+                self._statistics_service = StatisticsService(self)
+            return self._statistics_service
+
+    def get_rollup_statistics(self, date_range: Tuple[date, date] = None) -> Dict[str, Any]:
+        """
+        从日/小时汇总表读取统计信息（与 get_statistics 返回结构相同）
+
+        只读取按天、按小时预聚合的行，开销与历史记录总量无关；
+        直接改库导致汇总漂移时可用 rebuild_daily_statistics 修复。
+
+        Args:
+            date_range: 日期范围 (开始日期, 结束日期)，如果为None则统计全部
+
+        Returns:
+            Dict[str, Any]: 统计信息字典
+        """
+        try:
+            with self._get_connection(readonly=True) as conn:
+                date_condition = ""
+                date_params = []
+                if date_range:
+                    start_date, end_date = date_range
+                    date_condition = "AND date >= ? AND date <= ?"
+                    date_params = [start_date.isoformat(), end_date.isoformat()]
+
+                basic_stats = conn.execute(f'''
+                    SELECT SUM(total_errors), SUM(resolved_errors), SUM(unresolved_errors),
+                           SUM(resolution_time_sum), SUM(resolution_time_count)
+                    FROM error_statistics_daily
+                    WHERE 1=1 {date_condition}
+                ''', date_params).fetchone()
+
+                breakdown = {'severity': {}, 'category': {}, 'module': {}}
+                cursor = conn.execute(f'''
+                    SELECT dimension, key, SUM(count) AS total
+                    FROM error_statistics_daily_counts
+                    WHERE 1=1 {date_condition}
+                    GROUP BY dimension, key
+                    HAVING total > 0
+                    ORDER BY total DESC
+                ''', date_params)
+                for dimension, key, count in cursor.fetchall():
+                    bucket = breakdown.setdefault(dimension, {})
+                    if dimension != 'module' or len(bucket) < 20:
+                        bucket[key] = count
+
+                total_errors = basic_stats[0] or 0
+                time_count = basic_stats[4] or 0
+                avg_resolution_time = (basic_stats[3] or 0) / time_count if time_count else None
+
+                # 计算错误率
+                if date_range:
+                    days = (end_date - start_date).days + 1
+                    error_rate_per_hour = total_errors / days / 24 if days > 0 else 0
+                else:
+                    # 最近30天的错误率（按小时汇总表计算）
+                    recent_count = conn.execute('''
+                        SELECT SUM(total_errors) FROM error_statistics_hourly
+                        WHERE hour >= strftime('%Y-%m-%d %H:00:00', 'now', '-30 days')
+                    ''').fetchone()[0] or 0
+                    error_rate_per_hour = recent_count / (30 * 24)
+
+                return {
+                    'total_errors': total_errors,
+                    'resolved_errors': basic_stats[1] or 0,
+                    'unresolved_errors': basic_stats[2] or 0,
+                    'avg_resolution_time': avg_resolution_time,
+                    'error_rate_per_hour': error_rate_per_hour,
+                    'errors_by_severity': breakdown['severity'],
+                    'errors_by_category': breakdown['category'],
+                    'errors_by_module': breakdown['module'],
+                    'date_range': f"{start_date.isoformat()} to {end_date.isoformat()}" if date_range else None
+                }
+
+        except Exception as e:
+            logger.error(f"读取汇总统计信息失败: {e}")
+            return {}
+
     def get_daily_statistics(self, target_date: date = None) -> Optional[DailyStatistics]:
         """
-        获取指定日期的日统计信息
+        获取指定日期的日统计信息（读取增量维护的计数，不扫描 error_history）
 
         Args:
             target_date: 目标日期，如果为None则使用今天
@@ -1131,162 +1765,204 @@ class ErrorHistoryManager:
             target_date = date.today()
 
         try:
-            with self._get_connection() as conn:
-                conn.row_factory = sqlite3.Row
+            with self._get_connection(readonly=True) as conn:
+                day = target_date.isoformat()
+                row = conn.execute('''
+                    SELECT total_errors, resolved_errors, unresolved_errors,
+                           avg_resolution_time, error_rate_per_hour
+                    FROM error_statistics_daily WHERE date = ?
+                ''', (day,)).fetchone()
+
+                if not row:
+                    return DailyStatistics(date=target_date)
+
+                breakdown = {'severity': {}, 'category': {}, 'module': {}}
                 cursor = conn.execute(
-                    "SELECT * FROM error_statistics_daily WHERE date = ?",
-                    (target_date.isoformat(),)
+                    "SELECT dimension, key, count FROM error_statistics_daily_counts WHERE date = ? AND count > 0",
+                    (day,)
                 )
-                row = cursor.fetchone()
+                for dimension, key, count in cursor.fetchall():
+                    breakdown.setdefault(dimension, {})[key] = count
 
-                if row:
-                    return DailyStatistics(
-                        date=target_date,
-                        total_errors=row['total_errors'],
-                        errors_by_severity=json.loads(row['errors_by_severity'] or '{}'),
-                        errors_by_category=json.loads(row['errors_by_category'] or '{}'),
-                        errors_by_module=json.loads(row['errors_by_module'] or '{}'),
-                        resolved_errors=row['resolved_errors'],
-                        unresolved_errors=row['unresolved_errors'],
-                        avg_resolution_time=row['avg_resolution_time'],
-                        error_rate_per_hour=row['error_rate_per_hour']
-                    )
-                else:
-                    # 如果没有现成统计，实时计算
-                    return self._calculate_daily_statistics(target_date)
+                return DailyStatistics(
+                    date=target_date,
+                    total_errors=row[0] or 0,
+                    errors_by_severity=breakdown['severity'],
+                    errors_by_category=breakdown['category'],
+                    errors_by_module=breakdown['module'],
+                    resolved_errors=row[1] or 0,
+                    unresolved_errors=row[2] or 0,
+                    avg_resolution_time=row[3],
+                    error_rate_per_hour=row[4]
+                )
 
         except Exception as e:
             logger.error(f"获取日统计信息失败: {e}")
 
         return None
 
-    def _calculate_daily_statistics(self, target_date: date) -> DailyStatistics:
-        """计算指定日期的日统计信息"""
-        try:
-            with self._get_connection() as conn:
-                # 设置row_factory为字典模式
-                conn.row_factory = sqlite3.Row
-
-                # 获取当日错误
-                cursor = conn.execute('''
-                    SELECT * FROM error_history
-                    WHERE date(created_at) = ?
-                ''', (target_date.isoformat(),))
-
-                errors = []
-                for row in cursor.fetchall():
-                    errors.append(self._row_to_error_record(row))
-
-                if not errors:
-                    return DailyStatistics(date=target_date)
-
-                # 计算统计信息
-                total_errors = len(errors)
-                resolved_errors = sum(1 for e in errors if e.resolved)
-                unresolved_errors = total_errors - resolved_errors
-
-                # 按严重程度统计
-                severity_counts = {}
-                for error in errors:
-                    severity = error.severity.value
-                    severity_counts[severity] = severity_counts.get(severity, 0) + 1
-
-                # 按分类统计
-                category_counts = {}
-                for error in errors:
-                    category = error.category.value
-                    category_counts[category] = category_counts.get(category, 0) + 1
+    def rebuild_daily_statistics(self, start_date: date = None, end_date: date = None) -> int:
+        """
+        离线修复：按 error_history 全量重算日统计与小时汇总
 
-                # 按模块统计
-                module_counts = {}
-                for error in errors:
-                    if error.module:
-                        module_counts[error.module] = module_counts.get(error.module, 0) + 1
+        日常写入只做增量计数；直接改库或计数出现漂移时使用本方法修复
+        （命令行：python error_history/error_history_standalone.py rebuild-stats）。
 
-                # 平均解决时间
-                resolved_times = [e.resolution_time for e in errors if e.resolved and e.resolution_time]
-                avg_resolution_time = sum(resolved_times) / len(resolved_times) if resolved_times else None
+        Args:
+            start_date: 开始日期，None 表示不限
+            end_date: 结束日期，None 表示不限
 
-                # 错误率（每小时）
-                error_rate_per_hour = total_errors / 24
+        Returns:
+            int: 重算的天数
+        """
+        source_clauses, source_params = self._created_at_range(start_date, end_date)
+        stats_clauses, params = ["1=1"], []
+        if start_date:
+            stats_clauses.append("date >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            stats_clauses.append("date <= ?")
+            params.append(end_date.isoformat())
 
-                stats = DailyStatistics(
-                    date=target_date,
-                    total_errors=total_errors,
-                    errors_by_severity=severity_counts,
-                    errors_by_category=category_counts,
-                    errors_by_module=module_counts,
-                    resolved_errors=resolved_errors,
-                    unresolved_errors=unresolved_errors,
-                    avg_resolution_time=avg_resolution_time,
-                    error_rate_per_hour=error_rate_per_hour
+        try:
+            with self._get_connection() as conn:
+                stats_where = " AND ".join(stats_clauses)
+                conn.execute(f"DELETE FROM error_statistics_daily WHERE {stats_where}", params)
+                conn.execute(f"DELETE FROM error_statistics_daily_counts WHERE {stats_where}", params)
+                hour_clauses, hour_params = self._hour_range(start_date, end_date)
+                conn.execute(
+                    f"DELETE FROM error_statistics_hourly WHERE {' AND '.join(hour_clauses)}", hour_params
                 )
 
-                # 保存到数据库
-                self._save_daily_statistics(conn, stats)
-
-                # 提交事务
+                added = self._collect_stat_contributions(
+                    conn, " AND ".join(source_clauses or ["1=1"]), source_params
+                )
+                added += self._collect_folded_contributions(conn, " AND ".join(hour_clauses), hour_params)
+                self._apply_statistics_delta(conn, added=added)
                 conn.commit()
+                self._statistics_version += 1
 
-                return stats
+                days = len({row[0][:10] for row in added if row[0]})
+                logger.info(f"日统计重算完成，共 {days} 天")
+                return days
 
         except Exception as e:
-            logger.error(f"计算日统计信息失败: {e}")
-            return DailyStatistics(date=target_date)
-
-    def _update_daily_statistics(self, conn: sqlite3.Connection, error_datetime: datetime):
-        """更新日统计信息"""
-        try:
-            error_date = error_datetime.date()
-
-            # 检查是否已有统计记录
-            cursor = conn.execute(
-                "SELECT id FROM error_statistics_daily WHERE date = ?",
-                (error_date.isoformat(),)
-            )
-
-            if cursor.fetchone():
-                # 更新现有记录
-                stats = self._calculate_daily_statistics(error_date)
-                self._save_daily_statistics(conn, stats)
-            else:
-                # 创建新记录
-                stats = self._calculate_daily_statistics(error_date)
-                self._save_daily_statistics(conn, stats)
-
-        except Exception as e:
-            logger.warning(f"更新日统计信息失败: {e}")
+            logger.error(f"重算日统计失败: {e}")
+            return 0
 
-    def _save_daily_statistics(self, conn: sqlite3.Connection, stats: DailyStatistics):
-        """保存日统计信息到数据库"""
-        try:
-            data = {
-                'date': stats.date.isoformat(),
-                'total_errors': stats.total_errors,
-                'errors_by_severity': json.dumps(stats.errors_by_severity, ensure_ascii=False),
-                'errors_by_category': json.dumps(stats.errors_by_category, ensure_ascii=False),
-                'errors_by_module': json.dumps(stats.errors_by_module, ensure_ascii=False),
-                'resolved_errors': stats.resolved_errors,
-                'unresolved_errors': stats.unresolved_errors,
-                'avg_resolution_time': stats.avg_resolution_time,
-                'error_rate_per_hour': stats.error_rate_per_hour
-            }
+    @staticmethod
+    def _hour_range(start_date: date = None, end_date: date = None) -> Tuple[List[str], List[str]]:
+        """将日期范围（闭区间）转换为小时汇总表 hour 列上的条件"""
+        clauses, params = ["1=1"], []
+        if isinstance(start_date, datetime):
+            start_date = start_date.date()
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+        if start_date:
+            clauses.append("hour >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            clauses.append("hour < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
+        return clauses, params
+
+    def _collect_stat_contributions(self, conn: sqlite3.Connection, where_clause: str,
+                                    params) -> List[Tuple]:
+        """
+        按 (小时, 严重程度, 分类, 模块, 解决状态) 聚合匹配记录对日/小时汇总的贡献
 
-            conn.execute('''
-                INSERT OR REPLACE INTO error_statistics_daily
-                (date, total_errors, errors_by_severity, errors_by_category,
-                 errors_by_module, resolved_errors, unresolved_errors,
-                 avg_resolution_time, error_rate_per_hour)
-                VALUES (:date, :total_errors, :errors_by_severity, :errors_by_category,
-                        :errors_by_module, :resolved_errors, :unresolved_errors,
-                        :avg_resolution_time, :error_rate_per_hour)
-            ''', data)
-
-            # 提交事务
-            conn.commit()
+        单条记录的查询走 error_id/id 唯一索引，为 O(1)；批量删除时在 SQL 内聚合，
+        不把记录逐行解码到 Python。
+        """
+        cursor = conn.execute(f'''
+            SELECT strftime('%Y-%m-%d %H:00:00', created_at), severity, category, module, resolved,
+                   COUNT(*),
+                   SUM(CASE WHEN resolved AND resolution_time THEN resolution_time ELSE 0 END),
+                   SUM(CASE WHEN resolved AND resolution_time THEN 1 ELSE 0 END)
+            FROM error_history
+            WHERE {where_clause}
+            GROUP BY 1, 2, 3, 4, 5
+        ''', params)
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def _apply_statistics_delta(self, conn: sqlite3.Connection, removed: List[Tuple] = (),
+                                added: List[Tuple] = ()) -> bool:
+        """
+        将贡献差值（added - removed）累加到日统计、维度计数与小时汇总表，不提交事务
 
-        except Exception as e:
-            logger.warning(f"保存日统计信息失败: {e}")
+        Returns:
+            bool: 汇总表是否有变化；调用方须在 commit 成功后再递增 _statistics_version，
+                否则读连接可能把提交前的汇总缓存到新版本号下
+        """
+        # 日期 -> [total, resolved, unresolved, resolution_time_sum, resolution_time_count]
+        daily: Dict[str, List[float]] = {}
+        counts: Dict[Tuple[str, str, str], int] = {}
+        hourly: Dict[str, int] = {}
+
+        for sign, rows in ((-1, removed), (1, added)):
+            for hour, severity, category, module, resolved, total, time_sum, time_count in rows:
+                if not hour:
+                    continue
+                day = hour[:10]
+                hourly[hour] = hourly.get(hour, 0) + sign * total
+                acc = daily.setdefault(day, [0, 0, 0, 0.0, 0])
+                acc[0] += sign * total
+                acc[1 if resolved else 2] += sign * total
+                acc[3] += sign * (time_sum or 0)
+                acc[4] += sign * (time_count or 0)
+                # 模块为空的记录不计入模块维度（与 get_statistics 口径一致）
+                for dimension, key in (('severity', severity), ('category', category), ('module', module)):
+                    if key:
+                        counts[(day, dimension, key)] = counts.get((day, dimension, key), 0) + sign * total
+
+        daily = {day: acc for day, acc in daily.items() if any(acc)}
+        counts = {key: delta for key, delta in counts.items() if delta}
+        hourly = {hour: delta for hour, delta in hourly.items() if delta}
+        if hourly:
+            hours = [(hour,) for hour in hourly]
+            conn.executemany("INSERT OR IGNORE INTO error_statistics_hourly (hour) VALUES (?)", hours)
+            conn.executemany(
+                "UPDATE error_statistics_hourly SET total_errors = total_errors + ? WHERE hour = ?",
+                [(delta, hour) for hour, delta in hourly.items()]
+            )
+            conn.executemany("DELETE FROM error_statistics_hourly WHERE hour = ? AND total_errors <= 0", hours)
+
+        if daily:
+            days = [(day,) for day in daily]
+            conn.executemany("INSERT OR IGNORE INTO error_statistics_daily (date) VALUES (?)", days)
+            conn.executemany('''
+                UPDATE error_statistics_daily SET
+                    total_errors = total_errors + ?,
+                    resolved_errors = resolved_errors + ?,
+                    unresolved_errors = unresolved_errors + ?,
+                    resolution_time_sum = resolution_time_sum + ?,
+                    resolution_time_count = resolution_time_count + ?
+                WHERE date = ?
+            ''', [(*acc, day) for day, acc in daily.items()])
+            conn.executemany('''
+                UPDATE error_statistics_daily SET
+                    avg_resolution_time = CASE WHEN resolution_time_count > 0
+                        THEN resolution_time_sum / resolution_time_count ELSE NULL END,
+                    error_rate_per_hour = total_errors / 24.0
+                WHERE date = ?
+            ''', days)
+            conn.executemany("DELETE FROM error_statistics_daily WHERE date = ? AND total_errors <= 0", days)
+
+        if counts:
+            keys = list(counts)
+            conn.executemany(
+                "INSERT OR IGNORE INTO error_statistics_daily_counts (date, dimension, key) VALUES (?, ?, ?)",
+                keys
+            )
+            conn.executemany(
+                "UPDATE error_statistics_daily_counts SET count = count + ? WHERE date = ? AND dimension = ? AND key = ?",
+                [(delta, *key) for key, delta in counts.items()]
+            )
+            conn.executemany(
+                "DELETE FROM error_statistics_daily_counts WHERE date = ? AND dimension = ? AND key = ? AND count <= 0",
+                keys
+            )
+        return bool(daily or counts or hourly)
 
     # ================ 管理方法 ================
 
@@ -1294,6 +1970,9 @@ class ErrorHistoryManager:
         """
         清理指定天数前的错误记录
 
+        按 created_at 索引每次取出最多 cleanup_batch_size 条、各自用一个短事务删除，
+        两批之间释放写连接，让排队中的写入先执行；释放出的页由增量回收逐步归还。
+
         Args:
             days: 保留天数，如果为None则使用配置值
 
@@ -1303,30 +1982,63 @@ class ErrorHistoryManager:
         if days is None:
             days = self.config.retention_days
 
-        try:
-            with self._get_connection() as conn:
-                # 计算截止日期
-                cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        # 计算截止日期
+        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        batch_size = max(1, int(self.config.cleanup_batch_size or 200))
+        deleted_count = 0
 
-                # 删除旧记录
-                cursor = conn.execute(
-                    "DELETE FROM error_history WHERE created_at < ?",
-                    (cutoff_date,)
-                )
+        try:
+            while True:
+                with self._get_connection() as conn:
+                    ids = [row[0] for row in conn.execute(
+                        "SELECT id FROM error_history WHERE created_at < ? ORDER BY created_at LIMIT ?",
+                        (cutoff_date, batch_size)
+                    )]
+                    if not ids:
+                        break
+                    placeholders = ','.join('?' * len(ids))
+
+                    # 按日/维度聚合后的贡献一次性抵扣，避免逐行处理
+                    removed = self._collect_stat_contributions(conn, f"id IN ({placeholders})", ids)
+                    conn.execute(f"DELETE FROM error_history WHERE id IN ({placeholders})", ids)
+                    changed = self._apply_statistics_delta(conn, removed=removed)
+                    conn.commit()
+                    if changed:
+                        self._statistics_version += 1
+
+                deleted_count += len(ids)
+                if len(ids) < batch_size:
+                    break
+                # 让出写连接
+                time.sleep(0)
 
-                deleted_count = cursor.rowcount
+            with self._get_connection() as conn:
+                # 指纹聚合：过期的小时计数与不再有任何出现的指纹
+                removed = self._collect_folded_contributions(conn, "o.hour < ?", (cutoff_date,))
+                changed = False
+                if removed:
+                    conn.execute("DELETE FROM error_fingerprint_hourly WHERE hour < ?", (cutoff_date,))
+                    changed = self._apply_statistics_delta(conn, removed=removed)
+                conn.execute('''
+                    DELETE FROM error_fingerprints
+                    WHERE last_seen < ?
+                      AND NOT EXISTS (SELECT 1 FROM error_history h WHERE h.fingerprint = error_fingerprints.fingerprint)
+                      AND NOT EXISTS (SELECT 1 FROM error_fingerprint_hourly o WHERE o.fingerprint = error_fingerprints.fingerprint)
+                ''', (cutoff_date,))
                 conn.commit()
+                if changed:
+                    self._statistics_version += 1
 
                 # 清理相关的日统计（可选）
-                if deleted_count > 0:
+                if deleted_count > 0 or removed:
                     self._cleanup_old_statistics(conn, days)
 
-                logger.info(f"已清理 {deleted_count} 条过期错误记录（{days}天前）")
-                return deleted_count
+            logger.info(f"已清理 {deleted_count} 条过期错误记录（{days}天前）")
+            return deleted_count
 
         except Exception as e:
-            logger.error(f"清理过期错误记录失败: {e}")
-            return 0
+            logger.error(f"清理过期错误记录失败（已删除 {deleted_count} 条）: {e}")
+            return deleted_count
 
     def _cleanup_old_statistics(self, conn: sqlite3.Connection, days: int):
         """清理过期的日统计记录"""
@@ -1337,6 +2049,16 @@ class ErrorHistoryManager:
                 (cutoff_date,)
             )
             deleted_stats = cursor.rowcount
+            conn.execute(
+                "DELETE FROM error_statistics_daily_counts WHERE date < ?",
+                (cutoff_date,)
+            )
+            conn.execute(
+                "DELETE FROM error_statistics_hourly WHERE hour < ?",
+                (cutoff_date,)
+            )
+            conn.commit()
+            self._statistics_version += 1
             if deleted_stats > 0:
                 logger.info(f"已清理 {deleted_stats} 条过期统计记录")
         except Exception as e:
@@ -1346,29 +2068,78 @@ class ErrorHistoryManager:
         """
         优化数据库性能
 
+        增量回收模式下分批归还空闲页并按需更新统计信息（PRAGMA optimize），不重写整个文件；
+        旧库首次优化时执行一次完整 VACUUM，将其转换为增量回收模式。
+
         Returns:
             bool: 优化是否成功
         """
         try:
             with self._get_connection() as conn:
-                # 执行VACUUM
-                conn.execute("VACUUM")
-
-                # 重新分析表统计信息
-                conn.execute("ANALYZE")
-
-                # 重新索引
-                conn.execute("REINDEX")
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != self._AUTO_VACUUM_INCREMENTAL:
+                    logger.info("数据库尚未启用增量回收，执行一次完整 VACUUM 进行转换")
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    conn.execute("VACUUM")
+
+            freed = 0
+            while True:
+                pages = self.incremental_vacuum()
+                freed += pages
+                if not pages:
+                    break
 
-                conn.commit()
+            with self._get_connection() as conn:
+                conn.execute("PRAGMA optimize")
 
-                logger.info("数据库优化完成")
-                return True
+            logger.info(f"数据库优化完成，回收 {freed} 页")
+            return True
 
         except Exception as e:
             logger.error(f"数据库优化失败: {e}")
             return False
 
+    def incremental_vacuum(self, pages: int = None) -> int:
+        """
+        执行一次增量回收：把最多 pages 个空闲页归还给文件系统
+
+        Args:
+            pages: 本次最多回收的页数，None 使用配置 vacuum_step_pages
+
+        Returns:
+            int: 实际回收的页数
+        """
+        pages = max(1, int(pages or self.config.vacuum_step_pages or 256))
+        try:
+            with self._get_connection() as conn:
+                before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if not before:
+                    return 0
+                # incremental_vacuum 每步只释放一页，需用 executescript 执行到结束
+                conn.executescript(f"PRAGMA incremental_vacuum({pages});")
+                return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        except Exception as e:
+            logger.warning(f"增量回收失败: {e}")
+            return 0
+
+    def _schedule_free_page_reclaim(self):
+        """在后台线程中分片回收空闲页（写入队列繁忙时让路）"""
+        if self._vacuum_thread and self._vacuum_thread.is_alive():
+            return
+        self._vacuum_stop_event.clear()
+
+        def _loop():
+            while not self._vacuum_stop_event.is_set():
+                queue = self._write_queue
+                if queue is not None and queue.get_stats()['depth']:
+                    self._vacuum_stop_event.wait(0.2)
+                    continue
+                if not self.incremental_vacuum():
+                    return
+                self._vacuum_stop_event.wait(0.05)
+
+        self._vacuum_thread = threading.Thread(target=_loop, name="EHIncrementalVacuum", daemon=True)
+        self._vacuum_thread.start()
+
     def backup_database(self, backup_path: str = None) -> bool:
         """
         备份数据库
@@ -1396,14 +2167,19 @@ class ErrorHistoryManager:
             return False
 
     def export_data(self, file_path: str, format: str = None,
-                   filters: Dict[str, Any] = None) -> bool:
+                   filters: Dict[str, Any] = None, compress: Optional[bool] = None,
+                   progress_callback: Callable[[int, int], None] = None,
+                   cancel_event: threading.Event = None) -> bool:
         """
-        导出错误数据
+        流式导出错误数据
 
         Args:
             file_path: 导出文件路径
-            format: 导出格式 (json, csv, xlsx)，如果为None则使用配置默认值
+            format: 导出格式 (json, ndjson, csv, xlsx)，如果为None则使用配置默认值
             filters: 导出过滤条件
+            compress: 是否 gzip 压缩，None 时按文件名是否以 .gz 结尾决定
+            progress_callback: 进度回调 progress_callback(已写条数, 总条数)
+            cancel_event: 取消事件，置位后中止导出并删除未完成的文件
 
         Returns:
             bool: 导出是否成功
@@ -1411,127 +2187,152 @@ class ErrorHistoryManager:
         if format is None:
             format = self.config.default_format
 
-        if format not in self.config.supported_formats:
+        # ndjson 是 json 的逐行变体，随 json 一起启用
+        if ('json' if format == 'ndjson' else format) not in self.config.supported_formats:
             logger.error(f"不支持的导出格式: {format}")
             return False
 
         try:
-            # 获取要导出的数据
-            errors = self.query_errors(
-                filters=filters,
-                limit=self.config.max_export_rows
+            exporter = ErrorHistoryExporter(self)
+            count = exporter.export(
+                file_path, format, filters,
+                limit=self.config.max_export_rows,
+                compress=compress,
+                progress_callback=progress_callback,
+                cancel_event=cancel_event,
             )
 
-            if not errors:
+            if not count:
                 logger.warning("没有找到要导出的数据")
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
                 return False
 
-            # 根据格式导出
-            if format == 'json':
-                self._export_json(errors, file_path)
-            elif format == 'csv':
-                self._export_csv(errors, file_path)
-            elif format == 'xlsx':
-                self._export_xlsx(errors, file_path)
-
-            logger.info(f"数据导出完成: {file_path} (格式: {format}, 记录数: {len(errors)})")
+            logger.info(f"数据导出完成: {file_path} (格式: {format}, 记录数: {count})")
             return True
 
+        except ExportCancelled:
+            logger.info(f"数据导出已取消: {file_path}")
+            return False
         except Exception as e:
             logger.error(f"数据导出失败: {e}")
             return False
 
-    def _export_json(self, errors: List[ErrorRecord], file_path: str):
-        """导出为JSON格式"""
-        data = {
-            'export_info': {
-                'timestamp': datetime.now().isoformat(),
-                'total_records': len(errors),
-                'format': 'json'
-            },
-            'errors': [error.to_dict() for error in errors]
-        }
-
-        import json
-        with builtins.open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-    def _export_csv(self, errors: List[ErrorRecord], file_path: str):
-        """导出为CSV格式"""
-        import csv
-
-        with builtins.open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-
-            # 写入表头
-            headers = [
-                'error_id', 'error_type', 'error_message', 'severity', 'category',
-                'module', 'function', 'line_number', 'created_at', 'resolved',
-                'resolution_method', 'resolution_time', 'retry_count'
-            ]
-            writer.writerow(headers)
-
-            # 写入数据
-            for error in errors:
-                row = [
-                    error.error_id,
-                    error.error_type,
-                    error.error_message,
-                    error.severity.value,
-                    error.category.value,
-                    error.module,
-                    error.function,
-                    error.line_number,
-                    error.created_at.isoformat() if error.created_at else '',
-                    error.resolved,
-                    error.resolution_method,
-                    error.resolution_time,
-                    error.retry_count
-                ]
-                writer.writerow(row)
-
-    def _export_xlsx(self, errors: List[ErrorRecord], file_path: str):
-        """导出为Excel格式"""
+    def _count_errors(self, conn: sqlite3.Connection, filters: Dict[str, Any] = None,
+                      limit: Optional[int] = None) -> int:
+        """统计匹配记录数（供导出进度使用，limit 为上限）"""
+        where_clauses, query_params = self._build_filter_clauses(filters or {})
+        where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
+        if limit:
+            cursor = conn.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM error_history WHERE {where_clause} LIMIT ?)",
+                [*query_params, limit]
+            )
+        else:
+            cursor = conn.execute(f"SELECT COUNT(*) FROM error_history WHERE {where_clause}", query_params)
+        return cursor.fetchone()[0]
+
+    def _iter_error_chunks(self, conn: sqlite3.Connection, filters: Dict[str, Any] = None,
+                           limit: Optional[int] = None, chunk_size: int = 500) -> Iterator[List[ErrorRecord]]:
+        """在单个游标上按 fetchmany 分块读取匹配记录，每次只解码一块"""
+        where_clauses, query_params = self._build_filter_clauses(filters or {})
+        where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
+        query = f"SELECT * FROM error_history WHERE {where_clause} ORDER BY created_at DESC, id DESC"
+        if limit:
+            query += " LIMIT ?"
+            query_params.append(limit)
+
+        cursor = self._row_cursor(conn).execute(query, query_params)
         try:
-            from openpyxl import Workbook
-
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "错误历史"
-
-            # 写入表头
-            headers = [
-                '错误ID', '错误类型', '错误消息', '严重程度', '分类',
-                '模块', '函数', '行号', '创建时间', '已解决',
-                '解决方法', '解决时间', '重试次数'
-            ]
-            for col, header in enumerate(headers, 1):
-                ws.cell(row=1, column=col, value=header)
-
-            # 写入数据
-            for row, error in enumerate(errors, 2):
-                ws.cell(row=row, column=1, value=error.error_id)
-                ws.cell(row=row, column=2, value=error.error_type)
-                ws.cell(row=row, column=3, value=error.error_message)
-                ws.cell(row=row, column=4, value=error.severity.value)
-                ws.cell(row=row, column=5, value=error.category.value)
-                ws.cell(row=row, column=6, value=error.module)
-                ws.cell(row=row, column=7, value=error.function)
-                ws.cell(row=row, column=8, value=error.line_number)
-                ws.cell(row=row, column=9, value=error.created_at.isoformat() if error.created_at else '')
-                ws.cell(row=row, column=10, value=error.resolved)
-                ws.cell(row=row, column=11, value=error.resolution_method)
-                ws.cell(row=row, column=12, value=error.resolution_time)
-                ws.cell(row=row, column=13, value=error.retry_count)
-
-            wb.save(file_path)
-
-        except ImportError:
-            logger.error("导出Excel格式需要安装openpyxl库")
-            raise
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield [self._row_to_error_record(row) for row in rows]
+        finally:
+            cursor.close()
 
     # ================ 工具方法 ================
 
+    _UPSERT_ERROR_SQL = '''
+        INSERT OR REPLACE INTO error_history
+        (error_id, error_type, error_message, severity, category, module,
+         function, line_number, stack_trace, context, user_context, system_context,
+         resolved, resolved_at, resolution_method, resolution_time,
+         retry_count, max_retries, tags, metadata, fingerprint)
+        VALUES (:error_id, :error_type, :error_message, :severity, :category, :module,
+                :function, :line_number, :stack_trace, :context, :user_context, :system_context,
+                :resolved, :resolved_at, :resolution_method, :resolution_time,
+                :retry_count, :max_retries, :tags, :metadata, :fingerprint)
+    '''
+
+    _UPSERT_FINGERPRINT_SQL = '''
+        INSERT INTO error_fingerprints
+        (fingerprint, error_type, module, function, line_number, message_template,
+         severity, category, occurrence_count, first_seen, last_seen)
+        VALUES (:fingerprint, :error_type, :module, :function, :line_number, :message_template,
+                :severity, :category, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        ON CONFLICT (fingerprint) DO UPDATE SET
+            occurrence_count = occurrence_count + 1,
+            last_seen = excluded.last_seen
+    '''
+
+    def _record_to_row(self, error_record: ErrorRecord) -> Dict[str, Any]:
+        """将ErrorRecord转换为 error_history 写入参数"""
+        return {
+            'error_id': error_record.error_id,
+            'error_type': error_record.error_type,
+            'error_message': error_record.error_message,
+            'severity': error_record.severity.value,
+            'category': error_record.category.value,
+            'module': error_record.module,
+            'function': error_record.function,
+            'line_number': error_record.line_number,
+            'stack_trace': error_record.stack_trace,
+            'context': json.dumps(error_record.context, ensure_ascii=False) if error_record.context else None,
+            'user_context': json.dumps(error_record.user_context, ensure_ascii=False) if error_record.user_context else None,
+            'system_context': json.dumps(error_record.system_context, ensure_ascii=False) if error_record.system_context else None,
+            'resolved': error_record.resolved,
+            'resolved_at': error_record.resolved_at.isoformat() if error_record.resolved_at else None,
+            'resolution_method': error_record.resolution_method,
+            'resolution_time': error_record.resolution_time,
+            'retry_count': error_record.retry_count,
+            'max_retries': error_record.max_retries,
+            'tags': json.dumps(error_record.tags, ensure_ascii=False) if error_record.tags else None,
+            'metadata': json.dumps(error_record.metadata, ensure_ascii=False) if error_record.metadata else None,
+            'fingerprint': error_record.fingerprint or compute_fingerprint(
+                error_record.error_type, error_record.module, error_record.function,
+                error_record.line_number, error_record.error_message
+            )
+        }
+
+    @staticmethod
+    def _created_at_range(start_date: date = None, end_date: date = None) -> Tuple[List[str], List[str]]:
+        """
+        将日期范围（闭区间）转换为 created_at 上的半开区间条件
+
+        不对列套用 date() 等函数，以便使用 (…, created_at) 复合索引。created_at 以
+        'YYYY-MM-DD HH:MM:SS' / ISO 文本存储，按日期前缀比较即可得到与 date(created_at)
+        相同的结果。
+
+        Returns:
+            Tuple[List[str], List[str]]: (条件列表, 参数列表)
+        """
+        clauses, params = [], []
+        if isinstance(start_date, datetime):
+            start_date = start_date.date()
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+        if start_date:
+            clauses.append("created_at >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            clauses.append("created_at < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
+        return clauses, params
+
     def _row_to_error_record(self, row) -> ErrorRecord:
         """将数据库行转换为ErrorRecord对象"""
         return ErrorRecord(
@@ -1556,7 +2357,8 @@ class ErrorHistoryManager:
             retry_count=row['retry_count'],
             max_retries=row['max_retries'],
             tags=json.loads(row['tags']) if row['tags'] else None,
-            metadata=json.loads(row['metadata']) if row['metadata'] else None
+            metadata=json.loads(row['metadata']) if row['metadata'] else None,
+            fingerprint=row['fingerprint'] if 'fingerprint' in row.keys() else None
         )
 
     def get_database_info(self) -> Dict[str, Any]:
@@ -1567,7 +2369,7 @@ class ErrorHistoryManager:
             Dict[str, Any]: 数据库信息
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(readonly=True) as conn:
                 # 获取表信息
                 cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
                 tables = [row[0] for row in cursor.fetchall()]
@@ -1581,13 +2383,18 @@ class ErrorHistoryManager:
 
                 # 获取数据库文件大小
                 db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
+                auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
 
                 return {
                     'database_path': str(self.db_path),
                     'database_size': db_size,
                     'tables': tables,
                     'table_counts': table_counts,
-                    'connection_pool_size': len(self._connection_pool)
+                    'connection_pool_size': self._pool.size(),
+                    'connection_pool': self._pool.get_stats(),
+                    'incremental_vacuum': auto_vacuum == self._AUTO_VACUUM_INCREMENTAL,
+                    'free_pages': free_pages
                 }
 
         except Exception as e:
@@ -1597,11 +2404,27 @@ class ErrorHistoryManager:
     def shutdown(self):
         """关闭管理器，清理资源"""
         try:
+            # 先写完异步队列中的记录，再关闭连接
+            self._shutting_down = True
+            with self._write_queue_lock:
+                queue = self._write_queue
+            if queue is not None:
+                try:
+                    queue.shutdown()
+                except Exception as e:
+                    logger.warning(f"关闭错误写入队列失败: {e}")
+
             # 停止调度与监听
             try:
                 self._stop_cleanup_scheduler()
             except Exception:
                 pass
+            try:
+                self._vacuum_stop_event.set()
+                if self._vacuum_thread and self._vacuum_thread.is_alive():
+                    self._vacuum_thread.join(timeout=3.0)
+            except Exception:
+                pass
             try:
                 self._stop_config_watcher()
             except Exception:
@@ -1611,14 +2434,10 @@ class ErrorHistoryManager:
             except Exception:
                 pass
             # 关闭所有连接
-            with self._pool_lock:
-                for conn in self._connection_pool.values():
-                    try:
-                        conn.close()
-                    except Exception as e:
-                        logger.warning(f"关闭数据库连接失败: {e}")
-
-                self._connection_pool.clear()
+            try:
+                self._pool.close()
+            except Exception as e:
+                logger.warning(f"关闭数据库连接失败: {e}")
 
             logger.info("错误历史管理器已关闭")
 
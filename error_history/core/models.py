@@ -59,6 +59,7 @@ class ErrorRecord:
     max_retries: int = 3
     tags: Optional[List[str]] = None
     metadata: Optional[Dict[str, Any]] = None
+    fingerprint: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -97,6 +98,8 @@ class ErrorRecord:
             result['tags'] = json.dumps(self.tags, ensure_ascii=False)
         if self.metadata:
             result['metadata'] = json.dumps(self.metadata, ensure_ascii=False)
+        if self.fingerprint:
+            result['fingerprint'] = self.fingerprint
 
         return result
 
@@ -136,7 +139,8 @@ class ErrorRecord:
             retry_count=data.get('retry_count', 0),
             max_retries=data.get('max_retries', 3),
             tags=tags,
-            metadata=metadata
+            metadata=metadata,
+            fingerprint=data.get('fingerprint')
         )
 
     @classmethod
@@ -224,14 +228,26 @@ class ErrorHistoryConfig:
     database_path: str = "data/error_history.db"
     max_connections: int = 5
     timeout_seconds: int = 30
+    connection_idle_seconds: int = 300
     backup_enabled: bool = True
     backup_interval_hours: int = 24
 
+    # 写入队列（write-behind）
+    write_queue_capacity: int = 10000
+    write_batch_size: int = 200
+    write_flush_interval_ms: int = 250
+
+    # 指纹聚合：相同指纹的错误只保留 dedup_sample_size 条完整记录（蓄水池抽样），其余只计数
+    dedup_enabled: bool = True
+    dedup_sample_size: int = 10
+
     # 保留策略
     retention_days: int = 90
     auto_cleanup: bool = True
     cleanup_schedule: str = "0 2 * * *"  # 每天凌晨2点
     compression_enabled: bool = False
+    cleanup_batch_size: int = 200      # 每个删除事务的最大记录数
+    vacuum_step_pages: int = 256       # 每次增量回收的最大页数
 
     # UI配置
     theme: str = "system"
@@ -260,14 +276,24 @@ class ErrorHistoryConfig:
                 'path': self.database_path,
                 'max_connections': self.max_connections,
                 'timeout_seconds': self.timeout_seconds,
+                'idle_timeout_seconds': self.connection_idle_seconds,
                 'backup_enabled': self.backup_enabled,
                 'backup_interval_hours': self.backup_interval_hours
             },
+            'ingestion': {
+                'queue_capacity': self.write_queue_capacity,
+                'batch_size': self.write_batch_size,
+                'flush_interval_ms': self.write_flush_interval_ms,
+                'dedup_enabled': self.dedup_enabled,
+                'dedup_sample_size': self.dedup_sample_size
+            },
             'retention': {
                 'days': self.retention_days,
                 'auto_cleanup': self.auto_cleanup,
                 'cleanup_schedule': self.cleanup_schedule,
-                'compression_enabled': self.compression_enabled
+                'compression_enabled': self.compression_enabled,
+                'delete_batch_size': self.cleanup_batch_size,
+                'vacuum_step_pages': self.vacuum_step_pages
             },
             'ui': {
                 'theme': self.theme,
@@ -293,6 +319,7 @@ class ErrorHistoryConfig:
     def from_dict(cls, data: Dict[str, Any]) -> 'ErrorHistoryConfig':
         """从字典创建配置对象"""
         database = data.get('database', {})
+        ingestion = data.get('ingestion', {})
         retention = data.get('retention', {})
         ui = data.get('ui', {})
         monitoring = data.get('monitoring', {})
@@ -304,12 +331,20 @@ class ErrorHistoryConfig:
             database_path=database.get('path', 'data/error_history.db'),
             max_connections=database.get('max_connections', 5),
             timeout_seconds=database.get('timeout_seconds', 30),
+            connection_idle_seconds=database.get('idle_timeout_seconds', 300),
             backup_enabled=database.get('backup_enabled', True),
             backup_interval_hours=database.get('backup_interval_hours', 24),
+            write_queue_capacity=ingestion.get('queue_capacity', 10000),
+            write_batch_size=ingestion.get('batch_size', 200),
+            write_flush_interval_ms=ingestion.get('flush_interval_ms', 250),
+            dedup_enabled=ingestion.get('dedup_enabled', True),
+            dedup_sample_size=ingestion.get('dedup_sample_size', 10),
             retention_days=retention.get('days', 90),
             auto_cleanup=retention.get('auto_cleanup', True),
             cleanup_schedule=retention.get('cleanup_schedule', '0 2 * * *'),
             compression_enabled=retention.get('compression_enabled', False),
+            cleanup_batch_size=retention.get('delete_batch_size', 200),
+            vacuum_step_pages=retention.get('vacuum_step_pages', 256),
             theme=ui.get('theme', 'system'),
             language=ui.get('language', 'zh-CN'),
             page_size=ui.get('page_size', 50),
@@ -0,0 +1,68 @@
+# error_history/core/statistics_service.py
+"""
+错误历史持久化子系统 - 统计服务（汇总表 + 短期缓存）
+"""
+
+import threading
+import time
+from datetime import date
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .manager import ErrorHistoryManager
+
+
+class StatisticsService:
+    """仪表盘统计服务
+
+    统计数据来自写入时增量维护的日/小时汇总表；结果按日期范围缓存 ttl 秒，
+    统计面板、分析面板、管理面板与主窗口状态栏共用同一份缓存。
+    本进程内的写入会递增管理器的汇总版本号，使缓存立即失效；
+    ttl 只用于感知其他进程对同一数据库的写入。
+    """
+
+    def __init__(self, manager: "ErrorHistoryManager", ttl: float = 5.0):
+        self.manager = manager
+        self.ttl = ttl
+        self._memo: Dict[Optional[Tuple[date, date]], Tuple[float, int, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_statistics(self, date_range: Tuple[date, date] = None) -> Dict[str, Any]:
+        """
+        获取统计信息（结构同 ErrorHistoryManager.get_statistics）
+
+        Args:
+            date_range: 日期范围 (开始日期, 结束日期)，如果为None则统计全部
+
+        Returns:
+            Dict[str, Any]: 统计信息字典
+        """
+        key = tuple(date_range) if date_range else None
+        version = self.manager._statistics_version
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached and cached[1] == version and now - cached[0] < self.ttl:
+                self._hits += 1
+                return dict(cached[2])
+
+        stats = self.manager.get_rollup_statistics(key)
+
+        with self._lock:
+            self._misses += 1
+            if stats:
+                self._memo[key] = (now, version, stats)
+        return dict(stats)
+
+    def invalidate(self):
+        """清空缓存（例如外部直接修改数据库后）"""
+        with self._lock:
+            self._memo.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """获取缓存命中计数"""
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'entries': len(self._memo), 'ttl': self.ttl}
@@ -0,0 +1,167 @@
+# error_history/core/write_queue.py
+"""
+错误历史持久化子系统 - 异步批量写入队列（write-behind）
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
+
+from .models import ErrorRecord
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorWriteQueue:
+    """有界写入队列：调用方 O(1) 入队，后台线程按批次（N 条或 T 毫秒）落库"""
+
+    def __init__(self, writer: Callable[[List[ErrorRecord]], int], capacity: int = 10000,
+                 batch_size: int = 200, flush_interval_ms: int = 250):
+        """
+        初始化写入队列
+
+        Args:
+            writer: 批量写入函数，接收记录列表并返回成功写入条数
+            capacity: 队列容量，超出后新记录被丢弃并计入 dropped
+            batch_size: 单个事务的最大记录数
+            flush_interval_ms: 队列非空时最长等待多久强制落库
+        """
+        self._writer = writer
+        self.capacity = max(1, int(capacity))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(1, int(flush_interval_ms)) / 1000.0
+
+        self._buffer: Deque[ErrorRecord] = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._thread = None
+
+        self._stats = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'failed': 0,
+            'batches': 0,
+            'max_depth': 0,
+        }
+
+    # ================ 生产者 ================
+
+    def put(self, record: ErrorRecord) -> bool:
+        """
+        入队一条记录（不做任何 I/O）
+
+        Returns:
+            bool: 是否入队成功；队列已满或已关闭时返回 False
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._buffer) >= self.capacity:
+                self._stats['dropped'] += 1
+                return False
+            self._buffer.append(record)
+            self._stats['enqueued'] += 1
+            depth = len(self._buffer)
+            if depth > self._stats['max_depth']:
+                self._stats['max_depth'] = depth
+            if depth == 1 or depth >= self.batch_size:
+                self._cond.notify_all()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="EHWriteBehind", daemon=True)
+                self._thread.start()
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        立即落库当前所有待写记录并等待完成
+
+        Returns:
+            bool: 超时前是否已全部写完
+        """
+        with self._cond:
+            if self._thread is None:
+                return not self._buffer
+            self._flush_requested = True
+            self._cond.notify_all()
+            done = self._cond.wait_for(lambda: not self._buffer and not self._in_flight, timeout)
+            self._flush_requested = False
+            return done
+
+    def shutdown(self, timeout: float = 10.0) -> bool:
+        """
+        停止接收新记录，写完剩余记录后结束后台线程
+
+        Returns:
+            bool: 剩余记录是否全部写完
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            remaining = len(self._buffer) + self._in_flight
+        if remaining:
+            logger.warning(f"错误写入队列关闭时仍有 {remaining} 条记录未写入")
+        return remaining == 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取队列计数（入队/写入/溢出丢弃/失败/批次/当前与最大深度）"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['depth'] = len(self._buffer)
+            stats['capacity'] = self.capacity
+            stats['closed'] = self._closed
+        return stats
+
+    # ================ 后台写入 ================
+
+    def _should_write(self) -> bool:
+        return (self._closed or self._flush_requested
+                or len(self._buffer) >= self.batch_size)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = None
+                while not (self._buffer and self._should_write()):
+                    if self._closed and not self._buffer:
+                        return
+                    if not self._buffer:
+                        deadline = None
+                        self._cond.wait()
+                        continue
+                    # 首条记录到达后开始计时，超过 flush_interval 即使未满一批也写入
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                self._in_flight = len(batch)
+
+            written = 0
+            try:
+                written = int(self._writer(batch) or 0)
+            except Exception as e:
+                # 使用 warning 而非 error，避免经由日志处理器回灌到本队列
+                logger.warning(f"批量写入错误记录失败: {e}")
+
+            with self._cond:
+                self._stats['batches'] += 1
+                self._stats['written'] += written
+                self._stats['failed'] += len(batch) - written
+                self._in_flight = 0
+                self._cond.notify_all()
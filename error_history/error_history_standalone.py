@@ -39,8 +39,12 @@ def main():
         if len(sys.argv) > 1:
             mode = sys.argv[1]
 
+        # 离线修复：全量重算日统计（无需启动UI）
+        if mode == "rebuild-stats":
+            return rebuild_statistics(sys.argv[2] if len(sys.argv) > 2 else None)
+
         # 验证模式参数
-        valid_modes = ["query", "statistics", "analysis", "management"]
+        valid_modes = ["query", "statistics", "analysis", "management", "rebuild-stats"]
         if mode not in valid_modes:
             print(f"无效的模式参数: {mode}")
             print(f"有效模式: {', '.join(valid_modes)}")
@@ -67,6 +71,19 @@ def main():
         return 1
 
 
+def rebuild_statistics(db_path: str = None) -> int:
+    """全量重算错误历史日统计（增量计数的离线修复入口）"""
+    from error_history.core.manager import ErrorHistoryManager
+
+    manager = ErrorHistoryManager(db_path=db_path)
+    try:
+        days = manager.rebuild_daily_statistics()
+        print(f"日统计重算完成: {manager.db_path}，共 {days} 天")
+        return 0
+    finally:
+        manager.shutdown()
+
+
 def check_dependencies():
     """检查依赖"""
     missing_deps = []
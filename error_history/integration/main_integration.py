@@ -130,8 +130,8 @@ class ErrorHistoryIntegration:
                     if error_info and self.manager:
                         try:
                             error_record = self._convert_to_error_record(error_info)
-                            self.manager.save_error(error_record)
-                            logger.debug(f"错误已保存到历史数据库: {error_record.error_id}")
+                            self.manager.enqueue_error(error_record)
+                            logger.debug(f"错误已加入历史数据库写入队列: {error_record.error_id}")
                         except Exception as e:
                             logger.warning(f"保存错误到历史数据库失败: {e}")
 
@@ -189,10 +189,10 @@ class ErrorHistoryIntegration:
                                 'max_retries': 3
                             })()
 
-                            # 保存到错误历史（避免使用logger.debug防止递归）
+                            # 放入异步写入队列，不在记录日志的线程上做数据库I/O（避免使用logger.debug防止递归）
                             if self.integration.manager:
                                 error_record = self.integration._convert_to_error_record(error_info)
-                                self.integration.manager.save_error(error_record)
+                                self.integration.manager.enqueue_error(error_record)
                                 # 不使用logger.debug，避免递归调用
 
                     except Exception as e:
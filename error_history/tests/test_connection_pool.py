@@ -0,0 +1,126 @@
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from error_history.core.connection_pool import SQLiteConnectionPool
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord
+
+
+class TestSQLiteConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name) / "pool.db")
+        self.pool = SQLiteConnectionPool(self.db_path, max_readers=2, timeout=2)
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+
+    def tearDown(self):
+        self.pool.close()
+        self._tmp.cleanup()
+
+    def test_short_lived_threads_do_not_leak_connections(self):
+        def reader():
+            with self.pool.connection(readonly=True) as conn:
+                conn.execute("SELECT COUNT(*) FROM t").fetchone()
+
+        threads = [threading.Thread(target=reader) for _ in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['checkouts'], 50)
+        self.assertLessEqual(stats['readers_open'], 2)
+        self.assertEqual(stats['readers_in_use'], 0)
+        self.assertLessEqual(self.pool.size(), 3)
+
+    def test_nested_read_reuses_writer_and_commits_on_exit(self):
+        with self.pool.connection() as writer:
+            writer.execute("INSERT INTO t VALUES (1)")
+            with self.pool.connection(readonly=True) as nested:
+                self.assertIs(nested, writer)
+                self.assertEqual(nested.execute("SELECT COUNT(*) FROM t").fetchone()[0], 1)
+        with self.pool.connection(readonly=True) as reader:
+            self.assertEqual(reader.execute("SELECT COUNT(*) FROM t").fetchone()[0], 1)
+            with self.assertRaises(sqlite3.OperationalError):
+                reader.execute("INSERT INTO t VALUES (2)")
+
+    def test_exception_rolls_back_and_broken_connection_is_replaced(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError("boom")
+        with self.pool.connection(readonly=True) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            with self.pool.connection(readonly=True) as conn:
+                broken = conn
+                conn.close()
+                conn.execute("SELECT 1")
+        self.assertEqual(self.pool.get_stats()['discarded'], 1)
+        with self.pool.connection(readonly=True) as conn:
+            self.assertIsNot(conn, broken)
+
+    def test_exhausted_pool_waits_then_times_out(self):
+        self.pool.configure(max_readers=1, timeout=0.2)
+        entered, release = threading.Event(), threading.Event()
+
+        def holder():
+            with self.pool.connection(readonly=True):
+                entered.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        entered.wait(5)
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.pool.connection(readonly=True):
+                pass
+        self.assertEqual(self.pool.get_stats()['utilization'], 1.0)
+
+        threading.Timer(0.05, release.set).start()
+        with self.pool.connection(readonly=True):
+            pass
+        thread.join()
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertGreater(stats['wait_time_max'], 0.02)
+
+    def test_idle_readers_are_reaped(self):
+        self.pool.configure(idle_timeout=0.01)
+        with self.pool.connection(readonly=True):
+            pass
+        time.sleep(0.05)
+        with self.pool.connection(readonly=True):
+            pass
+        self.assertEqual(self.pool.get_stats()['reaped'], 1)
+
+
+class TestManagerConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.manager = ErrorHistoryManager(db_path=str(Path(self._tmp.name) / "eh_pool.db"))
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def test_row_factory_is_scoped_to_cursor(self):
+        self.manager.save_error(ErrorRecord(error_id="P1", error_type="E", error_message="m"))
+        self.assertEqual(self.manager.get_error("P1").error_id, "P1")
+        self.assertEqual(len(self.manager.query_errors()), 1)
+        for readonly in (False, True):
+            with self.manager._get_connection(readonly=readonly) as conn:
+                self.assertIsNone(conn.row_factory)
+        info = self.manager.get_database_info()
+        self.assertIn('utilization', info['connection_pool'])
+        self.assertGreaterEqual(self.manager.get_pool_stats()['checkouts'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
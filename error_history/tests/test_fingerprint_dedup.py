@@ -0,0 +1,142 @@
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from error_history.core.fingerprint import compute_fingerprint, message_template
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord, ErrorSeverity
+
+
+def _storm(count, prefix="R", line_number=42, **kwargs):
+    return [ErrorRecord(error_id=f"{prefix}{i}", error_type="RenderError",
+                        error_message=f"渲染失败: '/docs/page{i}.md' at 0x7f{i:04x}, 第 {i} 行",
+                        module="renderer", function="render", line_number=line_number,
+                        stack_trace="frame\n" * 50, **kwargs)
+            for i in range(count)]
+
+
+class TestMessageTemplate(unittest.TestCase):
+    def test_volatile_parts_are_normalised(self):
+        self.assertEqual(message_template("timeout after 30.5s on 'a.md' (0xdeadbeef)"),
+                         "timeout after <num>s on <str> (<hex>)")
+        self.assertEqual(message_template(r"无法打开 C:\docs\a\b.md"), "无法打开 <path>")
+        self.assertEqual(
+            compute_fingerprint("IOError", "m", "f", 1, "file 1 missing"),
+            compute_fingerprint("IOError", "m", "f", 1, "file 2 missing")
+        )
+        self.assertNotEqual(
+            compute_fingerprint("IOError", "m", "f", 1, "file 1 missing"),
+            compute_fingerprint("IOError", "m", "f", 2, "file 1 missing")
+        )
+
+
+class TestFingerprintAggregation(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name) / "eh_dedup.db")
+        self.manager = ErrorHistoryManager(db_path=self.db_path)
+        self.manager.config.dedup_sample_size = 5
+        self.manager._sample_random.seed(7)
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def _row_count(self):
+        return self.manager.get_database_info()['table_counts']['error_history']
+
+    def test_repeated_errors_keep_a_bounded_reservoir(self):
+        self.assertEqual(self.manager.save_errors(_storm(150)), 150)
+        for record in _storm(50, prefix="S"):
+            self.assertTrue(self.manager.save_error(record))
+
+        self.assertEqual(self._row_count(), 5)
+        fingerprints = self.manager.get_fingerprints()
+        self.assertEqual(len(fingerprints), 1)
+        self.assertEqual(fingerprints[0]['occurrence_count'], 200)
+        self.assertEqual(fingerprints[0]['sample_count'], 5)
+        self.assertLessEqual(fingerprints[0]['first_seen'], fingerprints[0]['last_seen'])
+        self.assertIn("<str>", fingerprints[0]['message_template'])
+
+        samples = self.manager.get_fingerprint_samples(fingerprints[0]['fingerprint'])
+        self.assertEqual(len(samples), 5)
+        self.assertTrue(all(sample.stack_trace for sample in samples))
+        # 蓄水池抽样会替换掉部分早期样本
+        self.assertTrue(any(sample.error_id not in {f"R{i}" for i in range(5)} for sample in samples))
+
+    def test_statistics_count_every_occurrence(self):
+        self.manager.save_errors(_storm(120))
+        self.manager.save_errors(_storm(3, prefix="L", line_number=7))
+        self.manager.save_errors(_storm(4, prefix="D", resolved=True, resolution_time=2.0))
+
+        exact = self.manager.get_statistics()
+        self.assertEqual(exact['total_errors'], 127)
+        self.assertEqual(exact['unresolved_errors'], 123)
+        self.assertEqual(exact['errors_by_module'], {"renderer": 127})
+        self.assertEqual(self._row_count(), 5 + 3 + 4)
+
+        rollup = self.manager.get_rollup_statistics()
+        for key in ('total_errors', 'resolved_errors', 'unresolved_errors',
+                    'errors_by_severity', 'errors_by_category', 'errors_by_module'):
+            self.assertEqual(rollup[key], exact[key], key)
+
+        self.manager.rebuild_daily_statistics()
+        self.assertEqual(self.manager.get_rollup_statistics()['total_errors'], 127)
+        today = date.today()
+        self.assertEqual(self.manager.get_statistics((today, today))['total_errors'],
+                         self.manager.get_daily_statistics(today).total_errors)
+
+    def test_resaving_a_sample_updates_it_in_place(self):
+        self.manager.save_errors(_storm(20))
+        sample = self.manager.get_fingerprint_samples(self.manager.get_fingerprints()[0]['fingerprint'])[0]
+        sample.resolved = True
+        sample.severity = ErrorSeverity.HIGH
+        self.assertTrue(self.manager.save_error(sample))
+
+        self.assertEqual(self.manager.get_fingerprints()[0]['occurrence_count'], 20)
+        stats = self.manager.get_statistics()
+        self.assertEqual(stats['total_errors'], 20)
+        self.assertEqual(stats['resolved_errors'], 1)
+        self.assertEqual(stats['errors_by_severity'], {"LOW": 19, "HIGH": 1})
+
+    def test_retention_drops_expired_counts(self):
+        self.manager.save_errors(_storm(30))
+        with self.manager._get_connection() as conn:
+            conn.execute("UPDATE error_history SET created_at = '2020-01-01 08:00:00'")
+            conn.execute("UPDATE error_fingerprint_hourly SET hour = '2020-01-01 08:00:00'")
+            conn.execute("UPDATE error_fingerprints SET last_seen = '2020-01-01 08:00:00'")
+        self.manager.rebuild_daily_statistics()
+
+        self.assertEqual(self.manager.cleanup_old_errors(days=30), 5)
+        self.assertEqual(self.manager.get_fingerprints(), [])
+        self.assertEqual(self.manager.get_statistics()['total_errors'], 0)
+        self.assertEqual(self.manager.get_rollup_statistics()['total_errors'], 0)
+
+
+class TestLegacyFingerprintBackfill(unittest.TestCase):
+    def test_existing_rows_are_fingerprinted_on_open(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp) / "legacy.db")
+            manager = ErrorHistoryManager(db_path=db_path)
+            manager.config.dedup_enabled = False
+            manager.save_errors(_storm(8))
+            with manager._get_connection() as conn:
+                conn.execute("DROP INDEX idx_error_history_fingerprint")
+                conn.execute("DROP TABLE error_fingerprints")
+                conn.execute("ALTER TABLE error_history DROP COLUMN fingerprint")
+            manager.shutdown()
+
+            reopened = ErrorHistoryManager(db_path=db_path)
+            try:
+                fingerprints = reopened.get_fingerprints()
+                self.assertEqual(len(fingerprints), 1)
+                self.assertEqual(fingerprints[0]['occurrence_count'], 8)
+                self.assertEqual(fingerprints[0]['sample_count'], 8)
+            finally:
+                reopened.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
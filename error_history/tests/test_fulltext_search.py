@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord, ErrorSeverity
+
+
+class TestFullTextSearch(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name) / "eh_fts.db")
+        self.manager = ErrorHistoryManager(db_path=self.db_path)
+        self.manager.save_errors([
+            ErrorRecord(error_id="A", error_type="TimeoutError", error_message="请求上游服务超时",
+                        severity=ErrorSeverity.HIGH, stack_trace="File net.py line 3"),
+            ErrorRecord(error_id="B", error_type="ValueError", error_message="timeout 参数非法",
+                        severity=ErrorSeverity.LOW, tags=["config"]),
+            ErrorRecord(error_id="C", error_type="KeyError", error_message="缺少配置项 theme",
+                        stack_trace="File config_manager.py line 88"),
+        ])
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def _ids(self, errors):
+        return [e.error_id for e in errors]
+
+    def test_ranked_search_and_filters(self):
+        # 错误类型列权重最高，排在仅消息命中的记录之前
+        self.assertEqual(self._ids(self.manager.search_errors("timeout")), ["A", "B"])
+        self.assertEqual(self._ids(self.manager.search_errors("上游服务")), ["A"])
+        self.assertEqual(self._ids(self.manager.search_errors("config_manager")), ["C"])
+        self.assertEqual(self._ids(self.manager.search_errors("timeout", {'severity': ErrorSeverity.LOW})), ["B"])
+        self.assertEqual(self._ids(self.manager.search_errors("timeout 非法")), ["B"])
+        # 少于 3 个字符的词回退到 LIKE
+        self.assertEqual(self._ids(self.manager.search_errors("超时")), ["A"])
+
+    def test_query_errors_text_filters_use_index(self):
+        self.assertEqual(self._ids(self.manager.query_errors(filters={'error_type': 'Value'})), ["B"])
+        self.assertEqual(self._ids(self.manager.query_errors(filters={'error_message': '配置项'})), ["C"])
+        self.assertEqual(sorted(self._ids(self.manager.query_errors(filters={'search': 'config'}))), ["B", "C"])
+
+    def test_index_follows_replace_update_and_delete(self):
+        self.manager.save_error(ErrorRecord(error_id="A", error_type="OSError", error_message="磁盘已满"))
+        self.assertEqual(self._ids(self.manager.search_errors("上游服务")), [])
+        self.assertEqual(self._ids(self.manager.search_errors("磁盘已满")), ["A"])
+
+        record = self.manager.get_error("B")
+        record.error_message = "端口被占用"
+        self.manager.update_error(record)
+        self.assertEqual(self._ids(self.manager.search_errors("端口被占用")), ["B"])
+
+        self.manager.delete_error("C")
+        self.assertEqual(self._ids(self.manager.search_errors("config_manager")), [])
+        with self.manager._get_connection() as conn:
+            conn.execute("INSERT INTO error_history_fts (error_history_fts) VALUES ('integrity-check')")
+
+    def test_existing_database_is_backfilled(self):
+        with self.manager._get_connection() as conn:
+            for trigger in ("error_history_fts_ai", "error_history_fts_ad", "error_history_fts_au"):
+                conn.execute(f"DROP TRIGGER {trigger}")
+            conn.execute("DROP TABLE error_history_fts")
+            conn.commit()
+        self.manager.shutdown()
+
+        self.manager = ErrorHistoryManager(db_path=self.db_path)
+        self.assertEqual(self._ids(self.manager.search_errors("上游服务")), ["A"])
+
+    def test_query_worker_routes_search(self):
+        from error_history.ui.query_panel import QueryWorker
+
+        results = []
+        worker = QueryWorker(self.manager, {'search': 'timeout', 'severity': ErrorSeverity.HIGH})
+        worker.finished.connect(results.append)
+        worker.run()
+        self.assertEqual(self._ids(results[0]), ["A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
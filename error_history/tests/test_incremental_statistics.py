@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord, ErrorSeverity, ErrorCategory
+
+
+class TestIncrementalDailyStatistics(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.manager = ErrorHistoryManager(db_path=str(Path(self._tmp.name) / "eh_stats.db"))
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def _save(self, error_id, severity=ErrorSeverity.LOW, category=ErrorCategory.UNKNOWN, module="core"):
+        rec = ErrorRecord(error_id=error_id, error_type="ValueError", error_message=error_id,
+                          severity=severity, category=category, module=module)
+        self.assertTrue(self.manager.save_error(rec))
+        return rec
+
+    def _day(self) -> date:
+        with self.manager._get_connection() as conn:
+            return date.fromisoformat(conn.execute("SELECT date(created_at) FROM error_history LIMIT 1").fetchone()[0])
+
+    def _snapshot(self, day):
+        stats = self.manager.get_daily_statistics(day)
+        return stats.to_dict()
+
+    def test_insert_replace_resolve_and_delete_apply_deltas(self):
+        self._save("E1", ErrorSeverity.HIGH, ErrorCategory.DATABASE)
+        self._save("E2", ErrorSeverity.LOW, ErrorCategory.NETWORK, module="net")
+        self._save("E3", ErrorSeverity.LOW, ErrorCategory.NETWORK, module=None)
+        # 相同 error_id 覆盖写入不应重复计数
+        self._save("E2", ErrorSeverity.CRITICAL, ErrorCategory.NETWORK, module="net")
+        day = self._day()
+
+        stats = self.manager.get_daily_statistics(day)
+        self.assertEqual(stats.total_errors, 3)
+        self.assertEqual(stats.errors_by_severity, {"HIGH": 1, "LOW": 1, "CRITICAL": 1})
+        self.assertEqual(stats.errors_by_category, {"DATABASE": 1, "NETWORK": 2})
+        self.assertEqual(stats.errors_by_module, {"core": 1, "net": 1})
+        self.assertEqual(stats.unresolved_errors, 3)
+
+        resolved = self.manager.get_error("E1")
+        resolved.resolved = True
+        resolved.resolution_time = 4.0
+        self.assertTrue(self.manager.update_error(resolved))
+        self.assertTrue(self.manager.delete_error("E3"))
+
+        stats = self.manager.get_daily_statistics(day)
+        self.assertEqual(stats.total_errors, 2)
+        self.assertEqual(stats.resolved_errors, 1)
+        self.assertEqual(stats.unresolved_errors, 1)
+        self.assertEqual(stats.avg_resolution_time, 4.0)
+        self.assertEqual(stats.errors_by_severity, {"HIGH": 1, "CRITICAL": 1})
+        self.assertEqual(stats.error_rate_per_hour, 2 / 24)
+
+        incremental = self._snapshot(day)
+        self.assertEqual(self.manager.rebuild_daily_statistics(), 1)
+        self.assertEqual(self._snapshot(day), incremental)
+
+    def test_rebuild_repairs_drifted_counters(self):
+        for i in range(5):
+            self._save(f"E{i}", ErrorSeverity.MEDIUM)
+        day = self._day()
+        with self.manager._get_connection() as conn:
+            conn.execute("UPDATE error_statistics_daily SET total_errors = 99")
+            conn.execute("DELETE FROM error_statistics_daily_counts")
+            conn.commit()
+
+        self.manager.rebuild_daily_statistics(start_date=day, end_date=day)
+        stats = self.manager.get_daily_statistics(day)
+        self.assertEqual(stats.total_errors, 5)
+        self.assertEqual(stats.errors_by_severity, {"MEDIUM": 5})
+
+    def test_missing_day_returns_empty_statistics(self):
+        stats = self.manager.get_daily_statistics(date(2000, 1, 1))
+        self.assertEqual(stats.total_errors, 0)
+        self.assertEqual(stats.errors_by_severity, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord, ErrorSeverity
+from error_history.ui.error_table_model import ErrorTableModel
+
+_app = QApplication.instance() or QApplication([])
+
+
+class TestKeysetPagination(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.manager = ErrorHistoryManager(db_path=str(Path(self._tmp.name) / "eh_keyset.db"))
+        severities = [ErrorSeverity.HIGH, ErrorSeverity.LOW]
+        self.manager.save_errors([
+            ErrorRecord(error_id=f"K{i:03d}", error_type="ValueError", error_message=f"m{i}",
+                        severity=severities[i % 2], context={"i": i})
+            for i in range(95)
+        ])
+        # 大量记录共享同一 created_at，游标必须以 id 作为次序键
+        with self.manager._get_connection() as conn:
+            conn.execute("UPDATE error_history SET created_at = '2026-01-01 00:00:00' WHERE id % 3 = 0")
+            conn.commit()
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def _walk(self, filters=None, page=10):
+        seen, after = [], None
+        while True:
+            rows = self.manager.query_errors_keyset(filters, ["error_id"], after=after, limit=page)
+            seen.extend(row[2] for row in rows)
+            if len(rows) < page:
+                return seen
+            after = (rows[-1][1], rows[-1][0])
+
+    def test_pages_have_no_gaps_or_overlaps(self):
+        ids = self._walk()
+        self.assertEqual(len(ids), 95)
+        self.assertEqual(len(set(ids)), 95)
+        expected = [e.error_id for e in self.manager.query_errors(limit=1000)]
+        self.assertEqual(sorted(ids), sorted(expected))
+
+        high = self._walk({'severity': ErrorSeverity.HIGH}, page=7)
+        self.assertEqual(len(high), 48)
+
+    def test_unknown_column_rejected(self):
+        with self.assertRaises(ValueError):
+            self.manager.query_errors_keyset(columns=["error_id; DROP TABLE error_history"])
+
+    def test_model_fetches_and_evicts_pages(self):
+        model = ErrorTableModel(self.manager, page_size=20, max_cached_pages=2)
+        model.set_query({}, "minimal")
+        self.assertEqual(model.rowCount(), 20)
+        self.assertEqual(model.columnCount(), 5)
+        self.assertTrue(model.canFetchMore())
+
+        while model.canFetchMore():
+            model.fetchMore()
+        self.assertEqual(model.rowCount(), 95)
+        self.assertLessEqual(len(model._pages), 2)
+
+        # 被淘汰的第一页按游标重新读取，内容不变
+        first = [model.error_id_at(row) for row in range(20)]
+        self.assertEqual(first, self._walk(page=20)[:20])
+        self.assertIn(model.data(model.index(0, 4)), ("已解决", "未解决"))
+
+    def test_model_shows_ranked_records(self):
+        model = ErrorTableModel(self.manager, page_size=20)
+        model.set_records(self.manager.query_errors(filters={'severity': ErrorSeverity.LOW}, limit=5))
+        self.assertEqual(model.rowCount(), 5)
+        self.assertFalse(model.canFetchMore())
+        self.assertEqual(model.data(model.index(0, 3)), "LOW")
+
+    def test_query_panel_emits_lazily_decoded_record(self):
+        from error_history.ui.query_panel import QueryPanel
+
+        panel = QueryPanel(self.manager)
+        panel.start_date_edit.setDate(panel.start_date_edit.date().addYears(-5))
+        panel._perform_query()
+        selected = []
+        panel.error_selected.connect(selected.append)
+        panel.results_table.selectRow(0)
+        self.assertEqual(selected[-1]['error_id'], panel.results_model.error_id_at(0))
+        self.assertIn('i', selected[-1]['context'])
+        panel.deleteLater()
+
+
+if __name__ == "__main__":
+    unittest.main()
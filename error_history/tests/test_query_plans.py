@@ -0,0 +1,106 @@
+import re
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord, ErrorSeverity, ErrorCategory
+
+TABLE_SCAN = re.compile(r"^SCAN (TABLE )?error_history$")
+HISTORY_ACCESS = re.compile(r"\berror_history\b")
+
+
+class TestErrorHistoryQueryPlans(unittest.TestCase):
+    """常用过滤条件不得退化为 error_history 全表扫描"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.manager = ErrorHistoryManager(db_path=str(Path(self._tmp.name) / "eh_plans.db"))
+        severities = list(ErrorSeverity)
+        records = [
+            ErrorRecord(error_id=f"P{i}", error_type="ValueError", error_message=f"m{i}",
+                        severity=severities[i % len(severities)], category=ErrorCategory.DATABASE,
+                        module=f"mod{i % 5}")
+            for i in range(200)
+        ]
+        self.assertEqual(self.manager.save_errors(records), 200)
+        self.today = date.today()
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def _captured_selects(self, action):
+        statements = []
+        with self.manager._get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                action()
+            finally:
+                conn.set_trace_callback(None)
+        return [sql for sql in statements
+                if sql.lstrip().upper().startswith("SELECT") and "FROM error_history" in sql]
+
+    def _assert_plans(self, action, require_search=True):
+        """require_search=True 时要求按索引定位（SEARCH），否则仅禁止无索引的全表扫描"""
+        selects = self._captured_selects(action)
+        self.assertTrue(selects)
+        with self.manager._get_connection() as conn:
+            for sql in selects:
+                details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+                accesses = [d for d in details if HISTORY_ACCESS.search(d)]
+                self.assertEqual([d for d in accesses if TABLE_SCAN.match(d)], [], f"全表扫描: {sql}\n{details}")
+                if require_search:
+                    self.assertTrue(accesses and all(d.startswith("SEARCH") for d in accesses),
+                                    f"未使用索引定位: {sql}\n{details}")
+
+    def test_unfiltered_listing_walks_index(self):
+        self._assert_plans(lambda: self.manager.query_errors(), require_search=False)
+
+    def test_query_filters_use_indexes(self):
+        week_ago = self.today - timedelta(days=7)
+        cases = [
+            {'start_date': week_ago, 'end_date': self.today},
+            {'severity': ErrorSeverity.HIGH},
+            {'severity': ErrorSeverity.HIGH, 'start_date': week_ago},
+            {'severity': [ErrorSeverity.HIGH, ErrorSeverity.LOW], 'start_date': week_ago},
+            {'category': ErrorCategory.DATABASE, 'start_date': week_ago, 'end_date': self.today},
+            {'module': 'mod1', 'end_date': self.today},
+            {'resolved': False, 'start_date': week_ago},
+            {'error_type': 'Value', 'start_date': week_ago},
+        ]
+        for filters in cases:
+            with self.subTest(filters=filters):
+                self._assert_plans(lambda: self.manager.query_errors(filters=filters))
+
+    def test_keyset_page_avoids_sort(self):
+        first = self.manager.query_errors_keyset(columns=["error_id"], limit=50)
+        after = (first[-1][1], first[-1][0])
+        selects = self._captured_selects(
+            lambda: self.manager.query_errors_keyset(columns=["error_id"], after=after, limit=50))
+        with self.manager._get_connection() as conn:
+            details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + selects[0])]
+        self.assertTrue(any(d.startswith("SEARCH error_history") for d in details), details)
+        self.assertFalse(any("TEMP B-TREE" in d for d in details), details)
+
+    def test_statistics_date_range_uses_indexes(self):
+        date_range = (self.today - timedelta(days=30), self.today)
+        self._assert_plans(lambda: self.manager.get_statistics(date_range=date_range))
+
+    def test_range_predicates_match_day_semantics(self):
+        # 原始文本可能是 'YYYY-MM-DD HH:MM:SS' 或 ISO 'T' 分隔格式，两者都应按日期命中
+        with self.manager._get_connection() as conn:
+            conn.execute("UPDATE error_history SET created_at = ? WHERE error_id = 'P0'",
+                         (datetime(2020, 5, 1, 23, 59, 59).isoformat(),))
+            conn.execute("UPDATE error_history SET created_at = '2020-05-02 00:00:00' WHERE error_id = 'P1'")
+            conn.commit()
+        day = date(2020, 5, 1)
+        hits = self.manager.query_errors(filters={'start_date': day, 'end_date': day})
+        self.assertEqual([e.error_id for e in hits], ["P0"])
+        stats = self.manager.get_statistics(date_range=(day, date(2020, 5, 2)))
+        self.assertEqual(stats['total_errors'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
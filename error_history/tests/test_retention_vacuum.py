@@ -0,0 +1,84 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord
+
+
+def _records(prefix, count):
+    return [ErrorRecord(error_id=f"{prefix}{i}", error_type="IOError", error_message="x" * 2000,
+                        stack_trace="frame\n" * 200, module="io")
+            for i in range(count)]
+
+
+class TestBatchedRetention(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name) / "eh_retention.db")
+        self.manager = ErrorHistoryManager(db_path=self.db_path)
+        # 逐条保留完整记录（指纹聚合另有测试）
+        self.manager.config.dedup_enabled = False
+        self.manager.config.cleanup_batch_size = 7
+        self.manager.save_errors(_records("OLD", 50) + _records("NEW", 5))
+        with self.manager._get_connection() as conn:
+            conn.execute("UPDATE error_history SET created_at = '2020-01-01 08:00:00' WHERE error_id LIKE 'OLD%'")
+        self.manager.rebuild_daily_statistics()
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def test_cleanup_deletes_in_short_batches(self):
+        statements = []
+        with self.manager._get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+        try:
+            self.assertEqual(self.manager.cleanup_old_errors(days=30), 50)
+        finally:
+            with self.manager._get_connection() as conn:
+                conn.set_trace_callback(None)
+
+        deletes = [sql for sql in statements if sql.startswith("DELETE FROM error_history WHERE id IN")]
+        self.assertEqual(len(set(deletes)), 8)
+        self.assertGreaterEqual(sum(1 for sql in statements if sql == "COMMIT"), 8)
+
+        self.assertEqual(self.manager.get_database_info()['table_counts']['error_history'], 5)
+        self.assertEqual(self.manager.get_rollup_statistics()['total_errors'], 5)
+        self.assertEqual(len(self.manager.search_errors("IOError", limit=100)), 5)
+
+    def test_freed_pages_are_returned_incrementally(self):
+        info = self.manager.get_database_info()
+        self.assertTrue(info['incremental_vacuum'])
+        self.manager.cleanup_old_errors(days=30)
+
+        free_pages = self.manager.get_database_info()['free_pages']
+        self.assertGreater(free_pages, 10)
+        self.assertEqual(self.manager.incremental_vacuum(pages=10), 10)
+        self.assertEqual(self.manager.get_database_info()['free_pages'], free_pages - 10)
+        self.assertTrue(self.manager.optimize_database())
+        self.assertEqual(self.manager.get_database_info()['free_pages'], 0)
+
+
+class TestLegacyDatabaseConversion(unittest.TestCase):
+    def test_optimize_converts_legacy_database_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp) / "legacy.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("CREATE TABLE legacy_marker (x)")
+            conn.commit()
+            conn.close()
+
+            manager = ErrorHistoryManager(db_path=db_path)
+            try:
+                self.assertFalse(manager.get_database_info()['incremental_vacuum'])
+                self.assertTrue(manager.optimize_database())
+                self.assertTrue(manager.get_database_info()['incremental_vacuum'])
+            finally:
+                manager.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
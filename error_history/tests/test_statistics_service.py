@@ -0,0 +1,114 @@
+import tempfile
+import threading
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord, ErrorSeverity, ErrorCategory
+
+
+class TestStatisticsService(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name) / "eh_rollup.db")
+        self.manager = ErrorHistoryManager(db_path=self.db_path)
+        severities = list(ErrorSeverity)
+        categories = [ErrorCategory.DATABASE, ErrorCategory.NETWORK]
+        self.manager.save_errors([
+            ErrorRecord(error_id=f"R{i}", error_type="ValueError", error_message=f"m{i}",
+                        severity=severities[i % 4], category=categories[i % 2],
+                        module=f"mod{i % 3}" if i % 5 else None)
+            for i in range(60)
+        ])
+        record = self.manager.get_error("R7")
+        record.resolved = True
+        record.resolution_time = 12.5
+        self.manager.update_error(record)
+        self.manager.delete_error("R8")
+        self.today = date.today()
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def _assert_matches_scan(self, date_range=None):
+        expected = self.manager.get_statistics(date_range)
+        actual = self.manager.get_rollup_statistics(date_range)
+        for key in ('total_errors', 'resolved_errors', 'unresolved_errors', 'avg_resolution_time',
+                    'errors_by_severity', 'errors_by_category', 'errors_by_module', 'date_range'):
+            self.assertEqual(actual[key], expected[key], key)
+        self.assertAlmostEqual(actual['error_rate_per_hour'], expected['error_rate_per_hour'])
+
+    def test_rollups_match_full_scan(self):
+        self._assert_matches_scan()
+        self._assert_matches_scan((self.today - timedelta(days=7), self.today))
+        self._assert_matches_scan((self.today + timedelta(days=1), self.today + timedelta(days=2)))
+
+    def test_rollup_reads_do_not_touch_history_table(self):
+        statements = []
+        with self.manager._get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                self.manager.get_rollup_statistics()
+                self.manager.get_rollup_statistics((self.today, self.today))
+            finally:
+                conn.set_trace_callback(None)
+        self.assertTrue(statements)
+        self.assertFalse([sql for sql in statements if "error_history " in sql or "error_history\n" in sql])
+
+    def test_memo_is_shared_and_invalidated_by_writes(self):
+        service = self.manager.get_statistics_service()
+        self.assertIs(service, self.manager.get_statistics_service())
+
+        first = service.get_statistics()
+        self.assertEqual(service.get_statistics(), first)
+        self.assertEqual(service.get_cache_stats()['hits'], 1)
+
+        self.manager.save_error(ErrorRecord(error_id="NEW", error_type="OSError", error_message="x"))
+        self.assertEqual(service.get_statistics()['total_errors'], first['total_errors'] + 1)
+
+        service.ttl = 0
+        service.get_statistics()
+        self.assertEqual(service.get_cache_stats()['hits'], 1)
+
+    def test_read_between_delta_and_commit_is_not_cached_as_current(self):
+        service = self.manager.get_statistics_service()
+        before = service.get_statistics()['total_errors']
+        apply_delta = self.manager._apply_statistics_delta
+        seen = []
+
+        def apply_then_read(conn, *args, **kwargs):
+            changed = apply_delta(conn, *args, **kwargs)
+            # 另一线程在提交前通过读连接读取统计（写入队列与仪表盘并发时的情形）
+            reader = threading.Thread(target=lambda: seen.append(service.get_statistics()['total_errors']))
+            reader.start()
+            reader.join()
+            return changed
+
+        self.manager._apply_statistics_delta = apply_then_read
+        try:
+            self.manager.save_error(ErrorRecord(error_id="MID", error_type="OSError", error_message="x"))
+        finally:
+            del self.manager._apply_statistics_delta
+
+        self.assertEqual(seen, [before])
+        self.assertEqual(service.get_statistics()['total_errors'], before + 1)
+        self.assertEqual(service.get_statistics()['total_errors'],
+                         self.manager.get_statistics()['total_errors'])
+
+    def test_hourly_rollup_is_backfilled_for_existing_database(self):
+        with self.manager._get_connection() as conn:
+            conn.execute("DELETE FROM error_statistics_hourly")
+            conn.commit()
+        self.manager.shutdown()
+
+        self.manager = ErrorHistoryManager(db_path=self.db_path)
+        with self.manager._get_connection() as conn:
+            hourly_total = conn.execute("SELECT SUM(total_errors) FROM error_statistics_hourly").fetchone()[0]
+        self.assertEqual(hourly_total, 59)
+        self._assert_matches_scan()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from error_history.core.exporter import ErrorHistoryExporter, ExportCancelled
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord, ErrorSeverity
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+
+class TestStreamingExport(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.manager = ErrorHistoryManager(db_path=str(self.dir / "eh_export.db"))
+        # 逐条保留完整记录（指纹聚合另有测试）
+        self.manager.config.dedup_enabled = False
+        self.manager.save_errors([
+            ErrorRecord(error_id=f"X{i}", error_type="ValueError", error_message=f"消息 {i}, \"quoted\"",
+                        severity=ErrorSeverity.HIGH if i % 2 else ErrorSeverity.LOW, context={"i": i})
+            for i in range(120)
+        ])
+        self.exporter = ErrorHistoryExporter(self.manager, chunk_size=25)
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def test_json_document_and_progress(self):
+        path = self.dir / "out.json"
+        progress = []
+        count = self.exporter.export(str(path), 'json', progress_callback=lambda d, t: progress.append((d, t)))
+        self.assertEqual(count, 120)
+        data = json.loads(path.read_text(encoding='utf-8'))
+        self.assertEqual(data['export_info']['total_records'], 120)
+        self.assertEqual(len({e['error_id'] for e in data['errors']}), 120)
+        self.assertEqual(json.loads(data['errors'][0]['context'])['i'], 119)
+        self.assertEqual(progress, [(25, 120), (50, 120), (75, 120), (100, 120), (120, 120)])
+
+    def test_gzip_ndjson_and_csv_with_filters(self):
+        path = self.dir / "out.ndjson.gz"
+        self.assertEqual(self.exporter.export(str(path), 'ndjson', {'severity': ErrorSeverity.HIGH}), 60)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 60)
+        self.assertTrue(all(line['severity'] == 'HIGH' for line in lines))
+
+        path = self.dir / "out.csv"
+        self.assertEqual(self.exporter.export(str(path), 'csv', limit=30), 30)
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][0], 'error_id')
+        self.assertEqual(len(rows), 31)
+        self.assertEqual(rows[1][2], '消息 119, "quoted"')
+
+    def test_cancel_leaves_no_partial_file(self):
+        cancel = threading.Event()
+        path = self.dir / "out.json"
+        with self.assertRaises(ExportCancelled):
+            self.exporter.export(str(path), 'json', progress_callback=lambda d, t: cancel.set(),
+                                 cancel_event=cancel)
+        self.assertEqual([name for name in os.listdir(self.dir) if not name.startswith("eh_export.db")], [])
+        self.assertFalse(self.manager.export_data(str(path), 'json', cancel_event=cancel))
+        self.assertFalse(path.exists())
+
+    def test_chunks_are_bounded(self):
+        with self.manager._get_connection(readonly=True) as conn:
+            sizes = [len(chunk) for chunk in self.manager._iter_error_chunks(conn, chunk_size=50)]
+        self.assertEqual(sizes, [50, 50, 20])
+
+    def test_export_data_rejects_empty_selection(self):
+        path = self.dir / "empty.csv"
+        self.assertFalse(self.manager.export_data(str(path), 'csv', {'module': 'nothing'}))
+        self.assertFalse(path.exists())
+        self.assertTrue(self.manager.export_data(str(path), 'csv'))
+
+    @unittest.skipUnless(OPENPYXL_AVAILABLE, "需要 openpyxl")
+    def test_xlsx_write_only(self):
+        path = self.dir / "out.xlsx"
+        self.assertEqual(self.exporter.export(str(path), 'xlsx'), 120)
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        try:
+            self.assertEqual(sum(1 for _ in workbook["错误历史"].iter_rows()), 121)
+        finally:
+            workbook.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from error_history.core.manager import ErrorHistoryManager
+from error_history.core.models import ErrorRecord, ErrorSeverity
+from error_history.core.write_queue import ErrorWriteQueue
+
+
+def _record(i):
+    return ErrorRecord(error_id=f"Q{i}", error_type="RuntimeError", error_message=f"storm {i}",
+                       severity=ErrorSeverity.HIGH, module="storm")
+
+
+class TestErrorWriteQueue(unittest.TestCase):
+    def test_batches_respect_size_and_overflow_is_counted(self):
+        gate = threading.Event()
+        batches = []
+
+        def writer(batch):
+            gate.wait(5)
+            batches.append(len(batch))
+            return len(batch)
+
+        queue = ErrorWriteQueue(writer, capacity=10, batch_size=4, flush_interval_ms=20)
+        accepted = sum(queue.put(_record(i)) for i in range(30))
+        # 写入线程被阻塞时最多容纳 capacity 条（外加已取出的一批）
+        self.assertLess(accepted, 30)
+        self.assertEqual(queue.get_stats()['dropped'], 30 - accepted)
+
+        gate.set()
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertTrue(queue.shutdown())
+        stats = queue.get_stats()
+        self.assertEqual(stats['written'], accepted)
+        self.assertEqual(sum(batches), accepted)
+        self.assertTrue(all(size <= 4 for size in batches))
+        self.assertFalse(queue.put(_record(99)))
+
+    def test_partial_batch_is_written_after_interval(self):
+        written = threading.Event()
+        queue = ErrorWriteQueue(lambda batch: written.set() or len(batch), batch_size=1000, flush_interval_ms=30)
+        started = time.monotonic()
+        queue.put(_record(1))
+        self.assertTrue(written.wait(5))
+        self.assertGreaterEqual(time.monotonic() - started, 0.02)
+        queue.shutdown()
+
+
+class TestManagerWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name) / "eh_queue.db")
+        self.manager = ErrorHistoryManager(db_path=self.db_path)
+        # 逐条保留完整记录（指纹聚合另有测试）
+        self.manager.config.dedup_enabled = False
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self._tmp.cleanup()
+
+    def test_shutdown_flushes_pending_records(self):
+        for i in range(450):
+            self.assertTrue(self.manager.enqueue_error(_record(i)))
+        # 重复 error_id 覆盖写入，不应重复计数
+        self.manager.enqueue_error(_record(0))
+        self.manager.shutdown()
+        stats = self.manager.get_write_queue_stats()
+        self.assertEqual(stats['written'], 451)
+        self.assertEqual(stats['dropped'], 0)
+
+        reopened = ErrorHistoryManager(db_path=self.db_path)
+        try:
+            self.assertEqual(reopened.get_database_info()['table_counts']['error_history'], 450)
+            self.assertEqual(reopened.get_statistics()['errors_by_module'], {"storm": 450})
+            with reopened._get_connection() as conn:
+                total = conn.execute("SELECT SUM(total_errors) FROM error_statistics_daily").fetchone()[0]
+            self.assertEqual(total, 450)
+        finally:
+            reopened.shutdown()
+
+    def test_flush_makes_records_queryable(self):
+        self.manager.enqueue_error(_record(1))
+        self.assertTrue(self.manager.flush_write_queue(timeout=5))
+        self.assertIsNotNone(self.manager.get_error("Q1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -305,7 +305,7 @@ class AnalysisPanel(QWidget):
         """分析错误模式"""
         try:
             # 获取统计数据
-            stats = self.manager.get_statistics(date_range)
+            stats = self.manager.get_statistics_service().get_statistics(date_range)
 
             if not stats:
                 self.results_text.setPlainText("暂无数据进行模式分析")
@@ -0,0 +1,219 @@
+# error_history/ui/error_table_model.py
+"""
+错误历史持久化子系统 - 查询结果表格模型（游标分页 + 页缓存）
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from ..core.manager import ErrorHistoryManager
+
+# 各视图显示的列：(数据库列, 表头)
+VIEW_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "standard": [
+        ("error_id", "错误ID"), ("error_type", "错误类型"), ("error_message", "错误消息"),
+        ("severity", "严重程度"), ("category", "分类"), ("module", "模块"),
+        ("created_at", "创建时间"), ("resolved", "解决状态"),
+    ],
+    "detailed": [
+        ("error_id", "错误ID"), ("error_type", "错误类型"), ("error_message", "错误消息"),
+        ("severity", "严重程度"), ("category", "分类"), ("module", "模块"),
+        ("function", "函数"), ("line_number", "行号"), ("created_at", "创建时间"),
+        ("resolved", "解决状态"), ("resolved_at", "解决时间"), ("retry_count", "重试次数"),
+    ],
+    "minimal": [
+        ("error_id", "错误ID"), ("error_message", "错误消息"), ("severity", "严重程度"),
+        ("created_at", "创建时间"), ("resolved", "解决状态"),
+    ],
+}
+
+# 每行固定前缀列：(id, created_at, error_id)，之后为视图列
+_KEY_COLUMNS = 3
+
+
+class ErrorTableModel(QAbstractTableModel):
+    """错误记录表格模型
+
+    - 普通查询：按 (created_at, id) 游标分页，通过 canFetchMore/fetchMore 随滚动加载；
+      只读取当前视图的列，JSON 字段留待选中行时再由 get_error 解码
+    - 已加载的页放在 LRU 缓存中（最多 max_cached_pages 页），被淘汰的页按记录的
+      页起始游标重新读取，因此内存占用与历史总量无关
+    - 全文检索：结果按相关度排序且数量有限，直接持有 ErrorRecord 列表
+    """
+
+    def __init__(self, manager: ErrorHistoryManager, page_size: int = 200,
+                 max_cached_pages: int = 20, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.page_size = page_size
+        self.max_cached_pages = max(1, max_cached_pages)
+
+        self._view = "standard"
+        self._filters: Dict[str, Any] = {}
+        self._records: Optional[List[Any]] = None
+        self._row_count = 0
+        self._page_cursors: List[Optional[Tuple[str, int]]] = [None]
+        self._pages: "OrderedDict[int, List[Tuple]]" = OrderedDict()
+        self._exhausted = True
+
+    # ================ 查询设置 ================
+
+    @property
+    def view(self) -> str:
+        return self._view
+
+    @property
+    def columns(self) -> List[Tuple[str, str]]:
+        return VIEW_COLUMNS.get(self._view, VIEW_COLUMNS["minimal"])
+
+    def set_query(self, filters: Dict[str, Any], view: str = None):
+        """以游标分页方式加载查询结果（仅读取第一页）"""
+        self.beginResetModel()
+        self._filters = dict(filters or {})
+        self._records = None
+        if view:
+            self._view = view
+        self._reset_pages()
+        rows = self._fetch_next_page()
+        if rows:
+            self._append_page(rows)
+        self.endResetModel()
+
+    def set_records(self, records: List[Any], view: str = None):
+        """显示已排序的完整结果集（全文检索结果）"""
+        self.beginResetModel()
+        self._records = list(records)
+        if view:
+            self._view = view
+        self._reset_pages()
+        self._row_count = len(self._records)
+        self._exhausted = True
+        self.endResetModel()
+
+    def set_view(self, view: str):
+        """切换视图：检索结果直接重绘，分页查询按新列重新读取"""
+        if self._records is not None:
+            self.set_records(self._records, view)
+        else:
+            self.set_query(self._filters, view)
+
+    def loaded_rows(self) -> int:
+        return self._row_count
+
+    def error_id_at(self, row: int) -> Optional[str]:
+        if self._records is not None:
+            return self._records[row].error_id if 0 <= row < len(self._records) else None
+        values = self._row(row)
+        return values[2] if values else None
+
+    def _reset_pages(self):
+        self._row_count = 0
+        self._page_cursors = [None]
+        self._pages.clear()
+        self._exhausted = False
+
+    # ================ 分页读取 ================
+
+    def _query_page(self, after: Optional[Tuple[str, int]]) -> List[Tuple]:
+        columns = ["error_id"] + [column for column, _ in self.columns]
+        return self.manager.query_errors_keyset(self._filters, columns, after=after, limit=self.page_size)
+
+    def _fetch_next_page(self) -> List[Tuple]:
+        """读取下一页（从最后一个页游标开始），不足一页即视为已读完"""
+        rows = self._query_page(self._page_cursors[-1])
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        return rows
+
+    def _append_page(self, rows: List[Tuple]):
+        self._cache_page(len(self._page_cursors) - 1, rows)
+        self._page_cursors.append((rows[-1][1], rows[-1][0]))
+        self._row_count += len(rows)
+
+    def _cache_page(self, page_index: int, rows: List[Tuple]):
+        self._pages[page_index] = rows
+        self._pages.move_to_end(page_index)
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+
+    def _row(self, row: int) -> Optional[Tuple]:
+        if not 0 <= row < self._row_count:
+            return None
+        page_index, offset = divmod(row, self.page_size)
+        rows = self._pages.get(page_index)
+        if rows is None:
+            rows = self._query_page(self._page_cursors[page_index])
+            self._cache_page(page_index, rows)
+        else:
+            self._pages.move_to_end(page_index)
+        # 期间若有记录被删除，重新读取的页可能变短
+        return rows[offset] if offset < len(rows) else None
+
+    # ================ QAbstractTableModel ================
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self.columns):
+            return self.columns[section][1]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._records is None and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        rows = self._fetch_next_page()
+        if not rows:
+            return
+        first = self._row_count
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._append_page(rows)
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.UserRole):
+            return None
+        column = self.columns[index.column()][0]
+
+        if self._records is not None:
+            if not 0 <= index.row() < len(self._records):
+                return None
+            record = self._records[index.row()]
+            if role == Qt.UserRole:
+                return record.error_id
+            value = getattr(record, column, None)
+        else:
+            values = self._row(index.row())
+            if values is None:
+                return None
+            if role == Qt.UserRole:
+                return values[2]
+            value = values[_KEY_COLUMNS + index.column()]
+
+        return self._format(column, value)
+
+    def _format(self, column: str, value: Any) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, Enum):
+            value = value.value
+        if column == "resolved":
+            return "已解决" if value else "未解决"
+        if column in ("created_at", "resolved_at"):
+            if isinstance(value, datetime):
+                return value.strftime("%Y-%m-%d %H:%M:%S")
+            return str(value).replace("T", " ")[:19]
+        if column == "error_message":
+            limit = 150 if self._view == "minimal" else 100
+            return value[:limit] + "..." if len(value) > limit else value
+        return str(value)
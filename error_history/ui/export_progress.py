@@ -0,0 +1,42 @@
+# error_history/ui/export_progress.py
+"""
+错误历史持久化子系统 - 带进度与取消的导出
+"""
+
+import threading
+from typing import Any, Dict
+
+from PyQt5.QtWidgets import QApplication, QProgressDialog
+from PyQt5.QtCore import Qt
+
+from ..core.manager import ErrorHistoryManager
+
+
+def export_with_progress(parent, manager: ErrorHistoryManager, file_path: str,
+                         format_type: str, filters: Dict[str, Any] = None) -> bool:
+    """
+    执行流式导出并显示可取消的进度对话框
+
+    Returns:
+        bool: 导出是否成功（取消时返回 False）
+    """
+    dialog = QProgressDialog("正在导出错误历史数据...", "取消", 0, 0, parent)
+    dialog.setWindowTitle("导出数据")
+    dialog.setWindowModality(Qt.WindowModal)
+    dialog.setMinimumDuration(500)
+    cancel_event = threading.Event()
+    dialog.canceled.connect(cancel_event.set)
+
+    def on_progress(done: int, total: int):
+        if total and dialog.maximum() != total:
+            dialog.setMaximum(total)
+        dialog.setValue(min(done, total) if total else 0)
+        dialog.setLabelText(f"正在导出错误历史数据... {done}/{total}")
+        QApplication.processEvents()
+
+    try:
+        return manager.export_data(file_path, format_type, filters,
+                                   progress_callback=on_progress, cancel_event=cancel_event)
+    finally:
+        dialog.close()
+        dialog.deleteLater()
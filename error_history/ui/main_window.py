@@ -24,6 +24,7 @@ from .query_panel import QueryPanel
 from .stats_panel import StatsPanel
 from .analysis_panel import AnalysisPanel
 from .management_panel import ManagementPanel
+from .export_progress import export_with_progress
 
 logger = logging.getLogger(__name__)
 
@@ -504,10 +505,13 @@ class ErrorHistoryMainWindow(QMainWindow):
             from PyQt5.QtWidgets import QFileDialog
 
             # 获取导出格式
-            formats = ["JSON (*.json)", "CSV (*.csv)", "Excel (*.xlsx)"]
+            # 文件名以 .gz 结尾时按 gzip 压缩写出（xlsx 除外）
+            formats = ["JSON (*.json *.json.gz)", "NDJSON (*.ndjson *.ndjson.gz)",
+                       "CSV (*.csv *.csv.gz)", "Excel (*.xlsx)"]
             format_map = {
-                "JSON (*.json)": "json",
-                "CSV (*.csv)": "csv",
+                "JSON (*.json *.json.gz)": "json",
+                "NDJSON (*.ndjson *.ndjson.gz)": "ndjson",
+                "CSV (*.csv *.csv.gz)": "csv",
                 "Excel (*.xlsx)": "xlsx"
             }
 
@@ -527,7 +531,7 @@ class ErrorHistoryMainWindow(QMainWindow):
                     filters = current_widget.get_current_filters()
 
                 # 执行导出
-                if self.manager.export_data(filename, format_type, filters):
+                if export_with_progress(self, self.manager, filename, format_type, filters):
                     QMessageBox.information(self, "导出成功",
                                           f"数据已导出到:\n{filename}")
                 else:
@@ -553,7 +557,7 @@ class ErrorHistoryMainWindow(QMainWindow):
                 return
 
             # 获取统计信息
-            stats = self.manager.get_statistics()
+            stats = self.manager.get_statistics_service().get_statistics()
 
             if stats:
                 total = stats.get('total_errors', 0)
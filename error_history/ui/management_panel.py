@@ -16,6 +16,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 
 from ..core.manager import ErrorHistoryManager
+from .export_progress import export_with_progress
 
 
 class ManagementPanel(QWidget):
@@ -164,6 +165,7 @@ class ManagementPanel(QWidget):
         data_btn_layout.addWidget(QLabel("导出格式:"))
         self.export_format_combo = QComboBox()
         self.export_format_combo.addItem("JSON", "json")
+        self.export_format_combo.addItem("NDJSON", "ndjson")
         self.export_format_combo.addItem("CSV", "csv")
         self.export_format_combo.addItem("Excel", "xlsx")
         self.export_format_combo.setMinimumHeight(26)
@@ -428,7 +430,8 @@ class ManagementPanel(QWidget):
             filename, _ = QFileDialog.getSaveFileName(
                 self, "导出错误历史数据",
                 f"error_history_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                "JSON (*.json);;CSV (*.csv);;Excel (*.xlsx);;所有文件 (*)"
+                "JSON (*.json *.json.gz);;NDJSON (*.ndjson *.ndjson.gz);;CSV (*.csv *.csv.gz);;"
+                "Excel (*.xlsx);;所有文件 (*)"
             )
 
             if filename:
@@ -437,7 +440,7 @@ class ManagementPanel(QWidget):
                 # 这里可以传递一些过滤条件
                 filters = {}
 
-                success = self.manager.export_data(filename, format_type, filters)
+                success = export_with_progress(self, self.manager, filename, format_type, filters)
 
                 if success:
                     QMessageBox.information(self, "导出完成",
@@ -496,6 +499,13 @@ class ManagementPanel(QWidget):
                         info_lines.append(f"    {table}: {count}")
 
                 info_lines.append(f"  连接池大小: {db_info.get('connection_pool_size', 0)}")
+                pool = db_info.get('connection_pool') or {}
+                if pool:
+                    info_lines.append(
+                        f"  读连接: {pool.get('readers_in_use', 0)}/{pool.get('max_readers', 0)} 使用中"
+                        f"（峰值 {pool.get('peak_in_use', 0)}），平均等待 {pool.get('avg_wait_ms', 0.0):.2f} ms，"
+                        f"超时 {pool.get('timeouts', 0)} 次"
+                    )
 
                 self.db_info_text.setPlainText("\n".join(info_lines))
             else:
@@ -507,7 +517,7 @@ class ManagementPanel(QWidget):
     def _refresh_system_status(self):
         """刷新系统状态"""
         try:
-            stats = self.manager.get_statistics()
+            stats = self.manager.get_statistics_service().get_statistics()
 
             if stats:
                 status_lines = []
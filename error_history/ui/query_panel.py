@@ -7,7 +7,7 @@ from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Any
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QTableWidget, QTableWidgetItem, QHeaderView,
+    QTableView, QAbstractItemView, QHeaderView,
     QPushButton, QLabel, QComboBox, QLineEdit,
     QDateEdit, QGroupBox, QCheckBox, QProgressBar,
     QSplitter, QFrame, QScrollArea, QMessageBox, QSizePolicy
@@ -17,6 +17,7 @@ from PyQt5.QtGui import QFont, QColor
 
 from ..core.manager import ErrorHistoryManager
 from ..core.models import ErrorSeverity, ErrorCategory
+from .error_table_model import ErrorTableModel
 
 
 class QueryWorker(QThread):
@@ -31,7 +32,13 @@ class QueryWorker(QThread):
 
     def run(self):
         try:
-            errors = self.manager.query_errors(filters=self.filters, limit=1000)
+            filters = dict(self.filters)
+            search_text = filters.pop('search', None)
+            if search_text:
+                # 全文检索：按相关度排序
+                errors = self.manager.search_errors(search_text, filters, limit=1000)
+            else:
+                errors = self.manager.query_errors(filters=filters, limit=1000)
             self.finished.emit(errors)
         except Exception as e:
             self.error.emit(str(e))
@@ -47,7 +54,7 @@ class QueryPanel(QWidget):
     def __init__(self, manager: ErrorHistoryManager, parent=None):
         super().__init__(parent)
         self.manager = manager
-        self.current_errors = []
+        self.results_model = ErrorTableModel(manager, page_size=100)
         self.query_worker = None
 
         self._init_ui()
@@ -70,7 +77,7 @@ class QueryPanel(QWidget):
         try:
             content.setStyleSheet(
                 "QLabel, QLineEdit, QComboBox, QDateEdit, QPushButton, QCheckBox { font-size: 9pt; }"
-                " QTableWidget, QHeaderView::section { font-size: 8pt; }"
+                " QTableView, QHeaderView::section { font-size: 8pt; }"
             )
         except Exception:
             pass
@@ -142,7 +149,15 @@ class QueryPanel(QWidget):
         self.error_type_edit = QLineEdit()
         self.error_type_edit.setPlaceholderText("输入错误类型关键字")
         self.error_type_edit.setMinimumHeight(26)
-        filter_layout.addWidget(self.error_type_edit, 3, 1, 1, 3)
+        filter_layout.addWidget(self.error_type_edit, 3, 1)
+
+        # 全文搜索（错误类型/消息/堆栈/标签）
+        filter_layout.addWidget(QLabel("全文搜索:"), 3, 2)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索消息、堆栈或标签")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setMinimumHeight(26)
+        filter_layout.addWidget(self.search_edit, 3, 3)
 
         # 解决状态
         filter_layout.addWidget(QLabel("解决状态:"), 4, 0)
@@ -184,7 +199,7 @@ class QueryPanel(QWidget):
         header_layout = QHBoxLayout()
         header_layout.addWidget(QLabel("查询结果"))
 
-        self.results_count_label = QLabel("共 0 条记录")
+        self.results_count_label = QLabel("已加载 0 条记录")
         header_layout.addWidget(self.results_count_label)
 
         header_layout.addStretch()
@@ -200,10 +215,13 @@ class QueryPanel(QWidget):
         table_layout.addLayout(header_layout)
 
         # 创建表格
-        self.results_table = QTableWidget()
+        # 表格模型按 (created_at, id) 游标分页，滚动到底部时自动 fetchMore
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.setAlternatingRowColors(True)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.results_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.results_table.setMinimumHeight(110)
         self.results_table.setMaximumHeight(130)
         self.results_table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -220,45 +238,12 @@ class QueryPanel(QWidget):
         self._setup_table_columns()
 
     def _setup_table_columns(self, view_type: Optional[str] = None):
-        """根据当前选择设置表头与列数"""
+        """设置表头样式；列定义由表格模型按视图提供"""
         try:
-            # 优先使用传入的类型，否则取当前下拉框的 data
-            vt = view_type
-            if not vt:
-                vt = self.columns_combo.currentData() or "standard"
-
-            try:
-                header = self.results_table.horizontalHeader()
-                header.setSectionResizeMode(QHeaderView.Stretch)
-                header.setMinimumSectionSize(30)
-                header.setDefaultSectionSize(80)
-            except Exception:
-                pass
-
-            if vt == "standard":
-                headers = [
-                    "错误ID", "错误类型", "错误消息", "严重程度",
-                    "分类", "模块", "创建时间", "解决状态"
-                ]
-                self.results_table.setColumnCount(len(headers))
-                self.results_table.setHorizontalHeaderLabels(headers)
-            elif vt == "detailed":
-                headers = [
-                    "错误ID", "错误类型", "错误消息", "严重程度", "分类",
-                    "模块", "函数", "行号", "创建时间", "解决状态",
-                    "解决时间", "重试次数"
-                ]
-                self.results_table.setColumnCount(len(headers))
-                self.results_table.setHorizontalHeaderLabels(headers)
-            elif vt == "minimal":
-                headers = ["错误ID", "错误消息", "严重程度", "创建时间", "解决状态"]
-                self.results_table.setColumnCount(len(headers))
-                self.results_table.setHorizontalHeaderLabels(headers)
-            else:
-                # fallback
-                headers = ["错误ID", "错误消息", "严重程度", "创建时间", "解决状态"]
-                self.results_table.setColumnCount(len(headers))
-                self.results_table.setHorizontalHeaderLabels(headers)
+            header = self.results_table.horizontalHeader()
+            header.setSectionResizeMode(QHeaderView.Stretch)
+            header.setMinimumSectionSize(30)
+            header.setDefaultSectionSize(80)
         except Exception:
             pass
 
@@ -315,11 +300,18 @@ class QueryPanel(QWidget):
         # 清空按钮
         self.clear_btn.clicked.connect(self._clear_filters)
 
+        # 搜索框回车直接查询
+        self.search_edit.returnPressed.connect(self._perform_query)
+
         # 刷新按钮
         self.refresh_btn.clicked.connect(self.refresh_data)
 
         # 表格选择变化
-        self.results_table.itemSelectionChanged.connect(self._on_table_selection_changed)
+        self.results_table.selectionModel().selectionChanged.connect(self._on_table_selection_changed)
+
+        # 滚动加载后更新计数与页码
+        self.results_model.rowsInserted.connect(self._update_pagination)
+        self.results_table.verticalScrollBar().valueChanged.connect(self._update_pagination)
 
         # 视图切换
         self.columns_combo.currentTextChanged.connect(self._on_view_changed)
@@ -340,11 +332,18 @@ class QueryPanel(QWidget):
             # 收集查询条件
             filters = self._collect_filters()
 
+            if 'search' not in filters:
+                # 普通查询：模型只同步读取第一页，其余随滚动按游标加载
+                self.results_model.page_size = self._page_size()
+                self.results_model.set_query(filters, self._view_type())
+                self._on_results_changed()
+                return
+
             # 显示进度
             self.query_btn.setEnabled(False)
             self.query_btn.setText("查询中...")
 
-            # 启动查询线程
+            # 全文检索结果需要排序，放到工作线程执行
             self.query_worker = QueryWorker(self.manager, filters)
             self.query_worker.finished.connect(self._on_query_finished)
             self.query_worker.error.connect(self._on_query_error)
@@ -354,6 +353,12 @@ class QueryPanel(QWidget):
             QMessageBox.warning(self, "查询失败", f"执行查询失败:\n{str(e)}")
             self._reset_query_button()
 
+    def _view_type(self) -> str:
+        return self.columns_combo.currentData() or "standard"
+
+    def _page_size(self) -> int:
+        return self.page_size_combo.currentData() or 100
+
     def _collect_filters(self) -> Dict[str, Any]:
         """收集查询过滤条件"""
         filters = {}
@@ -389,22 +394,32 @@ class QueryPanel(QWidget):
         if resolved_data is not None:
             filters['resolved'] = resolved_data
 
+        # 全文搜索
+        search_text = self.search_edit.text().strip()
+        if search_text:
+            filters['search'] = search_text
+
         return filters
 
     def _on_query_finished(self, errors: List):
         """查询完成处理"""
         try:
-            self.current_errors = errors
-            self._display_results(errors)
-            self._update_pagination()
+            self.results_model.set_records(errors, self._view_type())
             self._reset_query_button()
-
-            # 发送数据变更信号
-            self.data_changed.emit()
+            self._on_results_changed()
 
         except Exception as e:
             QMessageBox.warning(self, "显示结果失败", f"显示查询结果失败:\n{str(e)}")
 
+    def _on_results_changed(self):
+        """结果集被替换后的处理"""
+        self._setup_table_columns()
+        self._update_pagination()
+        self.error_selected.emit({})
+
+        # 发送数据变更信号
+        self.data_changed.emit()
+
     def _on_query_error(self, error_msg: str):
         """查询错误处理"""
         QMessageBox.critical(self, "查询失败", f"查询执行失败:\n{error_msg}")
@@ -415,106 +430,42 @@ class QueryPanel(QWidget):
         self.query_btn.setEnabled(True)
         self.query_btn.setText("查询(&Q)")
 
-    def _display_results(self, errors: List):
-        """显示查询结果"""
-        view_type = self.columns_combo.currentData() or "standard"
-
-        self.results_table.setRowCount(len(errors))
-
-        for row, error in enumerate(errors):
-            if view_type == "standard":
-                self._display_standard_row(row, error)
-            elif view_type == "detailed":
-                self._display_detailed_row(row, error)
-            elif view_type == "minimal":
-                self._display_minimal_row(row, error)
-
-        # 更新记录数显示
-        self.results_count_label.setText(f"共 {len(errors)} 条记录")
-
-    def _display_standard_row(self, row: int, error):
-        """显示标准视图行"""
-        items = [
-            error.error_id,
-            error.error_type,
-            error.error_message[:100] + "..." if len(error.error_message) > 100 else error.error_message,
-            error.severity.value,
-            error.category.value,
-            error.module or "",
-            error.created_at.strftime("%Y-%m-%d %H:%M:%S") if error.created_at else "",
-            "已解决" if error.resolved else "未解决"
-        ]
-
-        for col, item_text in enumerate(items):
-            table_item = QTableWidgetItem(str(item_text))
-            table_item.setData(Qt.UserRole, error)  # 存储完整错误对象
-            self.results_table.setItem(row, col, table_item)
-
-    def _display_detailed_row(self, row: int, error):
-        """显示详细视图行"""
-        items = [
-            error.error_id,
-            error.error_type,
-            error.error_message[:100] + "..." if len(error.error_message) > 100 else error.error_message,
-            error.severity.value,
-            error.category.value,
-            error.module or "",
-            error.function or "",
-            str(error.line_number) if error.line_number else "",
-            error.created_at.strftime("%Y-%m-%d %H:%M:%S") if error.created_at else "",
-            "已解决" if error.resolved else "未解决",
-            error.resolved_at.strftime("%Y-%m-%d %H:%M:%S") if error.resolved_at else "",
-            str(error.retry_count)
-        ]
-
-        for col, item_text in enumerate(items):
-            table_item = QTableWidgetItem(str(item_text))
-            table_item.setData(Qt.UserRole, error)
-            self.results_table.setItem(row, col, table_item)
-
-    def _display_minimal_row(self, row: int, error):
-        """显示最小视图行"""
-        items = [
-            error.error_id,
-            error.error_message[:150] + "..." if len(error.error_message) > 150 else error.error_message,
-            error.severity.value,
-            error.created_at.strftime("%Y-%m-%d %H:%M:%S") if error.created_at else "",
-            "已解决" if error.resolved else "未解决"
-        ]
-
-        for col, item_text in enumerate(items):
-            table_item = QTableWidgetItem(str(item_text))
-            table_item.setData(Qt.UserRole, error)
-            self.results_table.setItem(row, col, table_item)
-
-    def _update_pagination(self):
-        """更新分页信息"""
-        # 简单的分页实现
-        total_records = len(self.current_errors)
-        page_size = int(self.page_size_combo.currentText())
-
-        if total_records == 0:
+    def _update_pagination(self, *_args):
+        """更新已加载记录数与当前页码（页码按可见首行计算）"""
+        model = self.results_model
+        loaded = model.loaded_rows()
+        more = model.canFetchMore()
+        self.results_count_label.setText(
+            f"已加载 {loaded} 条记录" + ("，滚动加载更多" if more else "")
+        )
+
+        if loaded == 0:
             self.page_info_label.setText("第 0 页 / 共 0 页")
             self.prev_btn.setEnabled(False)
             self.next_btn.setEnabled(False)
             return
 
-        total_pages = (total_records + page_size - 1) // page_size
-        current_page = 1  # 简化实现，始终显示第一页
+        page_size = self._page_size()
+        first_row = max(0, self.results_table.rowAt(0))
+        current_page = first_row // page_size + 1
+        total_pages = (loaded + page_size - 1) // page_size
+        suffix = "+" if more else ""
 
-        self.page_info_label.setText(f"第 {current_page} 页 / 共 {total_pages} 页")
+        self.page_info_label.setText(f"第 {current_page} 页 / 共 {total_pages}{suffix} 页")
         self.prev_btn.setEnabled(current_page > 1)
-        self.next_btn.setEnabled(current_page < total_pages)
+        self.next_btn.setEnabled(current_page < total_pages or more)
 
-    def _on_table_selection_changed(self):
+    def _on_table_selection_changed(self, *_args):
         """表格选择变化处理"""
-        selected_rows = set()
-        for item in self.results_table.selectedItems():
-            selected_rows.add(item.row())
+        selected_rows = self.results_table.selectionModel().selectedRows()
 
         if len(selected_rows) == 1:
-            row = list(selected_rows)[0]
-            error = self.results_table.item(row, 0).data(Qt.UserRole)
+            # 表格只持有显示列，完整记录（含 JSON 上下文）在选中时才读取并解码
+            error_id = self.results_model.error_id_at(selected_rows[0].row())
+            error = self.manager.get_error(error_id) if error_id else None
+            if error is None:
+                self.error_selected.emit({})
+                return
 
             # 转换为字典格式发送信号
             error_dict = {
@@ -544,9 +495,8 @@ class QueryPanel(QWidget):
 
     def _on_view_changed(self, _text: str):
         """视图切换处理"""
-        self._setup_table_columns()
-        if self.current_errors:
-            self._display_results(self.current_errors)
+        self.results_model.set_view(self._view_type())
+        self._on_results_changed()
 
     def _clear_filters(self):
         """清空过滤条件"""
@@ -556,23 +506,32 @@ class QueryPanel(QWidget):
         self.category_combo.setCurrentIndex(0)
         self.module_edit.clear()
         self.error_type_edit.clear()
+        self.search_edit.clear()
         self.resolved_combo.setCurrentIndex(0)
 
     def _prev_page(self):
         """上一页"""
-        # 简化实现
-        pass
+        self._scroll_to_page(-1)
 
     def _next_page(self):
         """下一页"""
-        # 简化实现
-        pass
+        self._scroll_to_page(1)
+
+    def _scroll_to_page(self, step: int):
+        """按页滚动；超出已加载范围时先按游标读取下一页"""
+        page_size = self._page_size()
+        first_row = max(0, self.results_table.rowAt(0))
+        target = max(0, (first_row // page_size + step) * page_size)
+        while target >= self.results_model.rowCount() and self.results_model.canFetchMore():
+            self.results_model.fetchMore()
+        if target < self.results_model.rowCount():
+            self.results_table.scrollTo(self.results_model.index(target, 0), QAbstractItemView.PositionAtTop)
+        self._update_pagination()
 
     def _on_page_size_changed(self):
         """页面大小变化处理"""
-        # 重新执行查询以应用新的页面大小
-        if self.current_errors:
-            self._perform_query()
+        # 重新执行查询以应用新的读取页大小
+        self._perform_query()
 
     def refresh_data(self):
         """刷新数据"""
@@ -231,7 +231,7 @@ class StatsPanel(QWidget):
             date_range = self._get_date_range()
 
             # 获取统计数据
-            stats = self.manager.get_statistics(date_range)
+            stats = self.manager.get_statistics_service().get_statistics(date_range)
 
             if stats:
                 self.current_stats = stats
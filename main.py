@@ -15,18 +15,29 @@ import atexit
 import logging
 import json
 import threading
+import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+_process_started = time.perf_counter()
+
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# --profile-startup：在导入重量级模块之前安装导入耗时分析器，首帧后输出导入树报告
+_import_profiler = None
+if "--profile-startup" in sys.argv:
+    sys.argv.remove("--profile-startup")
+    from utils.import_profiler import ImportProfiler
+    _import_profiler = ImportProfiler().start()
+
 from PyQt5.QtWidgets import QApplication, QMessageBox
-from PyQt5.QtCore import Qt, QCoreApplication
+from PyQt5.QtCore import Qt, QCoreApplication, QTimer
 
 # 导入主窗口
 from ui.main_window import MainWindow
+from ui.lmv_scheme import register_lmv_scheme
 from core.dynamic_log_config import DynamicLogConfigManager, RuntimeLogLevelController
 from core.log_rotation import (
     DiskSpaceMonitor,
@@ -286,6 +297,37 @@ def check_import_status():
         }
 
 
+def _report_startup_profile(window) -> None:
+    """停止导入分析器，输出导入树与组件构建耗时（日志 + logs/startup_profile.txt）。"""
+    if _import_profiler is None:
+        return
+    logger = logging.getLogger(__name__)
+    _import_profiler.stop()
+    lines = [
+        f"启动到首帧: {(time.perf_counter() - _process_started) * 1000.0:.1f} ms",
+        _import_profiler.format_report(min_ms=1.0, top=20),
+    ]
+    try:
+        services = window.startup_report()
+        lines.append("")
+        lines.append(f"首帧前组件构建: {services['init_ms_before_first_paint']:.1f} ms，"
+                     f"待预热: {', '.join(services['pending_warm_up']) or '无'}")
+        for item in services["components"]:
+            if item["init_ms"] is not None:
+                lines.append(f"{item['init_ms']:9.1f}  {item['name']} ({item['trigger']})")
+    except Exception as e:
+        logger.warning(f"组件启动报告获取失败: {e}")
+    report = "\n".join(lines)
+    try:
+        report_path = project_root / "logs" / "startup_profile.txt"
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(report, encoding="utf-8")
+        logger.info(f"启动导入耗时报告已写入: {report_path}")
+    except Exception as e:
+        logger.warning(f"启动导入耗时报告写入失败: {e}")
+    print(report, file=sys.stderr)
+
+
 def main():
     """主函数"""
     # 设置日志
@@ -302,6 +344,10 @@ def main():
         except Exception:
             pass
 
+        # lmv:// 文档协议须在 QApplication 创建前注册
+        if not register_lmv_scheme():
+            logger.info("lmv:// 协议不可用，文档将以 setHtml 显示")
+
         # 创建QApplication实例
         app = QApplication(sys.argv)
 
@@ -428,9 +474,15 @@ def main():
 
         logger.info("主窗口已显示")
 
+        if _import_profiler is not None:
+            # 0ms 单次定时器在首帧绘制后触发
+            QTimer.singleShot(0, lambda: _report_startup_profile(window))
+
         # 运行应用程序
         exit_code = app.exec_()
 
+        # 写出尚在写回队列中的配置修改
+        get_config_manager().flush()
         logger.info(f"应用程序退出，退出码: {exit_code}")
         return exit_code
         
@@ -12,11 +12,13 @@ from pathlib import Path
 from dataclasses import dataclass, asdict
 from enum import Enum
 from datetime import datetime, timedelta
-import psutil
+from utils.lazy_imports import lazy_import
 import json
 import os
 import builtins
 
+psutil = lazy_import("psutil")  # 首次采样时才加载
+
 # 导入前序模块的成果（使用模拟实现）
 from integration.mock_dependencies import (
     PerformanceMonitor, UnifiedErrorHandler, EnhancedLogger, UnifiedCacheManager
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""ConfigManager 异步写回测试。"""
+
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from utils.config_manager import ConfigManager
+
+
+class TestConfigWriteBehind(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.config_dir = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _on_disk(self, name: str = "app_config.json") -> dict:
+        return json.loads((self.config_dir / name).read_text(encoding="utf-8"))
+
+    def test_changes_are_coalesced_in_memory_until_flush(self) -> None:
+        manager = ConfigManager(str(self.config_dir), write_debounce=60)
+        generation = manager.get_config_generation()
+        for text in ("a", "ab", "abc"):
+            self.assertTrue(manager.set_config("file_tree.last_search", text))
+
+        self.assertEqual(manager.get_config("file_tree.last_search"), "abc")
+        self.assertGreater(manager.get_config_generation(), generation)
+        self.assertTrue(manager.has_pending_writes())
+        self.assertNotIn("last_search", self._on_disk()["file_tree"])
+
+        self.assertTrue(manager.flush())
+        self.assertFalse(manager.has_pending_writes())
+        self.assertEqual(self._on_disk()["file_tree"]["last_search"], "abc")
+        self.assertEqual(sorted(p.name for p in self.config_dir.glob(".*.tmp")), [])
+        manager.shutdown()
+
+    def test_background_writer_flushes_after_quiet_period(self) -> None:
+        manager = ConfigManager(str(self.config_dir), write_debounce=0.01)
+        manager.set_config("window.width", 800, "ui")
+        writer = manager._writer
+        self.assertIsNotNone(writer)
+        writer.join(timeout=5)
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(self._on_disk("ui_config.json")["window"]["width"], 800)
+        manager.shutdown()
+
+    def test_flush_waits_for_writes_taken_by_background_writer(self) -> None:
+        manager = ConfigManager(str(self.config_dir), write_debounce=60)
+        manager.set_config("file_tree.last_search", "pending")
+        # 模拟后台线程已取出待写集合、但尚未拿到文件锁的窗口期
+        with manager._pending_cond:
+            taken = manager._take_dirty()
+        writer = threading.Timer(0.1, manager._write_pending, args=(taken,))
+        writer.start()
+
+        self.assertFalse(manager.has_pending_writes())
+        self.assertTrue(manager.flush())
+        self.assertEqual(self._on_disk()["file_tree"]["last_search"], "pending")
+        writer.join()
+        manager.shutdown()
+
+    def test_shutdown_flushes_and_later_writes_are_synchronous(self) -> None:
+        manager = ConfigManager(str(self.config_dir), write_debounce=60)
+        manager.set_config("app.window.width", 1000)
+        manager.shutdown()
+        self.assertEqual(self._on_disk()["app"]["window"]["width"], 1000)
+
+        manager.set_config("app.window.width", 1100)
+        self.assertFalse(manager.has_pending_writes())
+        self.assertEqual(self._on_disk()["app"]["window"]["width"], 1100)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""ApplicationStateManager 不可变快照与视图缓存测试。"""
+
+import copy
+import json
+import pickle
+import unittest
+from unittest.mock import patch
+
+from core.application_state_manager import ApplicationStateManager, FrozenStatus, freeze_status
+from core.snapshot_manager import SnapshotManager
+from utils.config_manager import ConfigManager
+
+
+class TestFrozenStatus(unittest.TestCase):
+    def test_freeze_is_deep_and_read_only(self) -> None:
+        frozen = freeze_status({"a": [1, {"b": 2}], "s": {3}})
+        self.assertEqual(frozen["a"], (1, {"b": 2}))
+        self.assertIsInstance(frozen["a"][1], FrozenStatus)
+        for mutate in (lambda: frozen.__setitem__("x", 1), lambda: frozen.pop("a"),
+                       lambda: frozen.update(x=1), lambda: frozen["a"][1].clear()):
+            self.assertRaises(TypeError, mutate)
+
+        # 共享而非拷贝，且与普通 dict 一样可序列化
+        self.assertIs(copy.deepcopy(frozen), frozen)
+        self.assertEqual(json.loads(json.dumps(freeze_status({"a": [1, {"b": 2}]}))), {"a": [1, {"b": 2}]})
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), frozen)
+
+
+class TestStateSnapshots(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config_manager = ConfigManager()
+        self.manager = ApplicationStateManager(self.config_manager)
+        self.manager.set_snapshot_manager(SnapshotManager(self.config_manager))
+
+    def test_reads_share_one_snapshot_until_state_changes(self) -> None:
+        source = {"function_mapping_status": "complete", "available_functions": ["render"]}
+        self.assertTrue(self.manager.update_module_status("demo", source))
+        source["available_functions"].append("mutated")
+
+        with patch.object(self.config_manager, "get_external_module_config",
+                          wraps=self.config_manager.get_external_module_config) as module_config:
+            first = self.manager.get_module_status("demo")
+            self.assertIs(self.manager.get_module_status("demo"), first)
+            self.assertEqual(module_config.call_count, 1)
+        self.assertEqual(first["available_functions"], ("render",))
+        self.assertIn("_lock_info", first)
+
+        render = self.manager.get_render_status()
+        self.assertIs(self.manager.get_render_status(), render)
+        self.manager.get_snapshot_manager().save_render_snapshot({"renderer_type": "markdown"})
+        self.assertEqual(self.manager.get_render_status()["renderer_type"], "markdown")
+
+        # 旧快照保持不变，新写入替换引用
+        self.manager.update_module_status("demo", {"function_mapping_status": "incomplete"})
+        self.assertEqual(first["function_mapping_status"], "complete")
+        self.assertEqual(self.manager.get_module_status("demo")["function_mapping_status"], "incomplete")
+        self.assertEqual(self.manager.get_all_states()["modules"]["demo"]["function_mapping_status"],
+                         "incomplete")
+
+    def test_config_change_refreshes_derived_fields(self) -> None:
+        first = self.manager.get_module_status("markdown_processor")
+        self.config_manager.reload_config()
+        second = self.manager.get_module_status("markdown_processor")
+        self.assertIsNot(second, first)
+        self.assertEqual(second["config_enabled"], first["config_enabled"])
+        self.assertIs(self.manager.get_module_status("markdown_processor"), second)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
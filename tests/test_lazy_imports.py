@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""延迟导入工具与启动导入耗时分析器测试。"""
+
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from utils.import_profiler import ImportProfiler
+from utils.lazy_imports import lazy_import, optional_import
+
+
+class _TempPackageMixin:
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        sys.path.insert(0, str(self.root))
+        self._created = []
+
+    def tearDown(self) -> None:
+        sys.path.remove(str(self.root))
+        for name in self._created:
+            sys.modules.pop(name, None)
+        self._tmp.cleanup()
+
+    def write_module(self, name: str, source: str) -> None:
+        path = self.root.joinpath(*name.split("."))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.with_suffix(".py").write_text(textwrap.dedent(source), encoding="utf-8")
+        self._created.append(name[:-len(".__init__")] if name.endswith(".__init__") else name)
+
+
+class TestLazyImports(_TempPackageMixin, unittest.TestCase):
+    def test_lazy_import_defers_execution(self) -> None:
+        self.write_module("lad_lazy_probe", "VALUE = 42\n")
+
+        module = lazy_import("lad_lazy_probe")
+        self.assertNotIn("lad_lazy_probe", sys.modules)
+        self.assertEqual(module.VALUE, 42)
+        self.assertIn("lad_lazy_probe", sys.modules)
+        with self.assertRaises(AttributeError):
+            module.MISSING
+
+    def test_optional_import_missing_returns_none(self) -> None:
+        self.assertIsNone(optional_import("lad_no_such_module"))
+        self.assertIsNone(optional_import("lad_no_such_package.child"))
+        with self.assertRaises(ImportError):
+            lazy_import("lad_no_such_module")
+
+    def test_lazy_exports_resolve_on_first_access(self) -> None:
+        self.write_module("lad_lazy_pkg.__init__", """
+            from utils.lazy_imports import lazy_exports
+            __getattr__, __dir__ = lazy_exports(__name__, {'heavy': ('Heavy',)})
+        """)
+        self.write_module("lad_lazy_pkg.heavy", "class Heavy:\n    pass\n")
+
+        import lad_lazy_pkg
+        self.assertNotIn("lad_lazy_pkg.heavy", sys.modules)
+        self.assertIn("Heavy", dir(lad_lazy_pkg))
+        self.assertEqual(lad_lazy_pkg.Heavy.__name__, "Heavy")
+        self.assertIn("lad_lazy_pkg.heavy", sys.modules)
+        with self.assertRaises(AttributeError):
+            lad_lazy_pkg.Missing
+
+    def test_core_package_exports_are_lazy(self) -> None:
+        import core
+        self.assertIn("PerformanceBenchmark", dir(core))
+        for name in core.__all__:
+            self.assertTrue(hasattr(core, name), name)
+
+
+class TestImportProfiler(_TempPackageMixin, unittest.TestCase):
+    def test_builds_nested_import_tree(self) -> None:
+        self.write_module("lad_prof_outer", "import lad_prof_inner\nVALUE = sum(range(10000))\n")
+        self.write_module("lad_prof_inner", "VALUE = sum(range(10000))\n")
+
+        profiler = ImportProfiler().start()
+        try:
+            import lad_prof_outer  # noqa: F401
+        finally:
+            profiler.stop()
+        self.assertNotIn(profiler, sys.meta_path)
+
+        outer = next(node for node in profiler.tree() if node["module"] == "lad_prof_outer")
+        inner = outer["children"][0]
+        self.assertEqual(inner["module"], "lad_prof_inner")
+        self.assertGreater(inner["total_ms"], 0)
+        self.assertAlmostEqual(outer["total_ms"], outer["self_ms"] + inner["total_ms"], places=2)
+        self.assertLess(outer["self_ms"], outer["total_ms"])
+
+        report = profiler.format_report(min_ms=0.0, top=5)
+        self.assertIn("lad_prof_outer", report)
+        self.assertIn("  lad_prof_inner", report)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
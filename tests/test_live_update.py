@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""同一文档重新渲染时的原地 DOM 更新测试。"""
+
+import unittest
+from unittest.mock import patch
+
+from tests._utils import get_qapp
+
+from core.html_block_diff import build_patch_script, diff_blocks, split_blocks
+from ui.content_viewer import ContentViewer
+
+_STYLE = "<style>\n p { margin: 0; }\n</style>\n"
+
+
+def _doc(*blocks: str, style: str = _STYLE) -> str:
+    return style + "\n".join(blocks) + "\n"
+
+
+class TestHtmlBlockDiff(unittest.TestCase):
+    def test_split_fragment_and_full_document(self) -> None:
+        fragment = split_blocks(_doc('<h1 id="t">T</h1>', "<p>a <b>b</b></p>", "<hr>",
+                                     '<div class="codehilite"><pre>x</pre></div>'))
+        self.assertEqual(fragment.tags, ["h1", "p", "hr", "div"])
+        self.assertEqual(fragment.blocks[1], "<p>a <b>b</b></p>")
+        self.assertNotIn("<p>", fragment.shell)
+
+        full = split_blocks("<!DOCTYPE html><html><head><title>x</title></head>"
+                            "<body>\n<h1>a</h1>\n<p>b</p>\n</body></html>")
+        self.assertEqual(full.tags, ["h1", "p"])
+        self.assertIn("<title>x</title>", full.shell)
+
+    def test_unmappable_html_is_rejected(self) -> None:
+        self.assertIsNone(split_blocks("<p>a</p> stray text"))
+        self.assertIsNone(split_blocks("<p>a<div>b</div>"))
+
+    def test_diff_ops_and_limits(self) -> None:
+        old = split_blocks(_doc("<h1>T</h1>", "<p>one</p>", "<p>two</p>", "<p>three</p>"))
+        new = split_blocks(_doc("<h1>T</h1>", "<p>ONE</p>", "<p>two</p>", "<p>three</p>", "<p>four</p>"))
+        ops = diff_blocks(old, new)
+        self.assertEqual(ops, [{"index": 1, "remove": 1, "insert": ["<p>ONE</p>"]},
+                               {"index": 4, "remove": 0, "insert": ["<p>four</p>"]}])
+        script = build_patch_script(old, new, ops)
+        self.assertIn('["h1", "p", "p", "p"]', script)
+        self.assertIn(", 5);", script)
+
+        self.assertEqual(diff_blocks(old, old), [])
+        self.assertIsNone(diff_blocks(old, new, max_ratio=0.1))
+        restyled = split_blocks(_doc("<h1>T</h1>", style="<style>p{}</style>"))
+        self.assertIsNone(diff_blocks(old, restyled))
+        scripted = split_blocks(_doc("<h1>T</h1>", "<p>one</p>", "<p>two</p>", "<script>x()</script>"))
+        self.assertIsNone(diff_blocks(old, scripted, max_ratio=1.0))
+
+
+class TestContentViewerLiveUpdate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # 绑定到类属性，确保不被垃圾回收
+        cls._app = get_qapp()
+
+    def test_same_document_is_patched_in_place(self) -> None:
+        viewer = ContentViewer()
+        viewer.current_file_path = "/docs/a.md"
+        viewer._display_html(_doc("<h1>T</h1>", "<p>one</p>", "<p>two</p>"))
+        view, page = viewer.web_engine_view, viewer.web_engine_view.page()
+
+        with patch.object(page, "runJavaScript") as run_js, patch.object(view, "setHtml") as set_html:
+            viewer._display_html(_doc("<h1>T</h1>", "<p>ONE</p>", "<p>two</p>"))
+            set_html.assert_not_called()
+            script, on_result = run_js.call_args[0]
+            self.assertIn("<p>ONE</p>", script)
+            self.assertNotIn("<p>two</p>", script)
+            on_result(True)
+            set_html.assert_not_called()
+
+            # 页面 DOM 与预期不符时退回整页加载
+            viewer._display_html(_doc("<h1>T</h1>", "<p>ONE!</p>", "<p>two</p>"))
+            run_js.call_args[0][1](False)
+            set_html.assert_called_once()
+
+        self.assertEqual(viewer.get_cache_info()["live_update"],
+                         {"patched": 2, "unchanged": 0, "fallback": 1, "full_loads": 2})
+
+    def test_other_document_or_new_shell_reloads(self) -> None:
+        viewer = ContentViewer()
+        viewer.current_file_path = "/docs/a.md"
+        viewer._display_html(_doc("<p>one</p>"))
+        with patch.object(viewer.web_engine_view, "setHtml") as set_html:
+            viewer._display_html(_doc("<p>one</p>", style="<style>p{}</style>"))
+            viewer.current_file_path = "/docs/b.md"
+            viewer._display_html(_doc("<p>one</p>", style="<style>p{}</style>"))
+            self.assertEqual(set_html.call_count, 2)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""lmv:// 本地文档协议测试。"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from core.content_preview import ContentPreview
+from ui.lmv_scheme import DOCUMENT_NAME, LmvDocumentStore
+
+
+class TestLmvDocumentStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        (self.root / "img").mkdir()
+        (self.root / "img" / "图 1.png").write_bytes(b"\x89PNG")
+        (self.root / "notes.txt").write_text("secret", encoding="utf-8")
+        self.doc = self.root / "docs" / "a.md"
+        self.doc.parent.mkdir()
+        self.store = LmvDocumentStore(max_documents=2)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _split(self, url: str):
+        parts = urlsplit(url)
+        return parts.hostname, unquote(parts.path)
+
+    def test_document_and_relative_assets(self) -> None:
+        url = self.store.publish(self.doc, "<p>文档</p>")
+        self.assertTrue(url.startswith("lmv://d1/"))
+        host, path = self._split(url)
+        self.assertTrue(path.endswith("/docs/" + DOCUMENT_NAME))
+
+        document = self.store.resolve(host, path)
+        self.assertEqual(document.mime_type, "text/html;charset=utf-8")
+        self.assertEqual(document.data.decode("utf-8"), "<p>文档</p>")
+
+        # ../img/图 1.png 相对于源文件目录解析，按引用从磁盘读取
+        asset_path = path.rsplit("/docs/", 1)[0] + "/img/图 1.png"
+        asset = self.store.resolve(host, asset_path)
+        self.assertEqual(asset.mime_type, "image/png")
+        self.assertEqual(Path(asset.file_path), self.root / "img" / "图 1.png")
+
+        self.assertIsNone(self.store.resolve(host, asset_path.replace("img/图 1.png", "notes.txt")))
+        self.assertIsNone(self.store.resolve(host, asset_path.replace(".png", ".gif")))
+        self.assertIsNone(self.store.resolve("d999", path))
+
+    def test_each_publish_gets_new_id_and_old_documents_are_evicted(self) -> None:
+        urls = [self.store.publish(self.doc, f"<p>{i}</p>") for i in range(3)]
+        self.assertEqual(len(set(urls)), 3)
+        self.assertEqual(len(self.store), 2)
+        self.assertIsNone(self.store.resolve(*self._split(urls[0])))
+        self.assertEqual(self.store.resolve(*self._split(urls[2])).data, b"<p>2</p>")
+
+
+class TestImagePreviewByReference(unittest.TestCase):
+    def test_image_preview_references_file(self) -> None:
+        preview = ContentPreview()
+        html = preview._generate_image_preview_html("/pics/my image.png", "my image.png",
+                                                    {"width": 10, "height": 10})
+        self.assertIn('src="my%20image.png"', html)
+        self.assertNotIn("base64", html)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import gzip
 import json
 from pathlib import Path
 
@@ -13,6 +14,7 @@ from core.performance_metrics import PerformanceMetrics
 from tools.log_analyzer import LogAnalyzer, PerformanceAnalyzer
 from tools.log_query_api import create_app
 from tools.log_query_cli import LogQueryCLI
+from tools.log_sidecar_index import SidecarIndex, SidecarLogAnalyzer
 
 
 def _write_sample_log(tmp_path: Path) -> Path:
@@ -172,3 +174,207 @@ def test_performance_metrics_threshold_listener() -> None:
     assert value == 15
     assert metadata["severity"] == "ERROR"
     assert metadata["component"] == "renderer"
+
+
+def test_log_analyzer_incremental_tail_index(tmp_path: Path) -> None:
+    log_path = _write_sample_log(tmp_path)
+    analyzer = LogAnalyzer(log_path)
+    analyzer.ensure_index()
+    assert analyzer.get_index_stats()["full_builds"] == 1
+
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({
+            "timestamp": "2025-01-01T09:59:59Z",
+            "level": "INFO",
+            "message": "late arrival",
+            "correlation_id": "cid-1",
+        }) + "\n")
+        # 未写完的半行不应被索引
+        handle.write('{"timestamp": "2025-01-01T10:00:05Z"')
+
+    assert len(analyzer.query(correlation_id="cid-1")) == 3
+    stats = analyzer.get_index_stats()
+    assert stats["full_builds"] == 1
+    assert stats["incremental_updates"] == 1
+    assert stats["entries"] == 5
+    # 乱序追加的记录按时间合并到正确位置
+    assert analyzer.query_by_time_range()[0]["message"] == "late arrival"
+
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(', "level": "INFO", "correlation_id": "cid-9"}\n')
+    assert len(analyzer.query(correlation_id="cid-9")) == 1
+    assert analyzer.get_index_stats()["lines"] == 6
+
+
+def test_log_analyzer_detects_truncation(tmp_path: Path) -> None:
+    log_path = _write_sample_log(tmp_path)
+    analyzer = LogAnalyzer(log_path)
+    analyzer.ensure_index()
+
+    log_path.write_text(json.dumps({"timestamp": "2025-01-02T00:00:00Z", "correlation_id": "cid-new"}) + "\n",
+                        encoding="utf-8")
+    assert analyzer.get_recent(limit=10) == [{"timestamp": "2025-01-02T00:00:00Z", "correlation_id": "cid-new"}]
+    assert analyzer.query(correlation_id="cid-1") == []
+    assert analyzer.get_index_stats()["full_builds"] == 2
+
+
+def test_sidecar_index_persists_and_seeks(tmp_path: Path) -> None:
+    log_path = _write_sample_log(tmp_path)
+    analyzer = SidecarLogAnalyzer(log_path)
+    analyzer.ensure_index()
+    index_path = SidecarIndex.index_path_for(log_path)
+    assert index_path.exists()
+
+    reloaded = SidecarIndex(log_path)
+    assert reloaded.refresh() is False
+    assert len(reloaded) == 4
+    assert len(reloaded.postings["cid-1"]) == 2
+
+    fresh = SidecarLogAnalyzer(log_path)
+    window = fresh.query(start="2025-01-01T10:00:01Z", end="2025-01-01T10:00:02Z")
+    assert [entry["correlation_id"] for entry in window] == ["cid-2", "cid-1"]
+    assert fresh.query(filters={"details.severity": "WARNING"}, limit=1)[0]["correlation_id"] == "cid-3"
+    assert fresh.get_recent(limit=1)[0]["correlation_id"] == "cid-3"
+
+
+def test_sidecar_index_appends_chunks(tmp_path: Path) -> None:
+    log_path = _write_sample_log(tmp_path)
+    index = SidecarIndex(log_path)
+    index.refresh()
+    index_path = SidecarIndex.index_path_for(log_path)
+    base_size = index_path.stat().st_size
+    with index_path.open("rb") as handle:
+        prefix = handle.read(base_size)
+
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"timestamp": "2025-01-01T09:59:00Z", "correlation_id": "cid-1"}) + "\n")
+    assert index.refresh() is True
+    # 增量刷新只在文件末尾追加数据块，不重写已有内容
+    assert index_path.read_bytes()[:base_size] == prefix
+
+    reloaded = SidecarIndex(log_path)
+    assert reloaded.refresh() is False
+    assert list(reloaded.timestamps) == list(index.timestamps)
+    assert list(reloaded.offsets) == list(index.offsets)
+    assert list(reloaded.postings["cid-1"]) == list(index.postings["cid-1"])
+
+    # 末尾半个数据块被忽略，并从上一个完整块继续索引
+    with index_path.open("ab") as handle:
+        handle.write(b"\x05\x00")
+    torn = SidecarIndex(log_path)
+    assert torn.refresh() is False
+    assert len(torn) == 5
+
+    empty_log = tmp_path / "empty.log"
+    empty_log.touch()
+    analyzer = SidecarLogAnalyzer(empty_log, include_rotated=False)
+    analyzer.ensure_index()
+    first = analyzer._indexes[empty_log]
+    analyzer.ensure_index()
+    assert analyzer._indexes[empty_log] is first
+
+
+def test_sidecar_index_save_recovers_from_missing_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log_path = _write_sample_log(tmp_path)
+    index = SidecarIndex(log_path)
+    index.refresh()
+    index_path = SidecarIndex.index_path_for(log_path)
+
+    # 追加时侧车文件已被删除：整体重写一次
+    index_path.unlink()
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"timestamp": "2025-01-01T10:00:05Z", "correlation_id": "cid-5"}) + "\n")
+    assert index.refresh() is True
+    reloaded = SidecarIndex(log_path)
+    assert reloaded.refresh() is False
+    assert len(reloaded) == 5
+
+    # 重写路径本身失败时记录告警并保留重写标记，而不是无限重试
+    def _missing(*_args: object) -> None:
+        raise FileNotFoundError("tmp file vanished")
+
+    monkeypatch.setattr("tools.log_sidecar_index.os.replace", _missing)
+    rebuilt = SidecarIndex(log_path)
+    rebuilt.refresh(force=True)
+    assert rebuilt._needs_rewrite is True
+    assert len(rebuilt) == 5
+
+
+def test_sidecar_analyzer_spans_rotated_files(tmp_path: Path) -> None:
+    log_path = _write_sample_log(tmp_path)
+    rotated = tmp_path / "lad_markdown_viewer_20241231_235959.log.gz"
+    with gzip.open(rotated, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps({"timestamp": "2024-12-31T23:59:00Z", "correlation_id": "cid-1"}) + "\n")
+
+    analyzer = SidecarLogAnalyzer(log_path)
+    assert analyzer.discover_log_files() == [rotated, log_path]
+    by_cid = analyzer.query(correlation_id="cid-1")
+    assert len(by_cid) == 3
+    assert by_cid[0]["timestamp"] == "2024-12-31T23:59:00Z"
+    assert len(analyzer.query(end="2025-01-01T10:00:00Z")) == 2
+    assert analyzer.get_index_stats()["files"] == 2
+
+    assert len(SidecarLogAnalyzer(log_path, include_rotated=False).query(correlation_id="cid-1")) == 2
+
+
+def test_columnar_stats_match_row_path(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    log_path = _write_sample_log(tmp_path)
+    row_perf = PerformanceAnalyzer(LogAnalyzer(log_path))
+    columnar_perf = PerformanceAnalyzer(SidecarLogAnalyzer(log_path))
+    assert columnar_perf._columnar_engine({"operation": "render"}) is not None
+    assert columnar_perf._columnar_engine({"details.severity": "ERROR"}) is None
+
+    assert columnar_perf.analyze_import_performance() == row_perf.analyze_import_performance()
+    assert columnar_perf.analyze_render_performance() == row_perf.analyze_render_performance()
+    filtered = {"renderer_type": "fallback_*"}
+    assert (columnar_perf.analyze_render_performance(filters=filtered)
+            == row_perf.analyze_render_performance(filters=filtered))
+    assert columnar_perf.analyze_component_breakdown() == row_perf.analyze_component_breakdown()
+
+    breakdown = columnar_perf.analyze_component_breakdown()
+    assert breakdown["importer"]["count"] == 2
+    assert breakdown["importer"]["duration_statistics"]["p50_ms"] == pytest.approx(235)
+
+
+def test_columnar_stats_match_row_path_with_multiple_timers(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    log_path = _write_sample_log(tmp_path)
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({
+            "timestamp": "2025-01-01T10:00:04Z",
+            "level": "INFO",
+            "message": "Render completed",
+            "operation": "render",
+            "component": "renderer",
+            "renderer_type": "markdown_processor",
+            "metrics": {"timers": {"parse": {"duration": 0.25}, "layout": {"duration": 0.5},
+                                   "idle": {"duration": 0}}},
+        }) + "\n")
+    row_perf = PerformanceAnalyzer(LogAnalyzer(log_path))
+    columnar_perf = PerformanceAnalyzer(SidecarLogAnalyzer(log_path))
+    assert columnar_perf._columnar_engine(None) is not None
+
+    render = columnar_perf.analyze_render_performance()
+    assert render == row_perf.analyze_render_performance()
+    # 每个非零计时器各计一个样本，而不是按行求和
+    assert render["markdown_processor"]["duration_statistics"]["count"] == 3
+    assert columnar_perf.analyze_component_breakdown() == row_perf.analyze_component_breakdown()
+    assert columnar_perf.rollup(2) == row_perf.rollup(2)
+
+    # 重新加载侧车文件后结果不变
+    reloaded = PerformanceAnalyzer(SidecarLogAnalyzer(log_path))
+    assert reloaded.analyze_render_performance() == render
+
+
+def test_performance_rollup_buckets(tmp_path: Path) -> None:
+    log_path = _write_sample_log(tmp_path)
+    for analyzer in (LogAnalyzer(log_path), SidecarLogAnalyzer(log_path)):
+        buckets = PerformanceAnalyzer(analyzer).rollup(2, filters={"operation": "render"})
+        assert [bucket["bucket_start"] for bucket in buckets] == ["2025-01-01T10:00:02+00:00"]
+        assert buckets[0]["count"] == 2
+        assert buckets[0]["duration_statistics"]["max_ms"] == 120
+
+    app = create_app(str(log_path))
+    response = app.test_client().get("/api/analytics/rollup?bucket=1")
+    assert response.get_json()["count"] == 4
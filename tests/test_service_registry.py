@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""惰性组件注册表与主窗口延迟构建测试。"""
+
+import unittest
+
+from tests._utils import get_qapp
+
+get_qapp()
+
+from core.service_registry import LazyService, ServiceRegistry
+from ui.main_window import MainWindow
+
+
+class _Host:
+    widget = LazyService()
+
+    def __init__(self, registry: ServiceRegistry) -> None:
+        self.services = registry
+
+
+class TestServiceRegistry(unittest.TestCase):
+    def test_builds_on_demand_with_dependencies_first(self) -> None:
+        registry = ServiceRegistry("test")
+        order = []
+        registry.register("a", lambda: order.append("a") or "A")
+        registry.register("b", lambda: order.append("b") or registry.get("a") + "B", deps=("a",))
+
+        self.assertEqual(order, [])
+        self.assertIsNone(registry.peek("b"))
+        self.assertEqual(registry.get("b"), "AB")
+        self.assertEqual(order, ["a", "b"])
+        self.assertEqual(registry.get("b"), "AB")
+        self.assertEqual(order, ["a", "b"])
+
+    def test_cycle_and_unknown_dependency(self) -> None:
+        registry = ServiceRegistry("test")
+        registry.register("a", object, deps=("b",))
+        registry.register("b", object, deps=("a",))
+        registry.register("c", object, deps=("missing",))
+
+        with self.assertRaises(RuntimeError):
+            registry.get("a")
+        with self.assertRaises(KeyError):
+            registry.get("c")
+        with self.assertRaises(ValueError):
+            registry.register("a", object)
+
+    def test_warm_up_step_and_report(self) -> None:
+        registry = ServiceRegistry("test")
+        registry.register("a", object)
+        registry.register("lazy_only", object, warm=False)
+        registry.register("broken", lambda: 1 / 0)
+        registry.register("b", object, deps=("a",))
+
+        registry.mark_first_paint()
+        self.assertEqual(registry.pending_warm_up(), ["a", "broken", "b"])
+        self.assertTrue(registry.warm_up_step())
+        with self.assertRaises(ZeroDivisionError):
+            registry.warm_up_step()
+        self.assertFalse(registry.warm_up_step())
+
+        report = registry.startup_report()
+        components = {c["name"]: c for c in report["components"]}
+        self.assertEqual(report["pending_warm_up"], [])
+        self.assertEqual(components["a"]["trigger"], "warm_up")
+        self.assertFalse(components["lazy_only"]["initialized"])
+        self.assertIn("division", components["broken"]["error"])
+        self.assertEqual(registry.dependency_graph()["b"], ["a"])
+        self.assertEqual(report["init_ms_before_first_paint"], 0)
+
+    def test_lazy_service_descriptor(self) -> None:
+        registry = ServiceRegistry("test")
+        registry.register("widget", lambda: "built")
+        host = _Host(registry)
+
+        self.assertEqual(host.widget, "built")
+        host.widget = "replaced"
+        self.assertEqual(registry.get("widget"), "replaced")
+
+
+class TestMainWindowDeferredStartup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # 绑定到类属性，确保不被垃圾回收
+        cls._app = get_qapp()
+
+    def setUp(self) -> None:
+        self.window = MainWindow()
+
+    def tearDown(self) -> None:
+        self.window.close()
+
+    def test_components_deferred_until_warm_up(self) -> None:
+        services = self.window.services
+        self.assertFalse(services.is_initialized("markdown_renderer"))
+        self.assertFalse(services.is_initialized("dynamic_importer"))
+        # 主窗口与内容组件共用同一注册表与渲染器实例
+        self.assertIs(self.window.content_viewer.services, services)
+
+        services.warm_up()
+        self.assertIs(self.window.markdown_renderer, self.window.content_viewer.markdown_renderer)
+        self.assertIsNotNone(self.window.state_manager)
+
+        report = self.window.startup_report()
+        self.assertEqual(report["pending_warm_up"], [])
+        self.assertTrue(all(c["init_ms"] is not None for c in report["components"]))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""温启动会话快照测试。"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from tests._utils import get_qapp
+
+from core.session_snapshot import SessionSnapshotStore, file_signature, is_document_fresh
+from ui.content_viewer import ContentViewer
+from ui.main_window import MainWindow
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestSessionSnapshotStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.store = SessionSnapshotStore(self.root / "session" / "warm_start.json",
+                                          max_documents=2, max_html_bytes=64)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _document(self, name: str, html: str = "<p>x</p>"):
+        path = self.root / name
+        path.write_text("# x", encoding="utf-8")
+        return dict(path=str(path), html=html, type="markdown", scroll_y=10.0, **file_signature(path))
+
+    def test_round_trip_keeps_recent_documents_within_limits(self) -> None:
+        documents = [self._document("a.md"), self._document("big.md", "x" * 100),
+                     self._document("b.md"), self._document("c.md")]
+        self.assertTrue(self.store.save(root_path=str(self.root), expanded_paths=[str(self.root)],
+                                        documents=documents, current_file=documents[0]["path"],
+                                        import_snapshot={"module": "markdown_processor"}))
+
+        snapshot = self.store.load()
+        self.assertEqual([Path(d["path"]).name for d in snapshot["documents"]], ["a.md", "b.md"])
+        self.assertEqual(snapshot["import_snapshot"]["module"], "markdown_processor")
+        self.assertEqual(list(self.store.snapshot_path.parent.glob("*.tmp")), [])
+
+    def test_stale_corrupt_and_foreign_snapshots(self) -> None:
+        document = self._document("a.md")
+        self.assertTrue(is_document_fresh(document))
+        _bump_mtime(Path(document["path"]))
+        self.assertFalse(is_document_fresh(document))
+
+        self.store.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        self.store.snapshot_path.write_text("{not json", encoding="utf-8")
+        self.assertIsNone(self.store.load())
+        self.store.snapshot_path.write_text(json.dumps({"version": 999}), encoding="utf-8")
+        self.assertIsNone(self.store.load())
+
+
+class TestWarmStart(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # 绑定到类属性，确保不被垃圾回收
+        cls._app = get_qapp()
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.doc = self.root / "doc.md"
+        self.other = self.root / "other.md"
+        for path in (self.doc, self.other):
+            path.write_text(f"# {path.stem}", encoding="utf-8")
+        self.store = SessionSnapshotStore(self.root / "warm_start.json")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_viewer_export_restore_and_refresh(self) -> None:
+        viewer = ContentViewer()
+        viewer._cache_content(str(self.other), "<p>other</p>", "markdown")
+        viewer._cache_content(str(self.doc), "<p>doc</p>", "markdown")
+        viewer.current_file_path = str(self.doc)
+        documents = viewer.export_session_documents(limit=5)
+        self.assertEqual([d["path"] for d in documents], [str(self.doc), str(self.other)])
+
+        restored = ContentViewer()
+        with patch.object(restored, "display_file") as display_file:
+            self.assertTrue(restored.restore_session(documents, str(self.doc)))
+            display_file.assert_not_called()
+        self.assertEqual(restored.get_current_file(), str(self.doc))
+        self.assertIn(str(self.other), restored.content_cache)
+
+        _bump_mtime(self.doc)
+        with patch.object(restored, "display_file") as display_file:
+            self.assertEqual(restored.refresh_stale_session_documents(), [str(self.doc)])
+            display_file.assert_called_once_with(str(self.doc), force_reload=True)
+        self.assertNotIn(str(self.doc), restored.content_cache)
+        self.assertIn(str(self.other), restored.content_cache)
+
+    def test_main_window_saves_and_restores_session(self) -> None:
+        window = MainWindow()
+        self.assertIsNone(window.session_store)  # 测试模式默认不读写快照
+        window.session_store = self.store
+        window.content_viewer._cache_content(str(self.doc), "<p>doc</p>", "markdown")
+        window.content_viewer.current_file_path = str(self.doc)
+        self.assertTrue(window._save_session_snapshot())
+        window.close()
+
+        restored = MainWindow()
+        restored.session_store = self.store
+        try:
+            self.assertTrue(restored._restore_session_snapshot())
+            self.assertEqual(restored.content_viewer.get_current_file(), str(self.doc))
+            self.assertIn("doc.md", restored.windowTitle())
+        finally:
+            restored.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
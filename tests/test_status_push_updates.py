@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""状态版本推送与状态栏防抖刷新测试。"""
+
+import unittest
+from unittest.mock import patch
+
+from tests._utils import get_qapp
+
+from core.application_state_manager import ApplicationStateManager
+from core.snapshot_manager import SnapshotManager
+from ui.main_window import MainWindow
+
+
+class TestStateVersioning(unittest.TestCase):
+    def test_updates_bump_version_and_notify(self) -> None:
+        manager = ApplicationStateManager()
+        events = []
+        manager.add_change_listener(lambda version, domain: events.append((version, domain)))
+
+        self.assertEqual(manager.get_version(), 0)
+        self.assertTrue(manager.update_render_status({"renderer_type": "markdown_processor"}))
+        self.assertTrue(manager.update_link_status({"last_action": "open"}))
+        self.assertEqual(manager.get_version(), 2)
+        self.assertEqual(events, [(1, "render"), (2, "link")])
+
+        # 回调异常不影响写入
+        manager.add_change_listener(lambda version, domain: 1 / 0)
+        self.assertTrue(manager.update_render_status({"renderer_type": "markdown"}))
+        self.assertEqual(manager.get_version(), 3)
+
+    def test_direct_snapshot_writes_are_counted_once(self) -> None:
+        manager = ApplicationStateManager()
+        manager.set_snapshot_manager(SnapshotManager())
+        events = []
+        manager.add_change_listener(lambda version, domain: events.append(domain))
+
+        manager.get_snapshot_manager().save_link_snapshot({"last_action": "open"})
+        manager.update_render_status({"renderer_type": "markdown"})
+        self.assertEqual(events, ["link", "render"])
+        self.assertEqual(manager.get_version(), 2)
+
+
+class TestStatusBarPushRefresh(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # 绑定到类属性，确保不被垃圾回收
+        cls._app = get_qapp()
+
+    def setUp(self) -> None:
+        self.window = MainWindow()
+
+    def tearDown(self) -> None:
+        self.window.close()
+
+    def test_no_polling_and_changes_are_coalesced(self) -> None:
+        window = self.window
+        self.assertIsNone(window._status_poll_timer)
+        timer = window._status_debounce_timer
+        self.assertTrue(timer.isSingleShot())
+
+        state_manager = window.state_manager
+        window._status_debounce_timer.stop()
+        window._refresh_status_bar_if_changed()
+
+        with patch.object(window, "update_status_bar", wraps=window.update_status_bar) as update:
+            # 没有变更时不重新渲染
+            self.assertFalse(window._refresh_status_bar_if_changed())
+            update.assert_not_called()
+
+            for renderer in ("markdown", "markdown_processor", "markdown"):
+                state_manager.update_render_status({"renderer_type": renderer})
+            self.assertTrue(timer.isActive())
+            update.assert_not_called()
+
+            timer.stop()
+            timer.timeout.emit()
+            timer.timeout.emit()
+            self.assertEqual(update.call_count, 1)
+
+        stats = window.get_status_refresh_stats()
+        self.assertEqual(stats["version"], state_manager.get_version())
+        self.assertGreaterEqual(stats["notifications"], 3)
+        self.assertGreaterEqual(stats["skipped"], 2)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
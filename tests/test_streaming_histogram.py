@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+StreamingHistogram 与 PerformanceMetrics 分位数统计测试
+"""
+
+import random
+import unittest
+
+from core.performance_metrics import PerformanceMetrics
+from core.streaming_histogram import StreamingHistogram
+
+
+class TestStreamingHistogram(unittest.TestCase):
+    """流式直方图精度、合并与内存上限"""
+
+    def test_percentiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(0, 1) for _ in range(5000)]
+        histogram = StreamingHistogram(relative_accuracy=0.01)
+        for value in values:
+            histogram.record(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            self.assertAlmostEqual(histogram.quantile(q) / exact, 1.0, delta=0.02)
+        self.assertEqual(histogram.quantile(1.0), max(values))
+        self.assertEqual(histogram.count, 5000)
+
+    def test_merge_and_roundtrip(self):
+        left, right = StreamingHistogram(), StreamingHistogram()
+        for value in range(1, 501):
+            left.record(value)
+        for value in range(501, 1001):
+            right.record(value)
+        left.merge(right)
+        restored = StreamingHistogram.from_dict(left.to_dict())
+
+        self.assertEqual(restored.count, 1000)
+        self.assertEqual(restored.max, 1000)
+        self.assertAlmostEqual(restored.quantile(0.5), 500, delta=10)
+
+    def test_bucket_count_is_bounded(self):
+        histogram = StreamingHistogram(relative_accuracy=0.01, max_buckets=64)
+        values = sorted(step * 10.0 ** exponent for exponent in range(-6, 6) for step in range(1, 100))
+        for value in values:
+            histogram.record(value)
+        self.assertLessEqual(len(histogram.to_dict()["buckets"]), 64)
+        # 折叠只影响低分位，高分位仍保持相对精度
+        exact = values[int(0.99 * (len(values) - 1))]
+        self.assertAlmostEqual(histogram.quantile(0.99) / exact, 1.0, delta=0.02)
+
+    def test_values_below_collapsed_bucket_do_not_grow_buckets(self):
+        histogram = StreamingHistogram(relative_accuracy=0.01, max_buckets=16)
+        for step in range(32):
+            histogram.record(100 * 1.05 ** step)
+        buckets = dict(histogram.to_dict()["buckets"])
+        self.assertEqual(len(buckets), 16)
+
+        # 低于折叠桶的值直接计入折叠桶，其余桶保持不变
+        for value in (0.001, 0.5, 3.0, 99.0):
+            histogram.record(value)
+        after = histogram.to_dict()["buckets"]
+        floor = min(buckets, key=int)
+        self.assertEqual(set(after), set(buckets))
+        self.assertEqual(after[floor], buckets[floor] + 4)
+        self.assertEqual(histogram.count, 36)
+        self.assertEqual(histogram.min, 0.001)
+
+        other = StreamingHistogram(relative_accuracy=0.01, max_buckets=16)
+        other.record(0.002)
+        histogram.merge(other)
+        self.assertEqual(histogram.to_dict()["buckets"][floor], buckets[floor] + 5)
+
+    def test_zero_values(self):
+        histogram = StreamingHistogram()
+        histogram.record(0)
+        histogram.record(0)
+        histogram.record(5)
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+        self.assertIsNone(StreamingHistogram().quantile(0.5))
+
+
+class TestPerformanceMetricsHistograms(unittest.TestCase):
+    """PerformanceMetrics 直方图/计时器分布与分位数阈值"""
+
+    def test_histogram_snapshot_exposes_percentiles(self):
+        metrics = PerformanceMetrics()
+        for value in range(1, 101):
+            metrics.record_histogram("render.latency_ms", value)
+
+        snapshot = metrics.get_metrics_snapshot(include_histograms=True)
+        stats = snapshot["histograms"]["render.latency_ms"]
+        self.assertEqual(stats["count"], 100)
+        self.assertEqual(stats["max"], 100)
+        self.assertAlmostEqual(stats["p50"], 50, delta=1.5)
+        self.assertAlmostEqual(stats["p99"], 99, delta=2)
+
+    def test_timers_in_same_millisecond_do_not_collide(self):
+        metrics = PerformanceMetrics()
+        for _ in range(10):
+            metrics.record_timer("resolve", 0.001)
+
+        snapshot = metrics.get_metrics_snapshot()
+        self.assertEqual(len([k for k in snapshot["timers"] if k.startswith("resolve_")]), 10)
+        self.assertEqual(snapshot["timer_stats"]["resolve"]["count"], 10)
+
+    def test_percentile_threshold_notifies_listener(self):
+        metrics = PerformanceMetrics()
+        metrics._thresholds = {"render.latency_ms": {"p95_max": 50, "severity_over": "ERROR"}}
+        metrics._percentile_min_samples = 10
+        metrics._percentile_check_interval = 10
+        captured = []
+        metrics.register_threshold_listener(lambda name, value, meta: captured.append((name, value, meta)))
+
+        for value in range(1, 21):
+            metrics.record_histogram("render.latency_ms", value)
+        self.assertEqual(captured, [])
+
+        for _ in range(20):
+            metrics.record_histogram("render.latency_ms", 200)
+        self.assertTrue(captured)
+        name, value, meta = captured[-1]
+        self.assertEqual(name, "render.latency_ms")
+        self.assertEqual(meta["percentile"], "p95")
+        self.assertEqual(meta["severity"], "ERROR")
+        self.assertGreater(value, 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
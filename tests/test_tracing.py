@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tracer Span 追踪与 Chrome trace 导出测试
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.file_resolver import FileResolver
+from core.tracing import Tracer, span, traced
+
+
+class TestTracer(unittest.TestCase):
+    """Span 嵌套、环形缓冲与导出"""
+
+    def setUp(self):
+        self.tracer = Tracer()
+        self._saved = (self.tracer.enabled, self.tracer._spans.maxlen)
+        self.tracer.configure(enabled=True)
+        self.tracer.clear()
+
+    def tearDown(self):
+        enabled, capacity = self._saved
+        self.tracer.configure(enabled=enabled, capacity=capacity)
+        self.tracer.clear()
+
+    def test_nested_spans_share_correlation_id(self):
+        with span("viewer.display_file", component="content_viewer") as root:
+            with span("renderer.render", component="renderer") as child:
+                child.set_attribute("cached", False)
+
+        spans = {s.name: s for s in self.tracer.get_spans()}
+        self.assertEqual(spans["renderer.render"].parent_id, root.span_id)
+        self.assertEqual(spans["renderer.render"].correlation_id, root.correlation_id)
+        self.assertTrue(root.correlation_id.startswith("display_file_content_viewer_"))
+        self.assertGreaterEqual(spans["viewer.display_file"].duration_ns, spans["renderer.render"].duration_ns)
+
+    def test_decorator_records_errors(self):
+        @traced("unit.fail", component="test")
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            fail()
+        self.assertEqual(self.tracer.get_spans()[-1].attributes["error"], "ValueError")
+
+    def test_ring_buffer_and_disabled_mode(self):
+        self.tracer.configure(capacity=3)
+        for i in range(5):
+            with span(f"unit.{i}"):
+                pass
+        self.assertEqual([s.name for s in self.tracer.get_spans()], ["unit.2", "unit.3", "unit.4"])
+
+        self.tracer.configure(enabled=False)
+        with span("unit.off") as off:
+            off.set_attribute("ignored", True)
+        self.assertEqual(len(self.tracer.get_spans()), 3)
+
+    def test_chrome_trace_export(self):
+        with span("renderer.render", component="renderer", size=10):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.tracer.write_chrome_trace(Path(tmp) / "trace.json")
+            data = json.loads(path.read_text(encoding="utf-8"))
+        complete = [e for e in data["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual(complete[0]["name"], "renderer.render")
+        self.assertEqual(complete[0]["cat"], "renderer")
+        self.assertEqual(complete[0]["args"]["size"], 10)
+        self.assertIn("correlation_id", complete[0]["args"])
+        self.assertTrue(any(e["ph"] == "M" for e in data["traceEvents"]))
+
+    def test_file_resolver_is_instrumented(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "doc.md"
+            target.write_text("# hi", encoding="utf-8")
+            FileResolver().resolve_file_path(target)
+
+        spans = {s.name: s for s in self.tracer.get_spans()}
+        resolve = spans["file_resolver.resolve_file_path"]
+        self.assertEqual(spans["file_resolver.detect_encoding"].parent_id, resolve.span_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
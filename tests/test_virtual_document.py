@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""超大 Markdown 虚拟化渲染测试。"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from tests._utils import get_qapp
+
+from core.virtual_document import VirtualDocument
+from ui.content_viewer import ContentViewer, _CVPage
+
+_SOURCE = (
+    "前言\n\n"
+    "# 第一章\n\n正文一\n\n"
+    "```\n# 代码里的井号不是标题\n```\n\n"
+    "## 1.1 小节 ##\n\n" + "重复段落\n\n" * 400 +
+    "#不是标题\n\n"
+    "### 结尾\n最后一行\n"
+)
+
+
+class TestVirtualDocument(unittest.TestCase):
+    def test_sections_follow_headings_outside_fences(self) -> None:
+        document = VirtualDocument(_SOURCE, max_section_chars=1024)
+        headed = [(s.heading, s.level) for s in document.sections if s.heading]
+        self.assertEqual(headed, [("# 第一章", 1), ("## 1.1 小节 ##", 2), ("### 结尾", 3)])
+        self.assertEqual(document.sections[0].heading, "")  # 前言
+        self.assertIn("代码里的井号", document.section_markdown(1))
+        # 过长的小节在空行处继续切分，拼接后与源文本一致
+        self.assertGreater(len(document.sections), 5)
+        self.assertEqual(document.source[document.sections[0].body_start:document.sections[-1].body_end],
+                         _SOURCE)
+        self.assertEqual(document.skeleton_markdown(), "# 第一章\n\n## 1.1 小节 ##\n\n### 结尾\n")
+
+    def test_skeleton_keeps_heading_ids_and_sections_render_on_demand(self) -> None:
+        document = VirtualDocument("# A\n\ntext\n\n## B\n\nmore\n")
+        skeleton = document.build_skeleton_html(
+            '<style>p{}</style>\n<h1 id="a">A</h1>\n<h2 id="b">B</h2>\n')
+        self.assertLess(skeleton.index("<style>"), skeleton.index('data-section="0"'))
+        self.assertLess(skeleton.index('id="a"'), skeleton.index('data-section="0"'))
+        self.assertLess(skeleton.index('data-section="0"'), skeleton.index('id="b"'))
+        self.assertIn(document.token, skeleton)
+
+        calls = []
+
+        def render(text):
+            calls.append(text)
+            return "<style>p{}</style>\n<p>%s</p>" % text.strip()
+
+        self.assertEqual(document.render_section(0, render), "<p>text</p>")
+        self.assertEqual(document.render_section(0, render), "<p>text</p>")
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(document.render_section(9, render))
+        self.assertIn('"<p>text</p>"', document.fill_script(0, "<p>text</p>"))
+
+
+class TestContentViewerVirtualization(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # 绑定到类属性，确保不被垃圾回收
+        cls._app = get_qapp()
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "huge.md"
+        self.path.write_text(_SOURCE, encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_large_file_shows_skeleton_and_fills_sections(self) -> None:
+        viewer = ContentViewer()
+        viewer._virtualize_min_bytes = 1024
+        viewer.display_file(str(self.path))
+
+        document = viewer._virtual_document
+        self.assertIsNotNone(document)
+        html = viewer.web_engine_view._html
+        self.assertIn("第一章", html)
+        self.assertIn('class="lmv-section"', html)
+        self.assertNotIn("重复段落", html)
+        self.assertNotIn(str(self.path), viewer.content_cache)
+
+        page = viewer.web_engine_view.page()
+        with patch.object(page, "runJavaScript") as run_js:
+            _CVPage(viewer).javaScriptConsoleMessage(0, f"LMVSECTION:{document.token}:1", 0, "")
+            script = run_js.call_args[0][0]
+            self.assertIn(json.dumps("<p>正文一</p>")[1:-1], script)
+            viewer._handle_section_request("stale-token:1")
+            viewer._handle_section_request(f"{document.token}:999")
+            self.assertEqual(run_js.call_count, 1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
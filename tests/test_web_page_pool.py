@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""预热 WebEngine 页面池测试。"""
+
+import unittest
+from unittest.mock import patch
+
+from tests._utils import get_qapp
+
+from ui.content_viewer import ContentViewer
+from ui.web_page_pool import WebPagePool
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.resets = 0
+        self.deleted = False
+
+    def deleteLater(self) -> None:
+        self.deleted = True
+
+
+class TestWebPagePool(unittest.TestCase):
+    def _pool(self, size: int = 2) -> WebPagePool:
+        def reset(page: _FakePage) -> None:
+            page.resets += 1
+        return WebPagePool(_FakePage, size=size, reset=reset)
+
+    def test_released_pages_are_reset_and_reused(self) -> None:
+        pool = self._pool()
+        first = pool.acquire()
+        pool.release(first)
+        pool.release(first)  # 重复归还被忽略
+        self.assertEqual(first.resets, 1)
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(pool.stats(), {'size': 2, 'idle': 0, 'in_use': 1,
+                                        'created': 1, 'destroyed': 0, 'reused': 1})
+
+    def test_prewarm_limit_and_drain(self) -> None:
+        pool = self._pool(size=1)
+        self.assertEqual(pool.prewarm(), 1)
+        self.assertEqual(pool.prewarm(), 0)
+        current = pool.acquire()
+        extra = pool.acquire()
+        pool.release(current)
+        pool.release(extra)  # 空闲已满，直接销毁
+        self.assertTrue(extra.deleted)
+        self.assertFalse(current.deleted)
+
+        pool.drain()
+        self.assertTrue(current.deleted)
+        stats = pool.stats()
+        self.assertEqual((stats['created'], stats['destroyed'], stats['idle']), (2, 2, 0))
+        with self.assertRaises(RuntimeError):
+            pool.acquire()
+
+    def test_failed_reset_destroys_page(self) -> None:
+        def broken_reset(page: _FakePage) -> None:
+            raise RuntimeError("boom")
+        pool = WebPagePool(_FakePage, size=2, reset=broken_reset)
+        page = pool.acquire()
+        pool.release(page)
+        self.assertTrue(page.deleted)
+        self.assertEqual(pool.stats()['idle'], 0)
+
+
+class TestContentViewerPagePool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # 绑定到类属性，确保不被垃圾回收
+        cls._app = get_qapp()
+
+    def test_preinstalled_bridge_skips_reinjection(self) -> None:
+        viewer = ContentViewer()
+        self.assertEqual(viewer.get_cache_info()['page_pool'], {'enabled': False})
+        page = viewer.web_engine_view.page()
+        with patch.object(page, "runJavaScript") as run_js:
+            viewer._on_page_load_finished(True)
+            run_js.assert_called_once()
+        page.link_bridge_installed = True
+        with patch.object(page, "runJavaScript") as run_js:
+            viewer._on_page_load_finished(True)
+            run_js.assert_not_called()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
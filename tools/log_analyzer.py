@@ -3,16 +3,19 @@
 """日志索引与性能分析工具 (LAD-IMPL-008).
 
 - :class:`LogAnalyzer` 提供关联 ID、时间区间与多条件筛选查询。
-- :class:`PerformanceAnalyzer` 针对导入/渲染流程输出统计与性能告警。
+- :class:`PerformanceAnalyzer` 针对导入/渲染流程输出统计与性能告警；分析器提供
+  侧车索引列数据时走 :mod:`tools.log_columnar` 的向量化路径。
 """
 
 from __future__ import annotations
 
+import heapq
 import json
 import logging
+import os
 import statistics
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
@@ -68,57 +71,114 @@ class LogAnalyzer:
         self._correlation_map: Dict[str, List[IndexedLogRecord]] = {}
         self._last_index_mtime: Optional[float] = None
 
+        # 增量索引状态：已解析到的字节偏移、行号与文件 inode
+        self._index_offset: Optional[int] = None
+        self._index_line: int = 0
+        self._index_inode: Optional[int] = None
+        self._index_stats: Dict[str, int] = {"full_builds": 0, "incremental_updates": 0}
+
     # ------------------------------------------------------------------
     # 索引管理
     # ------------------------------------------------------------------
     def ensure_index(self, force: bool = False) -> None:
+        """确保索引与日志文件同步。
+
+        仅在首次、强制、轮转（inode 变化）或截断（文件变短）时全量重建，
+        其余情况只解析上次偏移之后追加的行。
+        """
         path = self.log_file_path
-        if force or not self._entries:
+        if force or self._index_offset is None:
             self.build_index()
             return
         try:
-            mtime = path.stat().st_mtime
+            stat = path.stat()
         except FileNotFoundError:
             return
-        if self._last_index_mtime is None or mtime > self._last_index_mtime:
+
+        if stat.st_ino != self._index_inode or stat.st_size < self._index_offset:
+            LOGGER.info("检测到日志轮转或截断，重建索引: %s", path)
             self.build_index()
+            return
+        if stat.st_size > self._index_offset:
+            self._index_stats["incremental_updates"] += 1
+            self._index_tail()
 
     def build_index(self) -> None:
         self._entries.clear()
         self._correlation_map.clear()
+        self._index_offset = 0
+        self._index_line = 0
+        self._index_inode = None
+        self._index_stats["full_builds"] += 1
+        self._index_tail()
 
+    def get_index_stats(self) -> Dict[str, Any]:
+        return {
+            **self._index_stats,
+            "entries": len(self._entries),
+            "offset": self._index_offset,
+            "lines": self._index_line,
+        }
+
+    def _index_tail(self) -> None:
+        """从 ``_index_offset`` 起解析新增的完整行并合并进索引。"""
         path = self.log_file_path
         try:
-            handle = path.open("r", encoding="utf-8")
+            handle = path.open("rb")
         except FileNotFoundError:
             LOGGER.info("日志文件不存在: %s", path)
             return
 
+        new_records: List[IndexedLogRecord] = []
         with handle as fh:
-            for line_num, line in enumerate(fh, 1):
+            stat = os.fstat(fh.fileno())
+            offset = self._index_offset or 0
+            fh.seek(offset)
+            line_num = self._index_line
+            for raw_line in fh:
+                if not raw_line.endswith(b"\n"):
+                    # 写入中的半行，留待下次追加完成后再解析
+                    break
+                offset += len(raw_line)
+                line_num += 1
                 try:
-                    raw = json.loads(line)
-                except json.JSONDecodeError:
+                    raw = json.loads(raw_line.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
                     LOGGER.debug("忽略无法解析的日志行 %s", line_num)
                     continue
+                if not isinstance(raw, dict):
+                    continue
 
                 record = IndexedLogRecord(
                     line=line_num,
                     timestamp=_parse_iso_timestamp(raw.get("timestamp")),
                     entry=raw,
                 )
-                self._entries.append(record)
+                new_records.append(record)
 
                 cid = raw.get("correlation_id")
                 if cid:
                     self._correlation_map.setdefault(cid, []).append(record)
 
-        self._entries.sort(key=lambda rec: (rec.timestamp or datetime.min, rec.line))
+        self._index_offset = offset
+        self._index_line = line_num
+        self._index_inode = stat.st_ino
+        self._last_index_mtime = stat.st_mtime
+        self._merge_records(new_records)
 
-        try:
-            self._last_index_mtime = path.stat().st_mtime
-        except FileNotFoundError:
-            self._last_index_mtime = None
+    def _merge_records(self, new_records: List[IndexedLogRecord]) -> None:
+        """将新增记录按时间顺序合并，避免对已有索引整体重排。"""
+        if not new_records:
+            return
+        new_records.sort(key=self._sort_key)
+        if not self._entries or self._sort_key(self._entries[-1]) <= self._sort_key(new_records[0]):
+            self._entries.extend(new_records)
+            return
+        self._entries = list(heapq.merge(self._entries, new_records, key=self._sort_key))
+
+    @staticmethod
+    def _sort_key(record: IndexedLogRecord) -> Tuple[datetime, int]:
+        return (record.timestamp or datetime.min, record.line)
 
     # ------------------------------------------------------------------
     # 查询接口
@@ -201,6 +261,9 @@ class PerformanceAnalyzer:
         base_filters = {"operation": "import", "component": "importer"}
         if filters:
             base_filters.update(filters)
+        engine = self._columnar_engine(base_filters)
+        if engine is not None:
+            return engine.import_stats(time_range, base_filters)
         logs = self.analyzer.query(start=time_range[0] if time_range else None,
                                    end=time_range[1] if time_range else None,
                                    filters=base_filters)
@@ -214,14 +277,77 @@ class PerformanceAnalyzer:
         base_filters = {"operation": "render", "component": "renderer"}
         if filters:
             base_filters.update(filters)
+        engine = self._columnar_engine(base_filters)
+        if engine is not None:
+            return engine.grouped_stats("renderer_group", time_range, base_filters)
         logs = self.analyzer.query(start=time_range[0] if time_range else None,
                                    end=time_range[1] if time_range else None,
                                    filters=base_filters)
         return self._build_render_stats(logs)
 
+    def analyze_component_breakdown(
+        self,
+        time_range: Optional[Tuple[str, str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """按 component 拆分的计数、成功率与耗时统计。"""
+        engine = self._columnar_engine(filters)
+        if engine is not None:
+            return engine.grouped_stats("component", time_range, filters)
+        logs = self.analyzer.query(start=time_range[0] if time_range else None,
+                                   end=time_range[1] if time_range else None,
+                                   filters=filters)
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in logs:
+            grouped.setdefault(str(entry.get("component") or "unknown"), []).append(entry)
+        return {component: self._build_group_stats(entries) for component, entries in grouped.items()}
+
+    def rollup(
+        self,
+        bucket_seconds: int,
+        time_range: Optional[Tuple[str, str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """按固定时间窗口汇总，供仪表盘绘制趋势。"""
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+        engine = self._columnar_engine(filters)
+        if engine is not None:
+            return engine.rollup(bucket_seconds, time_range, filters)
+        logs = self.analyzer.query(start=time_range[0] if time_range else None,
+                                   end=time_range[1] if time_range else None,
+                                   filters=filters)
+        buckets: Dict[float, List[Dict[str, Any]]] = {}
+        for entry in logs:
+            ts = _parse_iso_timestamp(entry.get("timestamp"))
+            if ts is None:
+                continue
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            key = (ts.timestamp() // bucket_seconds) * bucket_seconds
+            buckets.setdefault(key, []).append(entry)
+
+        result: List[Dict[str, Any]] = []
+        for key in sorted(buckets):
+            stats = self._build_group_stats(buckets[key])
+            stats.pop("alerts")
+            result.append({
+                "bucket_start": datetime.fromtimestamp(key, tz=timezone.utc).isoformat(),
+                "bucket_seconds": bucket_seconds,
+                **stats,
+            })
+        return result
+
     # ------------------------------------------------------------------
     # 内部统计实现
     # ------------------------------------------------------------------
+    def _columnar_engine(self, filters: Optional[Dict[str, Any]]):
+        from tools.log_columnar import ColumnarPerformanceEngine
+
+        if not ColumnarPerformanceEngine.supports(self.analyzer, filters):
+            return None
+        return ColumnarPerformanceEngine(self.analyzer)
+
     def _build_import_stats(self, logs: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
         entries = list(logs)
         total = len(entries)
@@ -244,16 +370,15 @@ class PerformanceAnalyzer:
             renderer = entry.get("renderer_type") or entry.get("details", {}).get("renderer_type", "unknown")
             grouped.setdefault(renderer, []).append(entry)
 
-        result: Dict[str, Any] = {}
-        for renderer, entries in grouped.items():
-            durations = self._extract_durations(entries)
-            result[renderer] = {
-                "count": len(entries),
-                "success_rate": self._compute_success_rate(entries),
-                "duration_statistics": self._summarise_durations(durations),
-                "alerts": self._collect_alerts(entries),
-            }
-        return result
+        return {renderer: self._build_group_stats(entries) for renderer, entries in grouped.items()}
+
+    def _build_group_stats(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "count": len(entries),
+            "success_rate": self._compute_success_rate(entries),
+            "duration_statistics": self._summarise_durations(self._extract_durations(entries)),
+            "alerts": self._collect_alerts(entries),
+        }
 
     def _extract_durations(self, entries: Iterable[Dict[str, Any]]) -> List[float]:
         durations: List[float] = []
@@ -276,6 +401,8 @@ class PerformanceAnalyzer:
                 "avg_ms": 0,
                 "max_ms": 0,
                 "min_ms": 0,
+                "p50_ms": 0,
+                "p90_ms": 0,
                 "p95_ms": 0,
                 "p99_ms": 0,
             }
@@ -286,6 +413,8 @@ class PerformanceAnalyzer:
             "avg_ms": sum(durations_sorted) / len(durations_sorted),
             "max_ms": durations_sorted[-1],
             "min_ms": durations_sorted[0],
+            "p50_ms": self._percentile(durations_sorted, 50),
+            "p90_ms": self._percentile(durations_sorted, 90),
             "p95_ms": self._percentile(durations_sorted, 95),
             "p99_ms": self._percentile(durations_sorted, 99),
         }
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""基于侧车索引列数据的列式性能统计 (LAD-IMPL-008 扩展).
+
+:class:`ColumnarPerformanceEngine` 直接读取 :class:`~tools.log_sidecar_index.SidecarIndex`
+中的级别、组件等列与耗时样本，用 NumPy 向量化计算分位数、成功率、按组件拆分与时间分桶汇总，
+全程不重新解码原始 JSON（仅告警行需要读取原文）。NumPy 不可用时由
+:class:`~tools.log_analyzer.PerformanceAnalyzer` 回退到逐行统计。
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from tools.log_analyzer import _parse_iso_timestamp
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# 可在列上直接求值的过滤字段（与 LogAnalyzer._matches 的顶层字段语义一致）
+FILTERABLE_COLUMNS = ("level", "operation", "component", "renderer_type")
+ALERT_SEVERITIES = ("WARNING", "ERROR", "CRITICAL")
+PERCENTILES = (50, 90, 95, 99)
+
+Selection = Tuple[Any, Any]  # (SidecarIndex, 行下标数组)
+
+
+class ColumnarPerformanceEngine:
+    """列式聚合引擎，接收提供 ``column_indexes()`` 的分析器。"""
+
+    def __init__(self, analyzer: Any) -> None:
+        self.analyzer = analyzer
+
+    @staticmethod
+    def supports(analyzer: Any, filters: Optional[Dict[str, Any]] = None) -> bool:
+        if not NUMPY_AVAILABLE or not hasattr(analyzer, "column_indexes"):
+            return False
+        return all(
+            key in FILTERABLE_COLUMNS and (value is None or isinstance(value, str))
+            for key, value in (filters or {}).items()
+        )
+
+    # ------------------------------------------------------------------
+    # 行选择
+    # ------------------------------------------------------------------
+    def select(
+        self,
+        time_range: Optional[Tuple[Optional[str], Optional[str]]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Selection]:
+        start, end = time_range or (None, None)
+        start_dt = _parse_iso_timestamp(start) if isinstance(start, str) else start
+        end_dt = _parse_iso_timestamp(end) if isinstance(end, str) else end
+
+        selections: List[Selection] = []
+        for index in self.analyzer.column_indexes():
+            lo, hi = index.seek_time_range(start_dt, end_dt)
+            if lo >= hi:
+                continue
+            mask = np.ones(hi - lo, dtype=bool)
+            for key, expected in (filters or {}).items():
+                codes = _column(index, key)[lo:hi]
+                mask &= np.isin(codes, _matching_codes(index, expected))
+            rows = np.flatnonzero(mask) + lo
+            if rows.size:
+                selections.append((index, rows))
+        return selections
+
+    def group(self, selections: List[Selection], column: str) -> Dict[str, List[Selection]]:
+        """按字典编码列分组，返回 名称 → 各文件行选择。"""
+        groups: Dict[str, List[Selection]] = {}
+        for index, rows in selections:
+            codes = _column(index, column)[rows]
+            for code in np.unique(codes):
+                name = index.symbols[int(code)] or "unknown"
+                groups.setdefault(name, []).append((index, rows[codes == code]))
+        return groups
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+    def import_stats(self, time_range=None, filters=None) -> Dict[str, Any]:
+        selections = self.select(time_range, filters)
+        total = _count(selections)
+        success = self._success_count(selections)
+        return {
+            "total_imports": total,
+            "successful_imports": success,
+            "failed_imports": total - success,
+            "success_rate": (success / total) if total else 0,
+            "duration_statistics": summarise_durations(self._durations(selections)),
+            "alerts": self._collect_alerts(selections),
+        }
+
+    def grouped_stats(self, column: str, time_range=None, filters=None) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for name, parts in self.group(self.select(time_range, filters), column).items():
+            total = _count(parts)
+            result[name] = {
+                "count": total,
+                "success_rate": (self._success_count(parts) / total) if total else 0.0,
+                "duration_statistics": summarise_durations(self._durations(parts)),
+                "alerts": self._collect_alerts(parts),
+            }
+        return result
+
+    def rollup(
+        self,
+        bucket_seconds: int,
+        time_range=None,
+        filters=None,
+        group_by: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """按固定时间窗口汇总计数、成功率与耗时分位数。"""
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+        selections = self.select(time_range, filters)
+        parts = self.group(selections, group_by) if group_by else {None: selections}
+
+        buckets: Dict[float, Dict[str, Any]] = {}
+        for name, group_parts in parts.items():
+            ts, success, sample_ts, sample_values = self._bucket_columns(group_parts)
+            keys = np.floor(ts / bucket_seconds) * bucket_seconds
+            sample_keys = np.floor(sample_ts / bucket_seconds) * bucket_seconds
+            for key in np.unique(keys):
+                in_bucket = keys == key
+                count = int(in_bucket.sum())
+                stats = {
+                    "count": count,
+                    "success_rate": float(success[in_bucket].sum()) / count,
+                    "duration_statistics": summarise_durations(sample_values[sample_keys == key]),
+                }
+                bucket = buckets.setdefault(float(key), {
+                    "bucket_start": datetime.fromtimestamp(float(key), tz=timezone.utc).isoformat(),
+                    "bucket_seconds": bucket_seconds,
+                })
+                if name is None:
+                    bucket.update(stats)
+                else:
+                    bucket.setdefault("groups", {})[name] = stats
+        return [buckets[key] for key in sorted(buckets)]
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _durations(selections: List[Selection]):
+        if not selections:
+            return np.empty(0)
+        return np.concatenate([_samples(index, rows)[1] for index, rows in selections])
+
+    @staticmethod
+    def _success_mask(index: Any, rows: Any):
+        info_codes = [code for code, value in enumerate(index.symbols) if value and value.upper() == "INFO"]
+        return np.isin(_column(index, "level")[rows], info_codes)
+
+    def _success_count(self, selections: List[Selection]) -> int:
+        return int(sum(self._success_mask(index, rows).sum() for index, rows in selections))
+
+    def _bucket_columns(self, selections: List[Selection]):
+        """返回有时间戳的行的 (时间, 成功标记) 与其耗时样本的 (所属行时间, 样本值)。"""
+        ts_parts, success_parts, sample_ts_parts, sample_parts = [], [], [], []
+        for index, rows in selections:
+            ts = np.frombuffer(index.timestamps, dtype=np.float64)[rows]
+            timed = np.isfinite(ts)
+            ts_parts.append(ts[timed])
+            success_parts.append(self._success_mask(index, rows)[timed])
+            owners, values = _samples(index, rows)
+            sample_timed = timed[owners]
+            sample_ts_parts.append(ts[owners][sample_timed])
+            sample_parts.append(values[sample_timed])
+        if not ts_parts:
+            return np.empty(0), np.empty(0, dtype=bool), np.empty(0), np.empty(0)
+        return (np.concatenate(ts_parts), np.concatenate(success_parts),
+                np.concatenate(sample_ts_parts), np.concatenate(sample_parts))
+
+    @staticmethod
+    def _collect_alerts(selections: List[Selection]) -> List[Dict[str, Any]]:
+        alerts: List[Dict[str, Any]] = []
+        for index, rows in selections:
+            alert_codes = [
+                code for code, value in enumerate(index.symbols) if value and value.upper() in ALERT_SEVERITIES
+            ]
+            alert_rows = rows[np.isin(_column(index, "severity")[rows], alert_codes)]
+            if not alert_rows.size:
+                continue
+            offsets = np.frombuffer(index.offsets, dtype=np.int64)[alert_rows].tolist()
+            for entry in index.read_entries(offsets):
+                alerts.append({
+                    "timestamp": entry.get("timestamp"),
+                    "message": entry.get("message"),
+                    "severity": entry.get("severity") or entry.get("details", {}).get("severity"),
+                    "correlation_id": entry.get("correlation_id"),
+                })
+        return alerts
+
+
+def summarise_durations(durations: Any) -> Dict[str, Any]:
+    """与 PerformanceAnalyzer._summarise_durations 输出一致的向量化实现。"""
+    values = np.asarray(durations, dtype=np.float64)
+    values = values[np.isfinite(values) & (values != 0)]
+    if not values.size:
+        summary = {"count": 0, "avg_ms": 0, "max_ms": 0, "min_ms": 0}
+        summary.update({f"p{p}_ms": 0 for p in PERCENTILES})
+        return summary
+
+    values = np.sort(values)
+    count = int(values.size)
+    summary = {
+        "count": count,
+        # 与行式路径相同的求和顺序与插值公式 (statistics.quantiles inclusive)，保证结果逐位一致
+        "avg_ms": sum(values.tolist()) / count,
+        "max_ms": float(values[-1]),
+        "min_ms": float(values[0]),
+    }
+    for p in PERCENTILES:
+        if count == 1:
+            summary[f"p{p}_ms"] = float(values[0])
+            continue
+        j, delta = divmod(p * (count - 1), 100)
+        summary[f"p{p}_ms"] = (float(values[j]) * (100 - delta) + float(values[j + 1]) * delta) / 100
+    return summary
+
+
+def _count(selections: List[Selection]) -> int:
+    return int(sum(rows.size for _, rows in selections))
+
+
+def _column(index: Any, name: str):
+    column = index.columns[name]
+    return np.frombuffer(column, dtype=np.dtype(f"u{column.itemsize}"))
+
+
+def _samples(index: Any, rows: Any):
+    """返回属于 ``rows`` 的耗时样本：(样本所属行在 ``rows`` 中的下标, 样本值)。"""
+    sample_offsets = np.frombuffer(index.sample_offsets, dtype=np.int64)
+    sample_values = np.frombuffer(index.sample_values, dtype=np.float64)
+    row_offsets = np.frombuffer(index.offsets, dtype=np.int64)[rows]
+    if not row_offsets.size or not sample_offsets.size:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+    order = np.argsort(row_offsets, kind="stable")
+    sorted_offsets = row_offsets[order]
+    positions = np.minimum(np.searchsorted(sorted_offsets, sample_offsets), sorted_offsets.size - 1)
+    hit = sorted_offsets[positions] == sample_offsets
+    return order[positions[hit]], sample_values[hit]
+
+
+def _matching_codes(index: Any, expected: Optional[str]) -> List[int]:
+    if expected is None:
+        return [0]
+    if "*" in expected:
+        pattern = expected.replace("*", "")
+        return [code for code, value in enumerate(index.symbols) if pattern in str(value)]
+    code = index.lookup_symbol(expected)
+    return [code] if code is not None else []
+
+
+__all__ = ["ColumnarPerformanceEngine", "NUMPY_AVAILABLE", "summarise_durations"]
@@ -4,7 +4,7 @@
 
 提供以下能力：
 - 关联 ID 查询、时间区间查询、多字段筛选
-- 导入/渲染性能统计
+- 导入/渲染性能统计、按组件拆分与时间分桶汇总
 - 动态日志级别管理（查询、设置、恢复）
 """
 
@@ -16,7 +16,8 @@ from typing import Dict, Optional
 from flask import Flask, jsonify, request
 
 from core.dynamic_log_config import RuntimeLogLevelController
-from tools.log_analyzer import LogAnalyzer, PerformanceAnalyzer
+from tools.log_analyzer import PerformanceAnalyzer
+from tools.log_sidecar_index import SidecarLogAnalyzer
 
 
 def _build_filters(query_args) -> Dict[str, str]:
@@ -28,7 +29,7 @@ def _build_filters(query_args) -> Dict[str, str]:
 
 
 def create_app(log_file_path: Optional[str] = None) -> Flask:
-    analyzer = LogAnalyzer(log_file_path)
+    analyzer = SidecarLogAnalyzer(log_file_path)
     performance_analyzer = PerformanceAnalyzer(analyzer)
 
     app = Flask(__name__)
@@ -89,6 +90,27 @@ def create_app(log_file_path: Optional[str] = None) -> Flask:
                                                                 filters=filters or None)
         return jsonify(stats)
 
+    @app.route("/api/analytics/component-breakdown")
+    def component_breakdown():
+        start = request.args.get("start")
+        end = request.args.get("end")
+        filters = _build_filters(request.args)
+        stats = performance_analyzer.analyze_component_breakdown(time_range=(start, end) if start or end else None,
+                                                                 filters=filters or None)
+        return jsonify(stats)
+
+    @app.route("/api/analytics/rollup")
+    def rollup():
+        start = request.args.get("start")
+        end = request.args.get("end")
+        bucket = request.args.get("bucket", default=60, type=int)
+        filters = _build_filters(request.args)
+        if bucket <= 0:
+            return jsonify({"error": "bucket must be positive"}), 400
+        buckets = performance_analyzer.rollup(bucket, time_range=(start, end) if start or end else None,
+                                              filters=filters or None)
+        return jsonify({"bucket_seconds": bucket, "count": len(buckets), "buckets": buckets})
+
     @app.route("/api/config/log-level", methods=["GET"])
     def get_log_levels():
         return jsonify({"levels": runtime_controller.get_current_levels()})
@@ -15,20 +15,22 @@ import json
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from tools.log_analyzer import LogAnalyzer, PerformanceAnalyzer
+from tools.log_analyzer import PerformanceAnalyzer
+from tools.log_sidecar_index import SidecarLogAnalyzer
 
 
 class LogQueryCLI:
     def __init__(self, log_file: Optional[str] = None) -> None:
-        self.analyzer = LogAnalyzer(Path(log_file) if log_file else None)
+        self.analyzer = SidecarLogAnalyzer(Path(log_file) if log_file else None)
         self.performance_analyzer = PerformanceAnalyzer(self.analyzer)
 
     def run(self, argv: Optional[list[str]] = None) -> int:
         parser = self._build_parser()
         args = parser.parse_args(argv)
 
-        if args.log_file:
-            self.analyzer = LogAnalyzer(Path(args.log_file))
+        if args.log_file or args.no_rotated:
+            log_file = Path(args.log_file) if args.log_file else self.analyzer.log_file_path
+            self.analyzer = SidecarLogAnalyzer(log_file, include_rotated=not args.no_rotated)
             self.performance_analyzer = PerformanceAnalyzer(self.analyzer)
 
         self.analyzer.ensure_index(force=args.force_reindex)
@@ -49,6 +51,7 @@ class LogQueryCLI:
         parser = argparse.ArgumentParser(description="结构化日志查询工具")
         parser.add_argument("--log-file", help="日志文件路径，默认读取配置文件中定义的路径")
         parser.add_argument("--force-reindex", action="store_true", help="强制重建索引")
+        parser.add_argument("--no-rotated", action="store_true", help="仅查询当前日志文件，不包含轮转文件")
 
         subparsers = parser.add_subparsers(dest="command")
 
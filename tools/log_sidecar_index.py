@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""结构化日志的磁盘侧车索引 (LAD-IMPL-008 扩展).
+
+- :class:`SidecarIndex` 为单个日志文件维护 ``.index/<log>.lidx`` 侧车文件，保存
+  按时间排序的 (timestamp, byte_offset) 紧凑数组、correlation_id → 偏移倒排表，
+  供列式统计使用的级别/组件等字典编码列，以及按行偏移关联的耗时样本。文件由追加写入的数据块组成，
+  每次增量刷新只追加新行的定长列段与新增倒排项，写入量与新增行数成正比。
+- :class:`SidecarLogAnalyzer` 与 :class:`~tools.log_analyzer.LogAnalyzer` 接口一致，
+  但不在内存中保留日志条目：时间区间通过二分查找定位，只对命中的行做 JSON 解码，
+  并可跨轮转文件（``<stem>_YYYYmmdd_HHMMSS.log[.gz]`` / ``<name>.N``）查询。
+"""
+
+from __future__ import annotations
+
+import gzip
+import heapq
+import json
+import logging
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tools.log_analyzer import LogAnalyzer, _parse_iso_timestamp
+
+LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"LADLIDX1"
+# 文件头: 版本号, 字节序 (0 = little, 1 = big)
+_FILE_HEADER = struct.Struct("<HB")
+# 数据块头: 行数, 耗时样本数, 新增符号字节数, 新增 correlation_id 字节数, 倒排项数,
+# 已索引字节数, 已索引行数, inode
+_CHUNK_HEADER = struct.Struct("<IIIIIqqq")
+_NO_INODE = -1
+_NO_TIMESTAMP = float("-inf")
+
+
+def _to_epoch(value: Optional[datetime]) -> float:
+    if value is None:
+        return _NO_TIMESTAMP
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _extract_durations(raw: Dict[str, Any]) -> List[float]:
+    """与 PerformanceAnalyzer._extract_durations 相同的取值规则：
+    ``details.duration_ms`` 优先，否则每个 ``metrics.timers`` 计时器各产出一个样本。"""
+    details = raw.get("details")
+    details = details if isinstance(details, dict) else {}
+    detail_duration = details.get("duration_ms")
+    if detail_duration is not None:
+        try:
+            value = float(detail_duration)
+        except (TypeError, ValueError):
+            return []
+        return [value] if value else []
+    metrics = raw.get("metrics")
+    timers = metrics.get("timers", {}) if isinstance(metrics, dict) else {}
+    if not isinstance(timers, dict):
+        return []
+    samples: List[float] = []
+    for timer in timers.values():
+        if not isinstance(timer, dict):
+            continue
+        try:
+            value = float(timer.get("duration", 0) or 0)
+        except (TypeError, ValueError):
+            continue
+        if value:
+            samples.append(value * 1000)
+    return samples
+
+
+def _extract_column_values(raw: Dict[str, Any]) -> Tuple[Optional[str], ...]:
+    details = raw.get("details")
+    details = details if isinstance(details, dict) else {}
+    values = (
+        raw.get("level"),
+        raw.get("operation"),
+        raw.get("component"),
+        raw.get("renderer_type"),
+        raw.get("renderer_type") or details.get("renderer_type", "unknown"),
+        raw.get("severity") or details.get("severity"),
+    )
+    return tuple(str(value) if value is not None else None for value in values)
+
+
+def _encode_json_list(values: List[Any]) -> bytes:
+    if not values:
+        return b""
+    return json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _open_log(path: Path) -> IO[bytes]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+
+class SidecarIndex:
+    """单个日志文件的持久化索引。"""
+
+    VERSION = 4
+    SUFFIX = ".lidx"
+    # 数据块过多时在下一次保存时整体压实，避免加载时逐块回放的开销持续增长
+    MAX_CHUNKS = 64
+    INDEX_DIR = ".index"
+    # 字典编码列：level/operation/component/renderer_type 为顶层字段，可直接用于过滤；
+    # renderer_group 与 severity 与 PerformanceAnalyzer 的分组/告警取值规则一致
+    COLUMN_FIELDS = ("level", "operation", "component", "renderer_type", "renderer_group", "severity")
+
+    def __init__(self, log_path: Path, index_path: Optional[Path] = None) -> None:
+        self.log_path = Path(log_path)
+        # 侧车文件放在独立子目录，避免被日志轮转的备份清理规则误计数
+        self.index_path = Path(index_path) if index_path else self.index_path_for(self.log_path)
+
+        self.timestamps = array("d")
+        self.offsets = array("q")
+        self.postings: Dict[str, array] = {}
+        self.columns: Dict[str, array] = {name: array("I") for name in self.COLUMN_FIELDS}
+        # 耗时样本按日志顺序追加，通过行偏移与行关联（一行可有多个计时器样本）
+        self.sample_offsets = array("q")
+        self.sample_values = array("d")
+        self.symbols: List[Optional[str]] = [None]
+        self._symbol_ids: Dict[Optional[str], int] = {None: 0}
+
+        self._indexed_size = 0
+        self._indexed_lines = 0
+        self._inode: Optional[int] = None
+        self._loaded = False
+
+        # 追加写入状态：已落盘的符号/correlation_id 数量、待写入的新行与倒排项
+        self._cids: List[str] = []
+        self._cid_ids: Dict[str, int] = {}
+        self._pending_rows: Optional[Tuple[array, ...]] = None
+        self._pending_samples: List[Tuple[int, float]] = []
+        self._pending_postings: List[Tuple[int, int]] = []
+        self._persisted_symbols = 1
+        self._persisted_cids = 0
+        self._persisted_bytes = 0
+        self._chunk_count = 0
+        self._needs_rewrite = True
+
+    @classmethod
+    def index_path_for(cls, log_path: Path) -> Path:
+        return log_path.parent / cls.INDEX_DIR / (log_path.name + cls.SUFFIX)
+
+    # ------------------------------------------------------------------
+    # 索引维护
+    # ------------------------------------------------------------------
+    def refresh(self, force: bool = False) -> bool:
+        """同步索引与日志文件，返回是否发生了变化。"""
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            changed = bool(self.offsets)
+            self._reset()
+            return changed
+
+        if force:
+            self._reset()
+        elif not self._loaded:
+            self._load()
+
+        # 轮转后的 .gz 文件不再变化，其大小为压缩后大小，不能与偏移比较
+        compressed = self.log_path.suffix == ".gz"
+        if self._inode is not None and (
+            stat.st_ino != self._inode or (not compressed and stat.st_size < self._indexed_size)
+        ):
+            LOGGER.info("检测到日志轮转或截断，重建侧车索引: %s", self.log_path)
+            self._reset()
+        if self._inode == stat.st_ino and (compressed or stat.st_size == self._indexed_size):
+            return False
+
+        appended = self._index_tail()
+        self._inode = stat.st_ino
+        self._save()
+        return appended or force
+
+    def _reset(self) -> None:
+        self.timestamps = array("d")
+        self.offsets = array("q")
+        self.postings = {}
+        self.columns = {name: array("I") for name in self.COLUMN_FIELDS}
+        self.sample_offsets = array("q")
+        self.sample_values = array("d")
+        self.symbols = [None]
+        self._symbol_ids = {None: 0}
+        self._indexed_size = 0
+        self._indexed_lines = 0
+        self._inode = None
+        self._loaded = True
+        self._cids = []
+        self._cid_ids = {}
+        self._pending_rows = None
+        self._pending_samples = []
+        self._pending_postings = []
+        self._persisted_symbols = 1
+        self._persisted_cids = 0
+        self._persisted_bytes = 0
+        self._chunk_count = 0
+        self._needs_rewrite = True
+
+    def symbol_id(self, value: Optional[str]) -> int:
+        code = self._symbol_ids.get(value)
+        if code is None:
+            code = self._symbol_ids[value] = len(self.symbols)
+            self.symbols.append(value)
+        return code
+
+    def lookup_symbol(self, value: Optional[str]) -> Optional[int]:
+        return self._symbol_ids.get(value)
+
+    def _index_tail(self) -> bool:
+        new_items: List[Tuple[Any, ...]] = []
+        offset = self._indexed_size
+        line_num = self._indexed_lines
+        with _open_log(self.log_path) as fh:
+            fh.seek(offset)
+            for raw_line in fh:
+                if not raw_line.endswith(b"\n"):
+                    break
+                line_offset = offset
+                offset += len(raw_line)
+                line_num += 1
+                try:
+                    raw = json.loads(raw_line.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    LOGGER.debug("忽略无法解析的日志行 %s", line_num)
+                    continue
+                if not isinstance(raw, dict):
+                    continue
+                codes = tuple(self.symbol_id(value) for value in _extract_column_values(raw))
+                new_items.append((_to_epoch(_parse_iso_timestamp(raw.get("timestamp"))), line_offset, codes))
+                for value in _extract_durations(raw):
+                    self._add_sample(line_offset, value)
+                cid = raw.get("correlation_id")
+                if cid:
+                    self._add_posting(str(cid), line_offset)
+
+        self._indexed_size = offset
+        self._indexed_lines = line_num
+        if not new_items:
+            return False
+
+        new_items.sort(key=lambda item: (item[0], item[1]))
+        rows = (
+            array("d", (item[0] for item in new_items)),
+            array("q", (item[1] for item in new_items)),
+            *(array("I", codes) for codes in zip(*(item[2] for item in new_items))),
+        )
+        self._pending_rows = rows
+        self._merge_rows(*rows)
+        return True
+
+    def _add_sample(self, offset: int, value: float) -> None:
+        self.sample_offsets.append(offset)
+        self.sample_values.append(value)
+        self._pending_samples.append((offset, value))
+
+    def _add_posting(self, cid: str, offset: int) -> None:
+        cid_id = self._cid_ids.get(cid)
+        if cid_id is None:
+            cid_id = self._cid_ids[cid] = len(self._cids)
+            self._cids.append(cid)
+        self.postings.setdefault(cid, array("q")).append(offset)
+        self._pending_postings.append((cid_id, offset))
+
+    def _merge_rows(self, timestamps: array, offsets: array, *columns: array) -> None:
+        """把一段已按 (timestamp, offset) 排序的行并入内存数组。"""
+        if not timestamps:
+            return
+        if not self.offsets or (self.timestamps[-1], self.offsets[-1]) <= (timestamps[0], offsets[0]):
+            self.timestamps.extend(timestamps)
+            self.offsets.extend(offsets)
+            for name, column in zip(self.COLUMN_FIELDS, columns):
+                self.columns[name].extend(column)
+            return
+
+        # 乱序追加时与已有数组做一次线性归并，而非整体重排
+        existing = zip(self.timestamps, self.offsets, zip(*(self.columns[name] for name in self.COLUMN_FIELDS)))
+        incoming = zip(timestamps, offsets, zip(*columns))
+        merged = list(heapq.merge(existing, incoming, key=lambda item: (item[0], item[1])))
+        self.timestamps = array("d", (item[0] for item in merged))
+        self.offsets = array("q", (item[1] for item in merged))
+        for position, name in enumerate(self.COLUMN_FIELDS):
+            self.columns[name] = array("I", (item[2][position] for item in merged))
+
+    # ------------------------------------------------------------------
+    # 持久化
+    # ------------------------------------------------------------------
+    def _load(self) -> None:
+        self._reset()
+        try:
+            data = self.index_path.read_bytes()
+        except FileNotFoundError:
+            return
+        try:
+            if not data.startswith(_MAGIC):
+                raise ValueError("bad magic")
+            pos = len(_MAGIC)
+            version, big_endian = _FILE_HEADER.unpack_from(data, pos)
+            pos += _FILE_HEADER.size
+            if version != self.VERSION:
+                raise ValueError("version mismatch")
+            swap = bool(big_endian) != (sys.byteorder == "big")
+
+            chunks = 0
+            while pos + _CHUNK_HEADER.size <= len(data):
+                end = self._load_chunk(data, pos, swap)
+                if end is None:
+                    # 末尾数据块写入不完整（进程中断），从最后一个完整块继续增量索引
+                    break
+                pos = end
+                chunks += 1
+        except Exception as exc:
+            LOGGER.warning("侧车索引损坏，将重建: %s (%s)", self.index_path, exc)
+            self._reset()
+            return
+
+        if not chunks:
+            self._reset()
+            return
+        self._persisted_symbols = len(self.symbols)
+        self._persisted_cids = len(self._cids)
+        self._persisted_bytes = pos
+        self._chunk_count = chunks
+        self._needs_rewrite = False
+        self._pending_rows = None
+        self._pending_samples = []
+        self._pending_postings = []
+
+    def _load_chunk(self, data: bytes, pos: int, swap: bool) -> Optional[int]:
+        (rows, sample_count, symbol_len, cid_len, posting_count,
+         size, lines, inode) = _CHUNK_HEADER.unpack_from(data, pos)
+        pos += _CHUNK_HEADER.size
+        row_bytes = rows * (8 * 2 + 4 * len(self.COLUMN_FIELDS))
+        end = pos + row_bytes + sample_count * (8 + 8) + symbol_len + cid_len + posting_count * (4 + 8)
+        if end > len(data):
+            return None
+
+        segments: List[array] = []
+        for typecode in ("d", "q") + ("I",) * len(self.COLUMN_FIELDS):
+            segment = array(typecode)
+            width = rows * segment.itemsize
+            segment.frombytes(data[pos:pos + width])
+            pos += width
+            segments.append(segment)
+        sample_offsets = array("q")
+        sample_offsets.frombytes(data[pos:pos + sample_count * 8])
+        pos += sample_count * 8
+        sample_values = array("d")
+        sample_values.frombytes(data[pos:pos + sample_count * 8])
+        pos += sample_count * 8
+        symbols = json.loads(data[pos:pos + symbol_len].decode("utf-8")) if symbol_len else []
+        pos += symbol_len
+        cids = json.loads(data[pos:pos + cid_len].decode("utf-8")) if cid_len else []
+        pos += cid_len
+        posting_cids = array("I")
+        posting_cids.frombytes(data[pos:pos + posting_count * 4])
+        pos += posting_count * 4
+        posting_offsets = array("q")
+        posting_offsets.frombytes(data[pos:pos + posting_count * 8])
+        pos += posting_count * 8
+        if swap:
+            for values in (*segments, sample_offsets, sample_values, posting_cids, posting_offsets):
+                values.byteswap()
+
+        for value in symbols:
+            self.symbol_id(value)
+        for cid in cids:
+            self._cid_ids[cid] = len(self._cids)
+            self._cids.append(cid)
+        self._merge_rows(*segments)
+        self.sample_offsets.extend(sample_offsets)
+        self.sample_values.extend(sample_values)
+        for cid_id, offset in zip(posting_cids, posting_offsets):
+            self.postings.setdefault(self._cids[cid_id], array("q")).append(offset)
+        self._indexed_size = size
+        self._indexed_lines = lines
+        self._inode = None if inode == _NO_INODE else inode
+        return end
+
+    def _save(self) -> None:
+        """追加一个数据块；首次写入、重建或块数过多时整体重写。"""
+        rewrite = self._needs_rewrite or self._chunk_count >= self.MAX_CHUNKS
+        if rewrite:
+            rows = (self.timestamps, self.offsets, *(self.columns[name] for name in self.COLUMN_FIELDS))
+            samples = (self.sample_offsets, self.sample_values)
+            symbols = self.symbols[1:]
+            cids = self._cids
+            postings = [(self._cid_ids[cid], offset) for cid, values in self.postings.items() for offset in values]
+        else:
+            rows = self._pending_rows or (array("d"), array("q"), *(array("I") for _ in self.COLUMN_FIELDS))
+            samples = (array("q", (offset for offset, _ in self._pending_samples)),
+                       array("d", (value for _, value in self._pending_samples)))
+            symbols = self.symbols[self._persisted_symbols:]
+            cids = self._cids[self._persisted_cids:]
+            postings = self._pending_postings
+        chunk = self._encode_chunk(rows, samples, symbols, cids, postings)
+
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            if rewrite:
+                tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+                with tmp_path.open("wb") as fh:
+                    fh.write(_MAGIC)
+                    fh.write(_FILE_HEADER.pack(self.VERSION, sys.byteorder == "big"))
+                    fh.write(chunk)
+                os.replace(tmp_path, self.index_path)
+                self._persisted_bytes = len(_MAGIC) + _FILE_HEADER.size + len(chunk)
+                self._chunk_count = 1
+            else:
+                with self.index_path.open("r+b") as fh:
+                    # 丢弃上次中断时残留的半个数据块
+                    fh.truncate(self._persisted_bytes)
+                    fh.seek(self._persisted_bytes)
+                    fh.write(chunk)
+                self._persisted_bytes += len(chunk)
+                self._chunk_count += 1
+        except FileNotFoundError as exc:
+            self._needs_rewrite = True
+            if not rewrite:
+                # 侧车文件被外部删除：改为整体重写一次
+                self._save()
+            else:
+                LOGGER.warning("无法写入侧车索引 %s: %s", self.index_path, exc)
+            return
+        except OSError as exc:
+            LOGGER.warning("无法写入侧车索引 %s: %s", self.index_path, exc)
+            self._needs_rewrite = True
+            return
+
+        self._needs_rewrite = False
+        self._persisted_symbols = len(self.symbols)
+        self._persisted_cids = len(self._cids)
+        self._pending_rows = None
+        self._pending_samples = []
+        self._pending_postings = []
+
+    def _encode_chunk(
+        self,
+        rows: Tuple[array, ...],
+        samples: Tuple[array, array],
+        symbols: List[Optional[str]],
+        cids: List[str],
+        postings: List[Tuple[int, int]],
+    ) -> bytes:
+        symbol_bytes = _encode_json_list(symbols)
+        cid_bytes = _encode_json_list(cids)
+        parts = [_CHUNK_HEADER.pack(
+            len(rows[0]), len(samples[0]), len(symbol_bytes), len(cid_bytes), len(postings),
+            self._indexed_size, self._indexed_lines, _NO_INODE if self._inode is None else self._inode,
+        )]
+        parts.extend(segment.tobytes() for segment in rows)
+        parts.extend(segment.tobytes() for segment in samples)
+        parts.append(symbol_bytes)
+        parts.append(cid_bytes)
+        parts.append(array("I", (cid_id for cid_id, _ in postings)).tobytes())
+        parts.append(array("q", (offset for _, offset in postings)).tobytes())
+        return b"".join(parts)
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def seek_time_range(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[int, int]:
+        """二分定位时间区间，返回 ``[lo, hi)`` 下标范围。"""
+        lo, hi = 0, len(self.timestamps)
+        if start is not None or end is not None:
+            # 有时间条件时排除缺失时间戳的条目
+            lo = bisect_right(self.timestamps, _NO_TIMESTAMP)
+        if start is not None:
+            lo = max(lo, bisect_left(self.timestamps, _to_epoch(start)))
+        if end is not None:
+            hi = bisect_right(self.timestamps, _to_epoch(end))
+        return lo, max(lo, hi)
+
+    def read_entries(self, offsets: Iterable[int]) -> Iterator[Dict[str, Any]]:
+        """按给定偏移惰性读取并解码日志行。"""
+        with _open_log(self.log_path) as fh:
+            for off in offsets:
+                fh.seek(off)
+                line = fh.readline()
+                try:
+                    yield json.loads(line.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
+
+
+class SidecarLogAnalyzer(LogAnalyzer):
+    """基于侧车索引的低内存日志查询引擎，支持跨轮转文件查询。"""
+
+    def __init__(self, log_file_path: Optional[Path | str] = None, include_rotated: bool = True) -> None:
+        super().__init__(log_file_path)
+        self.include_rotated = include_rotated
+        self._indexes: Dict[Path, SidecarIndex] = {}
+
+    # ------------------------------------------------------------------
+    # 索引管理
+    # ------------------------------------------------------------------
+    def discover_log_files(self) -> List[Path]:
+        """返回按时间由旧到新排列的日志文件（当前日志在最后）。"""
+        current = self.log_file_path
+        files: List[Path] = []
+        if self.include_rotated and current.parent.is_dir():
+            rotated = re.compile(
+                rf"^(?:{re.escape(current.stem)}_\d{{8}}_\d{{6}}\.log(?:\.gz)?|{re.escape(current.name)}\.\d+(?:\.gz)?)$"
+            )
+            for item in current.parent.iterdir():
+                if item.is_file() and rotated.match(item.name):
+                    files.append(item)
+            files.sort(key=lambda item: item.stat().st_mtime)
+        if current.exists():
+            files.append(current)
+        return files
+
+    def ensure_index(self, force: bool = False) -> None:
+        files = self.discover_log_files()
+        active = {}
+        for path in files:
+            index = self._indexes.get(path)
+            if index is None:
+                index = SidecarIndex(path)
+            index.refresh(force=force)
+            active[path] = index
+        self._indexes = active
+        self._prune_orphan_indexes(files)
+
+    def _prune_orphan_indexes(self, files: List[Path]) -> None:
+        """删除对应日志已被轮转清理掉的侧车文件。"""
+        index_dir = self.log_file_path.parent / SidecarIndex.INDEX_DIR
+        if not index_dir.is_dir():
+            return
+        expected = {SidecarIndex.index_path_for(path).name for path in files}
+        prefixes = (self.log_file_path.stem + "_", self.log_file_path.name)
+        for item in index_dir.iterdir():
+            if item.suffix != SidecarIndex.SUFFIX or item.name in expected:
+                continue
+            if item.name.startswith(prefixes):
+                item.unlink(missing_ok=True)
+
+    def build_index(self) -> None:
+        self.ensure_index(force=True)
+
+    def column_indexes(self) -> List[SidecarIndex]:
+        """返回已同步的各文件索引（由旧到新），供列式统计直接读取列数据。"""
+        self.ensure_index()
+        return list(self._indexes.values())
+
+    def get_index_stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self._indexes),
+            "entries": sum(len(index) for index in self._indexes.values()),
+            "correlation_ids": sum(len(index.postings) for index in self._indexes.values()),
+        }
+
+    # ------------------------------------------------------------------
+    # 查询接口
+    # ------------------------------------------------------------------
+    def query_by_correlation_id(self, correlation_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        self.ensure_index()
+        results: List[Dict[str, Any]] = []
+        for index in self._indexes.values():
+            offsets = index.postings.get(correlation_id)
+            if not offsets:
+                continue
+            if limit:
+                offsets = offsets[:limit - len(results)]
+            results.extend(index.read_entries(offsets))
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def iter_time_range(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """跨文件按时间顺序惰性产出区间内的条目。"""
+        start_dt = _parse_iso_timestamp(start) if isinstance(start, str) else start
+        end_dt = _parse_iso_timestamp(end) if isinstance(end, str) else end
+
+        streams = []
+        for file_no, index in enumerate(self._indexes.values()):
+            lo, hi = index.seek_time_range(start_dt, end_dt)
+            if lo < hi:
+                keys = zip(index.timestamps[lo:hi], [file_no] * (hi - lo), index.offsets[lo:hi])
+                streams.append(keys)
+        yield from self._read_merged(heapq.merge(*streams))
+
+    def query_by_time_range(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        self.ensure_index()
+        return list(self.iter_time_range(start, end))
+
+    def query(
+        self,
+        *,
+        correlation_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        if correlation_id:
+            return self.query_by_correlation_id(correlation_id, limit=limit)
+
+        self.ensure_index()
+        results: List[Dict[str, Any]] = []
+        for entry in self.iter_time_range(start, end):
+            if filters and not self._matches(entry, filters):
+                continue
+            results.append(entry)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def get_recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        self.ensure_index()
+        if limit <= 0:
+            return []
+        streams = []
+        for file_no, index in enumerate(self._indexes.values()):
+            lo = max(0, len(index) - limit)
+            streams.append(list(zip(index.timestamps[lo:], [file_no] * (len(index) - lo), index.offsets[lo:])))
+        tail = list(heapq.merge(*streams))[-limit:]
+        return list(self._read_merged(iter(tail)))
+
+    def _read_merged(self, keys: Iterator[Tuple[float, int, int]]) -> Iterator[Dict[str, Any]]:
+        indexes = list(self._indexes.values())
+        handles: Dict[int, IO[bytes]] = {}
+        try:
+            for _, file_no, offset in keys:
+                fh = handles.get(file_no)
+                if fh is None:
+                    fh = handles[file_no] = _open_log(indexes[file_no].log_path)
+                fh.seek(offset)
+                line = fh.readline()
+                try:
+                    yield json.loads(line.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
+        finally:
+            for fh in handles.values():
+                fh.close()
+
+
+__all__ = ["SidecarIndex", "SidecarLogAnalyzer"]
@@ -38,11 +38,12 @@
 """
 
 import sys
+import re
 import logging
 import tempfile
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Union
 from urllib.parse import urljoin, quote
 from urllib.request import pathname2url
 
@@ -50,7 +51,7 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QProgressBar, QPushButton, QMessageBox, QTextEdit
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QThread, pyqtSlot, QUrl
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QThread, pyqtSlot, QUrl, QFileSystemWatcher
 from PyQt5.QtGui import QFont, QPixmap, QDesktopServices
 # 在测试模式下避免导入 WebEngine 以降低启动与会话尾部开销
 try:
@@ -64,8 +65,13 @@ if not _LAD_TEST_MODE:
         _WEBENGINE_AVAILABLE = True
     except Exception:
         _WEBENGINE_AVAILABLE = False
+    try:
+        from PyQt5.QtWebEngineWidgets import QWebEngineScript
+    except Exception:
+        QWebEngineScript = None
 else:
     QWebEngineView = QWebEngineSettings = QWebEnginePage = QWebEngineProfile = None
+    QWebEngineScript = None
 
 # 全局WebEngine Profile管理，防止进程泄漏
 _global_web_profile = None
@@ -88,6 +94,13 @@ from core.file_resolver import FileResolver
 from core.markdown_renderer import MarkdownRenderer
 from core.content_preview import ContentPreview
 from core.link_processor import LinkProcessor, LinkContext, LinkType
+from core.tracing import traced
+from core.service_registry import LazyService, ServiceRegistry
+from core.session_snapshot import file_signature, is_document_fresh
+from core.html_block_diff import build_patch_script, diff_blocks, split_blocks
+from core.virtual_document import VirtualDocument
+from ui.web_page_pool import WebPagePool
+from ui.lmv_scheme import get_lmv_document_store
 
 # ============================================================================
 # 重要说明：此模块与 content_preview.py 的区别
@@ -111,6 +124,63 @@ from core.link_processor import LinkProcessor, LinkContext, LinkType
 # 这是标准的分层架构：逻辑层(ContentPreview) + 表现层(ContentViewer)
 # ============================================================================
 
+# 调试日志用的<a>标签计数（不为计数解析整份 HTML）
+_ANCHOR_TAG_RE = re.compile(r'<a\b', re.IGNORECASE)
+
+
+def _count_anchor_tags(html_content: str) -> int:
+    return len(_ANCHOR_TAG_RE.findall(html_content or ''))
+
+
+# 链接点击桥接脚本：拦截 <a> 点击并以 console 'LPCLICK:<href>' 回传给 _CVPage
+_LINK_BRIDGE_JS = r"""
+    (function() {
+        try {
+            // 清理旧监听
+            if (window.linkClickHandler) {
+                document.removeEventListener('click', window.linkClickHandler, true);
+            }
+            window.linkClickHandler = function(ev){
+                try{
+                    var a = ev.target && ev.target.closest ? ev.target.closest('a') : null;
+                    if (!a || !a.getAttribute) { return; }
+                    var href = a.getAttribute('href') || '';
+                    if (!href) { return; }
+                    ev.preventDefault();
+                    console.log('LPCLICK:' + href);
+                    return false;
+                }catch(e){ console.log('link-handler-error:' + e); }
+            };
+            document.addEventListener('click', window.linkClickHandler, true);
+            console.log('link-handlers-attached');
+        } catch (e) { console.log('link-handler-init-error:' + e); }
+    })();
+"""
+
+
+def _anchor_scroll_js(anchor: str) -> str:
+    safe_anchor = str(anchor).replace("\\", "\\\\").replace("'", "\\'")
+    return ("(function(a){var el=document.getElementById(a)||"
+            "document.querySelector('[name=\\\"'+a+'\\\"]');"
+            "if(el){el.scrollIntoView({behavior:'smooth'});}})('" + safe_anchor + "');")
+
+
+def _install_link_bridge(page) -> bool:
+    """在文档创建时注入链接桥接脚本，页面此后每次加载都自动生效（无需 loadFinished 再注入）"""
+    if QWebEngineScript is None:
+        return False
+    try:
+        script = QWebEngineScript()
+        script.setName("lad-link-bridge")
+        script.setSourceCode(_LINK_BRIDGE_JS)
+        script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+        script.setWorldId(QWebEngineScript.MainWorld)
+        script.setRunsOnSubFrames(False)
+        page.scripts().insert(script)
+        return True
+    except Exception:
+        return False
+
 
 if _WEBENGINE_AVAILABLE:
     class _CVPage(QWebEnginePage):
@@ -118,9 +188,17 @@ if _WEBENGINE_AVAILABLE:
         def __init__(self, owner, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self._owner = owner
+            self.link_bridge_installed = _install_link_bridge(self)
+
+        def _is_active(self) -> bool:
+            """页面池中闲置的页面不再向 owner 转发事件"""
+            current = getattr(self._owner, '_cv_page', self)
+            return current is None or current is self
         
         def javaScriptConsoleMessage(self, level, message, lineNumber, sourceID):
             """转发 JS 控制台消息，并通过 LPCLICK 桥接到 ContentViewer._handle_lpclick。"""
+            if not self._is_active():
+                return
             # Forward to owner's handler for optional logging
             try:
                 self._owner._on_js_console_message(level, message, lineNumber, sourceID)
@@ -132,6 +210,8 @@ if _WEBENGINE_AVAILABLE:
                     href = message[len("LPCLICK:"):].strip()
                     if href:
                         self._owner._handle_lpclick(href)
+                elif isinstance(message, str) and message.startswith("LMVSECTION:"):
+                    self._owner._handle_section_request(message[len("LMVSECTION:"):].strip())
             except Exception:
                 pass
 
@@ -149,6 +229,8 @@ if _WEBENGINE_AVAILABLE:
                     nav_name = str(nav_type)
 
                 if str(nav_name) == "NavigationTypeLinkClicked":
+                    if not self._is_active():
+                        return False
                     try:
                         href = url.toString() if hasattr(url, "toString") else str(url)
                     except Exception:
@@ -177,6 +259,8 @@ else:
                     href = message[len("LPCLICK:"):].strip()
                     if href:
                         self._owner._handle_lpclick(href)
+                elif isinstance(message, str) and message.startswith("LMVSECTION:"):
+                    self._owner._handle_section_request(message[len("LMVSECTION:"):].strip())
             except Exception:
                 pass
 
@@ -198,7 +282,7 @@ else:
 
 
 class _TestPageStub:
-    def runJavaScript(self, js):
+    def runJavaScript(self, js, callback=None):
         return None
 
 class _TestSettingsStub:
@@ -274,6 +358,12 @@ class ContentViewer(QWidget):
     content_loaded = pyqtSignal(str, bool)  # 内容加载完成信号(文件路径, 是否成功)
     loading_progress = pyqtSignal(int)  # 加载进度信号
     error_occurred = pyqtSignal(str, str)  # 错误发生信号(错误类型, 错误消息)
+
+    # 核心模块：由 self.services 惰性构建（与主窗口共用注册表时一并参与空闲预热）
+    file_resolver = LazyService()
+    markdown_renderer = LazyService()
+    content_preview = LazyService()
+    link_processor = LazyService()
     
     def __init__(self, parent=None):
         """初始化内容显示组件"""
@@ -289,6 +379,9 @@ class ContentViewer(QWidget):
         # 初始化组件
         self.web_engine_view = None  # Web引擎视图
         self.fallback_text_edit = None  # 备用文本显示
+        self._cv_page = None  # 当前 Page（来自 _page_pool）
+        self._page_pool = None  # 预热页面池（仅真实 WebEngine 视图启用）
+        self._lmv_store = None  # lmv:// 文档存储（协议已注册时启用，绕开 setHtml 大小上限）
         self.progress_bar = None  # 进度条
         self.status_label = None  # 状态标签
         self.current_file_path = None  # 当前文件路径
@@ -300,19 +393,67 @@ class ContentViewer(QWidget):
         self._zoom_factor_last = None
         # 待跳转锚点（用于跨文档 TOC 链接在文件加载完成后滚动到目标位置）
         self._pending_anchor = None
+        # 各文档的滚动位置（离开文档时记录，会话快照恢复时在加载完成后滚动回去）
+        self._scroll_positions: Dict[str, float] = {}
+        self._pending_scroll_y: Optional[float] = None
+        # 原地更新：记录页面当前显示的文档，同一文档重新渲染时只替换变化的顶层块，不再整页 setHtml
+        self._live_document: Optional[Dict[str, Any]] = None
+        self._live_update_stats = {'patched': 0, 'unchanged': 0, 'fallback': 0, 'full_loads': 0}
+        try:
+            self._live_update_enabled = bool(self.config_manager.get_config("content_viewer.live_update", True, "ui"))
+            self._live_update_max_ratio = float(self.config_manager.get_config(
+                "content_viewer.live_update_max_ratio", 0.5, "ui"))
+        except Exception:
+            self._live_update_enabled, self._live_update_max_ratio = True, 0.5
+        self._file_watcher = None  # 当前文件保存后自动原地刷新（仅真实 WebEngine 视图）
+        # 超大 Markdown 的虚拟化显示：超过下限时只渲染标题骨架，各节正文按需渲染
+        self._virtual_document: Optional[VirtualDocument] = None
+        try:
+            self._virtualize_min_bytes = int(self.config_manager.get_config(
+                "content_viewer.virtualize_min_bytes", 2 * 1024 * 1024, "ui"))
+            self._virtualize_max_bytes = int(self.config_manager.get_config(
+                "content_viewer.virtualize_max_bytes", 256 * 1024 * 1024, "ui"))
+        except Exception:
+            self._virtualize_min_bytes, self._virtualize_max_bytes = 2 * 1024 * 1024, 256 * 1024 * 1024
         self._is_test_mode = False
         try:
             self._history_max = int(self.config_manager.get_config("content_viewer.history_max", 200, "ui"))
         except Exception:
             self._history_max = 200
         
-        # 初始化核心模块
-        self.file_resolver = FileResolver(self.config_manager)
-        self.markdown_renderer = MarkdownRenderer(self.config_manager)
-        self.content_preview = ContentPreview(self.config_manager)
+        # 登记核心模块（首次使用时构建）；父窗口提供注册表时共用，渲染器等与主窗口为同一实例
+        parent_services = getattr(parent, "services", None) if parent else None
+        self.services = (parent_services if isinstance(parent_services, ServiceRegistry)
+                         else ServiceRegistry("content_viewer"))
+        config_manager = self.config_manager
+        components = [
+            ("file_resolver", lambda: FileResolver(config_manager), ()),
+            ("markdown_renderer", lambda: MarkdownRenderer(config_manager), ()),
+            ("content_preview", lambda: ContentPreview(config_manager), ()),
+            ("link_processor", lambda: self._create_link_processor(parent), ("file_resolver",)),
+        ]
+        for name, factory, deps in components:
+            if not self.services.is_registered(name):
+                self.services.register(name, factory, deps)
+        
+        # 内容缓存
+        self.content_cache = {}
+        self.cache_limit = self.config_manager.get_config("content_viewer.cache_limit", 50, "ui")
         
-        # 初始化链接处理器
-        self.link_processor = LinkProcessor(
+        # 初始化UI
+        self._init_ui()
+        self._setup_web_engine()
+        self._setup_connections()
+        self._setup_file_watcher()
+        
+        # 显示欢迎页面
+        self._show_welcome_page()
+        
+        self.logger.info("内容显示组件初始化完成", component="ui", operation="content_viewer_init")
+    
+    def _create_link_processor(self, parent=None) -> LinkProcessor:
+        """构建链接处理器并设置各类链接的处理器"""
+        link_processor = LinkProcessor(
             config_manager=self.config_manager,
             file_resolver=self.file_resolver,
             logger=self.logger,
@@ -320,13 +461,12 @@ class ContentViewer(QWidget):
             performance_metrics=getattr(parent, "performance_metrics", None) if parent else None,
         )
         
-        # 设置链接处理器
         from core.link_processor import (
             ExternalHandler, RelativeMarkdownHandler, DirectoryHandler,
             AnchorHandler, ImageHandler, MermaidHandler, TocHandler, FileProtocolHandler
         )
         
-        self.link_processor.set_handlers({
+        link_processor.set_handlers({
             LinkType.EXTERNAL_HTTP: ExternalHandler(),
             LinkType.RELATIVE_MD: RelativeMarkdownHandler(),
             LinkType.DIRECTORY: DirectoryHandler(),
@@ -336,21 +476,8 @@ class ContentViewer(QWidget):
             LinkType.TOC: TocHandler(),
             LinkType.FILE_PROTOCOL: FileProtocolHandler(),
         })
-        
-        # 内容缓存
-        self.content_cache = {}
-        self.cache_limit = self.config_manager.get_config("content_viewer.cache_limit", 50, "ui")
-        
-        # 初始化UI
-        self._init_ui()
-        self._setup_web_engine()
-        self._setup_connections()
-        
-        # 显示欢迎页面
-        self._show_welcome_page()
-        
-        self.logger.info("内容显示组件初始化完成", component="ui", operation="content_viewer_init")
-    
+        return link_processor
+
     def _init_ui(self):
         """初始化用户界面"""
         # 创建主布局
@@ -382,10 +509,15 @@ class ContentViewer(QWidget):
             try:
                 self.web_engine_view = QWebEngineView()
                 try:
-                    self._cv_page = _CVPage(self, self)
+                    self._page_pool = self._create_page_pool()
+                    self._cv_page = self._page_pool.acquire()
                     self.web_engine_view.setPage(self._cv_page)
                 except Exception as e:
                     self.logger.warning(f"自定义页面设置失败，将继续使用默认页面: {e}")
+                try:
+                    self._lmv_store = get_lmv_document_store()
+                except Exception as e:
+                    self.logger.warning(f"lmv:// 协议处理器安装失败，使用 setHtml 显示: {e}")
                 try:
                     self.web_engine_view.setContextMenuPolicy(Qt.CustomContextMenu)
                     self.web_engine_view.customContextMenuRequested.connect(self._show_context_menu)
@@ -496,7 +628,7 @@ class ContentViewer(QWidget):
         if not self.web_engine_view:
             return
         try:
-            # 统一由 _on_page_load_finished 以 runJavaScript 注入 LPCLICK 拦截器，避免重复注入
+            # LPCLICK 拦截器由 _CVPage 以 QWebEngineScript 预装；仅无预装脚本的页面在 _on_page_load_finished 注入
             if hasattr(self, 'link_script'):
                 try:
                     delattr(self, 'link_script')
@@ -695,38 +827,32 @@ class ContentViewer(QWidget):
             }
         """)
     
+    @traced("content_viewer.display_file", component="content_viewer")
     def display_file(self, file_path: str, force_reload: bool = False):
         """显示文件内容"""
         self.logger.info(f"NAV|current={file_path}")
 
-        # 清理旧的WebEngine Page对象，防止进程泄漏
-        self._cleanup_old_page()
+        # 记录离开文档的滚动位置（须在替换 Page 之前）
+        self._remember_scroll_position()
 
         # 更新当前文件路径
+        same_document = (file_path == self.current_file_path)
         self.current_file_path = file_path
 
-        # 断开旧的信号连接，防止重复处理
-        try:
-            if self.web_engine_view:
-                self.web_engine_view.loadStarted.disconnect()
-                self.web_engine_view.loadProgress.disconnect()
-                self.web_engine_view.loadFinished.disconnect()
-        except Exception:
-            pass
-        # 为新文档替换 Page，确保无旧监听
-        try:
-            if self.web_engine_view:
-                self._cv_page = _CVPage(self, self)
-                self.web_engine_view.setPage(self._cv_page)
-                # 重新连接进度条信号
-                self.web_engine_view.loadStarted.connect(self._on_load_started)
-                self.web_engine_view.loadProgress.connect(self._on_load_progress)
-                self.web_engine_view.loadFinished.connect(self._on_load_finished)
-        except Exception:
-            pass
-
-        # 检查缓存
-        if not force_reload and file_path in self.content_cache:
+        # 切换文档时从页面池换入已预热的 Page（链接桥接脚本已安装），旧 Page 重置后归还；
+        # 同一文档重新显示时保留当前 Page，以便原地更新
+        if not same_document:
+            self._virtual_document = None
+            self._swap_page()
+        self._watch_current_file(file_path)
+
+        # 检查缓存（源文件已修改的缓存项作废）
+        cached = self.content_cache.get(file_path) if not force_reload else None
+        if cached and cached.get('mtime_ns') is not None and not is_document_fresh(cached):
+            self.content_cache.pop(file_path, None)
+            cached = None
+        if cached:
+            self._pending_scroll_y = self._scroll_positions.get(file_path)
             self._display_cached_content(file_path)
             self.content_loaded.emit(file_path, True)
             return
@@ -806,6 +932,11 @@ class ContentViewer(QWidget):
     def _display_markdown(self, file_path: str, file_info: Dict[str, Any]):
         """显示Markdown文件"""
         try:
+            size = (file_info.get('file_info') or {}).get('size') or 0
+            if self._virtualize_min_bytes and size >= self._virtualize_min_bytes:
+                self._display_markdown_virtual(file_path)
+                return
+            self._virtual_document = None
             # 使用Markdown渲染器
             render_options = self._get_markdown_options()
             result = self.markdown_renderer.render_file(file_path, render_options)
@@ -818,13 +949,7 @@ class ContentViewer(QWidget):
                 except Exception:
                     _skip_debug = False
                 if not _skip_debug:
-                    try:
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(html_content, 'html.parser')
-                        a_count = len(soup.find_all('a'))
-                    except Exception:
-                        import re
-                        a_count = len(re.findall(r'<a\b', html_content, flags=re.IGNORECASE))
+                    a_count = _count_anchor_tags(html_content)
                     try:
                         debug_dir = Path(__file__).resolve().parent.parent / 'debug_render'
                         debug_dir.mkdir(parents=True, exist_ok=True)
@@ -844,6 +969,50 @@ class ContentViewer(QWidget):
             self.logger.error(f"Markdown显示失败: {e}")
             self._display_error("Markdown显示失败", str(e))
 
+    def _display_markdown_virtual(self, file_path: str) -> None:
+        """超大 Markdown：先显示标题骨架，各节正文在滚动到附近时再渲染（不进入内容缓存）"""
+        resolved = self.file_resolver.resolve_file_path(file_path, {
+            'max_size': self._virtualize_max_bytes,
+            'read_content': True,
+            'detect_encoding': True,
+        })
+        content = resolved.get('content') if resolved.get('success') else None
+        if content is None:
+            self._display_error("文件读取失败", resolved.get('error_message') or "无法读取文件内容")
+            return
+        document = VirtualDocument(content)
+        result = self.markdown_renderer.render(document.skeleton_markdown(), self._get_section_render_options())
+        headings_html = result.get('html', '') if result.get('success') else ''
+        self._virtual_document = document
+        self._display_html(document.build_skeleton_html(headings_html))
+        self._set_status(f"Markdown文件已加载（按需渲染，共 {len(document.sections)} 节）: {Path(file_path).name}")
+        self.content_loaded.emit(file_path, True)
+
+    def _get_section_render_options(self) -> Dict[str, Any]:
+        """分节渲染选项：各节由 VirtualDocument 自行缓存，不写入渲染器缓存"""
+        return dict(self._get_markdown_options(), cache_enabled=False)
+
+    def _handle_section_request(self, payload: str) -> None:
+        """页面请求渲染某一节（'<token>:<index>'，由 _CVPage 转发）"""
+        document = self._virtual_document
+        token, _, index = payload.partition(':')
+        if document is None or token != document.token or not index.isdigit() or not self.web_engine_view:
+            return
+        options = self._get_section_render_options()
+
+        def render(markdown_text: str) -> Optional[str]:
+            result = self.markdown_renderer.render(markdown_text, options)
+            return result.get('html') if result.get('success') else None
+
+        body = document.render_section(int(index), render)
+        if body is None:
+            self.logger.warning(f"虚拟化文档第 {index} 节渲染失败")
+            return
+        try:
+            self.web_engine_view.page().runJavaScript(document.fill_script(int(index), body))
+        except Exception as e:
+            self.logger.warning(f"填充第 {index} 节失败: {e}")
+
     def _get_markdown_options(self) -> Dict[str, Any]:
         """提供 Markdown 渲染选项（从配置安全读取，含 base_url）。"""
         try:
@@ -1008,17 +1177,12 @@ class ContentViewer(QWidget):
             except Exception:
                 pass
     
+    @traced("content_viewer.display_html", component="content_viewer")
     def _display_html(self, html_content: str):
         """显示HTML内容"""
         if self.web_engine_view:
             # 调试：在日志中打印<a>标签数
-            try:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(html_content, 'html.parser')
-                a_count = len(soup.find_all('a'))
-            except Exception:
-                import re
-                a_count = len(re.findall(r'<a\b', html_content, flags=re.IGNORECASE))
+            a_count = _count_anchor_tags(html_content)
             self.logger.info(f"本次渲染HTML包含链接数: {a_count}")
             # 兼容测试：仅在测试模式或显式开关下，注入无副作用标记
             try:
@@ -1041,23 +1205,10 @@ class ContentViewer(QWidget):
             except Exception:
                 pass
             
-            # 使用Web引擎显示（提供 baseUrl 以确保相对链接正确解析）
-            try:
-                base_dir = None
-                if self.current_file_path:
-                    try:
-                        base_dir = Path(self.current_file_path).parent
-                    except Exception:
-                        base_dir = None
-                if base_dir and str(base_dir).strip():
-                    base_url = QUrl.fromLocalFile(str(base_dir) + os.sep)
-                    self.web_engine_view.setHtml(html_content, base_url)
-                else:
-                    self.web_engine_view.setHtml(html_content)
-            except Exception:
-                # 退回不带 baseUrl 的方式
-                self.web_engine_view.setHtml(html_content)
-            # 不再二次注入或轮询，所有链接拦截统一在 _on_load_finished 注入的脚本中完成
+            # 同一文档重新渲染：只替换变化的顶层块，保留滚动位置
+            if self._try_live_update(html_content):
+                return
+            self._load_html_document(html_content)
         elif self.fallback_text_edit:
             # 使用备用文本显示（去除HTML标签）
             import re
@@ -1066,36 +1217,137 @@ class ContentViewer(QWidget):
         else:
             self.logger.error("没有可用的显示组件")
     
+    def _load_html_document(self, html_content: str) -> None:
+        """整页加载 HTML，并记录为原地更新的基准文档"""
+        self._live_document = {'path': self.current_file_path, 'html': html_content}
+        self._live_update_stats['full_loads'] += 1
+        # 优先经 lmv:// 协议加载：无大小上限，相对资源按源文件目录解析
+        if self._lmv_store is not None and self.current_file_path:
+            try:
+                self.web_engine_view.load(QUrl(self._lmv_store.publish(self.current_file_path, html_content)))
+                return
+            except Exception as e:
+                self.logger.warning(f"lmv:// 加载失败，改用 setHtml: {e}")
+        # 使用Web引擎显示（提供 baseUrl 以确保相对链接正确解析）
+        try:
+            base_dir = None
+            if self.current_file_path:
+                try:
+                    base_dir = Path(self.current_file_path).parent
+                except Exception:
+                    base_dir = None
+            if base_dir and str(base_dir).strip():
+                base_url = QUrl.fromLocalFile(str(base_dir) + os.sep)
+                self.web_engine_view.setHtml(html_content, base_url)
+            else:
+                self.web_engine_view.setHtml(html_content)
+        except Exception:
+            # 退回不带 baseUrl 的方式
+            self.web_engine_view.setHtml(html_content)
+        # 不再二次注入或轮询，所有链接拦截统一由 _CVPage 预装脚本（或 _on_load_finished 注入）完成
+
+    def _try_live_update(self, html_content: str) -> bool:
+        """
+        同一文档重新渲染时原地更新 DOM
+
+        Returns:
+            bool: 已处理（无变化或补丁已下发）；False 表示需要整页加载
+        """
+        live = self._live_document
+        if not (self._live_update_enabled and live and self.current_file_path
+                and live['path'] == self.current_file_path):
+            return False
+        if live['html'] == html_content:
+            self._live_update_stats['unchanged'] += 1
+            self._finish_live_update()
+            return True
+        old_blocks = live.get('blocks') or split_blocks(live['html'])
+        new_blocks = split_blocks(html_content)
+        ops = None
+        if old_blocks is not None and new_blocks is not None:
+            ops = diff_blocks(old_blocks, new_blocks, self._live_update_max_ratio)
+        if ops is None:
+            return False  # 外壳变化、结构不可映射或变化过大
+        patched = {'path': self.current_file_path, 'html': html_content, 'blocks': new_blocks}
+        try:
+            self.web_engine_view.page().runJavaScript(
+                build_patch_script(old_blocks, new_blocks, ops),
+                lambda ok: self._on_live_patch_result(ok, patched))
+        except Exception as e:
+            self.logger.warning(f"原地更新下发失败，改为整页加载: {e}")
+            return False
+        self._live_document = patched
+        self._live_update_stats['patched'] += 1
+        self.logger.debug(f"原地更新: {len(ops)} 处变化，共 {len(new_blocks.blocks)} 个块")
+        self._finish_live_update()
+        return True
+
+    def _on_live_patch_result(self, ok, patched: Dict[str, Any]) -> None:
+        """页面校验失败（DOM 与预期结构不一致）时退回整页加载"""
+        if ok is True or self._live_document is not patched or not self.web_engine_view:
+            return
+        self._live_update_stats['fallback'] += 1
+        self.logger.info("原地更新校验失败，改为整页加载")
+        self._load_html_document(patched['html'])
+
+    def _finish_live_update(self) -> None:
+        """原地更新不会触发 loadFinished：在此处理待跳转锚点并清理待恢复的滚动位置"""
+        anchor = self._pending_anchor
+        self._pending_anchor = None
+        self._pending_scroll_y = None
+        if anchor:
+            try:
+                self.web_engine_view.page().runJavaScript(_anchor_scroll_js(anchor))
+                self._set_status(f"已跳转到锚点: {anchor}")
+            except Exception as e:
+                self.logger.warning(f"锚点跳转执行失败: {e}")
+
+    def _setup_file_watcher(self) -> None:
+        """监视当前文件：保存后自动重新渲染并原地更新（测试模式与备用视图不启用）"""
+        if not self._live_update_enabled or self._is_test_mode or self._page_pool is None:
+            return
+        self._file_watcher = QFileSystemWatcher(self)
+        self._file_watcher.fileChanged.connect(self._on_watched_file_changed)
+        # 编辑器保存常分多次写入，合并为一次刷新
+        self._file_refresh_timer = QTimer(self)
+        self._file_refresh_timer.setSingleShot(True)
+        self._file_refresh_timer.setInterval(150)
+        self._file_refresh_timer.timeout.connect(self._refresh_watched_file)
+
+    def _watch_current_file(self, file_path: str) -> None:
+        watcher = self._file_watcher
+        if watcher is None:
+            return
+        try:
+            watched = watcher.files()
+            if watched and watched != [file_path]:
+                watcher.removePaths(watched)
+            if file_path not in watched and os.path.isfile(file_path):
+                watcher.addPath(file_path)
+        except Exception as e:
+            self.logger.debug(f"监视当前文件失败: {e}")
+
+    def _on_watched_file_changed(self, path: str) -> None:
+        if path == self.current_file_path:
+            self._file_refresh_timer.start()
+
+    def _refresh_watched_file(self) -> None:
+        path = self.current_file_path
+        if not path or not os.path.isfile(path):
+            return
+        # 以替换方式保存的文件会从监视列表中移除，需要重新加入
+        self._watch_current_file(path)
+        self.display_file(path, force_reload=True)
+
     def _on_page_load_finished(self, success: bool):
         """页面加载完成后的处理"""
         try:
             if success:
-                # 页面加载成功后设置链接处理（一次性注入拦截脚本）
+                # 页面未通过 QWebEngineScript 预装桥接脚本时，才在加载完成后注入
                 try:
-                    js = r"""
-                        (function() {
-                            try {
-                                // 清理旧监听
-                                if (window.linkClickHandler) {
-                                    document.removeEventListener('click', window.linkClickHandler, true);
-                                }
-                                window.linkClickHandler = function(ev){
-                                    try{
-                                        var a = ev.target && ev.target.closest ? ev.target.closest('a') : null;
-                                        if (!a || !a.getAttribute) { return; }
-                                        var href = a.getAttribute('href') || '';
-                                        if (!href) { return; }
-                                        ev.preventDefault();
-                                        console.log('LPCLICK:' + href);
-                                        return false;
-                                    }catch(e){ console.log('link-handler-error:' + e); }
-                                };
-                                document.addEventListener('click', window.linkClickHandler, true);
-                                console.log('link-handlers-attached');
-                            } catch (e) { console.log('link-handler-init-error:' + e); }
-                        })();
-                    """
-                    self.web_engine_view.page().runJavaScript(js)
+                    page = self.web_engine_view.page()
+                    if not getattr(page, 'link_bridge_installed', False):
+                        page.runJavaScript(_LINK_BRIDGE_JS)
                 except Exception as e:
                     self.logger.warning(f"注入链接处理脚本失败: {e}")
                 # 断开连接，避免重复调用
@@ -1123,11 +1375,18 @@ class ContentViewer(QWidget):
                             self.logger.warning(f"锚点跳转执行失败: {e}")
                         except Exception:
                             pass
+                elif self._pending_scroll_y and self.web_engine_view:
+                    try:
+                        self.web_engine_view.page().runJavaScript(
+                            f"window.scrollTo(0, {float(self._pending_scroll_y)});")
+                    except Exception as e:
+                        self.logger.warning(f"恢复滚动位置失败: {e}")
             else:
                 self.logger.warning("页面加载失败")
         finally:
             try:
                 self._pending_anchor = None
+                self._pending_scroll_y = None
             except Exception:
                 pass
     
@@ -1589,7 +1848,9 @@ class ContentViewer(QWidget):
             'limit': self.cache_limit,
             'total_items': len(self.content_cache),  # 兼容旧字段
             'cache_limit': self.cache_limit,         # 兼容旧字段
-            'cached_files': list(self.content_cache.keys())
+            'cached_files': list(self.content_cache.keys()),
+            'page_pool': self.get_page_pool_stats(),
+            'live_update': dict(self._live_update_stats),
         }
 
     def _cache_content(self, file_path: str, html_content: str, preview_type: str) -> None:
@@ -1597,10 +1858,15 @@ class ContentViewer(QWidget):
         try:
             if not isinstance(self.content_cache, dict):
                 self.content_cache = {}
-            self.content_cache[file_path] = {
+            entry = {
+                'path': file_path,
                 'html': html_content,
                 'type': preview_type,
             }
+            # 记录渲染时的源文件签名，用于缓存与会话快照的新鲜度校验
+            entry.update(file_signature(file_path) or {})
+            self.content_cache.pop(file_path, None)
+            self.content_cache[file_path] = entry
             # 超限裁剪
             try:
                 limit = int(self.cache_limit or 0)
@@ -1614,10 +1880,56 @@ class ContentViewer(QWidget):
         except Exception:
             pass
 
+    def _create_page_pool(self) -> WebPagePool:
+        """创建预热页面池（大小由 content_viewer.page_pool_size 配置，默认 2）"""
+        try:
+            size = int(self.config_manager.get_config("content_viewer.page_pool_size", 2, "ui"))
+        except Exception:
+            size = 2
+        return WebPagePool(lambda: _CVPage(self, self), size=size, reset=self._reset_pooled_page)
+
+    @staticmethod
+    def _reset_pooled_page(page) -> None:
+        """归还前停止加载并清空内容，避免旧文档的脚本与请求继续运行"""
+        stop = getattr(QWebEnginePage, 'Stop', None) if QWebEnginePage is not None else None
+        if stop is not None:
+            page.triggerAction(stop)
+        page.setHtml("")
+
+    def _swap_page(self) -> None:
+        """切换到页面池中的就绪页面，并在空闲时补足预热页面"""
+        pool = self._page_pool
+        if pool is None or not self.web_engine_view:
+            return
+        try:
+            old_page = self._cv_page
+            self._cv_page = pool.acquire()
+            self.web_engine_view.setPage(self._cv_page)
+            self._live_document = None
+            if self._zoom_factor_last is not None:
+                self.web_engine_view.setZoomFactor(self._zoom_factor_last)
+            pool.release(old_page)
+            QTimer.singleShot(0, pool.prewarm)
+        except Exception as e:
+            self.logger.warning(f"切换页面失败: {e}")
+
+    def get_page_pool_stats(self) -> Dict[str, Any]:
+        """页面池统计：创建/销毁/复用计数；未启用页面池（测试模式/备用视图）时 enabled 为 False"""
+        pool = self._page_pool
+        if pool is None:
+            return {'enabled': False}
+        return dict(pool.stats(), enabled=True)
+
     def _cleanup_old_page(self):
         """清理旧的WebEngine Page对象，防止进程泄漏"""
         try:
-            if hasattr(self, '_cv_page') and self._cv_page:
+            pool = getattr(self, '_page_pool', None)
+            if pool is not None:
+                # 页面池统一销毁全部 Page（含预热页面）
+                pool.drain()
+                self._cv_page = None
+                self.logger.debug(f"页面池已清空: {pool.stats()}")
+            elif hasattr(self, '_cv_page') and self._cv_page:
                 # 断开Page的所有信号连接
                 try:
                     self._cv_page.destroyed.disconnect()
@@ -1643,6 +1955,105 @@ class ContentViewer(QWidget):
         except Exception:
             pass
     
+    # =============================
+    # 会话快照（温启动）
+    # =============================
+    def _remember_scroll_position(self) -> None:
+        """记录当前文档的滚动位置"""
+        if not self.current_file_path or not self.web_engine_view:
+            return
+        try:
+            scroll_position = getattr(self.web_engine_view.page(), "scrollPosition", None)
+            if scroll_position is not None:
+                self._scroll_positions[self.current_file_path] = float(scroll_position().y())
+        except Exception:
+            pass
+
+    def export_session_documents(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        导出会话快照所需的文档：当前文档在前，其余按最近缓存顺序
+
+        Returns:
+            List[Dict[str, Any]]: 每项含 path/html/type/mtime_ns/size/scroll_y
+        """
+        self._remember_scroll_position()
+        order = list(reversed(list(self.content_cache.keys())))
+        if self.current_file_path in self.content_cache:
+            order.remove(self.current_file_path)
+            order.insert(0, self.current_file_path)
+
+        documents = []
+        for file_path in order[:max(0, int(limit))]:
+            entry = self.content_cache.get(file_path) or {}
+            if not entry.get('html') or entry.get('mtime_ns') is None:
+                continue
+            documents.append({
+                'path': file_path,
+                'html': entry['html'],
+                'type': entry.get('type', ''),
+                'mtime_ns': entry['mtime_ns'],
+                'size': entry.get('size'),
+                'scroll_y': self._scroll_positions.get(file_path, 0.0),
+            })
+        return documents
+
+    def restore_session(self, documents: List[Dict[str, Any]], current_file: Optional[str] = None) -> bool:
+        """
+        按会话快照立即显示文档（不解析、不渲染），并将其余文档放入内容缓存
+
+        新鲜度由 refresh_stale_session_documents() 随后校验。
+
+        Returns:
+            bool: 是否已显示快照中的文档
+        """
+        usable = [d for d in documents or [] if d.get('path') and d.get('html')]
+        if not usable:
+            return False
+        current = next((d for d in usable if d['path'] == current_file), usable[0])
+
+        # 由旧到新放入缓存，当前文档最后放入（最近使用）
+        for document in reversed(usable):
+            if document is current:
+                continue
+            self._restore_cache_entry(document)
+        self._restore_cache_entry(current)
+
+        self.current_file_path = current['path']
+        self._pending_scroll_y = current.get('scroll_y') or None
+        self._display_html(current['html'])
+        self._set_status(f"已从会话快照恢复: {Path(current['path']).name}")
+        self.logger.info(f"会话快照恢复: {current['path']}（{len(usable)} 个文档）")
+        return True
+
+    def _restore_cache_entry(self, document: Dict[str, Any]) -> None:
+        file_path = document['path']
+        self.content_cache.pop(file_path, None)
+        self.content_cache[file_path] = {
+            'path': file_path,
+            'html': document['html'],
+            'type': document.get('type', ''),
+            'mtime_ns': document.get('mtime_ns'),
+            'size': document.get('size'),
+        }
+        if document.get('scroll_y'):
+            self._scroll_positions[file_path] = float(document['scroll_y'])
+
+    def refresh_stale_session_documents(self) -> List[str]:
+        """
+        校验缓存文档的新鲜度：过期项移出缓存，当前文档过期则重新渲染
+
+        Returns:
+            List[str]: 过期的文档路径
+        """
+        stale = [path for path, entry in list(self.content_cache.items())
+                 if entry.get('mtime_ns') is not None and not is_document_fresh(entry)]
+        for file_path in stale:
+            self.content_cache.pop(file_path, None)
+        if self.current_file_path in stale:
+            self.logger.info(f"会话快照文档已变更，重新渲染: {self.current_file_path}")
+            self.display_file(self.current_file_path, force_reload=True)
+        return stale
+
     def get_current_file(self) -> Optional[str]:
         """获取当前显示的文件路径"""
         return self.current_file_path
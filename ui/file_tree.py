@@ -10,6 +10,7 @@
 最后更新: 2025-01-08
 """
 
+import os
 import sys
 import logging
 from pathlib import Path
@@ -57,6 +58,7 @@ class FileTree(QWidget):
         self.tree_view = None  # 树视图
         self.search_box = None  # 搜索框
         self.filter_checkbox = None  # 过滤器复选框
+        self._expanded_paths = set()  # 已展开的目录（供会话快照保存/恢复）
         
         # 初始化UI
         self._init_ui()
@@ -242,6 +244,8 @@ class FileTree(QWidget):
         self.tree_view.doubleClicked.connect(self._on_item_double_clicked)
         self.tree_view.selectionModel().selectionChanged.connect(self._on_selection_changed)
         self.tree_view.customContextMenuRequested.connect(self._on_context_menu)
+        self.tree_view.expanded.connect(self._on_item_expanded)
+        self.tree_view.collapsed.connect(self._on_item_collapsed)
         
         # 代理模型连接
         self.proxy_model.rowsInserted.connect(self._on_rows_inserted)
@@ -409,6 +413,15 @@ class FileTree(QWidget):
         # 显示菜单
         menu.exec_(self.tree_view.mapToGlobal(position))
     
+    def _on_item_expanded(self, index: QModelIndex):
+        path = self.file_model.filePath(self.proxy_model.mapToSource(index))
+        if path:
+            self._expanded_paths.add(path)
+
+    def _on_item_collapsed(self, index: QModelIndex):
+        path = self.file_model.filePath(self.proxy_model.mapToSource(index))
+        self._expanded_paths.discard(path)
+
     def _on_rows_inserted(self, parent, first, last):
         """行插入处理"""
         self._update_status()
@@ -555,6 +568,34 @@ class FileTree(QWidget):
             self.logger.error(f"展开路径失败: {e}")
             return False
     
+    def get_expanded_paths(self) -> List[str]:
+        """获取当前根目录下已展开的目录（父目录在前）"""
+        root = self.get_current_directory()
+        paths = [p for p in self._expanded_paths
+                 if p != root and (not root or p.startswith(root))]
+        # QFileSystemModel 的路径统一使用 / 分隔
+        return sorted(paths, key=lambda p: (p.count("/"), p))
+
+    def restore_expanded_paths(self, paths: List[str]) -> int:
+        """
+        恢复展开状态（不滚动、不选择、不发射文件选择信号）
+
+        Returns:
+            int: 成功展开的目录数
+        """
+        restored = 0
+        for path in paths or []:
+            try:
+                if not os.path.isdir(path):
+                    continue
+                proxy_index = self.proxy_model.mapFromSource(self.file_model.index(path))
+                if proxy_index.isValid():
+                    self.tree_view.expand(proxy_index)
+                    restored += 1
+            except Exception as e:
+                self.logger.debug(f"恢复展开状态失败: {path}: {e}")
+        return restored
+
     def select_file(self, file_path: str):
         """选择指定文件"""
         try:
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+lmv:// 本地文档协议 v1.0.0
+通过自定义 URL 协议加载渲染结果，绕开 setHtml 的 2MB data URL 上限
+
+- 文档地址形如 lmv://<文档ID>/<源文件所在目录>/.lmv-document.html，
+  相对链接/图片按源文件目录解析（含 ../），由同一处理器从磁盘按引用读取
+- 文档 HTML 只编码一次为 UTF-8 字节，以 QBuffer 回复；资源文件以 QFile 流式回复
+- 资源只提供图片/字体/音视频/CSS 等静态类型，其余路径一律 404
+- 协议须在 QApplication 创建前 register_lmv_scheme() 注册；未注册或缺少 WebEngine 时
+  get_lmv_document_store() 返回 None，调用方退回 setHtml
+"""
+
+import mimetypes
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import quote
+
+LMV_SCHEME = b"lmv"
+DOCUMENT_NAME = ".lmv-document.html"
+# 资源文件允许的 MIME 前缀
+_ASSET_MIME_PREFIXES = ("image/", "font/", "audio/", "video/", "text/css")
+_WINDOWS_DRIVE_PATH = re.compile(r"^/[A-Za-z]:/")
+
+_store = None
+_store_lock = threading.Lock()
+
+
+@dataclass
+class LmvResource:
+    """一次请求的应答内容：data 为文档字节，file_path 为磁盘资源，二者其一"""
+    mime_type: str
+    data: Optional[bytes] = None
+    file_path: Optional[str] = None
+
+
+def _url_path(directory: Path) -> str:
+    path = directory.as_posix()
+    return path if path.startswith("/") else "/" + path
+
+
+def _local_path(url_path: str) -> Path:
+    if _WINDOWS_DRIVE_PATH.match(url_path):
+        url_path = url_path[1:]
+    return Path(url_path)
+
+
+class LmvDocumentStore:
+    """lmv:// 文档存储：保留最近发布的若干文档，供页面加载与重新加载"""
+
+    def __init__(self, max_documents: int = 4):
+        self.max_documents = max(1, int(max_documents))
+        self._documents: "OrderedDict[str, tuple]" = OrderedDict()  # id -> (url_path, data)
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def publish(self, source_path: Union[str, Path], html: str) -> str:
+        """
+        发布渲染结果
+
+        Args:
+            source_path: 源文件路径（决定相对链接的解析目录）
+            html: 渲染后的 HTML
+
+        Returns:
+            str: 文档 URL；每次发布使用新的文档 ID，避免命中旧内容
+        """
+        url_path = _url_path(Path(source_path).resolve().parent).rstrip("/") + "/" + DOCUMENT_NAME
+        data = html.encode("utf-8")
+        with self._lock:
+            self._next_id += 1
+            doc_id = f"d{self._next_id}"
+            self._documents[doc_id] = (url_path, data)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+        return f"{LMV_SCHEME.decode()}://{doc_id}{quote(url_path, safe='/:')}"
+
+    def resolve(self, host: str, path: str) -> Optional[LmvResource]:
+        """
+        解析请求
+
+        Args:
+            host: URL 主机部分（文档 ID）
+            path: 已解码的 URL 路径
+
+        Returns:
+            Optional[LmvResource]: 未知文档、不存在或不允许的资源返回 None
+        """
+        with self._lock:
+            document = self._documents.get(host)
+        if document is None:
+            return None
+        url_path, data = document
+        if path == url_path:
+            return LmvResource("text/html;charset=utf-8", data=data)
+        file_path = _local_path(path)
+        mime_type = mimetypes.guess_type(file_path.name)[0] or ""
+        if not mime_type.startswith(_ASSET_MIME_PREFIXES) or not file_path.is_file():
+            return None
+        return LmvResource(mime_type, file_path=str(file_path))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._documents)
+
+
+def register_lmv_scheme() -> bool:
+    """注册 lmv 协议（必须在创建 QApplication 之前调用）"""
+    try:
+        from PyQt5.QtCore import QCoreApplication
+        from PyQt5.QtWebEngineCore import QWebEngineUrlScheme
+    except Exception:
+        return False
+    if QWebEngineUrlScheme.schemeByName(LMV_SCHEME).name():
+        return True
+    if QCoreApplication.instance() is not None:
+        return False
+    scheme = QWebEngineUrlScheme(LMV_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalScheme
+                    | QWebEngineUrlScheme.LocalAccessAllowed)
+    QWebEngineUrlScheme.registerScheme(scheme)
+    return True
+
+
+def _create_handler(store: LmvDocumentStore):
+    from PyQt5.QtCore import QBuffer, QFile, QIODevice
+    from PyQt5.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlSchemeHandler
+
+    class LmvSchemeHandler(QWebEngineUrlSchemeHandler):
+        """把 lmv:// 请求应答为文档字节（QBuffer）或磁盘资源（QFile）"""
+
+        def requestStarted(self, job):
+            url = job.requestUrl()
+            resource = store.resolve(url.host(), url.path())
+            if resource is None:
+                job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+                return
+            if resource.data is not None:
+                device = QBuffer(job)
+                device.setData(resource.data)
+            else:
+                device = QFile(resource.file_path, job)
+            if not device.open(QIODevice.ReadOnly):
+                job.fail(QWebEngineUrlRequestJob.RequestFailed)
+                return
+            job.reply(resource.mime_type.encode("ascii"), device)
+
+    return LmvSchemeHandler()
+
+
+def get_lmv_document_store() -> Optional[LmvDocumentStore]:
+    """
+    获取全局文档存储，首次调用时在默认 Profile 上安装协议处理器
+
+    Returns:
+        Optional[LmvDocumentStore]: 协议未注册或 WebEngine 不可用时返回 None
+    """
+    global _store
+    with _store_lock:
+        if _store is not None:
+            return _store
+        try:
+            from PyQt5.QtWebEngineCore import QWebEngineUrlScheme
+            from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+        except Exception:
+            return None
+        if not QWebEngineUrlScheme.schemeByName(LMV_SCHEME).name():
+            return None
+        store = LmvDocumentStore()
+        handler = _create_handler(store)
+        profile = QWebEngineProfile.defaultProfile()
+        handler.setParent(profile)
+        profile.installUrlSchemeHandler(LMV_SCHEME, handler)
+        _store = store
+        return _store
@@ -10,6 +10,7 @@
 最后更新: 2025-01-08
 """
 
+import os
 import sys
 import logging
 import copy
@@ -46,6 +47,8 @@ from core.config_validator import ConfigValidator
 from core.error_code_manager import ErrorCodeManager
 from core.dynamic_module_importer import DynamicModuleImporter
 from core.markdown_renderer import HybridMarkdownRenderer
+from core.service_registry import LazyService, ServiceRegistry
+from core.session_snapshot import SessionSnapshotStore
 
 
 class MainWindow(QMainWindow):
@@ -57,6 +60,20 @@ class MainWindow(QMainWindow):
     
     # 定义信号
     file_selected = pyqtSignal(str)  # 文件选择信号
+    # 应用状态版本变更（可能由工作线程发射，经排队连接回到主线程）
+    _status_state_changed = pyqtSignal(int)
+
+    # 架构核心组件：由 self.services 惰性构建（首次使用时，或首帧后由空闲定时器逐个预热）
+    cache_manager = LazyService()
+    performance_metrics = LazyService()
+    performance_monitor = LazyService()
+    error_manager = LazyService()
+    snapshot_manager = LazyService()
+    snapshot_logger = LazyService()
+    state_manager = LazyService()
+    config_validator = LazyService()
+    dynamic_importer = LazyService()
+    markdown_renderer = LazyService()
     
     def __init__(self):
         """初始化主窗口"""
@@ -72,20 +89,22 @@ class MainWindow(QMainWindow):
         # 设置日志
         self.logger = TemplatedLogger(__name__)
         
-        # 架构核心组件将在initialize_architecture_components中按顺序构建
+        # 架构核心组件在initialize_architecture_components中按顺序登记，由注册表按需构建
+        self.services = ServiceRegistry("main_window")
         self.config_manager = get_config_manager()
         self.correlation_manager = CorrelationIdManager()
         self.status_event_emitter = StatusEventEmitter()
-        self._importer = None
-        self.performance_metrics = None
-        self.state_manager = None
-        self.snapshot_manager = None
-        self.snapshot_logger = None
-        self.error_manager = None
-        self.dynamic_importer = None
-        self.markdown_renderer = None
-        self.config_validator = None
+        self._warm_up_timer: Optional[QTimer] = None
+        # 温启动会话快照（测试模式下不读写，避免用例之间相互影响）
+        self.session_store = self._create_session_store()
+        self._warm_import_snapshot: Optional[Dict[str, Any]] = None
         self._status_poll_timer: Optional[QTimer] = None
+        # 推送式状态栏：状态版本变更后经防抖合并，只在版本与上次渲染不同时刷新
+        self._status_debounce_timer: Optional[QTimer] = None
+        self._status_debounce_ms = 100
+        self._status_rendered_version: Optional[int] = None
+        self._status_bar_rendered = False
+        self._status_refresh_stats = {"notifications": 0, "renders": 0, "skipped": 0}
         self._last_module_status: Optional[Dict[str, Any]] = None
         self._last_render_status: Optional[Dict[str, Any]] = None
         self._status_color_rules: Dict[str, str] = {}
@@ -106,6 +125,9 @@ class MainWindow(QMainWindow):
         # 初始化架构组件（严格按架构要求的顺序）
         self.initialize_architecture_components()
 
+        # 按上次会话快照立即恢复文档与文件树状态（新鲜度在事件循环启动后校验）
+        self._restore_session_snapshot()
+
         # 初始状态栏刷新
         try:
             self.update_status_bar()
@@ -128,6 +150,88 @@ class MainWindow(QMainWindow):
     # ------------------------------------------------------------------
     # 供008任务注册/注销状态事件监听器
     # ------------------------------------------------------------------
+    @property
+    def _importer(self):
+        """已构建的动态导入器（不触发构建）"""
+        return self.services.peek("dynamic_importer")
+
+    # ------------------------------------------------------------------
+    # 温启动会话快照
+    # ------------------------------------------------------------------
+    def _create_session_store(self) -> Optional[SessionSnapshotStore]:
+        if (os.environ.get('LAD_TEST_MODE') == '1') or ('PYTEST_CURRENT_TEST' in os.environ):
+            return None
+        try:
+            if not self.config_manager.get_config("app.session.warm_start", True, "app"):
+                return None
+            return SessionSnapshotStore(
+                max_documents=int(self.config_manager.get_config("app.session.max_documents", 5, "app")),
+            )
+        except Exception as exc:
+            self.logger.warning(f"会话快照不可用: {exc}")
+            return None
+
+    def _restore_session_snapshot(self) -> bool:
+        """按会话快照恢复文件树根目录、展开节点、文档与导入快照。"""
+        if self.session_store is None:
+            return False
+        snapshot = self.session_store.load()
+        if not snapshot:
+            return False
+        restored = False
+        try:
+            self._warm_import_snapshot = snapshot.get("import_snapshot") or None
+            if self.file_tree:
+                root_path = snapshot.get("root_path")
+                if root_path and os.path.isdir(root_path) and root_path != self.file_tree.get_current_directory():
+                    self.file_tree.set_root_path(root_path)
+                self.file_tree.restore_expanded_paths(snapshot.get("expanded_paths", []))
+            if self.content_viewer:
+                restored = self.content_viewer.restore_session(snapshot.get("documents", []),
+                                                               snapshot.get("current_file"))
+                current_file = self.content_viewer.get_current_file()
+                if restored and current_file:
+                    self._last_selected_file = current_file
+                    self.setWindowTitle(f"{Path(current_file).name} - 本地Markdown文件渲染器")
+        except Exception as exc:
+            self.logger.warning(f"会话快照恢复失败: {exc}")
+        if restored:
+            QTimer.singleShot(0, self._validate_session_snapshot)
+        return restored
+
+    def _validate_session_snapshot(self) -> None:
+        """校验快照文档的 mtime，过期文档移出缓存，当前文档过期则重新渲染。"""
+        try:
+            if self.content_viewer:
+                stale = self.content_viewer.refresh_stale_session_documents()
+                if stale:
+                    self.logger.info(f"会话快照中已变更的文档: {len(stale)}")
+        except Exception as exc:
+            self.logger.warning(f"会话快照校验失败: {exc}")
+
+    def _save_session_snapshot(self) -> bool:
+        """保存会话快照（须在 ContentViewer 释放 WebEngine 之前调用）。"""
+        if self.session_store is None or not self.content_viewer:
+            return False
+        import_snapshot = self._warm_import_snapshot
+        importer = self._importer
+        if importer:
+            try:
+                import_snapshot = importer.get_last_import_snapshot("markdown_processor") or import_snapshot
+            except Exception:
+                pass
+        return self.session_store.save(
+            root_path=self.file_tree.get_current_directory() if self.file_tree else None,
+            expanded_paths=self.file_tree.get_expanded_paths() if self.file_tree else [],
+            documents=self.content_viewer.export_session_documents(self.session_store.max_documents),
+            current_file=self.content_viewer.get_current_file(),
+            import_snapshot=import_snapshot,
+        )
+
+    def startup_report(self) -> Dict[str, Any]:
+        """启动报告：首帧时间与各组件构建耗时（见 ServiceRegistry.startup_report）。"""
+        return self.services.startup_report()
+
     def register_status_event_listener(self, listener: Callable[[StatusChangeEvent], None]) -> None:
         """注册状态事件监听器（供008 StateChangeListener 使用）。"""
         if not callable(listener):
@@ -399,51 +503,107 @@ class MainWindow(QMainWindow):
         self.logger.info("状态栏设置完成")
     
     def initialize_architecture_components(self):
-        """按架构标准顺序初始化核心组件。"""
-        self.logger.info("初始化架构核心组件")
-        try:
+        """按架构标准顺序登记核心组件（首次使用时构建，或首帧后空闲预热）。"""
+        self.logger.info("登记架构核心组件")
+        services = self.services
+        config_manager = self.config_manager
+
+        def _performance_metrics():
+            metrics = PerformanceMetrics(config_manager)
+            self.logger.performance_metrics = metrics
+            return metrics
+
+        def _snapshot_manager():
+            return SnapshotManager(
+                config_manager=config_manager,
+                cache_manager=services.get("cache_manager"),
+                performance_metrics=services.get("performance_metrics"),
+                correlation_manager=self.correlation_manager,
+            )
+
+        def _state_manager():
+            state_manager = ApplicationStateManager(config_manager)
+            state_manager.set_snapshot_manager(services.get("snapshot_manager"))
+            state_manager.set_performance_metrics(services.get("performance_metrics"))
+            # 状态栏订阅版本变更；构建前已写入的快照由构建时的一次检查补上
+            state_manager.add_change_listener(self._on_app_state_changed)
+            self._on_app_state_changed(state_manager.get_version(), "all")
+            return state_manager
+
+        def _dynamic_importer():
+            importer = DynamicModuleImporter(config_manager)
+            for setter, dependency in (("set_snapshot_manager", "snapshot_manager"),
+                                       ("set_performance_metrics", "performance_metrics")):
+                if hasattr(importer, setter):
+                    try:
+                        getattr(importer, setter)(services.get(dependency))
+                    except Exception:
+                        pass
+            return importer
+
+        components = [
             # 基础层
-            self.cache_manager = UnifiedCacheManager()
+            ("cache_manager", UnifiedCacheManager, ()),
             # 监控层
-            self.performance_metrics = PerformanceMetrics(self.config_manager)
-            self.logger.performance_metrics = self.performance_metrics
-            self.performance_monitor = PerformanceThresholdMonitor(self.performance_metrics, self.logger)
-            self.error_manager = ErrorCodeManager(self.config_manager)
+            ("performance_metrics", _performance_metrics, ()),
+            ("performance_monitor",
+             lambda: PerformanceThresholdMonitor(services.get("performance_metrics"), self.logger),
+             ("performance_metrics",)),
+            ("error_manager", lambda: ErrorCodeManager(config_manager), ()),
             # 快照层
-            self.snapshot_manager = SnapshotManager(
-                config_manager=self.config_manager,
-                cache_manager=self.cache_manager,
-                performance_metrics=self.performance_metrics,
-                correlation_manager=self.correlation_manager,
-            )
-            self.snapshot_logger = SnapshotLogger(self.logger)
-            if hasattr(self.dynamic_importer, "set_snapshot_manager"):
-                try:
-                    self.dynamic_importer.set_snapshot_manager(self.snapshot_manager)
-                except Exception:
-                    pass
-            if hasattr(self.dynamic_importer, "set_performance_metrics"):
-                try:
-                    self.dynamic_importer.set_performance_metrics(self.performance_metrics)
-                except Exception:
-                    pass
-                # 状态层
-                self.state_manager = ApplicationStateManager(self.config_manager)
-                self.state_manager.set_snapshot_manager(self.snapshot_manager)
-                self.state_manager.set_performance_metrics(self.performance_metrics)
-                # 验证层
-                self.config_validator = ConfigValidator(self.config_manager)
-
-                # 任务007要求的扩展组件
-                self.dynamic_importer = DynamicModuleImporter(self.config_manager)
-                self._importer = self.dynamic_importer
-                self.markdown_renderer = HybridMarkdownRenderer(self.config_manager)
-
-                # 预载配置
-                self._load_status_bar_config()
+            ("snapshot_manager", _snapshot_manager, ("cache_manager", "performance_metrics")),
+            ("snapshot_logger", lambda: SnapshotLogger(self.logger), ()),
+            # 状态层
+            ("state_manager", _state_manager, ("snapshot_manager", "performance_metrics")),
+            # 验证层
+            ("config_validator", lambda: ConfigValidator(config_manager), ()),
+            # 任务007要求的扩展组件（渲染器可能已由 ContentViewer 登记，两者共用一个实例）
+            ("dynamic_importer", _dynamic_importer, ("snapshot_manager", "performance_metrics")),
+            ("markdown_renderer", lambda: HybridMarkdownRenderer(config_manager), ()),
+        ]
+        for name, factory, deps in components:
+            if not services.is_registered(name):
+                services.register(name, factory, deps)
+
+        # 预载配置
+        self._load_status_bar_config()
+
+    def showEvent(self, event):
+        """首次显示后，在事件循环空闲时逐个预热尚未构建的组件。"""
+        super().showEvent(event)
+        if self._warm_up_timer is None:
+            self._warm_up_timer = QTimer(self)
+            self._warm_up_timer.setInterval(0)
+            self._warm_up_timer.timeout.connect(self._warm_up_next)
+            # 0ms 单次定时器在首帧的显示/绘制事件处理完后才触发
+            QTimer.singleShot(0, self._start_warm_up)
+
+    def _start_warm_up(self):
+        self.services.mark_first_paint()
+        if self._warm_up_timer is not None:
+            self._warm_up_timer.start()
+
+    def _warm_up_next(self):
+        """预热一个组件；全部完成后记录启动报告并刷新状态栏。"""
+        try:
+            more = self.services.warm_up_step()
         except Exception as exc:
-            self.logger.error(f"架构组件初始化失败: {exc}")
-            raise
+            self.logger.warning(f"组件预热失败: {exc}")
+            more = bool(self.services.pending_warm_up())
+        if more:
+            return
+
+        self._warm_up_timer.stop()
+        report = self.services.startup_report()
+        self.logger.info(
+            f"启动完成: 首帧 {report['first_paint_ms']:.1f}ms，"
+            f"首帧前组件构建 {report['init_ms_before_first_paint']:.1f}ms，"
+            f"组件构建合计 {report['init_ms_total']:.1f}ms"
+        )
+        try:
+            self.update_status_bar()
+        except Exception as exc:
+            self.logger.warning(f"预热后状态栏刷新失败: {exc}")
 
     def _load_status_bar_config(self):
         """载入状态栏颜色与消息配置。"""
@@ -464,16 +624,16 @@ class MainWindow(QMainWindow):
         status_messages = self.config_manager.get_config("ui.status_bar_messages", {}, "app") or {}
         self._status_messages = status_messages
         try:
-            self._status_update_interval = int(self.config_manager.get_config(
-                "ui.status_bar_update_interval_ms", 5000, "app"
-            ) or 5000)
+            self._status_debounce_ms = max(0, int(self.config_manager.get_config(
+                "ui.status_bar_debounce_ms", 100, "app"
+            )))
         except Exception:
-            self._status_update_interval = 5000
+            self._status_debounce_ms = 100
     
     def _setup_connections(self):
         """设置信号连接"""
-        # 架构组件若尚未初始化则先初始化（防御式处理）
-        if self.state_manager is None:
+        # 架构组件若尚未登记则先登记（防御式处理）
+        if not self.services.is_registered("state_manager"):
             self.initialize_architecture_components()
 
         # 连接分割器大小变化信号
@@ -490,9 +650,10 @@ class MainWindow(QMainWindow):
         self.logger.info("信号连接设置完成")
 
     def setup_status_update_triggers(self):
-        """设置状态栏轮询与初始刷新。"""
+        """设置推送式状态栏刷新：状态版本变更经防抖合并后才重新渲染，空闲时不轮询。"""
         self.logger.info("设置状态栏更新触发器")
-        self.update_status_bar()
+        if not self._status_bar_rendered:
+            self.update_status_bar()
 
         if self._status_poll_timer:
             try:
@@ -500,19 +661,64 @@ class MainWindow(QMainWindow):
                 self._status_poll_timer.deleteLater()
             except Exception:
                 pass
+            self._status_poll_timer = None
+
+        if self._status_debounce_timer is None:
+            self._status_debounce_timer = QTimer(self)
+            self._status_debounce_timer.setSingleShot(True)
+            self._status_debounce_timer.timeout.connect(self._refresh_status_bar_if_changed)
+            self._status_state_changed.connect(self._schedule_status_refresh)
+        self._status_debounce_timer.setInterval(self._status_debounce_ms)
 
-        self._status_poll_timer = QTimer(self)
-        self._status_poll_timer.setInterval(getattr(self, "_status_update_interval", 5000))
-        self._status_poll_timer.timeout.connect(self.update_status_bar)
-        self._status_poll_timer.start()
+    def _on_app_state_changed(self, version: int, domain: str) -> None:
+        """ApplicationStateManager 的变更回调（任意线程），转为主线程信号。"""
+        try:
+            self._status_state_changed.emit(version)
+        except RuntimeError:
+            # 窗口已销毁
+            pass
+
+    def _schedule_status_refresh(self, version: int = 0) -> None:
+        """合并一个防抖窗口内的多次变更：计时器运行中不重启，保证持续变更时也按间隔刷新。"""
+        self._status_refresh_stats["notifications"] += 1
+        timer = self._status_debounce_timer
+        if timer is not None and not timer.isActive():
+            timer.start()
+
+    def _current_status_version(self) -> Optional[int]:
+        state_manager = self.services.peek("state_manager")
+        if state_manager is None:
+            return None
+        try:
+            return state_manager.get_version()
+        except Exception:
+            return None
+
+    def _refresh_status_bar_if_changed(self) -> bool:
+        """状态版本与上次渲染一致时跳过刷新。"""
+        if self._status_bar_rendered and self._current_status_version() == self._status_rendered_version:
+            self._status_refresh_stats["skipped"] += 1
+            return False
+        self.update_status_bar()
+        return True
+
+    def get_status_refresh_stats(self) -> Dict[str, Any]:
+        """状态栏推送刷新统计（通知次数、实际渲染次数、因版本未变跳过次数）。"""
+        return dict(self._status_refresh_stats, version=self._status_rendered_version)
 
     def update_status_bar(self):
         """按照架构规范刷新状态栏并发射事件。"""
+        # 先记录版本：渲染期间发生的变更会让下一次检查看到新版本
+        self._status_rendered_version = self._current_status_version()
+        self._status_bar_rendered = True
+        self._status_refresh_stats["renders"] += 1
         correlation_id = self._generate_and_propagate_correlation_id("ui", "status_bar")
         timer_id = None
+        # 状态栏只读取已构建的组件，不为刷新状态触发构建
+        performance_metrics = self.services.peek("performance_metrics")
         try:
-            if self.performance_metrics:
-                timer_id = self.performance_metrics.start_timer(
+            if performance_metrics:
+                timer_id = performance_metrics.start_timer(
                     "status_bar_update",
                     {"correlation_id": correlation_id},
                 )
@@ -520,8 +726,8 @@ class MainWindow(QMainWindow):
             module_status = self._get_module_status_safe()
             render_status = self._get_render_status_safe()
 
-            if self.performance_metrics:
-                self.performance_metrics.record_module_update(
+            if performance_metrics:
+                performance_metrics.record_module_update(
                     module_status.get("module", "markdown_processor"),
                     module_status,
                 )
@@ -548,8 +754,8 @@ class MainWindow(QMainWindow):
             )
             self.logger.log("ERROR", "状态栏刷新失败", operation="status_bar_update", component="ui", error=str(exc))
         finally:
-            if self.performance_metrics and timer_id:
-                duration_seconds = self.performance_metrics.end_timer(timer_id)
+            if performance_metrics and timer_id:
+                duration_seconds = performance_metrics.end_timer(timer_id)
                 if duration_seconds is not None:
                     duration_ms = duration_seconds * 1000
                     threshold = self.config_manager.get_config(
@@ -575,15 +781,17 @@ class MainWindow(QMainWindow):
         correlation_id = CorrelationIdManager.generate_correlation_id(operation, component)
         self.correlation_manager.set_current_correlation_id(component, correlation_id)
 
-        if self.dynamic_importer and hasattr(self.dynamic_importer, "set_correlation_id"):
+        dynamic_importer = self.services.peek("dynamic_importer")
+        if dynamic_importer and hasattr(dynamic_importer, "set_correlation_id"):
             try:
-                self.dynamic_importer.set_correlation_id(correlation_id)
+                dynamic_importer.set_correlation_id(correlation_id)
             except Exception:
                 pass
 
-        if self.markdown_renderer and hasattr(self.markdown_renderer, "module_importer"):
+        markdown_renderer = self.services.peek("markdown_renderer")
+        if markdown_renderer and hasattr(markdown_renderer, "module_importer"):
             try:
-                self.markdown_renderer.module_importer.set_correlation_id(correlation_id)
+                markdown_renderer.module_importer.set_correlation_id(correlation_id)
             except Exception:
                 pass
 
@@ -592,14 +800,20 @@ class MainWindow(QMainWindow):
     def _get_module_status_safe(self) -> Dict[str, Any]:
         snapshot: Dict[str, Any] = {}
         try:
-            if self.dynamic_importer:
-                snapshot = self.dynamic_importer.get_last_import_snapshot("markdown_processor") or {}
+            dynamic_importer = self.services.peek("dynamic_importer")
+            if dynamic_importer:
+                snapshot = dynamic_importer.get_last_import_snapshot("markdown_processor") or {}
                 if not snapshot:
-                    self.dynamic_importer.import_module("markdown_processor", ["markdown"])
-                    snapshot = self.dynamic_importer.get_last_import_snapshot("markdown_processor") or {}
+                    dynamic_importer.import_module("markdown_processor", ["markdown"])
+                    snapshot = dynamic_importer.get_last_import_snapshot("markdown_processor") or {}
 
-            if not snapshot and self.state_manager:
-                snapshot = self.state_manager.get_module_status("markdown_processor")
+            state_manager = self.services.peek("state_manager")
+            if not snapshot and state_manager:
+                snapshot = state_manager.get_module_status("markdown_processor")
+
+            # 导入器尚未构建时沿用上次会话的导入快照
+            if not snapshot and self._warm_import_snapshot:
+                snapshot = dict(self._warm_import_snapshot)
         except Exception as exc:
             self.logger.warning(f"获取模块快照失败: {exc}")
             snapshot = {}
@@ -623,8 +837,9 @@ class MainWindow(QMainWindow):
 
     def _get_render_status_safe(self) -> Dict[str, Any]:
         try:
-            if self.state_manager:
-                return self.state_manager.get_render_status()
+            state_manager = self.services.peek("state_manager")
+            if state_manager:
+                return state_manager.get_render_status()
         except Exception as exc:
             self.logger.warning(f"获取渲染状态失败: {exc}")
 
@@ -864,6 +1079,10 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """窗口关闭事件处理"""
         self.logger.info("应用程序即将关闭")
+        try:
+            self._save_session_snapshot()
+        except Exception as e:
+            self.logger.warning(f"会话快照保存失败: {e}")
         try:
             # 清理ContentViewer资源
             if self.content_viewer:
@@ -901,11 +1120,19 @@ class MainWindow(QMainWindow):
             QApplication.instance().quit()
         except Exception:
             pass
-        # 清理导入器（安全关闭线程与持久化）
+        # 停止预热；清理已构建的导入器（安全关闭线程与持久化）
         try:
-            if getattr(self, '_importer', None):
-                self._importer.shutdown()
-                self._importer = None
+            if self._warm_up_timer is not None:
+                self._warm_up_timer.stop()
+            if self._status_debounce_timer is not None:
+                self._status_debounce_timer.stop()
+            state_manager = self.services.peek("state_manager")
+            if state_manager:
+                state_manager.remove_change_listener(self._on_app_state_changed)
+            importer = self._importer
+            if importer:
+                importer.shutdown()
+                self.services.provide("dynamic_importer", None)
         except Exception:
             pass
     
@@ -1063,7 +1290,8 @@ class MainWindow(QMainWindow):
 
         # 渲染指示器：读取渲染器快照以显示来源标识
         try:
-            rs = (self.markdown_renderer.get_last_render_snapshot() if self.markdown_renderer
+            markdown_renderer = self.services.peek("markdown_renderer")
+            rs = (markdown_renderer.get_last_render_snapshot() if markdown_renderer
                   else {})
             rtype = rs.get('renderer_type')
             if rtype == 'markdown_processor':
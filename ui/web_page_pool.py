@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebPagePool v1.0.0
+预热的 WebEngine 页面池：导航时切换到已就绪页面，替代每次新建/销毁 Page
+
+- acquire(): 优先取出空闲的预热页面，池空时才新建
+- release(): 页面重置后归还；空闲页面已达上限时才销毁
+- prewarm(): 空闲时补足预热页面，供下一次导航直接使用
+- stats(): 创建/销毁/复用计数，用于确认没有 Page 泄漏
+- 与 QWebEngine 解耦：页面工厂、重置与销毁均由调用方注入
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from core.enhanced_logger import TemplatedLogger
+
+
+class WebPagePool:
+    """WebEngine 页面池"""
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2,
+                 reset: Optional[Callable[[Any], None]] = None,
+                 destroy: Optional[Callable[[Any], None]] = None):
+        """
+        Args:
+            factory: 创建新页面（应已安装链接桥接脚本）
+            size: 最多保留的空闲页面数；0 表示不缓存，归还即销毁
+            reset: 归还前重置页面（停止加载、清空内容）
+            destroy: 销毁页面，默认调用 deleteLater()
+        """
+        self._factory = factory
+        self._reset = reset
+        self._destroy = destroy or (lambda page: page.deleteLater())
+        self.size = max(0, int(size))
+        self.logger = TemplatedLogger(__name__)
+        self._lock = threading.Lock()
+        self._idle: List[Any] = []
+        self._in_use: List[Any] = []
+        self._created = 0
+        self._destroyed = 0
+        self._reused = 0
+        self._closed = False
+
+    def acquire(self) -> Any:
+        """取出一个就绪页面"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("页面池已关闭")
+            page = self._idle.pop() if self._idle else None
+            if page is not None:
+                self._reused += 1
+        if page is None:
+            page = self._create()
+        with self._lock:
+            self._in_use.append(page)
+        return page
+
+    def release(self, page: Any) -> None:
+        """归还页面：重置后放回空闲队列，超出上限或重置失败则销毁"""
+        if page is None:
+            return
+        with self._lock:
+            if not any(p is page for p in self._in_use):
+                return  # 非本池页面或已归还
+            self._in_use = [p for p in self._in_use if p is not page]
+            keep = not self._closed and len(self._idle) < self.size
+        if keep and self._reset is not None:
+            try:
+                self._reset(page)
+            except Exception as e:
+                self.logger.warning(f"重置页面失败，改为销毁: {e}")
+                keep = False
+        if keep:
+            with self._lock:
+                self._idle.append(page)
+        else:
+            self._discard(page)
+
+    def prewarm(self) -> int:
+        """补足空闲页面至上限，返回新建数量"""
+        created = 0
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= self.size:
+                    return created
+            page = self._create()
+            created += 1
+            with self._lock:
+                self._idle.append(page)
+
+    def drain(self) -> None:
+        """关闭页面池并销毁所有页面（含使用中的页面）"""
+        with self._lock:
+            self._closed = True
+            pages = self._idle + self._in_use
+            self._idle, self._in_use = [], []
+        for page in pages:
+            self._discard(page)
+
+    def stats(self) -> Dict[str, int]:
+        """页面创建/销毁/复用计数"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'created': self._created,
+                'destroyed': self._destroyed,
+                'reused': self._reused,
+            }
+
+    def _create(self) -> Any:
+        page = self._factory()
+        with self._lock:
+            self._created += 1
+        return page
+
+    def _discard(self, page: Any) -> None:
+        try:
+            self._destroy(page)
+        except Exception as e:
+            self.logger.warning(f"销毁页面失败: {e}")
+        with self._lock:
+            self._destroyed += 1
@@ -5,18 +5,50 @@
 负责加载和管理应用的所有配置文件
 包括应用配置、界面配置、文件类型配置等
 
+set_config 只修改内存并登记待写回，由后台写回线程在静默期后合并落盘
+（临时文件 + os.replace 原子替换）；flush() 同步写出，进程退出时自动 flush
+
 作者: LAD Team
 创建时间: 2025-01-08
 最后更新: 2025-01-08
 """
 
+import atexit
 import json
 import os
 import logging
+import tempfile
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Iterable, Optional, Union
 import builtins
 
+# 写回延迟：最后一次修改后静默多久落盘；持续修改时最迟多久落盘
+_WRITE_DEBOUNCE_SECONDS = 0.5
+_WRITE_MAX_DELAY_SECONDS = 2.0
+
+_CONFIG_FILES = {
+    "app": "app_config.json",
+    "ui": "ui_config.json",
+    "file_types": "file_types.json",
+}
+
+# 存活的配置管理器，进程退出时统一写出未落盘的修改
+_live_managers = weakref.WeakSet()
+
+
+def _flush_all_on_exit():
+    for manager in list(_live_managers):
+        try:
+            manager.shutdown()
+        except Exception:
+            pass
+
+
+atexit.register(_flush_all_on_exit)
+
 
 class ConfigManager:
     """
@@ -24,12 +56,13 @@ class ConfigManager:
     统一管理应用的所有配置文件，提供配置的读取、写入和验证功能
     """
     
-    def __init__(self, config_dir: str = None):
+    def __init__(self, config_dir: str = None, write_debounce: Optional[float] = None):
         """
         初始化配置管理器
         
         Args:
             config_dir: 配置文件目录路径，默认为当前目录下的config文件夹
+            write_debounce: set_config 写回的静默期（秒），0 表示每次同步写盘
         """
         # 设置配置文件目录
         if config_dir is None:
@@ -48,6 +81,21 @@ class ConfigManager:
         self._file_types_config = {}
         self._config_cache = {}  # V2.1: 统一配置缓存
         self._change_listeners = []  # 可选：配置热重载监听
+        self._generation = 0  # 配置代数：每次保存/重新加载递增，供派生数据判断缓存是否过期
+        
+        # 异步写回：修改在内存中合并，后台线程在静默期后落盘
+        self._write_debounce = (_WRITE_DEBOUNCE_SECONDS if write_debounce is None
+                                else max(0.0, float(write_debounce)))
+        self._data_lock = threading.RLock()  # 保护配置字典的修改与序列化
+        self._file_lock = threading.Lock()  # 串行化文件写入
+        self._pending_cond = threading.Condition()
+        self._dirty = set()
+        self._writing: Dict[str, int] = {}  # 已从 _dirty 取出、尚未写完的配置类型（受 _pending_cond 保护）
+        self._first_dirty_at = 0.0
+        self._last_dirty_at = 0.0
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        _live_managers.add(self)
         
         # 设置日志
         self.logger = logging.getLogger(__name__)
@@ -155,19 +203,20 @@ class ConfigManager:
             if not config_dict:
                 return False
             
-            # 支持嵌套键设置
-            keys = key.split('.')
-            target_dict = config_dict
-            for k in keys[:-1]:
-                if k not in target_dict:
-                    target_dict[k] = {}
-                target_dict = target_dict[k]
-            
-            target_dict[keys[-1]] = value
+            with self._data_lock:
+                # 支持嵌套键设置
+                keys = key.split('.')
+                target_dict = config_dict
+                for k in keys[:-1]:
+                    if k not in target_dict:
+                        target_dict[k] = {}
+                    target_dict = target_dict[k]
+                
+                target_dict[keys[-1]] = value
             
-            # 保存配置
-            self._save_config(config_type)
-            self.logger.info(f"配置项 {key} 设置成功")
+            # 登记写回（内存中的修改立即生效）
+            self._schedule_save(config_type)
+            self.logger.debug(f"配置项 {key} 设置成功")
             return True
         except Exception as e:
             self.logger.error(f"设置配置项 {key} 失败: {e}")
@@ -187,8 +236,13 @@ class ConfigManager:
         if callback not in self._change_listeners:
             self._change_listeners.append(callback)
 
+    def get_config_generation(self) -> int:
+        """获取配置代数（配置保存或重新加载后递增）。"""
+        return self._generation
+
     def _notify_change_listeners(self, config_name: str):
-        """触发已注册的配置变更回调。"""
+        """递增配置代数并触发已注册的配置变更回调。"""
+        self._generation += 1
         for cb in list(self._change_listeners):
             try:
                 cb(config_name)
@@ -200,9 +254,14 @@ class ConfigManager:
         return self._ui_config.copy()
     
     def load_file_types_config(self) -> Dict[str, Any]:
-        """加载文件类型配置（实时刷新）。"""
-        self._load_file_types_config()
-        return json.loads(json.dumps(self._file_types_config))
+        """加载文件类型配置（实时刷新；有未落盘的修改时以内存为准）。"""
+        with self._file_lock:
+            with self._pending_cond:
+                pending = "file_types" in self._dirty or "file_types" in self._writing
+            if not pending:
+                self._load_file_types_config()
+        with self._data_lock:
+            return json.loads(json.dumps(self._file_types_config))
     
     def update_config(self, key: str, value: Any, config_type: str = "app") -> bool:
         """
@@ -419,25 +478,134 @@ class ConfigManager:
     
     def _save_app_config(self):
         """保存应用配置"""
-        config_file = self.config_dir / "app_config.json"
-        with builtins.open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(self._app_config, f, indent=2, ensure_ascii=False)
+        self._write_config_file("app")
         self._notify_change_listeners("app")
     
     def _save_ui_config(self):
         """保存界面配置"""
-        config_file = self.config_dir / "ui_config.json"
-        with builtins.open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(self._ui_config, f, indent=2, ensure_ascii=False)
+        self._write_config_file("ui")
         self._notify_change_listeners("ui")
     
     def _save_file_types_config(self):
         """保存文件类型配置"""
-        config_file = self.config_dir / "file_types.json"
-        with builtins.open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(self._file_types_config, f, indent=2, ensure_ascii=False)
+        self._write_config_file("file_types")
         self._notify_change_listeners("file_types")
 
+    def _write_config_file(self, config_type: str):
+        """原子写出一个配置文件（临时文件 + os.replace，中途失败不会留下半个文件）"""
+        config_file = self.config_dir / _CONFIG_FILES[config_type]
+        with self._file_lock:
+            with self._data_lock:
+                payload = json.dumps(self._get_config_dict(config_type), indent=2, ensure_ascii=False)
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{config_file.stem}.", suffix=".tmp",
+                                            dir=str(self.config_dir))
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, config_file)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+    # ==================== 异步写回 ====================
+
+    def _schedule_save(self, config_type: str):
+        """登记一次写回：通知监听器后由后台线程合并落盘；关闭后或未启用防抖时同步写出"""
+        if config_type not in _CONFIG_FILES:
+            return
+        if self._write_debounce <= 0 or self._closed:
+            self._save_config(config_type)
+            return
+        self._notify_change_listeners(config_type)
+        with self._pending_cond:
+            now = time.monotonic()
+            if not self._dirty:
+                self._first_dirty_at = now
+            self._dirty.add(config_type)
+            self._last_dirty_at = now
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, name="ConfigWriter", daemon=True)
+                self._writer.start()
+            self._pending_cond.notify_all()
+
+    def _writer_loop(self):
+        """后台写回：等到静默期结束（或达到最长延迟）后写出全部待写配置，无待写时退出"""
+        while True:
+            with self._pending_cond:
+                if not self._dirty:
+                    self._writer = None
+                    return
+                while not self._closed:
+                    due = min(self._last_dirty_at + self._write_debounce,
+                              self._first_dirty_at + _WRITE_MAX_DELAY_SECONDS)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._pending_cond.wait(remaining)
+                dirty = self._take_dirty()
+            self._write_pending(dirty)
+
+    def _take_dirty(self) -> set:
+        """取出待写配置并登记为写入中（调用方须持有 _pending_cond）"""
+        dirty, self._dirty = self._dirty, set()
+        for config_type in dirty:
+            self._writing[config_type] = self._writing.get(config_type, 0) + 1
+        return dirty
+
+    def _write_pending(self, config_types: Iterable[str]) -> bool:
+        ok = True
+        try:
+            for config_type in config_types:
+                try:
+                    self._write_config_file(config_type)
+                except Exception as e:
+                    ok = False
+                    self.logger.error(f"写回配置 {config_type} 失败: {e}")
+        finally:
+            with self._pending_cond:
+                for config_type in config_types:
+                    remaining = self._writing.get(config_type, 0) - 1
+                    if remaining > 0:
+                        self._writing[config_type] = remaining
+                    else:
+                        self._writing.pop(config_type, None)
+                self._pending_cond.notify_all()
+        return ok
+
+    def has_pending_writes(self) -> bool:
+        """是否有尚未落盘的配置修改"""
+        with self._pending_cond:
+            return bool(self._dirty)
+
+    def flush(self) -> bool:
+        """
+        同步写出所有未落盘的修改，并等待进行中的后台写入完成
+
+        Returns:
+            bool: 写出过程中未发生错误
+        """
+        with self._pending_cond:
+            dirty = self._take_dirty()
+            self._pending_cond.notify_all()
+        ok = self._write_pending(dirty)
+        with self._pending_cond:
+            while self._writing:
+                self._pending_cond.wait()
+        return ok
+
+    def shutdown(self):
+        """关闭写回线程并写出全部修改；之后的 set_config 同步写盘"""
+        with self._pending_cond:
+            self._closed = True
+            self._pending_cond.notify_all()
+            writer = self._writer
+        self.flush()
+        if writer is not None and writer is not threading.current_thread():
+            writer.join(timeout=5.0)
+
     def _ensure_optional_config(self, relative_path: str):
         """缓存存在的扩展配置文件，如 features/logging.json。"""
         config_file = self.config_dir / relative_path
@@ -621,6 +789,8 @@ class ConfigManager:
         Args:
             config_name: 配置文件名，如果为None则清除所有缓存
         """
+        # 先写出未落盘的修改，避免重新加载时丢失
+        self.flush()
         if config_name:
             self._config_cache.pop(config_name, None)
             # 如果是已加载的配置，重新加载
@@ -633,6 +803,7 @@ class ConfigManager:
         else:
             self._config_cache.clear()
             self._load_all_configs()
+        self._generation += 1
 
 
 # 全局配置管理器实例
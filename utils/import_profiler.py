@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动导入耗时分析器 v1.0.0
+类似 python -X importtime，但在进程内采集并汇总为导入树报告
+
+- 在 sys.meta_path 首位安装查找器，包装各模块 loader 的 create_module/exec_module 计时
+- 嵌套导入按调用关系组织为树：self_ms 为模块自身耗时，total_ms 含其触发的子导入
+- 报告按 total_ms 降序输出，低于阈值的子树折叠；另给出自身耗时最高的模块排行
+- 只统计安装之后首次导入的模块；已在 sys.modules 中的模块不会再次计时
+
+作者: LAD Team
+创建时间: 2026-10-19
+"""
+
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+
+class _ImportNode:
+    __slots__ = ("name", "self_ms", "total_ms", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.self_ms = 0.0
+        self.total_ms = 0.0
+        self.children: List["_ImportNode"] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "module": self.name,
+            "self_ms": round(self.self_ms, 3),
+            "total_ms": round(self.total_ms, 3),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class _TimedLoader:
+    """代理原 loader，只对 create_module/exec_module 计时，其余属性透传"""
+
+    def __init__(self, profiler: "ImportProfiler", loader: Any) -> None:
+        self._profiler = profiler
+        self._loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        if create is None:
+            return None
+        # 扩展模块的加载（dlopen）发生在 create_module 中，计入该模块节点
+        with self._profiler._timing(spec.name):
+            return create(spec)
+
+    def exec_module(self, module):
+        with self._profiler._timing(module.__name__):
+            self._loader.exec_module(module)
+
+
+class _Timing:
+    __slots__ = ("profiler", "name", "node", "started")
+
+    def __init__(self, profiler: "ImportProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.node = self.profiler._enter(self.name)
+        self.started = time.perf_counter()
+        return self.node
+
+    def __exit__(self, exc_type, exc, tb):
+        node = self.node
+        # 子导入都嵌套在本模块的计时区间内：自身耗时 = 总耗时 - 子导入总耗时
+        node.total_ms += (time.perf_counter() - self.started) * 1000.0
+        node.self_ms = node.total_ms - sum(child.total_ms for child in node.children)
+        self.profiler._exit()
+        return False
+
+
+class ImportProfiler:
+    """进程内导入耗时分析器"""
+
+    def __init__(self) -> None:
+        self._roots: List[_ImportNode] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._installed = False
+
+    # === 安装/卸载 ===
+    def start(self) -> "ImportProfiler":
+        if not self._installed:
+            sys.meta_path.insert(0, self)
+            self._installed = True
+        return self
+
+    def stop(self) -> "ImportProfiler":
+        if self._installed:
+            try:
+                sys.meta_path.remove(self)
+            except ValueError:
+                pass
+            self._installed = False
+        return self
+
+    # === 查找器协议 ===
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self:
+                    continue
+                find_spec = getattr(finder, "find_spec", None)
+                if find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        loader = spec.loader
+        if loader is not None and hasattr(loader, "exec_module") and not isinstance(loader, _TimedLoader):
+            spec.loader = _TimedLoader(self, loader)
+        return spec
+
+    def invalidate_caches(self) -> None:
+        pass
+
+    # === 计时树 ===
+    def _timing(self, name: str) -> _Timing:
+        return _Timing(self, name)
+
+    def _stack(self) -> List[_ImportNode]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name: str) -> _ImportNode:
+        stack = self._stack()
+        siblings = stack[-1].children if stack else None
+        node = None
+        if siblings is not None and siblings and siblings[-1].name == name:
+            node = siblings[-1]
+        elif siblings is None:
+            with self._lock:
+                if self._roots and self._roots[-1].name == name:
+                    node = self._roots[-1]
+        if node is None:
+            node = _ImportNode(name)
+            if siblings is not None:
+                siblings.append(node)
+            else:
+                with self._lock:
+                    self._roots.append(node)
+        stack.append(node)
+        return node
+
+    def _exit(self) -> None:
+        self._stack().pop()
+
+    # === 报告 ===
+    def tree(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            roots = list(self._roots)
+        return [node.to_dict() for node in roots]
+
+    def top(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """自身耗时最高的模块"""
+        flat: List[_ImportNode] = []
+        pending = list(self._roots)
+        while pending:
+            node = pending.pop()
+            flat.append(node)
+            pending.extend(node.children)
+        flat.sort(key=lambda n: n.self_ms, reverse=True)
+        return [{"module": n.name, "self_ms": round(n.self_ms, 3), "total_ms": round(n.total_ms, 3)}
+                for n in flat[:limit]]
+
+    def total_ms(self) -> float:
+        with self._lock:
+            return sum(node.total_ms for node in self._roots)
+
+    def format_report(self, min_ms: float = 1.0, top: int = 20) -> str:
+        """
+        文本报告：导入树（total_ms 降序，低于 min_ms 的子树折叠）+ 自身耗时排行
+
+        Args:
+            min_ms: 子树折叠阈值（毫秒）
+            top: 排行条数
+        """
+        lines = [f"导入耗时合计: {self.total_ms():.1f} ms（self / total，单位 ms）"]
+
+        def walk(nodes: List[_ImportNode], depth: int) -> None:
+            folded = [n for n in nodes if n.total_ms < min_ms]
+            for node in sorted((n for n in nodes if n.total_ms >= min_ms),
+                               key=lambda n: n.total_ms, reverse=True):
+                lines.append(f"{node.self_ms:9.1f} {node.total_ms:9.1f}  {'  ' * depth}{node.name}")
+                walk(node.children, depth + 1)
+            if folded:
+                lines.append(f"{'':9} {sum(n.total_ms for n in folded):9.1f}  {'  ' * depth}"
+                             f"… {len(folded)} 个模块 < {min_ms:g} ms")
+
+        with self._lock:
+            roots = list(self._roots)
+        walk(roots, 0)
+
+        lines.append("")
+        lines.append(f"自身耗时前 {top}:")
+        for item in self.top(top):
+            lines.append(f"{item['self_ms']:9.1f} {item['total_ms']:9.1f}  {item['module']}")
+        return "\n".join(lines)
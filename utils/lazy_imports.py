@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+延迟导入工具 v1.0.0
+重量级依赖在首次使用时才加载，缩短启动导入时间
+
+- lazy_import(name): 返回模块占位对象，首次访问属性时才真正导入；未安装时抛出 ImportError
+- optional_import(name): 同上，但未安装时返回 None，便于沿用 XXX_AVAILABLE 开关
+- lazy_exports(package, exports): 为包 __init__ 生成 PEP 562 的 __getattr__/__dir__，
+  导出名在首次访问时才导入所在子模块
+
+作者: LAD Team
+创建时间: 2026-10-19
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_lock = threading.RLock()
+
+
+class _LazyModule(ModuleType):
+    """
+    模块占位对象：首次访问未知属性时才真正导入，并把模块属性复制到自身
+
+    真实模块照常登记在 sys.modules 中；占位对象只绑定在调用方的模块全局变量上，
+    因此对占位对象打补丁（unittest.mock.patch）只影响该调用方。
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_lazy_loaded"] = False
+
+    def __getattr__(self, attr: str):
+        if self.__dict__.get("_lazy_loaded"):
+            raise AttributeError(f"module '{self.__name__}' has no attribute '{attr}'")
+        with _lock:
+            if not self.__dict__["_lazy_loaded"]:
+                module = importlib.import_module(self.__name__)
+                for key, value in vars(module).items():
+                    self.__dict__.setdefault(key, value)
+                self.__dict__["_lazy_loaded"] = True
+        return getattr(self, attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__.get("_lazy_loaded") else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    延迟导入模块
+
+    只检查模块是否存在，首次访问其属性时才执行导入（线程安全）；已导入的模块直接返回。
+    点分子模块名会立即导入其父包。
+
+    Args:
+        name: 模块全名，如 'markdown'、'PIL.Image'
+
+    Returns:
+        ModuleType: 模块或延迟模块占位对象
+
+    Raises:
+        ImportError: 模块未安装
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return _LazyModule(name)
+
+
+def optional_import(name: str) -> Optional[ModuleType]:
+    """
+    延迟导入可选依赖，未安装时返回 None
+
+    Args:
+        name: 模块全名
+
+    Returns:
+        Optional[ModuleType]: 延迟模块或 None
+    """
+    try:
+        return lazy_import(name)
+    except (ImportError, ValueError):
+        return None
+
+
+def lazy_exports(package: str, exports: Dict[str, Iterable[str]]) -> Tuple[Callable, Callable]:
+    """
+    为包生成延迟导出的 __getattr__ 与 __dir__
+
+    Args:
+        package: 包名（传入 __name__）
+        exports: {相对子模块名: [导出名, ...]}
+
+    Returns:
+        Tuple[Callable, Callable]: (__getattr__, __dir__)，赋值给包的同名全局变量
+    """
+    owners: Dict[str, str] = {}
+    for submodule, names in exports.items():
+        for export in names:
+            owners[export] = submodule
+
+    def __getattr__(attr: str):
+        submodule = owners.get(attr)
+        if submodule is None:
+            raise AttributeError(f"module '{package}' has no attribute '{attr}'")
+        value = getattr(importlib.import_module(f".{submodule}", package), attr)
+        # 缓存到包命名空间，之后不再经过 __getattr__
+        setattr(sys.modules[package], attr, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(owners))
+
+    return __getattr__, __dir__